@@ -0,0 +1,86 @@
+# Databricks notebook source
+# DBTITLE 1,Widget Variables Initialization
+dbutils.widgets.text("ITERATIONS", "5")
+# "compare" runs the benchmark; "legacy" / "packaged" time one startup in this (fresh) REPL and exit
+dbutils.widgets.text("MODE", "compare")
+ITERATIONS = int(dbutils.widgets.get("ITERATIONS"))
+MODE = dbutils.widgets.get("MODE")
+
+# COMMAND ----------
+
+# DBTITLE 1,Startup Strategies
+import importlib
+import json
+import statistics
+import time
+
+LEGACY_MODULES = ("ncp_etl.runtime", "ncp_etl.schema_manager", "ncp_etl.file_registry", "ncp_etl.secrets",
+                  "ncp_etl.transforms")
+
+
+def legacy_task_startup():
+    """ What every task paid with `%run ./data_utility_modules` + `%run ./custom_etl_functions`. """
+    # %run executed every class and function definition (and their pyspark imports) in the task's REPL
+    for module in LEGACY_MODULES:
+        importlib.import_module(module)
+    # SchemaManager.__init__ fired the DDL as a Spark job on every construction
+    metadata_table = f"{spark.catalog.currentCatalog()}.ncp.metadata_table"
+    spark.sql(f"""
+        CREATE TABLE IF NOT EXISTS {metadata_table} (
+            table_name STRING,
+            schema_json STRING,
+            checkpoint TIMESTAMP,
+            source_table STRING,
+            table_keys STRING
+        ) USING DELTA
+    """)
+    # Cloud detection and the secret lookup ran unconditionally, with nothing cached between tasks
+    if "azuredatabricks.net" in spark.conf.get("spark.databricks.workspaceUrl", "unknown"):
+        dbutils.secrets.get(scope="azure-secret-scope", key="azure_analytics_blob_storage_key")
+
+
+def packaged_task_startup():
+    """ Import-once package: definitions load lazily, DDL and cloud are resolved once per cluster. """
+    import ncp_etl
+    ncp_etl.SchemaManager(spark)._create_metadata_table_if_not_exists()
+    ncp_etl.configure_storage_access(spark)
+
+
+STARTUPS = {"legacy": legacy_task_startup, "packaged": packaged_task_startup}
+
+# COMMAND ----------
+
+# DBTITLE 1,Fresh Task (child run)
+if MODE in STARTUPS:
+    start = time.perf_counter()
+    STARTUPS[MODE]()
+    dbutils.notebook.exit(json.dumps({"ms": (time.perf_counter() - start) * 1000}))
+
+# COMMAND ----------
+
+# DBTITLE 1,Run Benchmark
+NOTEBOOK_PATH = dbutils.notebook.entry_point.getDbutils().notebook().getContext().notebookPath().get()
+
+
+def time_fresh_tasks(mode, iterations):
+    """ Run this notebook as a child per iteration: its own Python REPL, like a job task, with no memo carried over. """
+    return [json.loads(dbutils.notebook.run(NOTEBOOK_PATH, 600, {"MODE": mode, "ITERATIONS": "1"}))["ms"]
+            for _ in range(iterations)]
+
+
+# Packaged path first, so no legacy iteration has warmed the metadata table or the Spark session for it.
+# Its first task on the cluster pays the cloud detection, which later tasks read from the driver-local cluster
+# cache; every task still checks the metadata table, as a catalog lookup instead of a DDL job.
+packaged_ms = time_fresh_tasks("packaged", ITERATIONS)
+legacy_ms = time_fresh_tasks("legacy", ITERATIONS)
+packaged_steady_ms = packaged_ms[1:] or packaged_ms
+
+results = spark.createDataFrame(
+    [
+        ("legacy %run, fresh task", statistics.median(legacy_ms), max(legacy_ms)),
+        ("ncp_etl, first fresh task", packaged_ms[0], packaged_ms[0]),
+        ("ncp_etl, fresh task", statistics.median(packaged_steady_ms), max(packaged_steady_ms)),
+    ],
+    "strategy STRING, median_ms DOUBLE, max_ms DOUBLE",
+)
+display(results)
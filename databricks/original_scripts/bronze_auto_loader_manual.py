@@ -11,10 +11,13 @@ OPERATIONAL_VOLUME = dbutils.widgets.get("OPERATIONAL_VOLUME")
 TARGET_TABLE = dbutils.widgets.get("TARGET_TABLE")
 SP_NAME = SOURCE_PATH.split("/")[-1]
 
+from datetime import datetime
+RUN_STARTED_AT = datetime.now()
+
 # COMMAND ----------
 
 # DBTITLE 1,Load Utility Module
-# MAGIC %run ./data_utility_modules
+from ncp_etl import SchemaManager, SourceFileRegistry, BadRecordQuarantine, RunHistory, configure_storage_access
 
 # COMMAND ----------
 
@@ -24,6 +27,13 @@ schema_manager = SchemaManager(spark)
 
 schema = schema_manager.get_schema(TARGET_TABLE)
 
+# Initialize SourceFileRegistry (file path/name lineage lives here, bronze rows keep only source_file_id)
+file_registry = SourceFileRegistry(spark)
+
+# Malformed lines are split into a quarantine table instead of failing the stream or being dropped
+quarantine = BadRecordQuarantine(spark)
+read_schema = BadRecordQuarantine.read_schema(schema)
+
 # Print Schema
 df_empty = spark.createDataFrame([], schema)
 print(f"Schema of table: {TARGET_TABLE}")
@@ -32,17 +42,9 @@ df_empty.printSchema()
 
 # COMMAND ----------
 
-import os
-
-cloud_provider = get_cloud_provider() 
-
-if cloud_provider == "Azure":
-    blob_storage = 'mlanalyticsstore01'
-    print(f"Connecting to Azure Blob Storage {blob_storage}")
-    key = dbutils.secrets.get(scope="azure-secret-scope", key='azure_analytics_blob_storage_key')
-    spark.conf.set(f"fs.azure.account.key.{blob_storage}.dfs.core.windows.net", key)
-    spark.conf.set("spark.databricks.delta.optimizeWrite.enabled", "true")
-    spark.conf.set("spark.databricks.delta.autoCompact.enabled", "true")
+# DBTITLE 1,Configure Storage Access
+# Cloud provider is resolved once per cluster; the storage key only on sessions that lack it
+configure_storage_access(spark)
 
 # COMMAND ----------
 
@@ -58,11 +60,10 @@ logging.getLogger("py4j").setLevel(logging.ERROR)
 
 # Set up paths dynamically
 CHECKPOINT_PATH = os.path.join(OPERATIONAL_VOLUME, SP_NAME, "checkpoint")
-BAD_RECORDS_PATH = os.path.join(OPERATIONAL_VOLUME, SP_NAME, "badRecordsPath")
 SCHEMA_LOCATION = os.path.join(OPERATIONAL_VOLUME, SP_NAME, "schema")
 
 print(f"Checkpoints Sink: {CHECKPOINT_PATH}")
-print(f"Bad Records Sink: {BAD_RECORDS_PATH}")
+print(f"Bad Records Sink: {quarantine.quarantine_table}")
 print(f"Schema Evolution Sink: {SCHEMA_LOCATION}")
 print(f"Reading data from: {SOURCE_PATH}")
 
@@ -79,14 +80,15 @@ def read_data_from_sink(spark, source_path):
             .option("delimiter", "\t")
             .option("header", False)
             .option("escape", '"')
-            # .option("badRecordsPath", BAD_RECORDS_PATH)
+            .option("mode", "PERMISSIVE")
+            .option("columnNameOfCorruptRecord", BadRecordQuarantine.CORRUPT_RECORD_COLUMN)
             .option("multiLine", "false")
             .option("encoding", "ISO-8859-1")
             .option("quote", '"')
-            .schema(schema)
+            .schema(read_schema)
             .load(source_path + "/*")
-            .withColumn("source_file_name", col("_metadata.file_name"))
-            .withColumn("source_file_path", col("_metadata.file_path"))
+            .transform(SourceFileRegistry.with_file_metadata)
+            .transform(BadRecordQuarantine.with_block_offset)
             .filter(col("_metadata.file_path").contains("2025-08"))
             )
 
@@ -106,17 +108,37 @@ if not spark.catalog.tableExists(TARGET_TABLE):
     df_empty = spark.createDataFrame([], schema)
     df_empty.write.format("delta").saveAsTable(TARGET_TABLE)
 
+# Bronze tables created before the file registry need the compact file id column
+file_registry.ensure_file_id_column(TARGET_TABLE)
+
 # COMMAND ----------
 
 # DBTITLE 1,Streaming Data to Delta Table in Unity Catalog
 # Writing the streaming data to a Delta table in Unity Catalog
+def write_batch_with_file_registry(batch_df, batch_id):
+    """ Quarantines malformed rows, registers the batch's source files, then appends the valid rows
+    (txnAppId/txnVersion keep retries idempotent). """
+    batch_df.persist()
+    valid_df, rejected_df = quarantine.split(batch_df, read_schema)
+    rejected_rows = quarantine.record(rejected_df, TARGET_TABLE, batch_id)
+    if rejected_rows:
+        print(f"Batch {batch_id}: quarantined {rejected_rows} malformed rows")
+    bronze_df = file_registry.register_files(valid_df)
+    (bronze_df.write
+        .format("delta")
+        .mode("append")
+        .option("txnAppId", TARGET_TABLE)
+        .option("txnVersion", batch_id)
+        .option("mergeSchema", "true")
+        .saveAsTable(TARGET_TABLE))
+    batch_df.unpersist()
+
 query = (
     df_final.writeStream
-      .format("delta")
+      .foreachBatch(write_batch_with_file_registry)
       .option("checkpointLocation", CHECKPOINT_PATH).trigger(once=True)
       .outputMode("append")
-      .option("mergeSchema", "true")
-      .table(TARGET_TABLE))
+      .start())
 
 # COMMAND ----------
 
@@ -144,6 +166,20 @@ else:
         print("No progress recorded.")
 
 
+# COMMAND ----------
+
+# DBTITLE 1,Record Run Metrics For Cluster Sizing
+# Feeds ClusterSizingAdvisor (create_new_etl) with duration, rows, bytes read, spill and shuffle
+if not query.exception():
+    RunHistory(spark).record_run(TARGET_TABLE, "bronze", RUN_STARTED_AT,
+                                 input_rows=sum(p["numInputRows"] for p in query.recentProgress))
+
+# COMMAND ----------
+
+# DBTITLE 1,Report Quarantined Rows
+# Rejected rows per file and reason for this run (raw lines are in the quarantine table)
+display(quarantine.reject_counts(TARGET_TABLE, since=RUN_STARTED_AT))
+
 # COMMAND ----------
 
 # DBTITLE 1,- Optimize Delta Table and Display Result
@@ -151,3 +187,10 @@ else:
 result = spark.sql(f"OPTIMIZE {TARGET_TABLE}")
 
 display(result)
+
+# COMMAND ----------
+
+# DBTITLE 1,Refresh Lineage View
+# Lineage lookups (source_file_name / source_file_path) go through the registry join
+lineage_view = file_registry.create_lineage_view(TARGET_TABLE)
+print(f"Lineage view: {lineage_view}")
@@ -0,0 +1,45 @@
+"""
+NCP ETL utility library.
+
+Packaged replacement for the `%run ./data_utility_modules` and `%run ./custom_etl_functions`
+notebooks. Import once per notebook; nothing Spark-related is imported or executed until a
+name is first used:
+
+    from ncp_etl import SchemaManager, filter_and_transform_transactions
+"""
+
+import importlib
+
+_EXPORTS = {
+    "SchemaManager": "ncp_etl.schema_manager",
+    "SourceFileRegistry": "ncp_etl.file_registry",
+    "BadRecordQuarantine": "ncp_etl.quarantine",
+    "DatabricksSecretManager": "ncp_etl.secrets",
+    "get_dbutils": "ncp_etl.runtime",
+    "get_cloud_provider": "ncp_etl.runtime",
+    "configure_storage_access": "ncp_etl.runtime",
+    "create_conversions_columns": "ncp_etl.transforms",
+    "fixing_dtypes": "ncp_etl.transforms",
+    "filter_and_transform_transactions": "ncp_etl.transforms",
+    "RunHistory": "ncp_etl.sizing",
+    "ClusterSizingAdvisor": "ncp_etl.sizing",
+    "recommend_cluster": "ncp_etl.sizing",
+    "apply_to_job_settings": "ncp_etl.sizing",
+    "TEST_CLIENTS": "ncp_etl.constants",
+    "BOOLEAN_STRING_COLUMN": "ncp_etl.constants",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """Resolve public names lazily so `import ncp_etl` stays cheap and pyspark-free."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'ncp_etl' has no attribute '{name}'")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,60 @@
+"""
+Constants shared by the NCP transactions ETL (Databricks silver and the local tooling).
+Kept free of pyspark imports so non-Spark code can import them.
+"""
+
+TEST_CLIENTS = ['test multi','davidh test2 multi','ice demo multi', 'monitoring client pod2 multi']
+
+BOOLEAN_STRING_COLUMN = ['is_currency_converted', 'is_eea', 'is_external_mpi', 'is_partial_amount', 'is_prepaid',
+                         'is_sale_3d', 'is_void', 'liability_shift', 'manage_3d_decision', 'mc_scheme_token_used',
+                         'partial_approval_is_void', 'rebill', 'is_3d']
+
+# fixing_dtypes: columns blanked out in silver
+COLUMNS_TO_FORCE_NULL = {
+    "user_agent_3d",
+    "authentication_request",
+    "authentication_response",
+    "authorization_req_duration",
+}
+
+# fixing_dtypes: accepted boolean spellings (after trim + lower) and string tokens treated as null
+BOOLEAN_TRUE_VALUES = ["true", "1", "yes", "1.0"]
+BOOLEAN_FALSE_VALUES = ["false", "0", "no", "0.0"]
+STRING_NULL_VALUES = ["<na>", "na", "nan", "none", "", " ", "\x00"]
+DEPRECATED_VALUE = "deprecated"
+
+# create_conversions_columns: status flag column -> transaction_type it reports on
+TRANSACTION_STATUS_MAP = {
+    "init_status": "initauth3d",
+    "auth_3d_status": "auth3d",
+    "sale_status": "sale",
+    "auth_status": "auth",
+    "settle_status": "settle",
+    "verify_auth_3d_status": "verify_auth_3d",
+}
+APPROVED_RESULT_ID = "1006"
+DECLINED_RESULT_ID = "1008"
+
+# Columns added by create_conversions_columns, in output order
+CONVERSION_COLUMNS = [
+    "is_sale_3d_auth_3d",
+    "manage_3d_decision_auth_3d",
+    *TRANSACTION_STATUS_MAP,
+    "is_successful_challenge",
+    "is_successful_exemption",
+    "is_successful_frictionless",
+    "is_successful_authentication",
+    "is_approved",
+    "is_declined",
+]
+
+# Bronze quarantine reasons (Databricks BadRecordQuarantine, Snowflake loader and shared/ncp_local/ingest.py)
+REJECT_COLUMN_COUNT = "column_count"
+REJECT_UNDECODABLE = "undecodable_bytes"
+REJECT_UNPARSEABLE_FIELD = "unparseable_field"
+
+# Placeholder tokens (after trim + lower) that null a typed field without making the row malformed
+TYPED_NULL_TOKENS = sorted(set(STRING_NULL_VALUES) | {"null", "-", DEPRECATED_VALUE})
+
+# U+FFFD left by an upstream lossy decode: its UTF-8 bytes as read with ISO-8859-1, and as UTF-8
+UNDECODABLE_MARKERS = ["\u00ef\u00bf\u00bd", "\ufffd"]
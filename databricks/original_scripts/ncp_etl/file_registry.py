@@ -0,0 +1,104 @@
+from pyspark.sql import functions as F
+
+from ncp_etl.runtime import ensure_table
+
+
+class SourceFileRegistry:
+    """
+    Keeps one row per ingested source file so bronze rows only carry a compact
+    BIGINT `source_file_id` instead of repeating the full ABFSS path strings.
+    """
+
+    FILE_ID_COLUMN = "source_file_id"
+    LEGACY_COLUMNS = ("source_file_name", "source_file_path")
+
+    def __init__(self, spark, registry_table="ncp.source_file_registry"):
+        self.spark = spark
+        self.registry_table = f"{spark.catalog.currentCatalog()}.{registry_table}"
+
+    def _create_registry_table_if_not_exists(self):
+        """Ensure registry table exists with required fields (DDL runs once, on first use)."""
+        ensure_table(self.spark, self.registry_table, f"""
+            CREATE TABLE IF NOT EXISTS {self.registry_table} (
+                source_file_id BIGINT,
+                source_file_path STRING,
+                source_file_name STRING,
+                file_size BIGINT,
+                file_modification_time TIMESTAMP,
+                first_ingested_at TIMESTAMP
+            ) USING DELTA
+        """)
+
+    @staticmethod
+    def file_id_expr():
+        """Deterministic file id derived from the file path, so no lookup is needed while streaming."""
+        return F.xxhash64(F.col("_metadata.file_path"))
+
+    @staticmethod
+    def with_file_metadata(df):
+        """Attach the file id plus the per-file metadata the registry needs (dropped before writing)."""
+        return (df
+                .withColumn(SourceFileRegistry.FILE_ID_COLUMN, SourceFileRegistry.file_id_expr())
+                .withColumn("_source_file_path", F.col("_metadata.file_path"))
+                .withColumn("_source_file_name", F.col("_metadata.file_name"))
+                .withColumn("_file_size", F.col("_metadata.file_size"))
+                .withColumn("_file_modification_time", F.col("_metadata.file_modification_time"))
+                )
+
+    def register_files(self, batch_df):
+        """
+        Register the distinct files of a micro-batch and return the batch without the
+        per-file metadata columns. Idempotent: files already registered are left untouched.
+        """
+        files_df = (batch_df
+                    .select(
+                        F.col(self.FILE_ID_COLUMN).alias("source_file_id"),
+                        F.col("_source_file_path").alias("source_file_path"),
+                        F.col("_source_file_name").alias("source_file_name"),
+                        F.col("_file_size").alias("file_size"),
+                        F.col("_file_modification_time").alias("file_modification_time"),
+                    )
+                    .dropDuplicates(["source_file_id"])
+                    .withColumn("first_ingested_at", F.from_utc_timestamp(F.current_timestamp(), "GMT"))
+                    )
+        self._create_registry_table_if_not_exists()
+        files_df.createOrReplaceTempView("_new_source_files")
+        files_df.sparkSession.sql(f"""
+            MERGE INTO {self.registry_table} AS target
+            USING _new_source_files AS source
+            ON target.source_file_id = source.source_file_id
+            WHEN NOT MATCHED THEN INSERT *
+        """)
+
+        return batch_df.drop("_source_file_path", "_source_file_name", "_file_size", "_file_modification_time")
+
+    def ensure_file_id_column(self, table_name):
+        """Add `source_file_id` to an existing bronze table that predates the registry."""
+        if self.FILE_ID_COLUMN not in self.spark.table(table_name).columns:
+            self.spark.sql(f"ALTER TABLE {table_name} ADD COLUMNS ({self.FILE_ID_COLUMN} BIGINT)")
+
+    def create_lineage_view(self, table_name, view_name=None):
+        """
+        Create a view over `table_name` that resolves `source_file_id` back to
+        `source_file_name` / `source_file_path`. Rows written before the registry
+        existed keep their original path columns.
+        """
+        self._create_registry_table_if_not_exists()
+        view_name = view_name or f"{table_name}_lineage"
+        table_columns = self.spark.table(table_name).columns
+
+        select_cols = [f"b.`{c}`" for c in table_columns if c not in self.LEGACY_COLUMNS]
+        for legacy_col in self.LEGACY_COLUMNS:
+            if legacy_col in table_columns:
+                select_cols.append(f"COALESCE(r.{legacy_col}, b.{legacy_col}) AS {legacy_col}")
+            else:
+                select_cols.append(f"r.{legacy_col}")
+
+        self.spark.sql(f"""
+            CREATE OR REPLACE VIEW {view_name} AS
+            SELECT {', '.join(select_cols)}
+            FROM {table_name} AS b
+            LEFT JOIN {self.registry_table} AS r
+              ON b.{self.FILE_ID_COLUMN} = r.source_file_id
+        """)
+        return view_name
@@ -0,0 +1,188 @@
+"""
+Malformed-row quarantine for the bronze Auto Loader stream.
+
+`read_data_from_sink` reads in PERMISSIVE mode with a corrupt-record column, so a bad line neither
+fails the stream nor disappears: each micro-batch is split into bronze rows and rejects, and the
+rejects land in a quarantine table (file, offset, reason, raw line) with per-file reject counters.
+"""
+
+from pyspark.sql import functions as F
+from pyspark.sql.types import StructType, StructField, StringType
+
+from ncp_etl.constants import (
+    REJECT_COLUMN_COUNT,
+    REJECT_UNDECODABLE,
+    REJECT_UNPARSEABLE_FIELD,
+    TYPED_NULL_TOKENS,
+    UNDECODABLE_MARKERS,
+)
+from ncp_etl.runtime import ensure_table
+
+
+class BadRecordQuarantine:
+    """
+    Splits micro-batches read with `columnNameOfCorruptRecord` into valid rows and rejects.
+
+    Reasons: wrong column count, undecodable bytes (U+FFFD left by an upstream decode) and typed
+    fields that do not parse. Placeholder tokens such as '-' or 'null' in a typed column stay null
+    in bronze, as before, and are not rejects.
+    """
+
+    CORRUPT_RECORD_COLUMN = "_corrupt_record"
+    BLOCK_START_COLUMN = "_file_block_start"
+    INGESTION_COLUMNS = ("inserted_at",)
+
+    def __init__(self, spark, quarantine_table="ncp.bronze_quarantine", counts_table="ncp.bronze_reject_counts"):
+        self.spark = spark
+        catalog = spark.catalog.currentCatalog()
+        self.quarantine_table = f"{catalog}.{quarantine_table}"
+        self.counts_table = f"{catalog}.{counts_table}"
+
+    def _create_tables_if_not_exist(self):
+        """Ensure quarantine and counter tables exist (DDL runs once, on first use)."""
+        ensure_table(self.spark, self.quarantine_table, f"""
+            CREATE TABLE IF NOT EXISTS {self.quarantine_table} (
+                target_table STRING,
+                source_file_id BIGINT,
+                source_file_path STRING,
+                file_block_start BIGINT,
+                reason STRING,
+                detail STRING,
+                raw_line STRING,
+                batch_id BIGINT,
+                quarantined_at TIMESTAMP
+            ) USING DELTA
+        """)
+        ensure_table(self.spark, self.counts_table, f"""
+            CREATE TABLE IF NOT EXISTS {self.counts_table} (
+                target_table STRING,
+                source_file_id BIGINT,
+                source_file_path STRING,
+                reason STRING,
+                rejected_rows BIGINT,
+                batch_id BIGINT,
+                recorded_at TIMESTAMP
+            ) USING DELTA
+        """)
+
+    @classmethod
+    def read_schema(cls, schema):
+        """
+        File columns of `schema` plus the corrupt-record column. Ingestion-time columns are left out:
+        the CSV reader flags every line whose token count differs from the read schema.
+        """
+        fields = [field for field in schema.fields if field.name not in cls.INGESTION_COLUMNS]
+        return StructType(fields + [StructField(cls.CORRUPT_RECORD_COLUMN, StringType(), True)])
+
+    @staticmethod
+    def with_block_offset(df):
+        """Attach the byte offset of the file split each row was read from (the reader has no per-line offset)."""
+        return df.withColumn(BadRecordQuarantine.BLOCK_START_COLUMN, F.col("_metadata.file_block_start"))
+
+    @staticmethod
+    def _contains_marker(value):
+        condition = F.lit(False)
+        for marker in UNDECODABLE_MARKERS:
+            condition = condition | F.coalesce(value.contains(marker), F.lit(False))
+        return condition
+
+    def _reject_columns(self, read_schema):
+        """(reason, detail) expressions; both are null for rows that belong in bronze."""
+        file_fields = [field for field in read_schema.fields if field.name != self.CORRUPT_RECORD_COLUMN]
+        raw = F.col(self.CORRUPT_RECORD_COLUMN)
+        tokens = F.split(raw, "\t", -1)
+        token_count = F.size(tokens)
+
+        # A typed field failed if the reader nulled it although the raw token is not a placeholder
+        failed_fields = []
+        for position, field in enumerate(file_fields):
+            if isinstance(field.dataType, StringType):
+                continue
+            token = F.element_at(tokens, position + 1)
+            failed_fields.append(F.when(
+                F.col(f"`{field.name}`").isNull() & ~F.lower(F.trim(token)).isin(TYPED_NULL_TOKENS),
+                F.concat(F.lit(f"{field.name}='"), token, F.lit("'"))))
+        failed_field = F.coalesce(*failed_fields) if failed_fields else F.lit(None).cast("string")
+
+        # Clean rows carry no raw line, so their string values are checked instead
+        string_values = F.array(*[F.col(f"`{field.name}`") for field in file_fields
+                                  if isinstance(field.dataType, StringType)])
+        undecodable = F.when(raw.isNotNull(), self._contains_marker(raw)).otherwise(
+            F.exists(string_values, self._contains_marker))
+
+        reason = (F.when(raw.isNotNull() & (token_count != len(file_fields)), F.lit(REJECT_COLUMN_COUNT))
+                  .when(undecodable, F.lit(REJECT_UNDECODABLE))
+                  .when(raw.isNotNull() & failed_field.isNotNull(), F.lit(REJECT_UNPARSEABLE_FIELD)))
+        detail = (F.when(reason == REJECT_COLUMN_COUNT,
+                         F.format_string(f"expected {len(file_fields)} columns, got %d", token_count))
+                  .when(reason == REJECT_UNPARSEABLE_FIELD, failed_field))
+        return reason, detail
+
+    def split(self, batch_df, read_schema):
+        """
+        Return (valid_df, rejected_df) for a micro-batch read with `read_schema`. Valid rows drop the
+        quarantine helper columns; rejects keep the file id/path, block offset, reason and raw line.
+        """
+        reason, detail = self._reject_columns(read_schema)
+        flagged = batch_df.withColumn("_reject_reason", reason).withColumn("_reject_detail", detail)
+
+        valid_df = (flagged
+                    .filter(F.col("_reject_reason").isNull())
+                    .drop(self.CORRUPT_RECORD_COLUMN, self.BLOCK_START_COLUMN, "_reject_reason", "_reject_detail"))
+
+        file_columns = [F.col(f"`{field.name}`") for field in read_schema.fields
+                        if field.name != self.CORRUPT_RECORD_COLUMN]
+        rejected_df = (flagged
+                       .filter(F.col("_reject_reason").isNotNull())
+                       .select(
+                           F.col("source_file_id"),
+                           F.col("_source_file_path").alias("source_file_path"),
+                           F.col(self.BLOCK_START_COLUMN).alias("file_block_start"),
+                           F.col("_reject_reason").alias("reason"),
+                           F.col("_reject_detail").alias("detail"),
+                           F.coalesce(F.col(self.CORRUPT_RECORD_COLUMN),
+                                      F.concat_ws("\t", *file_columns)).alias("raw_line"),
+                       ))
+        return valid_df, rejected_df
+
+    def record(self, rejected_df, target_table, batch_id):
+        """
+        Append the rejects and their per-file counts. txnAppId/txnVersion make a retried micro-batch
+        a no-op, so a bad file never forces the batch to be reprocessed. Returns the reject count.
+        """
+        self._create_tables_if_not_exist()
+        recorded_at = F.from_utc_timestamp(F.current_timestamp(), "GMT")
+        rejects = (rejected_df
+                   .withColumn("target_table", F.lit(target_table))
+                   .withColumn("batch_id", F.lit(batch_id).cast("bigint"))
+                   .withColumn("quarantined_at", recorded_at))
+        counts = (rejected_df
+                  .groupBy("source_file_id", "source_file_path", "reason")
+                  .agg(F.count(F.lit(1)).alias("rejected_rows"))
+                  .withColumn("target_table", F.lit(target_table))
+                  .withColumn("batch_id", F.lit(batch_id).cast("bigint"))
+                  .withColumn("recorded_at", recorded_at))
+
+        count_rows = counts.collect()
+        if not count_rows:
+            return 0
+        for df, table in ((rejects, self.quarantine_table), (counts, self.counts_table)):
+            (df.select(*self.spark.table(table).columns)
+               .write
+               .format("delta")
+               .mode("append")
+               .option("txnAppId", f"{target_table}:{table}")
+               .option("txnVersion", batch_id)
+               .saveAsTable(table))
+        return sum(row["rejected_rows"] for row in count_rows)
+
+    def reject_counts(self, target_table, since=None):
+        """Rejected rows per file and reason for `target_table` (optionally only batches recorded since `since`)."""
+        self._create_tables_if_not_exist()
+        counts = self.spark.table(self.counts_table).filter(F.col("target_table") == target_table)
+        if since is not None:
+            counts = counts.filter(F.col("recorded_at") >= F.lit(since))
+        return (counts
+                .groupBy("source_file_path", "reason")
+                .agg(F.sum("rejected_rows").alias("rejected_rows"))
+                .orderBy(F.desc("rejected_rows")))
@@ -0,0 +1,115 @@
+"""
+Runtime context for the NCP ETL notebooks: dbutils access, cloud detection, storage credentials
+and one-time DDL. Everything here is resolved lazily and memoized, so calling these helpers at the
+top of every task costs nothing after the first call.
+"""
+
+import json
+import os
+import threading
+
+# Driver-local cache shared by every notebook REPL on the cluster (each task runs in its own
+# Python process, so module-level caches alone would be resolved once per task, not per cluster).
+CLUSTER_CACHE_PATH = os.environ.get("NCP_ETL_CLUSTER_CACHE", "/local_disk0/tmp/ncp_etl_runtime.json")
+
+_lock = threading.Lock()
+_ensured_tables = set()
+_cloud_provider = None
+_dbutils = None
+
+
+def _read_cluster_cache():
+    try:
+        with open(CLUSTER_CACHE_PATH, "r") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_cluster_cache(values):
+    cache = _read_cluster_cache()
+    cache.update(values)
+    try:
+        os.makedirs(os.path.dirname(CLUSTER_CACHE_PATH), exist_ok=True)
+        with open(CLUSTER_CACHE_PATH, "w") as file:
+            json.dump(cache, file)
+    except OSError:
+        pass  # Cache is an optimization only; fall back to per-process memoization
+
+
+def get_dbutils(spark=None):
+    """Return the notebook's dbutils handle (needed for secrets and the notebook context API)."""
+    global _dbutils
+    if _dbutils is None:
+        try:
+            import IPython
+            _dbutils = IPython.get_ipython().user_ns["dbutils"]
+        except (ImportError, AttributeError, KeyError):
+            from pyspark.dbutils import DBUtils
+            from pyspark.sql import SparkSession
+            _dbutils = DBUtils(spark or SparkSession.getActiveSession())
+    return _dbutils
+
+
+def get_cloud_provider(spark=None):
+    """Detect the cloud the workspace runs on. Resolved once per cluster."""
+    global _cloud_provider
+    if _cloud_provider is not None:
+        return _cloud_provider
+
+    cached = _read_cluster_cache().get("cloud_provider")
+    if cached:
+        _cloud_provider = cached
+        return _cloud_provider
+
+    if spark is None:
+        from pyspark.sql import SparkSession
+        spark = SparkSession.getActiveSession()
+    browser_hostname = spark.conf.get("spark.databricks.workspaceUrl", "unknown")
+
+    if "azuredatabricks.net" in browser_hostname:
+        cloud = "Azure"
+    elif "gcp" in browser_hostname:
+        cloud = "GCP"
+    elif "databricks" in browser_hostname or "amazonaws.com" in browser_hostname:
+        cloud = "AWS"
+    else:
+        cloud = "Unknown"
+
+    print(f"Running on: {cloud}")
+    _cloud_provider = cloud
+    _write_cluster_cache({"cloud_provider": cloud})
+    return cloud
+
+
+def configure_storage_access(spark, blob_storage="mlanalyticsstore01", secret_scope="azure-secret-scope",
+                             secret_key="azure_analytics_blob_storage_key"):
+    """
+    Configure the Azure storage account key and Delta write settings on the session.
+    Skips the secret lookup when the session already carries the key.
+    """
+    if get_cloud_provider(spark) != "Azure":
+        return
+
+    account_key_conf = f"fs.azure.account.key.{blob_storage}.dfs.core.windows.net"
+    if spark.conf.get(account_key_conf, None) is None:
+        print(f"Connecting to Azure Blob Storage {blob_storage}")
+        key = get_dbutils(spark).secrets.get(scope=secret_scope, key=secret_key)
+        spark.conf.set(account_key_conf, key)
+    spark.conf.set("spark.databricks.delta.optimizeWrite.enabled", "true")
+    spark.conf.set("spark.databricks.delta.autoCompact.enabled", "true")
+
+
+def ensure_table(spark, table_name, create_sql):
+    """
+    Run `create_sql` only if `table_name` does not exist yet. The existence check is a catalog
+    lookup (no Spark job), and the result is memoized, so the DDL runs once per workspace.
+    """
+    if table_name in _ensured_tables:
+        return
+    with _lock:
+        if table_name in _ensured_tables:
+            return
+        if not spark.catalog.tableExists(table_name):
+            spark.sql(create_sql)
+        _ensured_tables.add(table_name)
@@ -0,0 +1,148 @@
+from pyspark.sql.types import (
+    StructType, StructField, StringType, IntegerType, LongType, ShortType,
+    ByteType, BooleanType, FloatType, DoubleType, DecimalType, DateType,
+    TimestampType, BinaryType
+)
+import json
+from datetime import datetime
+
+from ncp_etl.runtime import ensure_table
+
+
+class SchemaManager:
+    def __init__(self, spark, metadata_table="ncp.metadata_table"):
+        self.spark = spark
+        self.metadata_table = f"{spark.catalog.currentCatalog()}.{metadata_table}"
+        self.type_mapping = {
+            "bigint": LongType(),
+            "int": IntegerType(),
+            "integer": IntegerType(),
+            "tinyint": ByteType(),
+            "long": LongType(),
+            "smallint": ShortType(),
+            "boolean": BooleanType(),
+            "bit": BooleanType(),
+            "decimal": lambda p, s: DecimalType(p, s),
+            "numeric": lambda p, s: DecimalType(p, s),
+            "float": FloatType(),
+            "real": FloatType(),
+            "double": DoubleType(),
+            "char": StringType(),
+            "string": StringType(),
+            "varchar": StringType(),
+            "nvarchar": StringType(),
+            "text": StringType(),
+            "date": DateType(),
+            "datetime": TimestampType(),
+            "timestamp": TimestampType(),
+            "time": StringType(),
+            "blob": BinaryType(),
+            "binary": BinaryType()
+        }
+
+    def _create_metadata_table_if_not_exists(self):
+        """Ensure metadata table exists with required fields (DDL runs once, on first use)."""
+        ensure_table(self.spark, self.metadata_table, f"""
+            CREATE TABLE IF NOT EXISTS {self.metadata_table} (
+                table_name STRING,
+                schema_json STRING,
+                checkpoint TIMESTAMP,
+                source_table STRING,
+                table_keys STRING
+            ) USING DELTA
+        """)
+
+    def update_metadata(self, table_name, field_name, field_value):
+        """Generic function to update a metadata field."""
+        valid_fields = {"schema_json", "checkpoint", "source_table", "table_keys"}
+        if field_name not in valid_fields:
+            raise ValueError(f"Invalid metadata field: {field_name}. Must be one of {valid_fields}.")
+
+        # Format value based on type
+        if isinstance(field_value, str):
+            value_expr = f"'{field_value}'"
+        elif isinstance(field_value, datetime):  # Convert datetime to timestamp
+            value_expr = f"TIMESTAMP('{field_value.isoformat()}')"
+        else:
+            value_expr = str(field_value)
+
+        self._create_metadata_table_if_not_exists()
+        self.spark.sql(f"""
+            MERGE INTO {self.metadata_table} AS target
+            USING (SELECT '{table_name}' AS table_name, {value_expr} AS {field_name}) AS source
+            ON target.table_name = source.table_name
+            WHEN MATCHED THEN UPDATE SET target.{field_name} = source.{field_name}
+            WHEN NOT MATCHED THEN INSERT (table_name, {field_name}) 
+            VALUES (source.table_name, source.{field_name})
+        """)
+
+    def add_schema(self, table_name, schema_dict):
+        """Add or update a schema definition in the metadata table."""
+        schema_json = json.dumps(schema_dict)
+        self.update_metadata(table_name, "schema_json", schema_json)
+
+    def get_schema(self, table_name):
+        """Retrieve the schema as a StructType for a given table."""
+        self._create_metadata_table_if_not_exists()
+        query = f"""
+            SELECT schema_json FROM {self.metadata_table} 
+            WHERE table_name = '{table_name}'
+        """
+        schema_row = self.spark.sql(query).collect()
+
+        if not schema_row:
+            print(f"Schema for table '{table_name}' not found.")
+            return None
+
+        schema_json = schema_row[0]["schema_json"]
+        schema_dict = json.loads(schema_json)
+        struct_fields = []
+        for col_name, col_type in schema_dict.items():
+            if "decimal" in col_type:
+                p, s = map(int, col_type.replace("decimal(", "").replace(")", "").split(","))
+                struct_fields.append(StructField(col_name, DecimalType(p, s), True))
+            else:
+                struct_fields.append(StructField(col_name, self.type_mapping[col_type], True))
+
+        return StructType(struct_fields)
+
+    def get_metadata(self, table_name, field_name):
+        """Fetch any metadata field except schema_json."""
+        valid_fields = {"checkpoint", "source_table", "table_keys"}
+        if field_name not in valid_fields:
+            raise ValueError(f"Invalid metadata field: {field_name}. Must be one of {valid_fields}.")
+
+        self._create_metadata_table_if_not_exists()
+        query = f"""
+            SELECT {field_name} FROM {self.metadata_table} 
+            WHERE table_name = '{table_name}'
+        """
+        result = self.spark.sql(query).collect()
+
+        if not result:
+            print(f"No value found for '{field_name}' in table '{table_name}'.")
+            return None
+
+        return result[0][field_name]  # Directly return array, timestamp, or string
+
+    def add_new_table_etl(self, schema_name, schema_dict, metadata_updates):
+
+        # Add schema
+        self.add_schema(schema_name, schema_dict)
+
+        # Update metadata
+        for key, value in metadata_updates.items():
+            self.update_metadata(schema_name, key, value)
+
+        # Get metadata values
+        metadata = {key: self.get_metadata(schema_name, key) for key in metadata_updates.keys()}
+        metadata["schema"] = self.get_schema(schema_name)
+    
+        return metadata
+
+    def list_schemas(self):
+        """List all table names that have schemas stored in the metadata table."""
+        self._create_metadata_table_if_not_exists()
+        return [row["table_name"] for row in self.spark.sql(f"""
+            SELECT table_name FROM {self.metadata_table}
+        """).collect()]
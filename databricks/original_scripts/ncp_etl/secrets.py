@@ -0,0 +1,85 @@
+import requests
+
+from ncp_etl.runtime import get_dbutils
+
+
+class DatabricksSecretManager:
+    def __init__(self, dbutils=None):
+        """
+        Initializes the DatabricksSecretManager with a base URL and retrieves a personal access token.
+        """
+        dbutils = dbutils or get_dbutils()
+        base_url= dbutils.notebook.entry_point.getDbutils().notebook().getContext().apiUrl().get()
+        api_token = dbutils.notebook.entry_point.getDbutils().notebook().getContext().apiToken().get()
+        self.base_url = base_url.rstrip("/")
+        self.token = api_token
+        self.headers = {
+            "Authorization": f"Bearer {self.token}",
+            "Content-Type": "application/json"
+        }
+
+    def _post(self, endpoint, payload):
+        url = f"{self.base_url}{endpoint}"
+        response = requests.post(url, headers=self.headers, json=payload)
+        return response
+
+    def create_secret_scope(self, scope_name):
+        """
+        Creates a new secret scope.
+        """
+        payload = {"scope": scope_name}
+        response = self._post("/api/2.0/secrets/scopes/create", payload)
+
+        if response.status_code == 200:
+            print(f"✅ Secret scope '{scope_name}' created successfully.")
+        else:
+            print(f"❌ Failed to create secret scope '{scope_name}'. Status: {response.status_code}, Response: {response.text}")
+
+    def put_secret(self, scope, key, value):
+        """
+        Adds or updates a secret in the specified scope.
+        """
+        payload = {
+            "scope": scope,
+            "key": key,
+            "string_value": value
+        }
+        response = self._post("/api/2.0/secrets/put", payload)
+
+        if response.status_code == 200:
+            print(f"✅ Secret '{key}' added to scope '{scope}' successfully.")
+        else:
+            print(f"❌ Failed to add secret '{key}'. Status: {response.status_code}, Response: {response.text}")
+
+    def update_secret(self, scope, key, new_value):
+        """
+        Updates an existing secret key by overwriting it with a new value.
+        """
+        print(f"🔄 Updating secret '{key}' in scope '{scope}'...")
+        self.put_secret(scope, key, new_value)
+    
+    def grant_permission(self, scope, principal, permission):
+        """
+        Grants permission on a secret scope to a user, group, or service principal.
+
+        Args:
+            scope (str): The secret scope name.
+            principal (str): User or group to grant permissions (e.g. 'user@example.com' or 'users').
+            permission (str): One of 'READ', 'WRITE', 'MANAGE'.
+        """
+        valid_permissions = {"READ", "WRITE", "MANAGE"}
+        if permission not in valid_permissions:
+            raise ValueError(f"Invalid permission '{permission}'. Must be one of {valid_permissions}")
+
+        payload = {
+            "scope": scope,
+            "principal": principal,
+            "permission": permission
+        }
+        response = self._post("/api/2.0/secrets/acls/put", payload)
+
+        if response.status_code == 200:
+            print(f"✅ Granted '{permission}' permission on scope '{scope}' to '{principal}'.")
+        else:
+            print(f"❌ Failed to grant permission. Status: {response.status_code}, Response: {response.text}")
+
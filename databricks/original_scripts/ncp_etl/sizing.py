@@ -0,0 +1,266 @@
+"""
+Cluster sizing advisor for the per-table NCP ingestion jobs.
+
+The bronze and silver notebooks record one row per task run (duration, rows, bytes read, spill,
+shuffle and the cluster shape that ran it) into a run-history table. The advisor turns that history
+into a node type, autoscale range and instance-pool decision, and rewrites the `JobSettings` dict
+that `create_new_etl` passes to `w.jobs.create`.
+"""
+
+import copy
+import math
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from ncp_etl.runtime import ensure_table
+
+# Azure node types the ingestion jobs may use (cores, memory in GB, family)
+NODE_TYPES = {
+    "Standard_D4ds_v5": {"cores": 4, "memory_gb": 16, "family": "general"},
+    "Standard_D8ds_v5": {"cores": 8, "memory_gb": 32, "family": "general"},
+    "Standard_D16ds_v5": {"cores": 16, "memory_gb": 64, "family": "general"},
+    "Standard_E8ds_v5": {"cores": 8, "memory_gb": 64, "family": "memory"},
+    "Standard_E16ds_v5": {"cores": 16, "memory_gb": 128, "family": "memory"},
+}
+
+DEFAULT_NODE_TYPE = "Standard_D8ds_v5"
+DEFAULT_MIN_WORKERS = 1
+DEFAULT_MAX_WORKERS = 4
+
+GIB = 1024 ** 3
+
+
+@dataclass
+class RunMetrics:
+    """Metrics of one bronze or silver task run."""
+    table_name: str
+    stage: str  # 'bronze' or 'silver'
+    started_at: datetime
+    duration_s: float
+    input_rows: int
+    input_bytes: int
+    spill_bytes: int
+    shuffle_bytes: int
+    num_workers: int
+    node_type_id: str
+
+
+@dataclass
+class SizingRecommendation:
+    """Recommended cluster shape for one table's job cluster."""
+    table_name: str
+    node_type_id: str
+    min_workers: int
+    max_workers: int
+    use_pool: bool
+    runs_considered: int
+    reason: str
+
+
+def _percentile(values, pct):
+    """Nearest-rank percentile; good enough for a few dozen runs."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0
+    rank = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[rank]
+
+
+def _core_seconds(run: RunMetrics) -> float:
+    cores = NODE_TYPES.get(run.node_type_id, NODE_TYPES[DEFAULT_NODE_TYPE])["cores"]
+    return run.duration_s * max(run.num_workers, 1) * cores
+
+
+def recommend_cluster(table_name: str, runs: List[RunMetrics], target_duration_s: float = 900,
+                      small_table_bytes: int = 2 * GIB, spill_ratio_threshold: float = 0.1,
+                      large_shuffle_bytes: int = 50 * GIB, max_workers_cap: int = 16,
+                      headroom: float = 1.25) -> SizingRecommendation:
+    """
+    Size a job cluster from observed runs.
+
+    Args:
+        table_name (str): Table (or job) the recommendation is for.
+        runs (List[RunMetrics]): Run history of every stage that shares the job cluster.
+        target_duration_s (float): Wall time a single task should fit in.
+        small_table_bytes (int): p90 bytes read below which the table goes to the shared instance pool.
+        spill_ratio_threshold (float): Spill/input ratio above which memory-optimized nodes are used.
+        large_shuffle_bytes (int): p90 shuffle size above which fewer, larger nodes are preferred.
+        max_workers_cap (int): Upper bound on recommended workers.
+        headroom (float): Multiplier on the p90 demand for the autoscale ceiling.
+
+    Returns:
+        SizingRecommendation: Node type, autoscale range and pool decision.
+    """
+    if not runs:
+        return SizingRecommendation(table_name, DEFAULT_NODE_TYPE, DEFAULT_MIN_WORKERS, DEFAULT_MAX_WORKERS,
+                                    use_pool=False, runs_considered=0, reason="no run history, keeping defaults")
+
+    # The cluster has to carry the heaviest stage, so size on the worst per-stage p90
+    stages = {}
+    for run in runs:
+        stages.setdefault(run.stage, []).append(run)
+
+    p90_work = max(_percentile([_core_seconds(r) for r in stage_runs], 90) for stage_runs in stages.values())
+    p50_work = max(_percentile([_core_seconds(r) for r in stage_runs], 50) for stage_runs in stages.values())
+    p90_input = max(_percentile([r.input_bytes for r in stage_runs], 90) for stage_runs in stages.values())
+    p90_spill = max(_percentile([r.spill_bytes for r in stage_runs], 90) for stage_runs in stages.values())
+    p90_shuffle = max(_percentile([r.shuffle_bytes for r in stage_runs], 90) for stage_runs in stages.values())
+
+    needed_cores = p90_work / target_duration_s
+    spill_ratio = p90_spill / max(p90_input, 1)
+
+    if p90_input < small_table_bytes and needed_cores <= NODE_TYPES["Standard_D4ds_v5"]["cores"] and p90_spill == 0:
+        return SizingRecommendation(table_name, "Standard_D4ds_v5", 1, 2, use_pool=True, runs_considered=len(runs),
+                                    reason=f"small table (p90 read {p90_input / GIB:.2f} GiB, "
+                                           f"{needed_cores:.1f} cores needed), share the instance pool")
+
+    if spill_ratio > spill_ratio_threshold:
+        node_type_id = "Standard_E16ds_v5" if p90_shuffle > large_shuffle_bytes else "Standard_E8ds_v5"
+    elif p90_shuffle > large_shuffle_bytes:
+        node_type_id = "Standard_D16ds_v5"
+    elif needed_cores <= NODE_TYPES["Standard_D4ds_v5"]["cores"]:
+        node_type_id = "Standard_D4ds_v5"
+    else:
+        node_type_id = "Standard_D8ds_v5"
+
+    cores = NODE_TYPES[node_type_id]["cores"]
+    max_workers = min(max_workers_cap, max(1, math.ceil(needed_cores * headroom / cores)))
+    min_workers = min(max_workers, max(1, math.ceil(p50_work / target_duration_s / cores)))
+
+    reason = (f"p90 {p90_work / 3600:.2f} core-hours per run, read {p90_input / GIB:.2f} GiB, "
+              f"spill ratio {spill_ratio:.2f}, shuffle {p90_shuffle / GIB:.2f} GiB")
+    return SizingRecommendation(table_name, node_type_id, min_workers, max_workers, use_pool=False,
+                                runs_considered=len(runs), reason=reason)
+
+
+def apply_to_job_settings(job_settings: Dict, recommendation: SizingRecommendation,
+                          job_cluster_key: Optional[str] = None, instance_pool_id: Optional[str] = None) -> Dict:
+    """
+    Return a copy of a `JobSettings` dict with the recommended cluster shape applied.
+    Pooled tables only move to the instance pool when `instance_pool_id` is given.
+    """
+    settings = copy.deepcopy(job_settings)
+    for job_cluster in settings.get("job_clusters", []):
+        if job_cluster_key and job_cluster["job_cluster_key"] != job_cluster_key:
+            continue
+        new_cluster = job_cluster["new_cluster"]
+        new_cluster["autoscale"] = {
+            "min_workers": recommendation.min_workers,
+            "max_workers": recommendation.max_workers,
+        }
+        if recommendation.use_pool and instance_pool_id:
+            # Pool nodes define the VM type and spot policy
+            new_cluster.pop("node_type_id", None)
+            new_cluster.pop("azure_attributes", None)
+            new_cluster["instance_pool_id"] = instance_pool_id
+            new_cluster["driver_instance_pool_id"] = instance_pool_id
+        else:
+            new_cluster["node_type_id"] = recommendation.node_type_id
+    return settings
+
+
+class RunHistory:
+    """Reads and writes per-task run metrics in a Delta table."""
+
+    def __init__(self, spark, history_table="ncp.etl_run_history"):
+        self.spark = spark
+        self.history_table = f"{spark.catalog.currentCatalog()}.{history_table}"
+
+    def _create_history_table_if_not_exists(self):
+        """Ensure history table exists with required fields (DDL runs once, on first use)."""
+        ensure_table(self.spark, self.history_table, f"""
+            CREATE TABLE IF NOT EXISTS {self.history_table} (
+                table_name STRING,
+                stage STRING,
+                started_at TIMESTAMP,
+                duration_s DOUBLE,
+                input_rows BIGINT,
+                input_bytes BIGINT,
+                spill_bytes BIGINT,
+                shuffle_bytes BIGINT,
+                num_workers INT,
+                node_type_id STRING
+            ) USING DELTA
+        """)
+
+    def _stage_metrics_since(self, started_at):
+        """Sum bytes read, spill and shuffle of the Spark stages submitted since `started_at`."""
+        import requests
+
+        sc = self.spark.sparkContext
+        totals = {"input_bytes": 0, "spill_bytes": 0, "shuffle_bytes": 0}
+        try:
+            response = requests.get(f"{sc.uiWebUrl}/api/v1/applications/{sc.applicationId}/stages",
+                                    params={"status": "complete"}, timeout=10)
+            stages = response.json()
+        except (requests.RequestException, ValueError):
+            print("Spark stage metrics unavailable, recording rows and duration only.")
+            return totals
+
+        for stage in stages:
+            submitted = stage.get("submissionTime")
+            if submitted and datetime.strptime(submitted[:19], "%Y-%m-%dT%H:%M:%S") < started_at.replace(microsecond=0):
+                continue
+            totals["input_bytes"] += stage.get("inputBytes", 0)
+            totals["spill_bytes"] += stage.get("diskBytesSpilled", 0)
+            totals["shuffle_bytes"] += stage.get("shuffleWriteBytes", 0)
+        return totals
+
+    def _cluster_shape(self):
+        sc = self.spark.sparkContext
+        node_type_id = sc.getConf().get("spark.databricks.clusterUsageTags.clusterNodeType", DEFAULT_NODE_TYPE)
+        num_workers = max(sc._jsc.sc().getExecutorMemoryStatus().size() - 1, 1)
+        return node_type_id, num_workers
+
+    def record_run(self, table_name, stage, started_at, input_rows):
+        """Record the current task run; spill/shuffle/bytes come from the Spark UI REST API."""
+        node_type_id, num_workers = self._cluster_shape()
+        stage_metrics = self._stage_metrics_since(started_at)
+        metrics = RunMetrics(
+            table_name=table_name,
+            stage=stage,
+            started_at=started_at,
+            duration_s=(datetime.now() - started_at).total_seconds(),
+            input_rows=int(input_rows or 0),
+            num_workers=num_workers,
+            node_type_id=node_type_id,
+            **stage_metrics,
+        )
+        self._create_history_table_if_not_exists()
+        (self.spark.createDataFrame([asdict(metrics)], schema=self.spark.table(self.history_table).schema)
+            .write.format("delta").mode("append").saveAsTable(self.history_table))
+        return metrics
+
+    def load(self, table_names, max_runs=30):
+        """Most recent runs (per table and stage) for the given tables."""
+        self._create_history_table_if_not_exists()
+        names = ", ".join(f"'{t}'" for t in table_names)
+        rows = self.spark.sql(f"""
+            SELECT * FROM {self.history_table}
+            WHERE table_name IN ({names})
+            QUALIFY ROW_NUMBER() OVER (PARTITION BY table_name, stage ORDER BY started_at DESC) <= {max_runs}
+        """).collect()
+        return [RunMetrics(**row.asDict()) for row in rows]
+
+
+class ClusterSizingAdvisor:
+    """Recommends job cluster shapes from the run-history table."""
+
+    def __init__(self, spark, history_table="ncp.etl_run_history", instance_pool_id=None, **sizing_options):
+        self.history = RunHistory(spark, history_table)
+        self.instance_pool_id = instance_pool_id
+        self.sizing_options = sizing_options
+
+    def recommend(self, job_name, table_names):
+        """Recommend one cluster for all tables (stages) that run on the same job cluster."""
+        runs = self.history.load(table_names)
+        return recommend_cluster(job_name, runs, **self.sizing_options)
+
+    def size_job_settings(self, job_settings, table_names, job_cluster_key=None):
+        """Apply the recommendation for `table_names` to a `JobSettings` dict."""
+        recommendation = self.recommend(job_settings.get("name", job_cluster_key), table_names)
+        print(f"Sizing {recommendation.table_name}: {recommendation.node_type_id}, "
+              f"{recommendation.min_workers}-{recommendation.max_workers} workers, "
+              f"pool={recommendation.use_pool} ({recommendation.reason})")
+        return apply_to_job_settings(job_settings, recommendation, job_cluster_key, self.instance_pool_id)
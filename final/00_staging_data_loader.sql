@@ -6,9 +6,21 @@
 CREATE OR REPLACE TABLE poc.public.ncp_bronze_staging_v2 (
     filename STRING,
     loaded_at TIMESTAMP_NTZ,
+    file_row_number NUMBER,
     raw_line STRING
 );
 
+-- Malformed lines are quarantined with file, line and reason instead of being dropped
+-- (01_staging_to_bronze_loader.sql adds parse rejects; load errors are recorded below)
+CREATE TABLE IF NOT EXISTS poc.public.ncp_bronze_quarantine_v2 (
+    filename STRING,
+    file_row_number NUMBER,
+    reason STRING,
+    detail STRING,
+    raw_line STRING,
+    quarantined_at TIMESTAMP_NTZ
+);
+
 -- STEP 2: Create file format for raw line loading
 CREATE OR REPLACE FILE FORMAT txt_format_raw
 TYPE = 'CSV' 
@@ -19,11 +31,12 @@ ERROR_ON_COLUMN_COUNT_MISMATCH = FALSE;
 
 -- STEP 3: Load production data - 7 DAYS (September 2-8, 2025)
 -- Process full week of data for comprehensive testing - OPTIMIZED SINGLE COMMAND
-COPY INTO poc.public.ncp_bronze_staging_v2 (filename, loaded_at, raw_line)
+COPY INTO poc.public.ncp_bronze_staging_v2 (filename, loaded_at, file_row_number, raw_line)
 FROM (
     SELECT
         METADATA$FILENAME::string,
         CURRENT_TIMESTAMP,
+        METADATA$FILE_ROW_NUMBER,
         $1::string
     FROM @NCP/bpa.STP_BusinessAnalyticsQuery/
 )
@@ -31,6 +44,22 @@ PATTERN = 'file2-bpa.STP_BusinessAnalyticsQuery-2025-09-0[2-8].*'  -- Sept 2-8 (
 FILE_FORMAT = (FORMAT_NAME = 'txt_format_raw') 
 ON_ERROR = CONTINUE;
 
+-- STEP 3b: Quarantine lines the COPY skipped (ON_ERROR = CONTINUE) instead of losing them
+DELETE FROM poc.public.ncp_bronze_quarantine_v2
+WHERE reason = 'load_error'
+  AND SPLIT_PART(filename, '/', -1) IN (SELECT DISTINCT SPLIT_PART(filename, '/', -1)
+                                        FROM poc.public.ncp_bronze_staging_v2);
+
+INSERT INTO poc.public.ncp_bronze_quarantine_v2
+SELECT
+    file AS filename,
+    line AS file_row_number,
+    'load_error' AS reason,
+    error AS detail,
+    rejected_record AS raw_line,
+    CURRENT_TIMESTAMP AS quarantined_at
+FROM TABLE(VALIDATE(poc.public.ncp_bronze_staging_v2, JOB_ID => '_last'));
+
 -- STEP 4: Verify staging load results
 SELECT 
     'STAGING LOAD SUMMARY' AS step,
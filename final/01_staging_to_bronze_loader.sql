@@ -2,22 +2,114 @@
 -- This script processes staging data into bronze table with proper column types
 -- RUN AFTER: 00_staging_data_loader.sql
 
--- STEP 2: Clear current bronze table and recreate with production data
--- Drop existing bronze table V2
-DROP TABLE IF EXISTS poc.public.ncp_bronze_v2;
+-- INCREMENTAL LOADING: staging files already recorded in poc.public.ncp_bronze_load_log_v2 are skipped, so
+-- only new files are parsed and INSERTed into the existing bronze table (no DROP/CREATE of the whole history).
+-- Re-running is a no-op. To reprocess files, delete their load-log rows and re-run: their bronze rows and
+-- parse rejects are replaced, not duplicated. 'full' clears bronze and the load log and reloads all of staging.
+--   DELETE FROM poc.public.ncp_bronze_load_log_v2 WHERE filename LIKE '%STP_BusinessAnalyticsQuery-2025-09-05%';
+SET bronze_load_mode = 'incremental';  -- 'incremental' | 'full'
 
--- STEP 3: Recreate bronze table V2 with full 185-column structure using parsed production data - OPTIMIZED VERSION
-CREATE TABLE poc.public.ncp_bronze_v2 AS
+-- STEP 0: Load log (one row per staging file parsed into bronze)
+CREATE TABLE IF NOT EXISTS poc.public.ncp_bronze_load_log_v2 (
+    filename STRING,
+    staged_at TIMESTAMP_NTZ,
+    staged_lines NUMBER,
+    bronze_rows NUMBER,
+    rejected_rows NUMBER,
+    loaded_at TIMESTAMP_NTZ
+);
+
+DELETE FROM poc.public.ncp_bronze_load_log_v2 WHERE $bronze_load_mode = 'full';
+
+-- STEP 1: Staging files not in the load log yet
+CREATE OR REPLACE TEMPORARY TABLE ncp_bronze_pending_files_v2 AS
+SELECT
+    filename,
+    MAX(loaded_at) AS staged_at,
+    COUNT(*) AS staged_lines
+FROM poc.public.ncp_bronze_staging_v2
+WHERE filename NOT IN (SELECT filename FROM poc.public.ncp_bronze_load_log_v2)
+GROUP BY filename;
+
+-- STEP 1b: Classify the lines of the pending files. Malformed lines go to poc.public.ncp_bronze_quarantine_v2
+-- (created by 00_staging_data_loader.sql) with file, line number and reason; per-file reject counts are kept in
+-- poc.public.ncp_bronze_reject_counts_v2. Same reasons as the Databricks BadRecordQuarantine:
+--   column_count      - not the 158 file columns of schema_config.json
+--   undecodable_bytes - U+FFFD left by an upstream lossy decode (read as ISO-8859-1: 'ï¿½')
+--   unparseable_field - a TIMESTAMP column that is neither a timestamp nor a null placeholder
+-- Blank lines are skipped, as the Spark CSV reader does.
+CREATE OR REPLACE TEMPORARY TABLE ncp_bronze_classified_v2 AS
 WITH parsed_data AS (
-  SELECT 
+  SELECT
     filename,
-    loaded_at as inserted_at,
+    file_row_number,
+    loaded_at,
     SPLIT(raw_line, '\t') AS cols,
     raw_line
   FROM poc.public.ncp_bronze_staging_v2
-  WHERE raw_line IS NOT NULL 
+  WHERE raw_line IS NOT NULL
     AND raw_line != ''
-    AND LENGTH(raw_line) > 100
+    AND filename IN (SELECT filename FROM ncp_bronze_pending_files_v2)
+)
+SELECT
+    parsed_data.*,
+    CASE
+        WHEN ARRAY_SIZE(cols) <> 158 THEN 'column_count'
+        WHEN CONTAINS(raw_line, '\u00EF\u00BF\u00BD') OR CONTAINS(raw_line, '\uFFFD') THEN 'undecodable_bytes'
+        WHEN TRY_TO_TIMESTAMP(cols[1]::STRING) IS NULL
+             AND LOWER(TRIM(cols[1]::STRING)) NOT IN ('', 'null', 'nan', 'none', 'na', '<na>', '-', 'deprecated')
+            THEN 'unparseable_field'
+        WHEN TRY_TO_TIMESTAMP(cols[3]::STRING) IS NULL
+             AND LOWER(TRIM(cols[3]::STRING)) NOT IN ('', 'null', 'nan', 'none', 'na', '<na>', '-', 'deprecated')
+            THEN 'unparseable_field'
+    END AS reject_reason,
+    CASE reject_reason
+        WHEN 'column_count' THEN 'expected 158 columns, got ' || ARRAY_SIZE(cols)
+        WHEN 'unparseable_field' THEN
+            IFF(TRY_TO_TIMESTAMP(cols[1]::STRING) IS NULL AND LOWER(TRIM(cols[1]::STRING)) NOT IN
+                    ('', 'null', 'nan', 'none', 'na', '<na>', '-', 'deprecated'),
+                'transaction_date=''' || cols[1]::STRING || '''',
+                'transaction_date_life_cycle=''' || cols[3]::STRING || '''')
+    END AS reject_detail
+FROM parsed_data;
+
+-- Re-running for the same files replaces their parse rejects and counts (COPY load errors are kept)
+DELETE FROM poc.public.ncp_bronze_quarantine_v2
+WHERE reason <> 'load_error'
+  AND filename IN (SELECT DISTINCT filename FROM ncp_bronze_classified_v2);
+
+INSERT INTO poc.public.ncp_bronze_quarantine_v2
+SELECT filename, file_row_number, reject_reason, reject_detail, raw_line, CURRENT_TIMESTAMP
+FROM ncp_bronze_classified_v2
+WHERE reject_reason IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS poc.public.ncp_bronze_reject_counts_v2 (
+    filename STRING,
+    reason STRING,
+    rejected_rows NUMBER,
+    recorded_at TIMESTAMP_NTZ
+);
+
+DELETE FROM poc.public.ncp_bronze_reject_counts_v2
+WHERE SPLIT_PART(filename, '/', -1) IN (SELECT DISTINCT SPLIT_PART(filename, '/', -1) FROM ncp_bronze_classified_v2);
+
+INSERT INTO poc.public.ncp_bronze_reject_counts_v2
+SELECT filename, reason, COUNT(*), CURRENT_TIMESTAMP
+FROM poc.public.ncp_bronze_quarantine_v2
+WHERE SPLIT_PART(filename, '/', -1) IN (SELECT DISTINCT SPLIT_PART(filename, '/', -1) FROM ncp_bronze_classified_v2)
+GROUP BY filename, reason;
+
+-- STEP 2: Parse the pending files with full 185-column structure - OPTIMIZED VERSION
+-- Only lines that passed classification; rejects are in the quarantine table, not silently dropped
+CREATE OR REPLACE TEMPORARY TABLE ncp_bronze_new_rows_v2 AS
+WITH parsed_data AS (
+  SELECT 
+    filename,
+    loaded_at as inserted_at,
+    cols,
+    raw_line
+  FROM ncp_bronze_classified_v2
+  WHERE reject_reason IS NULL
 )
 SELECT 
     filename,
@@ -173,6 +265,33 @@ SELECT
     
 FROM parsed_data;
 
+-- STEP 3: Append the new rows to bronze V2 and record the files, in one transaction so a failed run leaves
+-- neither rows nor log entries behind. Rows of reprocessed files are deleted first.
+CREATE TABLE IF NOT EXISTS poc.public.ncp_bronze_v2 LIKE ncp_bronze_new_rows_v2;
+
+BEGIN TRANSACTION;
+
+DELETE FROM poc.public.ncp_bronze_v2
+WHERE $bronze_load_mode = 'full'
+   OR filename IN (SELECT filename FROM ncp_bronze_pending_files_v2);
+
+INSERT INTO poc.public.ncp_bronze_v2
+SELECT * FROM ncp_bronze_new_rows_v2;
+
+INSERT INTO poc.public.ncp_bronze_load_log_v2
+SELECT
+    pending.filename,
+    pending.staged_at,
+    pending.staged_lines,
+    COUNT(classified.filename) - COUNT(classified.reject_reason),
+    COUNT(classified.reject_reason),
+    CURRENT_TIMESTAMP
+FROM ncp_bronze_pending_files_v2 pending
+LEFT JOIN ncp_bronze_classified_v2 classified ON classified.filename = pending.filename
+GROUP BY pending.filename, pending.staged_at, pending.staged_lines;
+
+COMMIT;
+
 -- STEP 4: Verify production bronze table V2
 SELECT 
     'PRODUCTION BRONZE V2 SUMMARY' AS step,
@@ -185,6 +304,26 @@ SELECT
     COUNT(CASE WHEN transaction_date IS NOT NULL THEN 1 END) AS valid_dates
 FROM poc.public.ncp_bronze_v2;
 
+-- Files parsed by this run
+SELECT
+    'BRONZE V2 LOAD LOG' AS step,
+    $bronze_load_mode AS load_mode,
+    COUNT(*) AS files_loaded,
+    SUM(bronze_rows) AS rows_appended,
+    SUM(rejected_rows) AS rows_rejected
+FROM poc.public.ncp_bronze_load_log_v2
+WHERE filename IN (SELECT filename FROM ncp_bronze_pending_files_v2);
+
+-- Rejected lines per file and reason
+SELECT
+    'BRONZE V2 QUARANTINE' AS step,
+    filename,
+    reason,
+    rejected_rows
+FROM poc.public.ncp_bronze_reject_counts_v2
+ORDER BY rejected_rows DESC
+LIMIT 20;
+
 -- Show sample of production data V2
 SELECT 
     transaction_main_id,
@@ -0,0 +1,4 @@
+"""
+Nuvei DWH Platform POC - Local NCP Tooling
+Spark-free, Snowflake-free implementations of the NCP transactions pipeline for local verification.
+"""
@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+Nuvei DWH Platform POC - Local Scaling Benchmark
+Runs the pipeline stages on synthetic drops (`generator.py`) at several volumes through the Python
+reference path and projects their cost per million rows, so the `cost_analysis/` numbers can be
+reproduced and extrapolated without a warehouse:
+
+    - bronze_parse:     raw drops -> typed bronze Parquet (`ingest.py`)
+    - silver_transform: bronze -> silver transforms (`transforms.filter_and_transform_transactions`)
+    - dedupe:           dropDuplicates(transaction_main_id, transaction_date)
+    - merge:            MERGE of the deduplicated rows into an existing silver table (update + insert)
+
+Every stage runs in a fresh process, so its peak RSS is its own. Per stage and volume the wall time,
+rows/s, peak memory and bytes written are recorded; rate cards turn the runtimes into credits and USD
+in the same layout as `cost_analysis/cost_results_example.csv`.
+
+Usage:
+    python -m shared.ncp_local.benchmark -o cost_analysis/local_benchmark_results.csv
+    python -m shared.ncp_local.benchmark --scales 1,10 --rows-per-file 20000 --rate-cards rate_cards.json \
+        --metrics-csv stage_metrics.csv
+"""
+
+import argparse
+import csv
+import json
+import logging
+import multiprocessing
+import os
+import resource
+import shutil
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, asdict, field, fields
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from shared.ncp_local.columnar import key_hashes
+from shared.ncp_local.exports import expand_paths
+from shared.ncp_local.generator import GeneratorConfig, DEFAULT_ROWS_PER_FILE, generate, plan_drop
+from shared.ncp_local.ingest import QUARANTINE_DIR, ingest_files
+from shared.ncp_local.schema import load_schema
+from shared.ncp_local.transforms import Deduplicator, filter_and_transform_transactions
+
+logger = logging.getLogger(__name__)
+
+STAGES = ['bronze_parse', 'silver_transform', 'dedupe', 'merge']
+DEDUPE_KEYS = ['transaction_main_id', 'transaction_date']
+ENGINE = 'python'
+
+# Same columns (and tab delimiter) as cost_analysis/cost_results_example.csv
+COST_COLUMNS = [
+    'QUERY_TAG', 'WAREHOUSE_NAME', 'TOTAL_QUERIES', 'TOTAL_RUNTIME_MINUTES', 'CLOUD_SERVICES_CREDITS',
+    'ACTUAL_COMPUTE_CREDITS', 'ESTIMATED_COMPUTE_CREDITS', 'FINAL_COMPUTE_CREDITS', 'TOTAL_CREDITS',
+    'CLOUD_SERVICES_COST_USD', 'COMPUTE_COST_USD', 'TOTAL_COST_USD', 'CREDITS_PER_MILLION_RECORDS',
+    'COST_PER_MILLION_RECORDS_USD', 'CREDIT_CALCULATION_METHOD',
+]
+CREDIT_CALCULATION_METHOD = 'PROJECTED_FROM_LOCAL_BENCHMARK'
+
+
+@dataclass
+class RateCard:
+    """
+    How a runtime is billed on one platform/size. `credits_per_hour` is Snowflake credits or Databricks
+    DBUs; `speedup` is how much faster that compute runs a stage than the benchmark machine (1.0 bills
+    the local runtime as-is).
+    """
+    name: str
+    platform: str
+    credits_per_hour: float
+    usd_per_credit: float
+    cloud_services_ratio: float = 0.0  # cloud services credits as a share of compute credits
+    infrastructure_usd_per_hour: float = 0.0  # cloud VMs billed outside the DBU rate (Databricks)
+    speedup: float = 1.0
+
+
+# List prices; replace with contract rates through --rate-cards
+DEFAULT_RATE_CARDS = [
+    # accurate_etl_cost_query.sql: 1 credit per X-Small hour at the Enterprise $3/credit;
+    # cloud services ran at ~1.5% of compute in cost_results_example.csv
+    RateCard('X_SMALL_2_GEN', 'snowflake', credits_per_hour=1.0, usd_per_credit=3.0, cloud_services_ratio=0.015),
+    # Jobs Compute, driver + 2 workers at 1 DBU/h each, plus their on-demand VMs
+    RateCard('DBX_JOBS_3_NODE', 'databricks', credits_per_hour=3.0, usd_per_credit=0.15,
+             infrastructure_usd_per_hour=0.936),
+]
+
+
+@dataclass
+class BenchmarkConfig:
+    """What to run and where"""
+    work_dir: str
+    scales: List[int] = field(default_factory=lambda: [1, 10, 100])
+    files_per_scale: int = 1  # drops at 1x
+    rows_per_file: int = DEFAULT_ROWS_PER_FILE
+    stages: List[str] = field(default_factory=lambda: list(STAGES))
+    merge_overlap: float = 0.1  # share of merged rows that update an existing target row
+    seed: int = 42
+    workers: int = os.cpu_count() or 1
+
+
+@dataclass
+class StageResult:
+    """Measurements of one stage at one volume"""
+    stage: str
+    scale: int
+    engine: str
+    rows_in: int
+    rows_out: int
+    seconds: float
+    rows_per_second: float
+    peak_rss_mb: float
+    arrow_peak_mb: float
+    bytes_written: int
+    workers: int
+
+
+# ------------------------------------------------------------------------------------------------
+# Stages (each returns rows in, rows out and bytes written)
+# ------------------------------------------------------------------------------------------------
+
+def _parquet_batches(paths: Iterable[str]) -> Iterator[pa.RecordBatch]:
+    for path in paths:
+        yield from pq.ParquetFile(path).iter_batches(batch_size=65_536)
+
+
+def _parquet_rows(path) -> int:
+    return pq.ParquetFile(path).metadata.num_rows
+
+
+def _write_parquet(tables: Iterable[pa.Table], path: Path) -> Tuple[int, int]:
+    """Write tables into one Parquet file (schema of the first table). Returns rows and bytes written."""
+    writer, rows = None, 0
+    temporary = path.with_name(f".{path.name}.tmp")
+    try:
+        for table in tables:
+            if writer is None:
+                writer = pq.ParquetWriter(temporary, table.schema)
+            writer.write_table(table.cast(writer.schema))
+            rows += table.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        return 0, 0
+    os.replace(temporary, path)
+    return rows, path.stat().st_size
+
+
+def _bronze_parse(directory: Path, workers: int) -> Tuple[int, int, int]:
+    ingested = ingest_files([str(directory / 'drops')], str(directory / 'bronze'), workers=workers)
+    rows = sum(entry.rows for entry in ingested)
+    rejected = sum(entry.rejected_rows for entry in ingested)
+    written = sum(os.path.getsize(entry.output) for entry in ingested)
+    written += sum(path.stat().st_size for path in (directory / 'bronze' / QUARANTINE_DIR).glob('*.parquet'))
+    return rows + rejected, rows, written
+
+
+def _silver_transform(directory: Path, workers: int) -> Tuple[int, int, int]:
+    schema_dict = load_schema('transactions')
+    bronze = sorted(str(path) for path in (directory / 'bronze').glob('*.parquet'))
+    rows_in = sum(_parquet_rows(path) for path in bronze)
+
+    def transformed():
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            in_flight = deque()
+            for batch in _parquet_batches(bronze):
+                in_flight.append(executor.submit(filter_and_transform_transactions,
+                                                 pa.Table.from_batches([batch]), schema_dict))
+                if len(in_flight) >= 2 * workers:
+                    yield in_flight.popleft().result()
+            while in_flight:
+                yield in_flight.popleft().result()
+
+    rows_out, written = _write_parquet(transformed(), directory / 'silver.parquet')
+    return rows_in, rows_out, written
+
+
+def _dedupe(directory: Path, workers: int) -> Tuple[int, int, int]:
+    source = directory / 'silver.parquet'
+    deduplicate = Deduplicator(DEDUPE_KEYS)
+    tables = (deduplicate(pa.Table.from_batches([batch])) for batch in _parquet_batches([str(source)]))
+    rows_out, written = _write_parquet(tables, directory / 'silver_deduped.parquet')
+    return _parquet_rows(source), rows_out, written
+
+
+def _merge(directory: Path, workers: int) -> Tuple[int, int, int]:
+    """
+    MERGE INTO target USING source ON the dedupe keys WHEN MATCHED UPDATE WHEN NOT MATCHED INSERT, done
+    as a copy-on-write rewrite: target rows whose key is in the source are dropped, then the source is
+    appended. Keys are matched on their 64-bit hashes.
+    """
+    source, target = directory / 'silver_deduped.parquet', directory / 'target.parquet'
+    source_keys = np.sort(key_hashes(pq.read_table(source, columns=DEDUPE_KEYS).columns))
+
+    def merged():
+        for batch in _parquet_batches([str(target)]):
+            table = pa.Table.from_batches([batch])
+            hashes = key_hashes([table[name] for name in DEDUPE_KEYS])
+            positions = np.minimum(np.searchsorted(source_keys, hashes), max(len(source_keys) - 1, 0))
+            matched = source_keys[positions] == hashes if len(source_keys) else np.zeros(len(hashes), bool)
+            yield table.filter(pa.array(~matched))
+        for batch in _parquet_batches([str(source)]):
+            yield pa.Table.from_batches([batch])
+
+    rows_out, written = _write_parquet(merged(), directory / 'target_merged.parquet')
+    os.replace(directory / 'target_merged.parquet', target)
+    return len(source_keys), rows_out, written
+
+
+def seed_merge_target(directory: Path, overlap: float) -> int:
+    """
+    Target table for the merge stage: the deduplicated rows with the keys of all but an `overlap` share
+    re-numbered, so the merge updates that share and inserts the rest. Returns the target rows.
+    """
+    every = max(1, round(1 / overlap)) if overlap > 0 else 0
+
+    def tables():
+        offset = 0
+        for batch in _parquet_batches([str(directory / 'silver_deduped.parquet')]):
+            table = pa.Table.from_batches([batch])
+            rows = np.arange(offset, offset + table.num_rows)
+            offset += table.num_rows
+            renumbered = np.ones(len(rows), bool) if not every else rows % every != 0
+            ids = table['transaction_main_id']
+            index = table.column_names.index('transaction_main_id')
+            yield table.set_column(index, 'transaction_main_id',
+                                   pc.if_else(pa.array(renumbered), pc.binary_join_element_wise('H', ids, ''), ids))
+
+    rows, _ = _write_parquet(tables(), directory / 'target.parquet')
+    return rows
+
+
+STAGE_FUNCTIONS = {
+    'bronze_parse': _bronze_parse,
+    'silver_transform': _silver_transform,
+    'dedupe': _dedupe,
+    'merge': _merge,
+}
+
+
+def _measure_stage(stage: str, directory: str, workers: int) -> Dict:
+    """Runs in a fresh process: the stage's timings and this process's peak memory"""
+    start = time.perf_counter()
+    rows_in, rows_out, written = STAGE_FUNCTIONS[stage](Path(directory), workers)
+    seconds = time.perf_counter() - start
+    usage = [resource.getrusage(who).ru_maxrss for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)]
+    return {'rows_in': rows_in, 'rows_out': rows_out, 'bytes_written': written, 'seconds': seconds,
+            'peak_rss_mb': max(usage) / 1024,  # ru_maxrss is in KiB on Linux
+            'arrow_peak_mb': pa.default_memory_pool().max_memory() / 1024 ** 2}
+
+
+def run_stage(stage: str, directory: Path, scale: int, workers: int) -> StageResult:
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        measured = executor.submit(_measure_stage, stage, str(directory), workers).result()
+    return StageResult(stage=stage, scale=scale, engine=ENGINE, rows_in=measured['rows_in'],
+                       rows_out=measured['rows_out'], seconds=round(measured['seconds'], 3),
+                       rows_per_second=round(measured['rows_in'] / max(measured['seconds'], 1e-9), 1),
+                       peak_rss_mb=round(measured['peak_rss_mb'], 1),
+                       arrow_peak_mb=round(measured['arrow_peak_mb'], 1),
+                       bytes_written=measured['bytes_written'], workers=workers)
+
+
+# ------------------------------------------------------------------------------------------------
+# Benchmark
+# ------------------------------------------------------------------------------------------------
+
+def prepare_drops(config: BenchmarkConfig, scale: int) -> Path:
+    """Generate the drops of a volume, reusing them when a previous run already wrote the same files"""
+    directory = Path(config.work_dir) / f"{scale}x"
+    generator_config = GeneratorConfig(output_dir=str(directory / 'drops'), files=config.files_per_scale * scale,
+                                       rows_per_file=config.rows_per_file, seed=config.seed,
+                                       workers=config.workers)
+    expected = {plan_drop(generator_config, index).path for index in range(generator_config.files)}
+    existing = set(expand_paths([generator_config.output_dir])) if Path(generator_config.output_dir).exists() else set()
+    if existing != expected:
+        shutil.rmtree(generator_config.output_dir, ignore_errors=True)
+        start = time.perf_counter()
+        drops = generate(generator_config)
+        logger.info(f"{scale}x: generated {len(drops)} drops, {sum(d['rows'] for d in drops):,} rows "
+                    f"in {time.perf_counter() - start:.1f}s")
+    return directory
+
+
+def run_benchmark(config: BenchmarkConfig) -> List[StageResult]:
+    """Run the selected stages at every scale; stages read the previous stage's output"""
+    results = []
+    for scale in config.scales:
+        directory = prepare_drops(config, scale)
+        for stage in STAGES:
+            if stage not in config.stages:
+                continue
+            if stage == 'bronze_parse':
+                shutil.rmtree(directory / 'bronze', ignore_errors=True)
+            if stage == 'merge':
+                seed_merge_target(directory, config.merge_overlap)
+            result = run_stage(stage, directory, scale, config.workers)
+            logger.info(f"{scale}x {stage}: {result.rows_in:,} rows in {result.seconds:.2f}s "
+                        f"({result.rows_per_second:,.0f} rows/s), peak {result.peak_rss_mb:,.0f} MB, "
+                        f"{result.bytes_written / 1024 ** 2:,.1f} MB written")
+            results.append(result)
+    return results
+
+
+# ------------------------------------------------------------------------------------------------
+# Cost projection
+# ------------------------------------------------------------------------------------------------
+
+def load_rate_cards(path: Optional[str]) -> List[RateCard]:
+    """Rate cards from a JSON list of RateCard fields (default: DEFAULT_RATE_CARDS)"""
+    if not path:
+        return list(DEFAULT_RATE_CARDS)
+    with open(path) as file:
+        return [RateCard(**card) for card in json.load(file)]
+
+
+def cost_row(query_tag: str, card: RateCard, queries: int, seconds: float, rows: int) -> Dict[str, str]:
+    """One cost_results_example.csv row for a projected runtime (formatted like accurate_etl_cost_query.sql)"""
+    hours = seconds / card.speedup / 3600
+    compute_credits = hours * card.credits_per_hour
+    cloud_services_credits = compute_credits * card.cloud_services_ratio
+    total_credits = compute_credits + cloud_services_credits
+    compute_cost = compute_credits * card.usd_per_credit + hours * card.infrastructure_usd_per_hour
+    cloud_services_cost = cloud_services_credits * card.usd_per_credit
+    total_cost = compute_cost + cloud_services_cost
+    millions = max(rows, 1) / 1e6
+    return {
+        'QUERY_TAG': query_tag,
+        'WAREHOUSE_NAME': card.name,
+        'TOTAL_QUERIES': str(queries),
+        'TOTAL_RUNTIME_MINUTES': f"{hours * 60:.2f}",
+        'CLOUD_SERVICES_CREDITS': f"{cloud_services_credits:.6f}",
+        'ACTUAL_COMPUTE_CREDITS': f"{0:.9f}",
+        'ESTIMATED_COMPUTE_CREDITS': f"{compute_credits:.6f}",
+        'FINAL_COMPUTE_CREDITS': f"{compute_credits:.9f}",
+        'TOTAL_CREDITS': f"{total_credits:.6f}",
+        'CLOUD_SERVICES_COST_USD': f"{cloud_services_cost:.4f}",
+        'COMPUTE_COST_USD': f"{compute_cost:.4f}",
+        'TOTAL_COST_USD': f"{total_cost:.4f}",
+        'CREDITS_PER_MILLION_RECORDS': f"{total_credits / millions:.6f}",
+        'COST_PER_MILLION_RECORDS_USD': f"{total_cost / millions:.6f}",
+        'CREDIT_CALCULATION_METHOD': CREDIT_CALCULATION_METHOD,
+    }
+
+
+def cost_rows(results: Sequence[StageResult], cards: Sequence[RateCard],
+              started: Optional[datetime] = None) -> List[Dict[str, str]]:
+    """
+    Per rate card and volume: one row per stage, then an ETL row summing the stages. Per-million figures
+    use each stage's input rows; the ETL row uses the raw rows parsed into bronze, like the 12.686818M
+    source records of accurate_etl_cost_query.sql.
+    """
+    stamp = f"{started or datetime.now():%Y-%m-%d_%H:%M:%S}"
+    rows = []
+    for card in cards:
+        for scale in sorted({result.scale for result in results}):
+            stages = [result for result in results if result.scale == scale]
+            for result in stages:
+                rows.append(cost_row(f"LOCAL_{result.stage.upper()}_{scale}X_{stamp}", card, 1,
+                                     result.seconds, result.rows_in))
+            source_rows = next((result.rows_in for result in stages if result.stage == 'bronze_parse'),
+                               stages[0].rows_in)
+            rows.append(cost_row(f"LOCAL_ETL_{scale}X_{stamp}", card, len(stages),
+                                 sum(result.seconds for result in stages), source_rows))
+    return rows
+
+
+def nonlinear_stages(results: Sequence[StageResult], min_ratio: float = 0.5) -> Dict[str, float]:
+    """
+    Stages whose rows/s at the largest scale fell below `min_ratio` of their rows/s at the smallest one,
+    with that ratio. Their cost grows faster than their rows, so a per-million projection understates the
+    larger volumes (and the 1x figure of a quadratic stage says nothing about 100x).
+    """
+    ratios = {}
+    for stage in STAGES:
+        runs = sorted((result for result in results if result.stage == stage), key=lambda result: result.scale)
+        if len(runs) > 1 and runs[0].rows_per_second > 0:
+            ratio = runs[-1].rows_per_second / runs[0].rows_per_second
+            if ratio < min_ratio:
+                ratios[stage] = ratio
+    return ratios
+
+
+def write_cost_csv(rows: Sequence[Dict[str, str]], path: str) -> None:
+    with open(path, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=COST_COLUMNS, delimiter='\t', lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_metrics_csv(results: Sequence[StageResult], path: str) -> None:
+    with open(path, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=[f.name for f in fields(StageResult)], lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(asdict(result) for result in results)
+
+
+def print_results(results: Sequence[StageResult]) -> None:
+    print(f"{'STAGE':<18}{'SCALE':>6}{'ROWS IN':>14}{'SECONDS':>10}{'ROWS/S':>12}{'PEAK MB':>10}{'WRITTEN MB':>12}")
+    for result in results:
+        print(f"{result.stage:<18}{f'{result.scale}x':>6}{result.rows_in:>14,}{result.seconds:>10.2f}"
+              f"{result.rows_per_second:>12,.0f}{result.peak_rss_mb:>10,.0f}"
+              f"{result.bytes_written / 1024 ** 2:>12,.1f}")
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    parser = argparse.ArgumentParser(description="Benchmark the local pipeline stages at several volumes")
+    parser.add_argument('-o', '--output', required=True, help="Cost CSV (cost_results_example.csv layout)")
+    parser.add_argument('--metrics-csv', help="Also write the raw per-stage measurements")
+    parser.add_argument('--work-dir', help="Drops and stage outputs (default: a temporary directory); "
+                                           "drops already generated there are reused")
+    parser.add_argument('--scales', default='1,10,100', help="Volumes as multiples of the 1x drop count")
+    parser.add_argument('--files-per-scale', type=int, default=1, help="Drops at 1x")
+    parser.add_argument('--rows-per-file', type=int, default=DEFAULT_ROWS_PER_FILE)
+    parser.add_argument('--stages', default=','.join(STAGES), help="Stages to run (each reads the previous "
+                                                                    "stage's output)")
+    parser.add_argument('--merge-overlap', type=float, default=0.1, help="Share of merged rows that update")
+    parser.add_argument('--rate-cards', help="JSON list of rate cards (name, platform, credits_per_hour, "
+                                             "usd_per_credit, cloud_services_ratio, "
+                                             "infrastructure_usd_per_hour, speedup)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    stages = args.stages.split(',')
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages {sorted(unknown)}, expected {STAGES}")
+    cards = load_rate_cards(args.rate_cards)
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix='ncp_benchmark_')
+    config = BenchmarkConfig(work_dir=work_dir, scales=[int(s) for s in args.scales.split(',')],
+                             files_per_scale=args.files_per_scale, rows_per_file=args.rows_per_file,
+                             stages=stages, merge_overlap=args.merge_overlap, seed=args.seed,
+                             workers=args.workers)
+
+    started = datetime.now()
+    try:
+        results = run_benchmark(config)
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    print_results(results)
+    for stage, ratio in nonlinear_stages(results).items():
+        logger.warning(f"{stage}: rows/s at {max(config.scales)}x is {ratio:.0%} of {min(config.scales)}x; "
+                       f"it does not scale linearly, so its cost per million rows is not a projection")
+    write_cost_csv(cost_rows(results, cards, started), args.output)
+    if args.metrics_csv:
+        write_metrics_csv(results, args.metrics_csv)
+    print(f"Wrote {args.output}" + (f" and {args.metrics_csv}" if args.metrics_csv else ""))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""
+Nuvei DWH Platform POC - Columnar Helpers
+Vectorized building blocks shared by the local tools: per-distinct-value transforms and 64-bit
+hashing of Arrow string columns with NumPy (no per-row Python).
+"""
+
+from typing import Callable, Sequence, Union
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+ArrayLike = Union[pa.Array, pa.ChunkedArray]
+
+# Stands in for nulls so that null and '' hash differently
+NULL_MARKER = '\x00'
+
+_HASH_MULTIPLIER = np.uint64(0x100000001B3)
+_powers = np.ones(1, dtype=np.uint64)
+
+
+def on_distinct_values(values: ArrayLike, transform: Callable[[pa.Array], pa.Array]) -> pa.Array:
+    """
+    Apply an element-wise transform once per distinct value. Most NCP columns are low-cardinality
+    (flags, codes, names), so this turns per-row regex work into per-dictionary-entry work.
+    """
+    if isinstance(values, pa.ChunkedArray):
+        values = values.combine_chunks()
+    encoded = pc.dictionary_encode(values)
+    if len(encoded.dictionary) * 2 > len(values):
+        return transform(values)
+    return pc.take(transform(encoded.dictionary), encoded.indices)
+
+
+def _hash_powers(length: int) -> np.ndarray:
+    """Multiplier powers P^0..P^(length-1) mod 2^64, grown on demand"""
+    global _powers
+    if len(_powers) < length:
+        grown = np.full(max(length, 2 * len(_powers)), _HASH_MULTIPLIER, dtype=np.uint64)
+        grown[0] = 1
+        _powers = np.cumprod(grown, dtype=np.uint64)
+    return _powers
+
+
+def mix64(values: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer: spreads polynomial hashes over all 64 bits"""
+    with np.errstate(over='ignore'):
+        z = values.astype(np.uint64, copy=True)
+        z ^= z >> np.uint64(30)
+        z *= np.uint64(0xBF58476D1CE4E5B9)
+        z ^= z >> np.uint64(27)
+        z *= np.uint64(0x94D049BB133111EB)
+        z ^= z >> np.uint64(31)
+    return z
+
+
+def hash_strings(values: ArrayLike) -> np.ndarray:
+    """
+    64-bit hash of every value of a string column, computed over the raw Arrow buffers.
+    Nulls hash like NULL_MARKER.
+    """
+    values = pc.fill_null(values.cast(pa.string()), NULL_MARKER)
+    if isinstance(values, pa.ChunkedArray):
+        values = values.combine_chunks()
+    count = len(values)
+    if count == 0:
+        return np.zeros(0, dtype=np.uint64)
+
+    buffers = values.buffers()
+    offsets = np.frombuffer(buffers[1], dtype=np.int32, count=count + 1, offset=values.offset * 4)
+    data = np.frombuffer(buffers[2], dtype=np.uint8)[offsets[0]:offsets[-1]] if buffers[2] else np.zeros(0, np.uint8)
+    lengths = np.diff(offsets)
+    starts = offsets[:-1] - offsets[0]
+
+    # Polynomial hash: sum((byte + 1) * P^(position from end)) mod 2^64
+    row_ends = np.repeat(starts + lengths, lengths)
+    position_from_end = row_ends - 1 - np.arange(len(data), dtype=np.int64)
+    powers = _hash_powers(int(lengths.max()) if len(lengths) else 1)
+    with np.errstate(over='ignore'):
+        contributions = (data.astype(np.uint64) + np.uint64(1)) * powers[position_from_end]
+        hashes = np.zeros(count, dtype=np.uint64)
+        non_empty = lengths > 0
+        if non_empty.any():
+            hashes[non_empty] = np.add.reduceat(contributions, starts[non_empty])
+        hashes += lengths.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+    return mix64(hashes)
+
+
+def hash_column(values: ArrayLike) -> np.ndarray:
+    """hash_strings computed once per distinct value (cheap for the many low-cardinality columns)"""
+    values = pc.fill_null(values.cast(pa.string()), NULL_MARKER)
+    if isinstance(values, pa.ChunkedArray):
+        values = values.combine_chunks()
+    encoded = pc.dictionary_encode(values)
+    if len(encoded.dictionary) * 2 > len(values):
+        return hash_strings(values)
+    return hash_strings(encoded.dictionary)[encoded.indices.to_numpy(zero_copy_only=False)]
+
+
+def key_text(columns: Union[ArrayLike, Sequence[ArrayLike]]) -> pa.Array:
+    """
+    Key column(s) as trimmed text, the form every tool matches keys in (Parquet keys may be integers).
+    A composite key joins its columns with a unit separator, nulls as NULL_MARKER.
+    """
+    if isinstance(columns, (pa.Array, pa.ChunkedArray)):
+        columns = [columns]
+    texts = [pc.utf8_trim_whitespace(column.cast(pa.string())) for column in columns]
+    if len(texts) > 1:
+        texts = [pc.binary_join_element_wise(*texts, '\x1f', null_handling='replace', null_replacement=NULL_MARKER)]
+    text = texts[0]
+    return text.combine_chunks() if isinstance(text, pa.ChunkedArray) else text
+
+
+def key_hashes(columns: Union[ArrayLike, Sequence[ArrayLike]], seed: int = 0) -> np.ndarray:
+    """64-bit hash of every key_text value; a non-zero `seed` salts it (hash-based sampling)"""
+    hashes = hash_strings(key_text(columns))
+    return mix64(hashes ^ np.uint64(seed)) if seed else hashes
+
+
+def combine_hashes(column_hashes: Sequence[np.ndarray]) -> np.ndarray:
+    """Order-sensitive combination of per-column hashes into one row hash"""
+    with np.errstate(over='ignore'):
+        combined = np.full(len(column_hashes[0]) if column_hashes else 0, np.uint64(0xCBF29CE484222325))
+        for hashes in column_hashes:
+            combined = mix64(combined * _HASH_MULTIPLIER + hashes)
+    return combined
+
+
+def hash_rows(columns: Sequence[ArrayLike]) -> np.ndarray:
+    """64-bit hash of whole rows from the per-column hashes"""
+    return combine_hashes([hash_column(c) for c in columns])
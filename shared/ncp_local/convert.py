@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Nuvei DWH Platform POC - Typed Parquet Conversion
+Converts bronze/silver exports and reference data (TSV with 'null' tokens, or Parquet) into typed Parquet
+that the parity tools can read with column pruning and predicate pushdown.
+
+- Column names are normalized (lower-case, Snowflake `THREED_*` spellings undone) and typed with
+  `schema_config.json`; silver exports also get boolean flag columns. Values that do not fit the type
+  (other than null placeholders) fail the conversion instead of silently becoming null.
+- Low-cardinality columns (transaction type, card scheme, currency, client name, flag columns and any
+  string column with few distinct values) are dictionary-encoded.
+- Rows are sorted by `transaction_date` across the whole export (external sort: sorted runs, then
+  merged in date windows), so row-group and page statistics prune date predicates.
+
+Usage:
+    python -m shared.ncp_local.convert 5_REFERENCE_DATA/databricks_silver_data_sample -o reference/silver.parquet
+    python -m shared.ncp_local.convert snowflake_export/ -o snowflake_silver.parquet --workers 8
+"""
+
+import argparse
+import logging
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from shared.ncp_local.exports import (ExportChunk, TIMESTAMP_PATTERN, export_columns, expand_paths,
+                                      iter_chunk_batches, plan_chunks)
+from shared.ncp_local.schema import (
+    BOOLEAN_STRING_COLUMN,
+    CONVERSION_COLUMNS,
+    TYPED_NULL_TOKENS,
+    arrow_type,
+    load_schema,
+    normalize_column_name,
+)
+from shared.ncp_local.tsv import cast_string_column
+
+logger = logging.getLogger(__name__)
+
+# Always dictionary-encoded (string columns); others are chosen by distinct ratio
+DICTIONARY_COLUMNS = ['transaction_type', 'card_scheme', 'currency_code', 'multi_client_name',
+                      *BOOLEAN_STRING_COLUMN, *CONVERSION_COLUMNS]
+
+
+@dataclass
+class ConvertConfig:
+    """Options of one export conversion"""
+    table_name: str = 'transactions'
+    sort_column: str = 'transaction_date'
+    dictionary_columns: List[str] = field(default_factory=lambda: list(DICTIONARY_COLUMNS))
+    dictionary_ratio: float = 0.01  # other string columns with distinct/rows at or below this
+    row_group_rows: int = 128 * 1024
+    window_rows: int = 2_000_000  # rows sorted in memory at once while merging runs
+    compression: str = 'zstd'
+    chunk_bytes: int = 256 << 20
+    workers: int = os.cpu_count() or 1
+
+
+# ------------------------------------------------------------------------------------------------
+# Typing
+# ------------------------------------------------------------------------------------------------
+
+def export_schema(columns: Sequence[str], schema_dict: Dict[str, str]) -> pa.Schema:
+    """
+    Arrow schema for normalized export columns: schema_config types, booleans for the flag columns of a
+    silver export (recognized by its conversion columns) and strings for everything else
+    """
+    is_silver = any(name in columns for name in CONVERSION_COLUMNS)
+    fields = []
+    for name in columns:
+        if is_silver and name in BOOLEAN_STRING_COLUMN:
+            fields.append(pa.field(name, pa.bool_()))
+        elif name in schema_dict:
+            fields.append(pa.field(name, arrow_type(schema_dict[name])))
+        else:
+            fields.append(pa.field(name, pa.string()))
+    return pa.schema(fields)
+
+
+def type_column(values: pa.Array, target: pa.DataType, name: str) -> pa.Array:
+    """Cast one export column; a value that is neither valid for `target` nor a null placeholder raises"""
+    if values.type == target:
+        return values
+    if pa.types.is_dictionary(values.type):
+        values = values.cast(values.type.value_type)
+    if not pa.types.is_string(values.type) and not pa.types.is_large_string(values.type):
+        return pc.cast(values, target)
+    if pa.types.is_string(target):
+        return values
+    if pa.types.is_timestamp(target):
+        # Export spellings: 'T' separator, zone suffix (the exports are UTC)
+        values = pc.replace_substring_regex(values, TIMESTAMP_PATTERN, r'\1 \2')
+    typed = cast_string_column(values, target)
+    placeholder = pc.is_in(pc.utf8_lower(pc.utf8_trim_whitespace(values)), value_set=pa.array(TYPED_NULL_TOKENS))
+    failed = pc.and_(pc.and_(pc.is_valid(values), pc.is_null(typed)), pc.invert(placeholder))
+    if pc.any(failed).as_py():
+        sample = pc.filter(values, failed)[0].as_py()
+        raise ValueError(f"Column '{name}' has values that are not {target}, e.g. {sample!r}")
+    return typed
+
+
+def type_batch(batch: pa.RecordBatch, schema: pa.Schema) -> pa.Table:
+    """Rename a raw export batch to normalized column names and cast it to `schema`"""
+    columns = [type_column(column, schema.field(i).type, schema.field(i).name)
+               for i, column in enumerate(batch.columns)]
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+# ------------------------------------------------------------------------------------------------
+# Sorted runs (run inside the workers)
+# ------------------------------------------------------------------------------------------------
+
+def _write_run(chunk: ExportChunk, run_path: str, schema: pa.Schema, config: ConvertConfig) -> Tuple[int, Dict]:
+    """Type and sort one chunk into a run file. Returns rows and distinct counts of the string columns."""
+    tables = [type_batch(batch, schema) for batch in iter_chunk_batches(chunk)]
+    table = pa.concat_tables(tables) if tables else schema.empty_table()
+    if config.sort_column in schema.names:
+        table = table.sort_by([(config.sort_column, 'ascending')])  # nulls last
+    pq.write_table(table, run_path, row_group_size=config.row_group_rows, compression='lz4')
+    distinct = {name: pc.count_distinct(table[name]).as_py() for name in schema.names
+                if pa.types.is_string(schema.field(name).type)}
+    return table.num_rows, distinct
+
+
+def _date_windows(run_paths: Sequence[str], column: str, window_rows: int) -> List[Tuple]:
+    """
+    [low, high) boundaries of the sort column holding roughly `window_rows` rows each, from the runs'
+    row-group statistics (the last window is open-ended; nulls are merged separately)
+    """
+    groups = []
+    for path in run_paths:
+        metadata = pq.ParquetFile(path).metadata
+        index = metadata.schema.to_arrow_schema().get_field_index(column)
+        for i in range(metadata.num_row_groups):
+            row_group = metadata.row_group(i)
+            statistics = row_group.column(index).statistics
+            if statistics is not None and statistics.has_min_max:
+                groups.append((statistics.min, row_group.num_rows))
+    groups.sort(key=lambda group: group[0])
+
+    bounds, rows = [None], 0
+    for low, group_rows in groups:
+        if rows >= window_rows and low != bounds[-1]:
+            bounds.append(low)
+            rows = 0
+        rows += group_rows
+    bounds.append(None)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _window_filter(column: str, low, high, column_type: pa.DataType) -> ds.Expression:
+    condition = pc.field(column).is_valid()
+    if low is not None:
+        condition = condition & (pc.field(column) >= pa.scalar(low, column_type))
+    if high is not None:
+        condition = condition & (pc.field(column) < pa.scalar(high, column_type))
+    return condition
+
+
+# ------------------------------------------------------------------------------------------------
+# Conversion
+# ------------------------------------------------------------------------------------------------
+
+class _RowGroupWriter:
+    """Writes sorted tables as full row groups with dictionary-encoded low-cardinality columns"""
+
+    def __init__(self, path: str, schema: pa.Schema, dictionary_columns: Sequence[str], config: ConvertConfig):
+        self.dictionary_columns = set(dictionary_columns)
+        self.schema = pa.schema([pa.field(f.name, pa.dictionary(pa.int32(), f.type))
+                                 if f.name in self.dictionary_columns else f for f in schema])
+        sorting = ([pq.SortingColumn(schema.get_field_index(config.sort_column), nulls_first=False)]
+                   if config.sort_column in schema.names else None)
+        self.writer = pq.ParquetWriter(path, self.schema, compression=config.compression,
+                                       use_dictionary=sorted(self.dictionary_columns), write_statistics=True,
+                                       write_page_index=True, sorting_columns=sorting)
+        self.row_group_rows = config.row_group_rows
+        self.pending: List[pa.Table] = []
+        self.pending_rows = 0
+        self.rows = 0
+
+    def write(self, table: pa.Table) -> None:
+        self.pending.append(table)
+        self.pending_rows += table.num_rows
+        while self.pending_rows >= self.row_group_rows:
+            self._flush(self.row_group_rows)
+
+    def _flush(self, rows: int) -> None:
+        table = pa.concat_tables(self.pending)
+        head, tail = table.slice(0, rows), table.slice(rows)
+        columns = [pc.dictionary_encode(head[name]) if name in self.dictionary_columns else head[name]
+                   for name in head.column_names]
+        self.writer.write_table(pa.Table.from_arrays(columns, schema=self.schema), row_group_size=rows)
+        self.rows += head.num_rows
+        self.pending, self.pending_rows = [tail], tail.num_rows
+
+    def close(self) -> None:
+        if self.pending_rows:
+            self._flush(self.pending_rows)
+        self.writer.close()
+
+
+def convert_export(paths: Sequence[str], output: str, config: Optional[ConvertConfig] = None) -> Dict:
+    """Convert an export (files, directories or globs) into one sorted, typed Parquet file"""
+    config = config or ConvertConfig()
+    files = expand_paths(paths)
+    if not files:
+        raise FileNotFoundError(f"No export files found: {paths}")
+    columns = [normalize_column_name(name) for name in export_columns(files[0])]
+    schema = export_schema(columns, load_schema(config.table_name))
+    chunks = plan_chunks(files, config.chunk_bytes)
+
+    start = time.perf_counter()
+    run_dir = tempfile.mkdtemp(prefix='.convert-', dir=os.path.dirname(os.path.abspath(output)))
+    try:
+        # Pass 1: typed, sorted runs (one per chunk)
+        run_paths = [os.path.join(run_dir, f"run-{i:05d}.parquet") for i in range(len(chunks))]
+        tasks = (chunks, run_paths, [schema] * len(chunks), [config] * len(chunks))
+        if config.workers > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(config.workers) as executor:
+                results = list(executor.map(_write_run, *tasks))
+        else:
+            results = list(map(_write_run, *tasks))
+        rows = sum(result[0] for result in results)
+
+        # Dictionary-encode named columns and any string column with few distinct values per run
+        dictionary_columns = [name for name in schema.names if pa.types.is_string(schema.field(name).type) and (
+            name in config.dictionary_columns or all(
+                distinct[name] <= max(1, run_rows * config.dictionary_ratio) for run_rows, distinct in results))]
+
+        # Pass 2: merge the runs window by window into full, globally sorted row groups
+        temporary = f"{output}.tmp"
+        writer = _RowGroupWriter(temporary, schema, dictionary_columns, config)
+        runs = ds.dataset(run_paths, schema=schema, format='parquet')
+        if config.sort_column in schema.names:
+            column_type = schema.field(config.sort_column).type
+            for low, high in _date_windows(run_paths, config.sort_column, config.window_rows):
+                window = runs.to_table(filter=_window_filter(config.sort_column, low, high, column_type))
+                writer.write(window.sort_by([(config.sort_column, 'ascending')]))
+            writer.write(runs.to_table(filter=pc.field(config.sort_column).is_null()))
+        else:
+            writer.write(runs.to_table())
+        writer.close()
+        os.replace(temporary, output)
+    finally:
+        shutil.rmtree(run_dir, ignore_errors=True)
+
+    if writer.rows != rows:
+        raise RuntimeError(f"Converted {writer.rows:,} rows but read {rows:,}")
+    return {'files': len(files), 'rows': rows, 'columns': len(schema), 'dictionary_columns': dictionary_columns,
+            'input_bytes': sum(os.path.getsize(f) for f in files), 'output_bytes': os.path.getsize(output),
+            'seconds': round(time.perf_counter() - start, 3)}
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    parser = argparse.ArgumentParser(description="Convert NCP exports into sorted, typed, dictionary-encoded Parquet")
+    parser.add_argument('inputs', nargs='+', help="Export files (TSV with header or Parquet), directories or globs")
+    parser.add_argument('-o', '--output', required=True, help="Output Parquet file")
+    parser.add_argument('--table', default='transactions', help="schema_config.json table")
+    parser.add_argument('--sort-column', default='transaction_date')
+    parser.add_argument('--row-group-rows', type=int, default=128 * 1024)
+    parser.add_argument('--compression', default='zstd', help="Parquet codec (zstd, snappy, none)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    summary = convert_export(args.inputs, args.output, ConvertConfig(
+        table_name=args.table, sort_column=args.sort_column, row_group_rows=args.row_group_rows,
+        compression=args.compression, workers=args.workers))
+    print(f"Converted {summary['files']} files, {summary['rows']:,} rows x {summary['columns']} columns in "
+          f"{summary['seconds']}s: {summary['input_bytes'] / 1024 ** 2:,.1f} MB -> "
+          f"{summary['output_bytes'] / 1024 ** 2:,.1f} MB ({len(summary['dictionary_columns'])} dictionary columns)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+"""
+Nuvei DWH Platform POC - Merkle Row-Hash Diff
+Streaming parity diff between two silver exports (e.g. Databricks vs Snowflake, TSV or Parquet).
+
+Rows are normalized (column names, null tokens, timestamp and number formatting), hashed, and keyed
+by `transaction_main_id`. Leaf digests are built per (hour of `transaction_date`, key-hash bucket) and
+rolled up into a day -> hour -> bucket Merkle tree. Only buckets whose digests differ are re-read,
+which yields the exact missing, extra and changed rows and the columns that differ.
+
+Memory is bounded by the chunk size and `max_rows_per_pass`, not by the export size; chunks of both
+exports are processed on a process pool.
+
+Usage:
+    python -m shared.ncp_local.diff --left databricks_export/ --right snowflake_export.tsv --json diff.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from shared.ncp_local.columnar import combine_hashes, hash_column, mix64
+from shared.ncp_local.exports import (ExportChunk, column_type, export_columns, expand_paths, is_parquet,
+                                     iter_chunk_batches, normalized_table, plan_chunks)
+from shared.ncp_local.schema import normalize_column_name
+
+UNKNOWN_HOUR = -1
+MAX_PUSHDOWN_RANGES = 256
+
+
+@dataclass
+class DiffConfig:
+    """Settings shared by every stage of the diff"""
+    key_column: str = 'transaction_main_id'
+    date_column: str = 'transaction_date'
+    fanout: int = 64  # key-hash buckets per hour (leaves per hour node)
+    ignore_columns: List[str] = field(default_factory=lambda: ['inserted_at'])
+    ignore_case: bool = False
+    max_examples: int = 1000  # rows reported per category (counts are always exact)
+    max_rows_per_pass: int = 20_000_000  # rows held in memory while resolving differing buckets
+    chunk_bytes: int = 256 << 20
+    workers: int = os.cpu_count() or 1
+
+
+@dataclass
+class ChangedRow:
+    """A key present on both sides whose normalized values differ"""
+    key: str
+    columns: Dict[str, Tuple[Optional[str], Optional[str]]]
+
+
+@dataclass
+class DiffReport:
+    """Outcome of a diff; `left` is the baseline"""
+    left_label: str
+    right_label: str
+    left_rows: int = 0
+    right_rows: int = 0
+    compared_columns: List[str] = field(default_factory=list)
+    left_only_columns: List[str] = field(default_factory=list)
+    right_only_columns: List[str] = field(default_factory=list)
+    leaves_compared: int = 0
+    leaves_differing: int = 0
+    differing_hours: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+    missing_count: int = 0
+    extra_count: int = 0
+    changed_count: int = 0
+    duplicate_keys_left: int = 0
+    duplicate_keys_right: int = 0
+    missing_keys: List[str] = field(default_factory=list)
+    extra_keys: List[str] = field(default_factory=list)
+    changed_rows: List[ChangedRow] = field(default_factory=list)
+    column_mismatch_counts: Dict[str, int] = field(default_factory=dict)
+    elapsed_s: float = 0.0
+
+    @property
+    def is_match(self) -> bool:
+        return (self.missing_count == 0 and self.extra_count == 0 and self.changed_count == 0
+                and not self.left_only_columns and not self.right_only_columns)
+
+
+@dataclass
+class _Side:
+    label: str
+    column_map: Dict[str, str]  # normalized name -> name in the export
+    chunks: List[ExportChunk]
+
+
+# ------------------------------------------------------------------------------------------------
+# Hashing (run inside the workers)
+# ------------------------------------------------------------------------------------------------
+
+def _hour_index(dates: pa.ChunkedArray) -> np.ndarray:
+    """Hours since epoch of the normalized `transaction_date` values (UNKNOWN_HOUR when unparseable)"""
+    hours = pc.utf8_slice_codeunits(dates, 0, 13)
+    valid = pc.match_substring_regex(hours, r'^\d{4}-\d{2}-\d{2} \d{2}$')
+    hours = pc.if_else(valid, pc.binary_join_element_wise(hours, ':00:00', ''), pa.scalar(None, pa.string()))
+    epoch_seconds = pc.cast(pc.cast(hours, pa.timestamp('s')), pa.int64())
+    return (pc.fill_null(pc.divide(epoch_seconds, 3600), UNKNOWN_HOUR)).to_numpy(zero_copy_only=False)
+
+
+def _hash_batch(table: pa.Table, config: DiffConfig, compare_columns: Sequence[str]):
+    """Key hash, row hash and leaf id of every row in a normalized batch"""
+    key_hash = hash_column(table[config.key_column])
+    row_hash = combine_hashes([hash_column(table[c]) for c in compare_columns])
+    bucket = (key_hash % np.uint64(config.fanout)).astype(np.int64)
+    leaf = _hour_index(table[config.date_column]) * config.fanout + bucket
+    return key_hash, row_hash, leaf
+
+
+def _hours_filter(chunk: ExportChunk, date_column: str, leaf_ids: np.ndarray,
+                  fanout: int) -> Optional[ds.Expression]:
+    """
+    Predicate on the raw date column selecting the hours of `leaf_ids`, for Parquet exports whose date
+    column is a zone-less timestamp (sorted, converted exports then skip most row groups). None otherwise.
+    """
+    if not is_parquet(chunk.path):
+        return None
+    date_type = column_type(chunk.path, date_column)
+    if not pa.types.is_timestamp(date_type) or date_type.tz is not None:
+        return None
+    hours = np.unique(leaf_ids // fanout)
+    known = hours[hours != UNKNOWN_HOUR]
+    breaks = np.flatnonzero(np.diff(known) != 1) + 1
+    ranges = [(run[0], run[-1] + 1) for run in np.split(known, breaks) if len(run)]
+    if len(ranges) > MAX_PUSHDOWN_RANGES:
+        return None
+
+    column = pc.field(date_column)
+    condition = column.is_null() if len(known) < len(hours) else None
+    for first, end in ranges:
+        low = pa.scalar(int(first) * 3600, pa.timestamp('s')).cast(date_type)
+        high = pa.scalar(int(end) * 3600, pa.timestamp('s')).cast(date_type)
+        in_range = (column >= low) & (column < high)
+        condition = in_range if condition is None else condition | in_range
+    return condition
+
+
+def _iter_hashed(chunk: ExportChunk, column_map, compare_columns, config, leaf_ids=None):
+    """Normalized batches with their hashes; `leaf_ids` narrows Parquet reads to those leaves' hours"""
+    raw_columns = [column_map[c] for c in compare_columns]
+    row_filter = (_hours_filter(chunk, column_map[config.date_column], leaf_ids, config.fanout)
+                  if leaf_ids is not None else None)
+    for batch in iter_chunk_batches(chunk, raw_columns, row_filter):
+        table = normalized_table(batch, column_map, compare_columns, config.ignore_case)
+        yield (table,) + _hash_batch(table, config, compare_columns)
+
+
+def _digest_chunk(chunk, column_map, compare_columns, config):
+    """Phase 1 worker: per-leaf row counts and order-independent digests for one chunk"""
+    leaves, counts, digests = [], [], []
+    rows = 0
+    for _, key_hash, row_hash, leaf in _iter_hashed(chunk, column_map, compare_columns, config):
+        rows += len(leaf)
+        if not len(leaf):
+            continue
+        with np.errstate(over='ignore'):
+            mixed = mix64(key_hash ^ (row_hash * np.uint64(0x9E3779B97F4A7C15)))
+        order = np.argsort(leaf, kind='stable')
+        sorted_leaf = leaf[order]
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(sorted_leaf)) + 1))
+        leaves.append(sorted_leaf[starts])
+        counts.append(np.diff(np.append(starts, len(sorted_leaf))))
+        with np.errstate(over='ignore'):
+            digests.append(np.add.reduceat(mixed[order], starts))
+    return rows, _merge_leaf_arrays(leaves, counts, digests)
+
+
+def _merge_leaf_arrays(leaves, counts, digests):
+    if not leaves:
+        return np.zeros(0, np.int64), np.zeros(0, np.int64), np.zeros(0, np.uint64)
+    leaves, counts, digests = np.concatenate(leaves), np.concatenate(counts), np.concatenate(digests)
+    unique, inverse = np.unique(leaves, return_inverse=True)
+    merged_counts = np.bincount(inverse, weights=counts, minlength=len(unique)).astype(np.int64)
+    merged_digests = np.zeros(len(unique), np.uint64)
+    with np.errstate(over='ignore'):
+        np.add.at(merged_digests, inverse, digests)
+    return unique, merged_counts, merged_digests
+
+
+def _collect_leaf_rows(chunk, column_map, compare_columns, config, leaf_ids):
+    """Phase 2 worker: (key hash, row hash) of the rows that fall in the differing leaves"""
+    key_hashes, row_hashes = [], []
+    for _, key_hash, row_hash, leaf in _iter_hashed(chunk, column_map, compare_columns, config, leaf_ids):
+        selected = np.isin(leaf, leaf_ids)
+        key_hashes.append(key_hash[selected])
+        row_hashes.append(row_hash[selected])
+    if not key_hashes:
+        return np.zeros(0, np.uint64), np.zeros(0, np.uint64)
+    return np.concatenate(key_hashes), np.concatenate(row_hashes)
+
+
+def _collect_key_rows(chunk, column_map, compare_columns, config, key_hash_set, leaf_ids):
+    """Phase 3 worker: normalized rows for specific key hashes (all within `leaf_ids`)"""
+    rows = []
+    for table, key_hash, _, _ in _iter_hashed(chunk, column_map, compare_columns, config, leaf_ids):
+        selected = np.flatnonzero(np.isin(key_hash, key_hash_set))
+        if len(selected):
+            picked = table.take(pa.array(selected)).to_pylist()
+            rows.extend(zip(key_hash[selected].tolist(), picked))
+    return rows
+
+
+# ------------------------------------------------------------------------------------------------
+# Merkle tree
+# ------------------------------------------------------------------------------------------------
+
+def _node_digests(ids: np.ndarray, counts: np.ndarray, digests: np.ndarray, parent_of) -> Dict[int, int]:
+    """Roll child (id, count, digest) triples up into parent digests; children are combined in id order"""
+    parents: Dict[int, List[Tuple[int, int, int]]] = {}
+    for child_id, count, digest in zip(ids.tolist(), counts.tolist(), digests.tolist()):
+        parents.setdefault(parent_of(child_id), []).append((child_id, count, digest))
+    result = {}
+    for parent_id, children in parents.items():
+        children.sort()
+        child_hashes = combine_hashes([np.array([c[i] for c in children], dtype=np.uint64) for i in range(3)])
+        result[parent_id] = int(combine_hashes([h.reshape(1) for h in child_hashes])[0])
+    return result
+
+
+class MerkleTree:
+    """day -> hour -> key bucket digests over the leaf digests of one export"""
+
+    def __init__(self, leaves: np.ndarray, counts: np.ndarray, digests: np.ndarray, fanout: int):
+        self.fanout = fanout
+        self.leaf = {int(l): (int(c), int(d)) for l, c, d in zip(leaves, counts, digests)}
+        self.hour_counts: Dict[int, int] = {}
+        for leaf_id, (count, _) in self.leaf.items():
+            hour = leaf_id // fanout
+            self.hour_counts[hour] = self.hour_counts.get(hour, 0) + count
+        self.hour = _node_digests(leaves, counts, digests, lambda leaf_id: leaf_id // fanout)
+        hours = np.array(sorted(self.hour), dtype=np.int64)
+        self.day = _node_digests(hours, np.array([self.hour_counts[h] for h in hours.tolist()], np.int64),
+                                 np.array([self.hour[h] for h in hours.tolist()], np.uint64),
+                                 lambda hour: hour // 24 if hour != UNKNOWN_HOUR else UNKNOWN_HOUR)
+        self.root = tuple(sorted(self.day.items()))
+
+
+def _differing_leaves(left: MerkleTree, right: MerkleTree, report: DiffReport) -> List[int]:
+    """Descend only into the subtrees whose digests differ"""
+    if left.root == right.root:
+        return []
+    differing = []
+    for day in sorted(set(left.day) | set(right.day)):
+        if left.day.get(day) == right.day.get(day):
+            continue
+        hours = [h for h in set(left.hour) | set(right.hour)
+                 if (h // 24 if h != UNKNOWN_HOUR else UNKNOWN_HOUR) == day]
+        for hour in sorted(hours):
+            if left.hour.get(hour) == right.hour.get(hour):
+                continue
+            report.differing_hours[_hour_label(hour)] = (left.hour_counts.get(hour, 0),
+                                                          right.hour_counts.get(hour, 0))
+            for bucket in range(left.fanout):
+                leaf_id = hour * left.fanout + bucket
+                if left.leaf.get(leaf_id) != right.leaf.get(leaf_id):
+                    differing.append(leaf_id)
+    return differing
+
+
+def _hour_label(hour: int) -> str:
+    if hour == UNKNOWN_HOUR:
+        return 'unknown'
+    return time.strftime('%Y-%m-%d %H:00', time.gmtime(hour * 3600))
+
+
+# ------------------------------------------------------------------------------------------------
+# Orchestration
+# ------------------------------------------------------------------------------------------------
+
+def _per_key_digests(key_hash: np.ndarray, row_hash: np.ndarray):
+    """Unique keys with their row count and an order-independent digest of their rows"""
+    order = np.argsort(key_hash, kind='stable')
+    sorted_keys = key_hash[order]
+    if not len(sorted_keys):
+        return sorted_keys, np.zeros(0, np.int64), np.zeros(0, np.uint64)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(sorted_keys)) + 1))
+    counts = np.diff(np.append(starts, len(sorted_keys)))
+    with np.errstate(over='ignore'):
+        digests = np.add.reduceat(mix64(row_hash[order]), starts)
+    return sorted_keys[starts], counts, digests
+
+
+class ExportDiff:
+    """Runs the three diff phases over a process pool"""
+
+    def __init__(self, config: DiffConfig):
+        self.config = config
+
+    def _map(self, executor, fn, side: _Side, compare_columns, *args) -> list:
+        tasks = [(chunk, side.column_map, compare_columns, self.config) + args for chunk in side.chunks]
+        if executor is None:
+            return [fn(*task) for task in tasks]
+        return list(executor.map(fn, *zip(*tasks))) if tasks else []
+
+    def run(self, left_paths: Sequence[str], right_paths: Sequence[str],
+            left_label: str = 'databricks', right_label: str = 'snowflake') -> DiffReport:
+        config = self.config
+        start = time.perf_counter()
+        report = DiffReport(left_label, right_label)
+        left, right = self._side(left_label, left_paths), self._side(right_label, right_paths)
+
+        for required in (config.key_column, config.date_column):
+            if required not in left.column_map or required not in right.column_map:
+                raise ValueError(f"Column '{required}' must exist in both exports")
+        ignored = {normalize_column_name(c) for c in config.ignore_columns}
+        compare_columns = sorted((set(left.column_map) & set(right.column_map)) - ignored)
+        report.compared_columns = compare_columns
+        report.left_only_columns = sorted(set(left.column_map) - set(right.column_map) - ignored)
+        report.right_only_columns = sorted(set(right.column_map) - set(left.column_map) - ignored)
+
+        executor = ProcessPoolExecutor(config.workers) if config.workers > 1 else None
+        try:
+            # Phase 1: leaf digests for both exports
+            trees = []
+            for side in (left, right):
+                results = self._map(executor, _digest_chunk, side, compare_columns)
+                rows = sum(r[0] for r in results)
+                merged = _merge_leaf_arrays([r[1][0] for r in results], [r[1][1] for r in results],
+                                            [r[1][2] for r in results])
+                trees.append(MerkleTree(*merged, fanout=config.fanout))
+                if side is left:
+                    report.left_rows = rows
+                else:
+                    report.right_rows = rows
+            left_tree, right_tree = trees
+            report.leaves_compared = len(set(left_tree.leaf) | set(right_tree.leaf))
+
+            # Descend into differing subtrees only
+            differing = _differing_leaves(left_tree, right_tree, report)
+            report.leaves_differing = len(differing)
+            if not differing:
+                return report
+
+            # Phase 2: exact key-level comparison, in passes that keep each key in one pass
+            targets = {'missing': [], 'extra': [], 'changed': []}
+            for leaf_ids in self._passes(differing, left_tree, right_tree):
+                key_sets = []
+                for side in (left, right):
+                    results = self._map(executor, _collect_leaf_rows, side, compare_columns, leaf_ids)
+                    key_hash = np.concatenate([r[0] for r in results]) if results else np.zeros(0, np.uint64)
+                    row_hash = np.concatenate([r[1] for r in results]) if results else np.zeros(0, np.uint64)
+                    key_sets.append(_per_key_digests(key_hash, row_hash))
+                self._reconcile(key_sets[0], key_sets[1], report, targets)
+
+            # Phase 3: fetch the rows behind the first `max_examples` keys of each category
+            self._details(executor, left, right, compare_columns, targets, report,
+                          np.array(differing, dtype=np.int64))
+        finally:
+            if executor is not None:
+                executor.shutdown()
+            report.elapsed_s = round(time.perf_counter() - start, 3)
+        return report
+
+    def _side(self, label: str, paths: Sequence[str]) -> _Side:
+        files = expand_paths(paths)
+        if not files:
+            raise FileNotFoundError(f"No export files found for {label}: {paths}")
+        column_map = {normalize_column_name(c): c for c in export_columns(files[0])}
+        return _Side(label, column_map, plan_chunks(files, self.config.chunk_bytes))
+
+    def _passes(self, differing: List[int], left: MerkleTree, right: MerkleTree) -> Iterable[np.ndarray]:
+        """Group differing leaves by key bucket so each pass stays under max_rows_per_pass"""
+        by_bucket: Dict[int, List[int]] = {}
+        for leaf_id in differing:
+            by_bucket.setdefault(leaf_id % self.config.fanout, []).append(leaf_id)
+        batch, batch_rows = [], 0
+        for bucket in sorted(by_bucket):
+            leaves = by_bucket[bucket]
+            rows = sum(max(left.leaf.get(l, (0, 0))[0], right.leaf.get(l, (0, 0))[0]) for l in leaves)
+            if batch and batch_rows + rows > self.config.max_rows_per_pass:
+                yield np.array(batch, dtype=np.int64)
+                batch, batch_rows = [], 0
+            batch.extend(leaves)
+            batch_rows += rows
+        if batch:
+            yield np.array(batch, dtype=np.int64)
+
+    def _reconcile(self, left_keys, right_keys, report: DiffReport, targets: Dict[str, list]):
+        (l_keys, l_counts, l_digests), (r_keys, r_counts, r_digests) = left_keys, right_keys
+        report.duplicate_keys_left += int((l_counts > 1).sum())
+        report.duplicate_keys_right += int((r_counts > 1).sum())
+
+        missing = np.setdiff1d(l_keys, r_keys, assume_unique=True)
+        extra = np.setdiff1d(r_keys, l_keys, assume_unique=True)
+        _, l_index, r_index = np.intersect1d(l_keys, r_keys, assume_unique=True, return_indices=True)
+        changed_mask = (l_digests[l_index] != r_digests[r_index]) | (l_counts[l_index] != r_counts[r_index])
+        changed = l_keys[l_index][changed_mask]
+
+        for name, keys in (('missing', missing), ('extra', extra), ('changed', changed)):
+            setattr(report, f'{name}_count', getattr(report, f'{name}_count') + len(keys))
+            room = self.config.max_examples - len(targets[name])
+            if room > 0:
+                targets[name].extend(keys[:room].tolist())
+
+    def _details(self, executor, left: _Side, right: _Side, compare_columns, targets, report: DiffReport,
+                 differing: np.ndarray):
+        wanted = np.array(sorted(set(targets['missing']) | set(targets['extra']) | set(targets['changed'])),
+                          dtype=np.uint64)
+        if not len(wanted):
+            return
+        rows = []
+        for side in (left, right):
+            side_rows: Dict[int, dict] = {}
+            for chunk_rows in self._map(executor, _collect_key_rows, side, compare_columns, wanted, differing):
+                for key_hash, row in chunk_rows:
+                    side_rows.setdefault(key_hash, row)
+            rows.append(side_rows)
+        left_rows, right_rows = rows
+
+        key_column = self.config.key_column
+        report.missing_keys = [left_rows[k][key_column] for k in targets['missing'] if k in left_rows]
+        report.extra_keys = [right_rows[k][key_column] for k in targets['extra'] if k in right_rows]
+        for key_hash in targets['changed']:
+            left_row, right_row = left_rows.get(key_hash), right_rows.get(key_hash)
+            if left_row is None or right_row is None:
+                continue
+            columns = {c: (left_row[c], right_row[c]) for c in compare_columns if left_row[c] != right_row[c]}
+            if not columns:
+                continue  # Only duplicate-count differences for this key
+            for c in columns:
+                report.column_mismatch_counts[c] = report.column_mismatch_counts.get(c, 0) + 1
+            report.changed_rows.append(ChangedRow(left_row[key_column], columns))
+        report.column_mismatch_counts = dict(sorted(report.column_mismatch_counts.items(),
+                                                    key=lambda item: -item[1]))
+
+
+def diff_exports(left_paths: Sequence[str], right_paths: Sequence[str], config: Optional[DiffConfig] = None,
+                 left_label: str = 'databricks', right_label: str = 'snowflake') -> DiffReport:
+    """Diff two silver exports (files, directories or globs per side)"""
+    return ExportDiff(config or DiffConfig()).run(left_paths, right_paths, left_label, right_label)
+
+
+def print_report(report: DiffReport, max_rows: int = 20) -> None:
+    left, right = report.left_label, report.right_label
+    print(f"Rows: {left}={report.left_rows:,} {right}={report.right_rows:,} "
+          f"({len(report.compared_columns)} columns compared, {report.elapsed_s}s)")
+    if report.left_only_columns:
+        print(f"Columns only in {left}: {', '.join(report.left_only_columns)}")
+    if report.right_only_columns:
+        print(f"Columns only in {right}: {', '.join(report.right_only_columns)}")
+    print(f"Buckets: {report.leaves_differing:,} of {report.leaves_compared:,} differ")
+    for hour, (left_count, right_count) in list(report.differing_hours.items())[:max_rows]:
+        print(f"  {hour}: {left}={left_count:,} {right}={right_count:,}")
+    print(f"Missing in {right}: {report.missing_count:,} | Extra in {right}: {report.extra_count:,} | "
+          f"Changed: {report.changed_count:,} | Duplicate keys: {left}={report.duplicate_keys_left:,} "
+          f"{right}={report.duplicate_keys_right:,}")
+    for column, count in list(report.column_mismatch_counts.items())[:max_rows]:
+        print(f"  {column}: {count:,} of {len(report.changed_rows):,} inspected changed rows")
+    for row in report.changed_rows[:max_rows]:
+        print(f"  {row.key}: " + ', '.join(f"{c}: {l!r} -> {r!r}" for c, (l, r) in row.columns.items()))
+    print("PARITY: PASS" if report.is_match else "PARITY: FAIL")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merkle row-hash diff of two silver exports")
+    parser.add_argument('--left', nargs='+', required=True, help="Baseline export files/dirs/globs (Databricks)")
+    parser.add_argument('--right', nargs='+', required=True, help="Compared export files/dirs/globs (Snowflake)")
+    parser.add_argument('--left-label', default='databricks')
+    parser.add_argument('--right-label', default='snowflake')
+    parser.add_argument('--key', default='transaction_main_id')
+    parser.add_argument('--date-column', default='transaction_date')
+    parser.add_argument('--ignore-columns', default='inserted_at', help="Comma-separated columns to skip")
+    parser.add_argument('--ignore-case', action='store_true', help="Compare values case-insensitively")
+    parser.add_argument('--fanout', type=int, default=64, help="Key buckets per hour")
+    parser.add_argument('--max-examples', type=int, default=1000)
+    parser.add_argument('--max-rows-per-pass', type=int, default=20_000_000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--json', help="Write the full report as JSON")
+    args = parser.parse_args()
+
+    config = DiffConfig(key_column=args.key, date_column=args.date_column, fanout=args.fanout,
+                        ignore_columns=[c for c in args.ignore_columns.split(',') if c],
+                        ignore_case=args.ignore_case, max_examples=args.max_examples,
+                        max_rows_per_pass=args.max_rows_per_pass, workers=args.workers)
+    report = diff_exports(args.left, args.right, config, args.left_label, args.right_label)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(asdict(report), file, indent=2, default=str)
+    sys.exit(0 if report.is_match else 1)
+
+
+if __name__ == '__main__':
+    main()
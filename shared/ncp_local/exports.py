@@ -0,0 +1,149 @@
+"""
+Nuvei DWH Platform POC - Export Access
+Uniform, chunked access to silver/bronze exports in TSV or Parquet, so tools can split one export
+into independent chunks and process them on several cores.
+"""
+
+import glob
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.fs as fs
+import pyarrow.parquet as pq
+
+from shared.ncp_local.columnar import on_distinct_values
+from shared.ncp_local.tsv import read_header, read_tsv_batches, split_byte_ranges
+
+PARQUET_SUFFIXES = ('.parquet', '.pq')
+
+# Null spellings across the Databricks/Snowflake exports (compared case-insensitively)
+EXPORT_NULL_TOKENS = ['null', 'none', 'nan', '<na>', '']
+
+# Built once: converting Python values to Arrow costs an import probe per call in pyarrow
+_NULL_TOKENS = pa.array(EXPORT_NULL_TOKENS)
+_BOOLEAN_TOKENS = pa.array(['true', 'false'])
+_NULL_STRING = pa.scalar(None, pa.string())
+
+TIMESTAMP_PATTERN = r'^(\d{4}-\d{2}-\d{2})[T ](\d{2}:\d{2}:\d{2}(?:\.\d+)?)(?:Z|[+-]\d{2}:?\d{2})?$'
+
+
+@dataclass(frozen=True)
+class ExportChunk:
+    """An independently readable slice of an export file"""
+    path: str
+    byte_range: Optional[Tuple[int, int]] = None  # TSV: [start, end) on line boundaries
+    row_groups: Optional[Tuple[int, ...]] = None  # Parquet: row groups to read
+
+
+def is_parquet(path: Union[str, Path]) -> bool:
+    return str(path).lower().endswith(PARQUET_SUFFIXES)
+
+
+def expand_paths(paths: Sequence[Union[str, Path]]) -> List[str]:
+    """Expand directories and glob patterns into a sorted list of export files"""
+    files = []
+    for path in paths:
+        path = str(path)
+        if os.path.isdir(path):
+            files.extend(sorted(str(p) for p in Path(path).rglob('*')
+                                if p.is_file() and not p.name.startswith(('.', '_'))))
+        elif any(ch in path for ch in '*?['):
+            files.extend(sorted(glob.glob(path)))
+        else:
+            files.append(path)
+    return files
+
+
+def export_columns(path: Union[str, Path]) -> List[str]:
+    """Column names of an export file (Parquet schema or TSV header)"""
+    if is_parquet(path):
+        return pq.ParquetFile(path).schema_arrow.names
+    return read_header(path)
+
+
+def plan_chunks(paths: Sequence[Union[str, Path]], target_bytes: int = 256 << 20) -> List[ExportChunk]:
+    """Split export files into chunks of roughly `target_bytes` for parallel processing"""
+    chunks = []
+    for path in expand_paths(paths):
+        if is_parquet(path):
+            metadata = pq.ParquetFile(path).metadata
+            group, group_bytes = [], 0
+            for index in range(metadata.num_row_groups):
+                group.append(index)
+                group_bytes += metadata.row_group(index).total_byte_size
+                if group_bytes >= target_bytes:
+                    chunks.append(ExportChunk(path, row_groups=tuple(group)))
+                    group, group_bytes = [], 0
+            if group:
+                chunks.append(ExportChunk(path, row_groups=tuple(group)))
+        else:
+            chunks.extend(ExportChunk(path, byte_range=r) for r in split_byte_ranges(path, target_bytes))
+    return chunks
+
+
+def column_type(path: Union[str, Path], column: str) -> pa.DataType:
+    """Type of a column in an export file (always string for TSV)"""
+    if is_parquet(path):
+        schema = pq.ParquetFile(path).schema_arrow
+        return schema.field(column).type
+    return pa.string()
+
+
+def iter_chunk_batches(chunk: ExportChunk, columns: Optional[List[str]] = None,
+                       row_filter: Optional[ds.Expression] = None) -> Iterator[pa.RecordBatch]:
+    """
+    Read one chunk as record batches (TSV values stay strings), optionally pruned to `columns`.
+
+    `row_filter` is pushed down into Parquet chunks: row groups and pages whose statistics cannot match
+    are not read, and non-matching rows are dropped. TSV chunks ignore it, so callers that need exact
+    filtering must still check the rows they get.
+    """
+    if is_parquet(chunk.path):
+        if row_filter is None:
+            yield from pq.ParquetFile(chunk.path).iter_batches(row_groups=chunk.row_groups, columns=columns)
+            return
+        fragment = ds.ParquetFileFormat().make_fragment(os.path.abspath(chunk.path), fs.LocalFileSystem(),
+                                                        row_groups=chunk.row_groups)
+        yield from fragment.to_batches(columns=columns, filter=row_filter)
+    else:
+        yield from read_tsv_batches(chunk.path, byte_range=chunk.byte_range, include_columns=columns)
+
+
+def normalize_values(values: pa.Array, ignore_case: bool = False) -> pa.Array:
+    """Canonical text for one column so that formatting differences between platforms do not count"""
+    values = pc.utf8_trim(values, characters=' ')
+    lowered = pc.utf8_lower(values)
+    values = pc.if_else(pc.is_in(lowered, _NULL_TOKENS), _NULL_STRING, values)
+    values = pc.if_else(pc.is_in(lowered, _BOOLEAN_TOKENS), lowered, values)
+    # Timestamps: 'T' or ' ' separator, optional zone suffix, trailing fractional zeros
+    values = pc.replace_substring_regex(values, TIMESTAMP_PATTERN, r'\1 \2')
+    values = pc.replace_substring_regex(values, r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d*?)0+$', r'\1')
+    values = pc.replace_substring_regex(values, r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\.$', r'\1')
+    # Decimals: 1.320 -> 1.32, 5.0 -> 5
+    values = pc.replace_substring_regex(values, r'^(-?\d+\.\d*?)0+$', r'\1')
+    values = pc.replace_substring_regex(values, r'^(-?\d+)\.$', r'\1')
+    return pc.utf8_lower(values) if ignore_case else values
+
+
+def normalized_table(batch: pa.RecordBatch, column_map: Dict[str, str], columns: Sequence[str],
+                     ignore_case: bool = False) -> pa.Table:
+    """Select `columns` (normalized names, see schema.normalize_column_name) from a raw batch as normalized text"""
+    normalized = {}
+    for name in columns:
+        values = batch.column(batch.schema.get_field_index(column_map[name]))
+        if pa.types.is_dictionary(values.type):
+            # Dictionary-encoded Parquet columns: normalize each dictionary once, then gather
+            normalized[name] = pa.chunked_array([pc.take(normalize_values(chunk.dictionary.cast(pa.string()),
+                                                                          ignore_case), chunk.indices)
+                                                 for chunk in getattr(values, 'chunks', [values])], pa.string())
+            continue
+        if pa.types.is_timestamp(values.type):
+            values = pc.strftime(values, format='%Y-%m-%d %H:%M:%S')
+        values = values.cast(pa.string())
+        normalized[name] = on_distinct_values(values, lambda v: normalize_values(v, ignore_case))
+    return pa.table(normalized)
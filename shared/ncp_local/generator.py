@@ -0,0 +1,603 @@
+#!/usr/bin/env python3
+"""
+Nuvei DWH Platform POC - Synthetic NCP Transactions Generator
+Generates raw `transactions` drops for load-testing bronze and silver without production extracts.
+
+Files match what `read_data_from_sink` (Databricks) and `00_staging_data_loader.sql` (Snowflake) read:
+tab-delimited, ISO-8859-1, no header, columns in `schema_config.json` order (without `inserted_at`),
+one file per SFTP drop window named like `file2-bpa.STP_BusinessAnalyticsQuery-2025-09-05-0015.txt`.
+
+Values follow the shapes seen in the silver sample: transaction type mix and approval rates, 3DS flows
+that drive the derived status/challenge/frictionless flags, a Zipf-weighted client catalog that
+includes TEST_CLIENTS, 'null'/'NaN'/'-'/'deprecated' tokens, boolean spelling variants and duplicate
+(transaction_main_id, transaction_date) keys within and across drops.
+
+Every drop is generated from its own seed (SeedSequence(seed, drop index, batch index)), so the output
+is identical for any worker count and drops can be produced on a process pool in bounded memory.
+
+Usage:
+    python -m shared.ncp_local.generator -o /data/ncp_drops --start 2025-09-02 --days 7
+    python -m shared.ncp_local.generator -o /data/ncp_drops --target-gb 20 --workers 8
+"""
+
+import argparse
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from shared.ncp_local.columnar import mix64
+from shared.ncp_local.schema import (BOOLEAN_STRING_COLUMN, COLUMNS_TO_FORCE_NULL, TEST_CLIENTS, file_columns,
+                                     load_schema)
+from shared.ncp_local.tsv import write_lines
+
+FILE_PREFIX = 'file2-bpa.STP_BusinessAnalyticsQuery'
+FILE_ENCODING = 'latin-1'  # ISO-8859-1
+
+# Production drops: 36.3M rows over 283 files for Sept 4-6, i.e. ~128K rows every 15 minutes
+DEFAULT_ROWS_PER_FILE = 128_000
+DEFAULT_DROP_MINUTES = 15
+
+ID_BASE = 1110000000860000000
+ID_STRIDE = 10_000_000  # transaction ids reserved per drop
+CARD_ID_BASE = 1110000000030000000
+CONSUMER_ID_BASE = 1110000000080000000
+
+NULL, NAN, DASH = 'null', 'NaN', '-'
+
+# (transaction_type, transaction_type_id, share, approval rate, 3DS step)
+TRANSACTION_TYPES = [
+    ('sale', '1000', 0.24, 0.80, False),
+    ('auth', '1007', 0.17, 0.82, False),
+    ('settle', '1006', 0.16, 0.995, False),
+    ('initauth3d', '1032', 0.15, 0.95, True),
+    ('auth3d', '1019', 0.10, 0.88, True),
+    ('credit', '1004', 0.08, 0.97, False),
+    ('void', '1003', 0.06, 0.99, False),
+    ('verify_auth_3d', '1031', 0.04, 0.90, True),
+]
+FOLLOW_UP_TYPES = {'settle', 'auth3d', 'void', 'credit', 'verify_auth_3d'}  # reference an earlier life cycle
+
+# (3d_flow_status, authentication_flow, 3d_flow, status, acs_res_authentication_status, share)
+THREE_DS_FLOWS = [
+    ('frictionless', 'frictionless', '2', '40', 'y', 0.55),
+    ('frictionless', 'frictionless', '2', '41', 'n', 0.05),
+    ('3d_success', 'challenge', '1', '40', 'c', 0.22),
+    ('3d_failure', 'challenge', '1', '41', 'c', 0.06),
+    ('3d_wasnt_completed', 'challenge', '1', NULL, 'c', 0.05),
+    ('exemption', 'exemption', '3', NULL, NULL, 0.07),
+]
+CHALLENGE_PREFERENCES = [('no_preference', 0.60), ('challenge_requested', 0.15),
+                         ('y_requested_by_acquirer', 0.15), ('no_challenge_requested', 0.10)]
+
+# (decline_reason, provider_response_code, share)
+DECLINES = [('insufficient funds', '51', 0.35), ('do not honor', '05', 0.25), ('suspected fraud', '59', 0.12),
+            ('expired card', '54', 0.08), ('invalid card number', '14', 0.08),
+            ('exceeds withdrawal limit', '61', 0.07), ('issuer unavailable', '129', 0.05)]
+
+# (card_scheme, BIN first digit, processor_id, processor_name, issuer_card_program_id, share)
+CARD_SCHEMES = [
+    ('visa', 4, '103', 'nuvei acquirer - visa', 'vis', 0.55),
+    ('mastercard', 5, '99', 'nuvei acquirer - mastercard', 'dmc', 0.38),
+    ('discover', 6, '383', 'nuvei acquirer - discover diners', NULL, 0.04),
+    ('amex', 3, '412', 'nuvei acquirer - amex', NULL, 0.03),
+]
+
+# (country, is_eea, region, ISO numeric, share)
+COUNTRIES = [
+    ('gb', 'true', 'west europe', 826, 0.24), ('de', 'true', 'west europe', 276, 0.10),
+    ('it', 'true', 'west europe', 380, 0.08), ('gr', 'true', 'west europe', 300, 0.06),
+    ('fr', 'true', 'west europe', 250, 0.06), ('es', 'true', 'west europe', 724, 0.05),
+    ('pl', 'true', 'east europe', 616, 0.04), ('ro', 'true', 'east europe', 642, 0.03),
+    ('ca', 'false', 'north america', 124, 0.09), ('us', 'false', 'north america', 840, 0.07),
+    ('br', 'false', 'latin america', 76, 0.04), ('mx', 'false', 'latin america', 484, 0.03),
+    ('tr', 'false', 'asia', 792, 0.04), ('nz', 'false', 'oceania', 554, 0.03), ('au', 'false', 'oceania', 36, 0.04),
+]
+CURRENCIES = [('gbp', 1.319494, 0.24), ('eur', 1.141045, 0.38), ('usd', 1.0, 0.14), ('cad', 0.7302, 0.09),
+              ('try', 0.024589, 0.04), ('nzd', 0.58772, 0.03), ('brl', 0.1812, 0.04), ('pln', 0.2683, 0.04)]
+
+ISSUER_BANKS = ['santander uk plc', 'bank of scotland plc', 'lloyds bank plc', 'barclays bank plc', 'monzo bank ltd',
+                'revolut ltd', 'nexi payments spa', 'intesa sanpaolo spa', 'national bank of greece s.a.',
+                'piraeus bank s.a.', 'crédit agricole', 'société générale', 'sparkasse köln bonn',
+                'deutsche kreditbank ag', 'caixabank s.a.', 'banco de crédito e inversiones', 'pko bank polski',
+                'banca transilvania', 'royal bank of canada', 'td canada trust', 'jpmorgan chase bank n.a.',
+                'itaú unibanco s.a.', 'dc bkm - ziraatbank', 'kiwibank ltd', 'commonwealth bank of australia']
+CLIENT_WORDS = ['nayax', 'gamart', 'moonpay', 'tangome', 'scrummy', 'e-play24', 'novibet', 'betway', 'skrill',
+                'playtech', 'lottoland', 'kindred', 'zalando', 'bolt', 'wolt', 'glovo', 'ryanair', 'avianca',
+                'müller', 'cañada', 'nordic', 'atlantic', 'pacific', 'summit', 'vertex', 'orbit', 'apex']
+CLIENT_SUFFIXES = ['limited', 'ltd', 'financial services - uk', 'ita ltd', 'cyprus limited', 'gmbh', 's.a.',
+                   'b.v.', 'inc', 'payments']
+INDUSTRY_CODES = ['5499', '7995', '6051', '5815', '5816', '4829', '5734', '5967', '4722', '5311']
+DEVICES = [('apple iphone', 'ios 1.0', 0.45), ('generic android 2.0', 'android 2.0', 0.35),
+           ('apple mac', 'mac os x', 0.10), ('generic windows', 'windows 10', 0.10)]
+USER_AGENTS = ['mozilla/5.0 (iphone; cpu iphone os 17_6_1 like mac os x) applewebkit/605.1.15 (khtml, like gecko) '
+               'mobile/15e148',
+               'mozilla/5.0 (linux; android 14; sm-s918b) applewebkit/537.36 (khtml, like gecko) chrome/128.0.0.0 '
+               'mobile safari/537.36',
+               'mozilla/5.0 (windows nt 10.0; win64; x64) applewebkit/537.36 (khtml, like gecko) chrome/128.0.0.0 '
+               'safari/537.36',
+               'sportsbook/3.40.0,mozilla/5.0 (iphone; cpu iphone os 17_5 like mac os x) applewebkit/605.1.15']
+SCREENS = [('896', '414'), ('844', '390'), ('932', '430'), ('915', '412'), ('1080', '1920'), ('900', '1440')]
+
+# Share of 'true' for the boolean string columns (others default to 'false')
+BOOLEAN_TRUE_SHARE = {'manage_3d_decision': 0.45, 'is_3d': 0.08,
+                      'liability_shift': 0.12, 'is_void': 0.02, 'rebill': 0.06, 'is_prepaid': 0.07,
+                      'is_currency_converted': 0.03, 'mc_scheme_token_used': 0.05, 'is_external_mpi': 0.01}
+BOOLEAN_VARIANT_SHARE = 0.02  # '1'/'0' instead of 'true'/'false' (normalized by fixing_dtypes)
+
+NAN_COLUMNS = ['interaction_counter', 'partial_approval_requested_amount', 'partial_approval_processed_amount',
+               'partial_approval_processed_amount_in_usd', 'FirstInstallment', 'PeriodicalInstallment',
+               'first_installment_usd', 'periodical_installment_usd']
+DASH_COLUMNS = ['partial_approval_void_time', 'request_timestamp_service', 'response_timestamp_service']
+ZERO_COLUMNS = ['IsCardReplaced', 'IsVdcuFeeApplied', 'is_external_scheme_token', 'IsAirline']
+
+_HEX_DIGITS = np.frombuffer(b'0123456789abcdef', dtype=np.uint8)
+
+
+@dataclass
+class GeneratorConfig:
+    """What to generate and where"""
+    output_dir: str
+    start: datetime = datetime(2025, 9, 2)
+    files: int = 96
+    rows_per_file: int = DEFAULT_ROWS_PER_FILE
+    drop_minutes: int = DEFAULT_DROP_MINUTES
+    seed: int = 42
+    duplicate_rate: float = 0.002  # rows repeating a key from earlier in the same drop
+    redelivery_rate: float = 0.001  # rows repeating a key from the previous drop
+    test_client_share: float = 0.01  # share of rows from TEST_CLIENTS (filtered out in silver)
+    batch_rows: int = 65_536
+    workers: int = os.cpu_count() or 1
+
+
+@dataclass
+class DropPlan:
+    """One SFTP drop file"""
+    index: int
+    path: str
+    window_start_ms: int
+    rows: int
+
+
+# ------------------------------------------------------------------------------------------------
+# Planning
+# ------------------------------------------------------------------------------------------------
+
+def _unit_floats(seed: int, a, b) -> np.ndarray:
+    """Deterministic floats in [0, 1) from (seed, a, b) without an RNG stream"""
+    with np.errstate(over='ignore'):
+        keys = (np.asarray(a, dtype=np.uint64) << np.uint64(32)) ^ np.asarray(b, dtype=np.uint64)
+        hashed = mix64(mix64(keys) ^ np.uint64(seed * 0x9E3779B97F4A7C15 % (1 << 64)))
+    return (hashed >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+def plan_drop(config: GeneratorConfig, index: int) -> DropPlan:
+    """Window, name and row count of drop `index`; volume follows a daily curve peaking in the evening"""
+    window_start = config.start + timedelta(minutes=config.drop_minutes * index)
+    hour = window_start.hour + window_start.minute / 60
+    daily = 1 + 0.35 * math.cos(2 * math.pi * (hour - 20) / 24)
+    jitter = 0.9 + 0.2 * float(_unit_floats(config.seed, index, 0xD209))
+    rows = max(1, int(config.rows_per_file * daily * jitter))
+    name = f"{FILE_PREFIX}-{window_start:%Y-%m-%d-%H%M}.txt"
+    window_start_ms = int((window_start - datetime(1970, 1, 1)).total_seconds() * 1000)
+    return DropPlan(index, str(Path(config.output_dir) / name), window_start_ms, rows)
+
+
+def row_keys(config: GeneratorConfig, plan: DropPlan, rows: np.ndarray):
+    """transaction_main_id and transaction_date (epoch ms) of rows in a drop, computable for any row"""
+    ids = ID_BASE + plan.index * ID_STRIDE + rows.astype(np.int64)
+    window_ms = config.drop_minutes * 60_000
+    offsets = (rows + _unit_floats(config.seed, plan.index, rows)) * window_ms / plan.rows
+    return ids, plan.window_start_ms + offsets.astype(np.int64)
+
+
+# ------------------------------------------------------------------------------------------------
+# Value helpers (everything is built as latin-1 binary so the lines are written as-is)
+# ------------------------------------------------------------------------------------------------
+
+def _vocab(values: List[str]) -> pa.Array:
+    return pa.array([v.encode(FILE_ENCODING) for v in values], pa.binary())
+
+
+def _take(values: List[str], indices: np.ndarray) -> pa.Array:
+    return _vocab(values).take(pa.array(indices))
+
+
+def _choice(rng, n: int, weights) -> np.ndarray:
+    weights = np.asarray(weights, dtype=np.float64)
+    return rng.choice(len(weights), size=n, p=weights / weights.sum())
+
+
+def _pick(rng, n: int, options) -> pa.Array:
+    """Sample (value, share) options"""
+    return _take([o[0] for o in options], _choice(rng, n, [o[-1] for o in options]))
+
+
+def _constant(value: str, n: int) -> pa.Array:
+    return pa.repeat(pa.scalar(value.encode(FILE_ENCODING), pa.binary()), n)
+
+
+def _where(mask: np.ndarray, when_true, when_false) -> pa.Array:
+    to_scalar = lambda v: pa.scalar(v.encode(FILE_ENCODING), pa.binary()) if isinstance(v, str) else v
+    return pc.if_else(pa.array(mask), to_scalar(when_true), to_scalar(when_false))
+
+
+def _ints(values: np.ndarray, width: int = 0) -> pa.Array:
+    text = pc.cast(pa.array(values, pa.int64()), pa.string())
+    if width:
+        text = pc.utf8_lpad(text, width, '0')
+    return text.cast(pa.binary())
+
+
+def _decimals(values: np.ndarray, decimals: int = 2) -> pa.Array:
+    return pc.cast(pa.array(np.round(values, decimals)), pa.string()).cast(pa.binary())
+
+
+def _timestamps(epoch_ms: np.ndarray) -> pa.Array:
+    return pc.strftime(pa.array(epoch_ms, pa.timestamp('ms')), format='%Y-%m-%d %H:%M:%S').cast(pa.binary())
+
+
+def _hex(words: np.ndarray, width: int, groups: Optional[List[int]] = None) -> pa.Array:
+    """Hex strings from (n, k) uint64 words, optionally dash-separated into `groups` (UUID layout)"""
+    raw = np.ascontiguousarray(words, dtype=np.uint64).view(np.uint8).reshape(len(words), -1)
+    nibbles = np.empty((len(words), raw.shape[1] * 2), dtype=np.uint8)
+    nibbles[:, 0::2], nibbles[:, 1::2] = raw >> 4, raw & 15
+    chars = _HEX_DIGITS[nibbles[:, :width]]
+    if groups:
+        cuts = np.cumsum(groups)[:-1]
+        chars = np.insert(chars, cuts, ord('-'), axis=1)
+    chars = np.ascontiguousarray(chars)
+    fixed = pa.FixedSizeBinaryArray.from_buffers(pa.binary(chars.shape[1]), len(words),
+                                                 [None, pa.py_buffer(chars.tobytes())])
+    return fixed.cast(pa.binary())
+
+
+def _hash_words(values: np.ndarray, count: int, salt: int) -> np.ndarray:
+    with np.errstate(over='ignore'):
+        base = values.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15) + np.uint64(salt)
+        return np.stack([mix64(base + np.uint64(i)) for i in range(count)], axis=1)
+
+
+def _booleans(rng, true_mask: np.ndarray) -> pa.Array:
+    variant = rng.random(len(true_mask)) < BOOLEAN_VARIANT_SHARE
+    return _take(['false', 'true', '0', '1'], true_mask.astype(np.int64) + 2 * variant)
+
+
+# ------------------------------------------------------------------------------------------------
+# Catalogs (shared by every drop of a seed)
+# ------------------------------------------------------------------------------------------------
+
+@dataclass
+class _Catalogs:
+    client_names: List[str]
+    client_short_names: List[str]
+    client_ids: np.ndarray
+    client_industries: np.ndarray
+    client_websites: np.ndarray
+    client_countries: np.ndarray
+    client_weights: np.ndarray
+    bin_numbers: np.ndarray
+    bin_schemes: np.ndarray
+    bin_countries: np.ndarray
+    bin_banks: np.ndarray
+    bin_debit: np.ndarray
+
+
+@lru_cache(maxsize=4)
+def _catalogs(seed: int, test_client_share: float, clients: int = 2000, bins: int = 5000) -> _Catalogs:
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(0xC47A,)))
+    names, seen = [], set(TEST_CLIENTS)
+    while len(names) < clients:
+        words = rng.choice(CLIENT_WORDS, size=2, replace=False)
+        name = f"{words[0]} {words[1]} {rng.choice(CLIENT_SUFFIXES)}"
+        if len(names) >= len(CLIENT_WORDS):
+            name = f"{name} {rng.integers(2, 99)}"
+        if name not in seen:
+            seen.add(name)
+            names.append(name)
+    # Zipf-like client volumes: a few merchants carry most of the traffic
+    weights = 1 / np.arange(1, clients + 1) ** 1.1
+    weights = weights / weights.sum() * (1 - test_client_share)
+    weights = np.concatenate([weights, np.full(len(TEST_CLIENTS), test_client_share / len(TEST_CLIENTS))])
+    all_names = names + list(TEST_CLIENTS)
+    total = len(all_names)
+
+    scheme = _choice(rng, bins, [s[-1] for s in CARD_SCHEMES])
+    first_digit = np.array([CARD_SCHEMES[s][1] for s in scheme])
+    return _Catalogs(
+        client_names=[f"{n} multi" if not n.endswith(' multi') else n for n in all_names],
+        client_short_names=[n[:-len(' multi')] if n.endswith(' multi') else n for n in all_names],
+        client_ids=rng.choice(np.arange(16_000, 260_000_000, 997), size=total, replace=False),
+        client_industries=rng.integers(0, len(INDUSTRY_CODES), total),
+        client_websites=rng.integers(100_000, 260_000, total),
+        client_countries=_choice(rng, total, [c[-1] for c in COUNTRIES]),
+        client_weights=weights,
+        bin_numbers=first_digit * 100_000 + rng.integers(0, 100_000, bins),
+        bin_schemes=scheme,
+        bin_countries=_choice(rng, bins, [c[-1] for c in COUNTRIES]),
+        bin_banks=rng.integers(0, len(ISSUER_BANKS), bins),
+        bin_debit=rng.random(bins) < 0.7,
+    )
+
+
+# ------------------------------------------------------------------------------------------------
+# Rows
+# ------------------------------------------------------------------------------------------------
+
+def generate_batch(config: GeneratorConfig, plan: DropPlan, batch_index: int, start_row: int, n: int,
+                   columns: List[str]) -> List[pa.Array]:
+    """Columns (latin-1 binary, file order) of rows [start_row, start_row + n) of a drop"""
+    rng = np.random.default_rng(np.random.SeedSequence(config.seed, spawn_key=(plan.index, batch_index)))
+    catalogs = _catalogs(config.seed, config.test_client_share)
+    rows = np.arange(start_row, start_row + n, dtype=np.int64)
+    ids, dates = row_keys(config, plan, rows)
+
+    # Duplicate keys: repeats of earlier rows of this drop, and late re-deliveries of the previous drop
+    duplicates = np.flatnonzero(rng.random(n) < config.duplicate_rate)
+    duplicates = duplicates[rows[duplicates] > 0]
+    if len(duplicates):
+        sources = (rng.random(len(duplicates)) * rows[duplicates]).astype(np.int64)
+        ids[duplicates], dates[duplicates] = row_keys(config, plan, sources)
+    if plan.index > 0:
+        redelivered = np.flatnonzero(rng.random(n) < config.redelivery_rate)
+        if len(redelivered):
+            previous = plan_drop(config, plan.index - 1)
+            sources = previous.rows - 1 - (rng.random(len(redelivered)) * min(previous.rows, 5000)).astype(np.int64)
+            ids[redelivered], dates[redelivered] = row_keys(config, previous, sources)
+
+    values: Dict[str, pa.Array] = {}
+    values['transaction_main_id'] = _ints(ids)
+    values['transaction_date'] = _timestamps(dates)
+
+    # Transaction type, result and life cycle
+    txn = _choice(rng, n, [t[2] for t in TRANSACTION_TYPES])
+    txn_type = np.array([t[0] for t in TRANSACTION_TYPES])[txn]
+    approved = rng.random(n) < np.array([t[3] for t in TRANSACTION_TYPES])[txn]
+    values['transaction_type'] = _take([t[0] for t in TRANSACTION_TYPES], txn)
+    values['transaction_type_id'] = _take([t[1] for t in TRANSACTION_TYPES], txn)
+    errored = ~approved & (rng.random(n) < 0.05)
+    values['transaction_result_id'] = _take(['1008', '1006', '1009'], approved + 2 * errored)
+    values['final_transaction_status'] = _where(approved, '1', '0')
+
+    follow_up = np.isin(txn_type, list(FOLLOW_UP_TYPES))
+    life_cycle_ids = np.where(follow_up, ids - rng.integers(1, 5000, n), ids)
+    life_cycle_dates = np.where(follow_up, dates - rng.integers(1_000, 600_000, n), dates)
+    values['transaction_id_life_cycle'] = _ints(life_cycle_ids)
+    values['transaction_date_life_cycle'] = _timestamps(life_cycle_dates)
+    values['gateway_id'] = _where(rng.random(n) < 0.4, _ints(life_cycle_ids), '0')
+
+    decline = _choice(rng, n, [d[-1] for d in DECLINES])
+    values['decline_reason'] = _where(approved | errored, NULL, _take([d[0] for d in DECLINES], decline))
+    response_codes = _where(approved, '00', _take([d[1] for d in DECLINES], decline))
+    values['provider_response_code'] = _where(rng.random(n) < 0.35, NULL, response_codes)
+
+    # 3DS: the 3DS steps always, plus 3DS sales/auths
+    sale_or_auth = np.isin(txn_type, ['sale', 'auth'])
+    sale_3d = sale_or_auth & (rng.random(n) < 0.15)
+    three_ds = np.array([t[4] for t in TRANSACTION_TYPES])[txn] | sale_3d
+    flow = _choice(rng, n, [f[-1] for f in THREE_DS_FLOWS])
+    for position, column in enumerate(['3d_flow_status', 'authentication_flow', '3d_flow', 'status',
+                                       'acs_res_authentication_status']):
+        values[column] = _where(three_ds, _take([f[position] for f in THREE_DS_FLOWS], flow), NULL)
+    is_challenge = three_ds & np.isin(flow, [2, 3, 4])
+    values['acs_url'] = _where(is_challenge, _take([f"https://acs{i}.3dsecure.net/challenge" for i in range(8)],
+                                                   rng.integers(0, 8, n)), NULL)
+    preference = _pick(rng, n, CHALLENGE_PREFERENCES)
+    values['challenge_preference'] = _where(three_ds | (rng.random(n) < 0.4), preference, NULL)
+    values['preference_reason'] = _where(three_ds, _take(['0', '8', '12', '13'], rng.integers(0, 4, n)), NULL)
+    values['three_ds_method_indication'] = _where(three_ds, _take(['y', 'u', 'n'], rng.integers(0, 3, n)), NULL)
+    values['three_ds_protocol_version'] = _where(three_ds, '2', NULL)
+    values['message_version_3d'] = _where(three_ds, _take(['2.2.0', '2.1.0'], (rng.random(n) < 0.2).astype(int)),
+                                          NULL)
+    values['three_ds_server_trans_id'] = _where(three_ds, _hex(_hash_words(ids, 2, 0x3D5), 32, [8, 4, 4, 4, 12]),
+                                                NULL)
+    values['threed_eci'] = _where(three_ds & approved, _take(['05', '02', '07'], rng.integers(0, 3, n)), NULL)
+    values['is_sale_3d'] = _where(sale_or_auth | three_ds, _booleans(rng, sale_3d | np.isin(txn_type, ['auth3d'])),
+                                  NULL)
+    values['manage_3d_decision'] = _where(sale_or_auth | three_ds,
+                                          _booleans(rng, rng.random(n) < BOOLEAN_TRUE_SHARE['manage_3d_decision']),
+                                          NULL)
+    values['is_cascaded_after_data_only_authentication'] = _where(three_ds | sale_or_auth, '0', NULL)
+    values['next_action'] = _where(three_ds & (rng.random(n) < 0.1), '2', NULL)
+
+    # Device / browser (3DS browser flows carry device data)
+    device = _choice(rng, n, [d[-1] for d in DEVICES])
+    browser = three_ds & (rng.random(n) < 0.85)
+    values['device_type'] = _where(three_ds, _take(['1', '2'], (device >= 2).astype(int)), '4')
+    values['device_name'] = _where(three_ds, _take([d[0] for d in DEVICES], device), NULL)
+    values['device_os'] = _where(three_ds, _take([d[1] for d in DEVICES], device), NULL)
+    values['device_channel'] = _where(three_ds, _where(browser, '02', '01'), NULL)
+    values['device_channel_name'] = _where(three_ds, _where(browser, 'browser', 'app'), NULL)
+    values['challenge_window_size'] = _where(browser, _take(['01', '02', '03', '04', '05'],
+                                                             _choice(rng, n, [6, 1, 1, 1, 1])), NULL)
+    values['browser_user_agent'] = _where(browser, _take(USER_AGENTS, rng.integers(0, len(USER_AGENTS), n)), NULL)
+    screen = rng.integers(0, len(SCREENS), n)
+    values['browser_screen_height'] = _where(browser, _take([s[0] for s in SCREENS], screen), NULL)
+    values['browser_screen_width'] = _where(browser, _take([s[1] for s in SCREENS], screen), NULL)
+
+    # Client
+    client = rng.choice(len(catalogs.client_weights), size=n, p=catalogs.client_weights)
+    client_ids = catalogs.client_ids[client]
+    values['multi_client_id'] = _ints(client_ids)
+    values['client_id'] = _ints(client_ids + 1)
+    values['multi_client_name'] = _take(catalogs.client_names, client)
+    values['client_name'] = _take(catalogs.client_short_names, client)
+    values['industry_code'] = _take(INDUSTRY_CODES, catalogs.client_industries[client])
+    values['website_id'] = _where(rng.random(n) < 0.8, _ints(catalogs.client_websites[client]), NULL)
+    client_country = catalogs.client_countries[client]
+    values['merchant_country'] = _take([c[0] for c in COUNTRIES], client_country)
+    values['MerchantCountryCodeNum'] = _ints(np.array([c[3] for c in COUNTRIES])[client_country])
+
+    # Card, BIN and issuer (a card always maps to the same BIN)
+    card_ids = CARD_ID_BASE + (rng.pareto(1.2, n) * 2_000_000).astype(np.int64) % 200_000_000
+    bin_index = card_ids % len(catalogs.bin_numbers)
+    scheme = catalogs.bin_schemes[bin_index]
+    country = catalogs.bin_countries[bin_index]
+    values['credit_card_id'] = _ints(card_ids)
+    values['cc_hash'] = _hex(_hash_words(card_ids, 3, 0xCC), 40)
+    values['bin'] = _ints(catalogs.bin_numbers[bin_index])
+    values['AcquirerBin'] = _ints(catalogs.bin_numbers[(bin_index * 7) % len(catalogs.bin_numbers)])
+    values['card_scheme'] = _take([s[0] for s in CARD_SCHEMES], scheme)
+    values['processor_id'] = _take([s[2] for s in CARD_SCHEMES], scheme)
+    values['processor_name'] = _take([s[3] for s in CARD_SCHEMES], scheme)
+    values['issuer_card_program_id'] = _take([s[4] for s in CARD_SCHEMES], scheme)
+    values['card_type'] = _where(catalogs.bin_debit[bin_index], 'debit', 'credit')
+    values['issuer_bank_name'] = _take(ISSUER_BANKS, catalogs.bin_banks[bin_index])
+    values['bin_country'] = _take([c[0] for c in COUNTRIES], country)
+    values['is_eea'] = _booleans(rng, np.array([c[1] == 'true' for c in COUNTRIES])[country])
+    values['IsPSD2'] = _ints(np.array([c[1] == 'true' for c in COUNTRIES], dtype=np.int64)[country])
+    values['region'] = _take([c[2] for c in COUNTRIES], country)
+    values['AcquirerBinCountryId'] = _ints(np.array([c[3] for c in COUNTRIES])[client_country])
+    values['ip_country'] = _where(rng.random(n) < 0.2, values['bin_country'], NULL)
+    values['cccid'] = _ints(_choice(rng, n, [40, 30, 10, 8, 6, 6]) + 1)
+    values['RequestedCCCID'] = values['cccid']
+    expiry_month, expiry_year = rng.integers(1, 13, n), rng.integers(25, 32, n)
+    values['exp_date'] = pc.binary_join_element_wise(_ints(expiry_month, 2), _ints(expiry_year, 2),
+                                                     b'-01-01 00:00:00', b'')
+    values['cc_seniority_start_date'] = _timestamps(dates - (rng.exponential(400, n) * 86_400_000).astype(np.int64))
+    values['consumer_id'] = _ints(CONSUMER_ID_BASE + rng.integers(0, 50_000_000, n))
+
+    # Amounts
+    currency = _choice(rng, n, [c[-1] for c in CURRENCIES])
+    rates = np.array([c[1] for c in CURRENCIES])[currency]
+    original_amount = np.round(np.exp(rng.normal(3.3, 1.3, n)), 2)
+    values['currency_code'] = _take([c[0] for c in CURRENCIES], currency)
+    values['original_currency_amount'] = _decimals(original_amount)
+    values['rate_usd'] = _decimals(rates, 6)
+    values['amount_in_usd'] = _decimals(original_amount * rates)
+    settled = approved & np.isin(txn_type, ['settle', 'sale'])
+    values['approved_amount_in_usd'] = _where(settled, values['amount_in_usd'], NAN)
+
+    # Application, risk and routing
+    values['payment_instrument'] = _pick(rng, n, [('cc', 0.85), ('apple pay', 0.10), ('google pay', 0.05)])
+    values['source_application'] = _pick(rng, n, [('web cashier', 0.4), ('safecharge rest api', 0.35),
+                                                  ('direct cc', 0.2), ('mobile sdk', 0.05)])
+    values['channel'] = _where(rng.random(n) < 0.8, '1', '3')
+    values['cc_request_type_id'] = _where(rng.random(n) < 0.6, '1', '2')
+    values['credit_type_id'] = _where(rng.random(n) < 0.9, '0', '1')
+    values['transaction_duration'] = _ints(np.exp(rng.normal(6.2, 0.8, n)).astype(np.int64))
+    has_risk = rng.random(n) < 0.5
+    values['risk_email_id'] = _where(has_risk, _ints(rng.integers(1_000_000_000, 1_700_000_000, n)), NULL)
+    values['email_payment_attempts'] = _where(has_risk, _ints(rng.poisson(0.4, n)), NAN)
+    values['final_fraud_decision_id'] = _where(has_risk, '3', NULL)
+    values['risk_threed_eci'] = _where(has_risk, _take(['2', '5', '7'], rng.integers(0, 3, n)), NULL)
+    values['email_seniority_start_date'] = _where(
+        has_risk, _timestamps(dates - (rng.exponential(900, n) * 86_400_000).astype(np.int64)), DASH)
+    values['avs_code'] = _where(rng.random(n) < 0.1, _take(['u', 'y', 'n', 'a'], rng.integers(0, 4, n)), NULL)
+    values['stored_credentials_mode'] = _where(rng.random(n) < 0.3, '1', NULL)
+    values['upo_id'] = _where(rng.random(n) < 0.4, _ints(rng.integers(1_000_000_000, 9_999_999_999, n)), '0')
+    token = rng.random(n) < 0.05
+    values['scheme_token_fetching_result'] = _where(token, 'active', NULL)
+    values['token_unique_reference_service'] = _where(token, _hex(_hash_words(card_ids, 2, 0x70C), 32), NULL)
+    values['api_type_service'] = _where(token, '1', NULL)
+    values['is_cryptogram_fetching_skipped'] = _where(token, '1', NULL)
+    values['request_timestamp_service'] = _where(token, _timestamps(dates + 73), DASH)
+    values['response_timestamp_service'] = _where(token, _timestamps(dates + 76), DASH)
+    values['mc_scheme_token_used'] = _booleans(rng, token)
+    values['IsOnlineRefund'] = _where(txn_type == 'credit', '1', '0')
+    values['IsNoCVV'] = _where(rng.random(n) < 0.03, '1', '0')
+    values['IsSupportedOCT'] = _where(rng.random(n) < 0.6, '1', '0')
+    values['IsSCAScope'] = _where(three_ds, '1', '0')
+
+    for column, share in BOOLEAN_TRUE_SHARE.items():
+        if column not in values:
+            values[column] = _booleans(rng, rng.random(n) < share)
+
+    return [values[c] if c in values else _default_column(c, n) for c in columns]
+
+
+def _default_column(column: str, n: int) -> pa.Array:
+    """Token-only columns: 'NaN' numerics, '-' timestamps, 'deprecated' payloads, otherwise 'null'"""
+    if column in NAN_COLUMNS:
+        return _constant(NAN, n)
+    if column in DASH_COLUMNS:
+        return _constant(DASH, n)
+    if column in ZERO_COLUMNS:
+        return _constant('0', n)
+    if column in COLUMNS_TO_FORCE_NULL and column != 'authorization_req_duration':
+        return _constant('deprecated', n)
+    if column in BOOLEAN_STRING_COLUMN:
+        return _constant('false' if column not in ('is_partial_amount', 'partial_approval_is_void') else NULL, n)
+    return _constant(NULL, n)
+
+
+def write_drop(config: GeneratorConfig, index: int) -> Dict:
+    """Generate one drop file batch by batch; returns its path, rows and bytes"""
+    plan = plan_drop(config, index)
+    columns = file_columns(load_schema('transactions'))
+    start = time.perf_counter()
+    with open(plan.path, 'wb') as file:
+        for batch_index, start_row in enumerate(range(0, plan.rows, config.batch_rows)):
+            n = min(config.batch_rows, plan.rows - start_row)
+            arrays = generate_batch(config, plan, batch_index, start_row, n, columns)
+            write_lines(file, pa.chunked_array([pc.binary_join_element_wise(*arrays, b'\t')]))
+    return {'path': plan.path, 'rows': plan.rows, 'bytes': os.path.getsize(plan.path),
+            'seconds': round(time.perf_counter() - start, 3)}
+
+
+def generate(config: GeneratorConfig) -> List[Dict]:
+    """Write all drops of a config, on a process pool when `workers` > 1"""
+    Path(config.output_dir).mkdir(parents=True, exist_ok=True)
+    indexes = range(config.files)
+    if config.workers > 1 and config.files > 1:
+        with ProcessPoolExecutor(config.workers) as executor:
+            return list(executor.map(write_drop, [config] * config.files, indexes))
+    return [write_drop(config, index) for index in indexes]
+
+
+def estimate_bytes_per_row(config: GeneratorConfig, sample_rows: int = 20_000) -> float:
+    """Average line size, measured on a generated sample"""
+    plan = DropPlan(0, '', plan_drop(config, 0).window_start_ms, sample_rows)
+    columns = file_columns(load_schema('transactions'))
+    lines = pc.binary_join_element_wise(*generate_batch(config, plan, 0, 0, sample_rows, columns), b'\t')
+    return (pc.sum(pc.binary_length(lines)).as_py() + sample_rows) / sample_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic raw NCP transactions drops")
+    parser.add_argument('-o', '--output-dir', required=True)
+    parser.add_argument('--start', default='2025-09-02', help="First drop window (YYYY-MM-DD[THH:MM])")
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument('--files', type=int, help="Number of drops")
+    size.add_argument('--days', type=float, help="Days of drops (96 per day at 15-minute drops)")
+    size.add_argument('--target-gb', type=float, help="Approximate total size to generate")
+    parser.add_argument('--rows-per-file', type=int, default=DEFAULT_ROWS_PER_FILE, help="Average rows per drop")
+    parser.add_argument('--drop-minutes', type=int, default=DEFAULT_DROP_MINUTES)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--duplicate-rate', type=float, default=0.002)
+    parser.add_argument('--redelivery-rate', type=float, default=0.001)
+    parser.add_argument('--test-client-share', type=float, default=0.01)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    config = GeneratorConfig(output_dir=args.output_dir, start=datetime.fromisoformat(args.start),
+                             rows_per_file=args.rows_per_file, drop_minutes=args.drop_minutes, seed=args.seed,
+                             duplicate_rate=args.duplicate_rate, redelivery_rate=args.redelivery_rate,
+                             test_client_share=args.test_client_share, workers=args.workers)
+    if args.files:
+        config.files = args.files
+    elif args.days:
+        config.files = max(1, round(args.days * 24 * 60 / args.drop_minutes))
+    elif args.target_gb:
+        bytes_per_file = estimate_bytes_per_row(config) * args.rows_per_file
+        config.files = max(1, round(args.target_gb * 1024 ** 3 / bytes_per_file))
+
+    start = time.perf_counter()
+    results = generate(config)
+    elapsed = time.perf_counter() - start
+    rows, size_bytes = sum(r['rows'] for r in results), sum(r['bytes'] for r in results)
+    print(f"Generated {len(results)} drops, {rows:,} rows, {size_bytes / 1024 ** 3:.2f} GiB in {elapsed:.1f}s "
+          f"({rows / elapsed:,.0f} rows/s) -> {config.output_dir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Nuvei DWH Platform POC - Local Bronze Ingestion
+Spark-free equivalent of `read_data_from_sink` + the bronze append for small tables and local tests.
+
+Files are read with the same options as the Databricks Auto Loader stream (tab delimiter, '"' quote and
+escape, no header, ISO-8859-1, no multi-line values) through memory-mapped byte ranges, typed with the
+SchemaManager type mapping (permissive: unparseable values become null) and written as one Parquet
+file per source file with `source_file_name` and `inserted_at` added.
+
+Malformed rows (wrong column count, undecodable bytes, unparseable typed fields) are quarantined to
+`<output>/_quarantine/<file name>.parquet` with their byte offset and reason; valid rows proceed.
+
+A file-level checkpoint records every ingested file with its reject counters; re-runs skip files whose
+path, size and modification time are unchanged and re-ingest overwritten ones
+(`cloudFiles.allowOverwrites`). A file that cannot be read is reported and retried on the next run
+without holding back the other files.
+
+Usage:
+    python -m shared.ncp_local.ingest /data/ncp_drops -o /data/bronze
+    python -m shared.ncp_local.ingest '/data/ncp_drops/*2025-09-05*' -o /data/bronze --workers 4
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from shared.ncp_local.exports import expand_paths
+from shared.ncp_local.quarantine import FileQuarantine
+from shared.ncp_local.schema import arrow_schema, arrow_type, file_columns, load_schema
+from shared.ncp_local.tsv import cast_batch, read_tsv_batches, split_byte_ranges
+
+logger = logging.getLogger(__name__)
+
+# read_data_from_sink options (bronze_auto_loader.py)
+SINK_ENCODING = 'ISO-8859-1'
+# Spark's CSV reader only treats empty fields as null; 'null'/'NaN'/'-' tokens stay strings in bronze
+SINK_NULL_VALUES = ['']
+
+SOURCE_FILE_COLUMN = 'source_file_name'
+CHECKPOINT_FILE = 'ingested_files.jsonl'
+QUARANTINE_DIR = '_quarantine'
+
+
+@dataclass
+class IngestedFile:
+    """Checkpoint entry for one source file"""
+    path: str
+    size: int
+    modified: float
+    rows: int
+    output: str
+    ingested_at: str
+    seconds: float
+    rejected_rows: int = 0
+    rejects: Dict[str, int] = field(default_factory=dict)
+    quarantine: Optional[str] = None
+
+
+class FileCheckpoint:
+    """Append-only JSON-lines log of ingested files; the last entry per path wins"""
+
+    def __init__(self, checkpoint_dir):
+        self.path = Path(checkpoint_dir) / CHECKPOINT_FILE
+        self.entries: Dict[str, IngestedFile] = {}
+        if self.path.exists():
+            with open(self.path) as file:
+                for line in file:
+                    if line.strip():
+                        entry = IngestedFile(**json.loads(line))
+                        self.entries[entry.path] = entry
+
+    def is_ingested(self, path: str) -> bool:
+        entry = self.entries.get(os.path.abspath(path))
+        if entry is None:
+            return False
+        stat = os.stat(path)
+        return entry.size == stat.st_size and entry.modified == stat.st_mtime
+
+    def commit(self, entry: IngestedFile) -> None:
+        """Record a file once its output is in place (durable before the next file is reported done)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a') as file:
+            file.write(json.dumps(asdict(entry)) + '\n')
+            file.flush()
+            os.fsync(file.fileno())
+        self.entries[entry.path] = entry
+
+
+def bronze_schema(schema_dict: Dict[str, str]) -> pa.Schema:
+    """File columns typed with the schema, then source_file_name and inserted_at (bronze column order)"""
+    schema = arrow_schema(schema_dict)
+    fields = [schema.field(name) for name in file_columns(schema_dict)]
+    fields.append(pa.field(SOURCE_FILE_COLUMN, pa.string()))
+    fields.extend(schema.field(name) for name in schema_dict if name not in file_columns(schema_dict))
+    return pa.schema(fields)
+
+
+def read_bronze_batches(path: str, schema_dict: Dict[str, str], inserted_at: Optional[datetime] = None,
+                        chunk_bytes: int = 64 << 20, block_size: int = 4 << 20,
+                        quarantine: Optional[FileQuarantine] = None) -> Iterator[pa.RecordBatch]:
+    """
+    Stream one raw file as typed bronze record batches. The file is split into newline-aligned,
+    memory-mapped ranges of `chunk_bytes`, each parsed in `block_size` blocks. Malformed rows go to
+    `quarantine`; without one, a row with the wrong column count raises.
+    """
+    columns = file_columns(schema_dict)
+    typed_columns = [name for name in columns if not pa.types.is_string(arrow_type(schema_dict[name]))]
+    schema = bronze_schema(schema_dict)
+    inserted_at = inserted_at or datetime.now(timezone.utc).replace(tzinfo=None)
+    file_name = os.path.basename(path)
+    for byte_range in split_byte_ranges(path, chunk_bytes, has_header=False):
+        scan = quarantine.range(byte_range) if quarantine is not None else None
+        for batch in read_tsv_batches(path, column_names=columns, null_values=SINK_NULL_VALUES,
+                                      encoding=SINK_ENCODING, block_size=block_size, byte_range=byte_range,
+                                      invalid_row_handler=scan.on_invalid_row if scan else None):
+            table = cast_batch(batch, schema_dict)
+            if scan is not None:
+                table = scan.filter_batch(batch, table, typed_columns)
+            table = table.append_column(SOURCE_FILE_COLUMN, pa.repeat(pa.scalar(file_name), table.num_rows))
+            for name in schema.names[len(columns) + 1:]:
+                table = table.append_column(name, pa.repeat(pa.scalar(inserted_at, schema.field(name).type),
+                                                            table.num_rows))
+            yield from table.cast(schema).to_batches()
+
+
+def ingest_file(path: str, output_dir: str, schema_dict: Dict[str, str], inserted_at: datetime,
+                chunk_bytes: int = 64 << 20, compression: str = 'snappy') -> IngestedFile:
+    """
+    Write one source file as `<output_dir>/<file name>.parquet` and its rejects, if any, as
+    `<output_dir>/_quarantine/<file name>.parquet` (both atomically, via temporary files)
+    """
+    start = time.perf_counter()
+    stat = os.stat(path)
+    output = Path(output_dir) / f"{os.path.basename(path)}.parquet"
+    quarantine_output = Path(output_dir) / QUARANTINE_DIR / output.name
+    temporary = output.with_name(f".{output.name}.tmp")
+    rows = 0
+    try:
+        with FileQuarantine(path) as quarantine, \
+                pq.ParquetWriter(temporary, bronze_schema(schema_dict), compression=compression) as writer:
+            for batch in read_bronze_batches(path, schema_dict, inserted_at, chunk_bytes, quarantine=quarantine):
+                writer.write_batch(batch)
+                rows += batch.num_rows
+    except BaseException:
+        temporary.unlink(missing_ok=True)
+        raise
+
+    # A re-ingested (overwritten) file replaces its previous rejects
+    if quarantine.rejects:
+        quarantine_output.parent.mkdir(parents=True, exist_ok=True)
+        quarantine_temporary = quarantine_output.with_name(f".{quarantine_output.name}.tmp")
+        pq.write_table(quarantine.to_table(), quarantine_temporary)
+        os.replace(quarantine_temporary, quarantine_output)
+        logger.warning(f"Quarantined {len(quarantine.rejects):,} rows of {os.path.basename(path)}: "
+                       f"{quarantine.counts}")
+    else:
+        quarantine_output.unlink(missing_ok=True)
+    os.replace(temporary, output)
+    return IngestedFile(path=os.path.abspath(path), size=stat.st_size, modified=stat.st_mtime, rows=rows,
+                        output=str(output), ingested_at=inserted_at.isoformat(),
+                        seconds=round(time.perf_counter() - start, 3), rejected_rows=len(quarantine.rejects),
+                        rejects=quarantine.counts,
+                        quarantine=str(quarantine_output) if quarantine.rejects else None)
+
+
+def ingest_files(inputs: Sequence[str], output_dir: str, checkpoint_dir: Optional[str] = None,
+                 table_name: str = 'transactions', workers: int = os.cpu_count() or 1,
+                 chunk_bytes: int = 64 << 20, compression: str = 'snappy') -> List[IngestedFile]:
+    """
+    Ingest new or changed files into `output_dir`. One `inserted_at` is used for the whole run, like a
+    single Auto Loader trigger. Returns the files ingested by this run; files that fail are logged,
+    left out of the checkpoint and retried on the next run.
+    """
+    schema_dict = load_schema(table_name)
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    checkpoint = FileCheckpoint(checkpoint_dir or Path(output_dir) / '_checkpoint')
+    pending = [path for path in expand_paths(inputs) if not checkpoint.is_ingested(path)]
+    inserted_at = datetime.now(timezone.utc).replace(tzinfo=None)
+
+    ingested = []
+    # Arrow parsing and Parquet encoding release the GIL, so files are ingested on threads
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = [executor.submit(ingest_file, path, output_dir, schema_dict, inserted_at, chunk_bytes,
+                                   compression) for path in pending]
+        for path, future in zip(pending, futures):
+            try:
+                entry = future.result()
+            except Exception as error:  # one bad file must not stop the others
+                logger.error(f"Failed to ingest {path}, it will be retried on the next run: {error}")
+                continue
+            checkpoint.commit(entry)
+            ingested.append(entry)
+            logger.info(f"Ingested {entry.rows:,} rows from {os.path.basename(entry.path)} in {entry.seconds}s"
+                        + (f" ({entry.rejected_rows:,} quarantined)" if entry.rejected_rows else ""))
+    return ingested
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    parser = argparse.ArgumentParser(description="Ingest raw NCP drops into local bronze Parquet files")
+    parser.add_argument('inputs', nargs='+', help="Source files, directories or globs")
+    parser.add_argument('-o', '--output-dir', required=True)
+    parser.add_argument('--checkpoint', help="Checkpoint directory (default: <output-dir>/_checkpoint)")
+    parser.add_argument('--table', default='transactions', help="schema_config.json table")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-mb', type=int, default=64, help="Memory-mapped range size per parse")
+    parser.add_argument('--compression', default='snappy', help="Parquet codec (snappy, zstd, none)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    ingested = ingest_files(args.inputs, args.output_dir, args.checkpoint, args.table, args.workers,
+                            args.chunk_mb << 20, args.compression)
+    elapsed = time.perf_counter() - start
+    rows, size_bytes = sum(f.rows for f in ingested), sum(f.size for f in ingested)
+    rejected = sum(f.rejected_rows for f in ingested)
+    print(f"Ingested {len(ingested)} files, {rows:,} rows, {size_bytes / 1024 ** 2:,.0f} MB in {elapsed:.1f}s "
+          f"({size_bytes / 1024 ** 2 / max(elapsed, 1e-9):,.0f} MB/s), {rejected:,} rows quarantined")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""
+Nuvei DWH Platform POC - Export Key Index
+Sorted, memory-mapped `transaction_main_id` -> (file, offset) index over bronze/silver exports, so spot
+checks such as `compare_specific_ids.sql` and `quick_spot_check.sql` read a handful of lines instead of
+grepping multi-GB files.
+
+- An index directory holds a manifest and immutable segments. Each segment is a NumPy array of
+  (key hash, file id, offset) records sorted by key hash and opened with `mmap_mode='r'`; a lookup is a
+  binary search per segment. Offsets are byte offsets of the line for TSV and row numbers for Parquet.
+- `build` is incremental: only files that are new or changed (size/modification time) since the last
+  run are indexed into a new segment; entries of changed and deleted files are retired. Segments are merged once
+  there are more than `max_segments`.
+- Keys are matched on a 64-bit hash, so every fetched row is checked against the requested key.
+- Lookups return the parsed rows; with a second index, Databricks and Snowflake rows are shown side by
+  side with the columns that differ after export normalization (see diff.py).
+
+Usage:
+    python -m shared.ncp_local.keyindex build databricks_export/ -i indexes/databricks
+    python -m shared.ncp_local.keyindex build 'snowflake_export/*.parquet' -i indexes/snowflake
+    python -m shared.ncp_local.keyindex lookup -i indexes/databricks --right-index indexes/snowflake \\
+        --ids 1120000004649718026 1110000000931265425
+    python -m shared.ncp_local.keyindex lookup -i indexes/databricks --right-index indexes/snowflake \\
+        --ids-from-sql snowflake/validation/compare_specific_ids.sql
+"""
+
+import argparse
+import json
+import logging
+import mmap
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from shared.ncp_local.columnar import key_hashes, key_text
+from shared.ncp_local.exports import (ExportChunk, export_columns, expand_paths, is_parquet, iter_chunk_batches,
+                                      normalized_table, plan_chunks)
+from shared.ncp_local.schema import normalize_column_name
+from shared.ncp_local.tsv import read_tsv_lines
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = 'manifest.json'
+ENTRY_DTYPE = np.dtype([('key', '<u8'), ('file', '<u4'), ('offset', '<u8')])
+
+
+@dataclass
+class IndexConfig:
+    """Configuration for building a key index"""
+    key_column: str = 'transaction_main_id'
+    chunk_bytes: int = 256 << 20
+    workers: int = os.cpu_count() or 1
+    max_segments: int = 8  # merge all segments once there are more
+
+
+@dataclass
+class IndexedFile:
+    """Manifest entry for one indexed export file"""
+    id: int
+    path: str
+    size: int
+    modified: float
+    rows: int
+    columns: List[str] = field(default_factory=list)
+
+
+# ----------------------------------------------------------------------------
+# Building
+# ----------------------------------------------------------------------------
+
+def _line_starts(path: str, byte_range: Tuple[int, int]) -> np.ndarray:
+    """Byte offset of every non-empty line in a newline-aligned range (Arrow skips empty lines)"""
+    start, end = byte_range
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        data = np.frombuffer(mapped, dtype=np.uint8, count=end - start, offset=start)
+        newlines = np.flatnonzero(data == 0x0A) + start
+        del data  # release the export so the mapping can be closed
+    starts = np.concatenate(([start], newlines + 1))
+    ends = np.concatenate((newlines, [end]))
+    return starts[ends > starts]
+
+
+def _row_offset(path: str, row_groups: Sequence[int]) -> int:
+    """Row number of the first row of `row_groups` within a Parquet file"""
+    metadata = pq.ParquetFile(path).metadata
+    return sum(metadata.row_group(i).num_rows for i in range(row_groups[0]))
+
+
+def _index_chunk(chunk: ExportChunk, key_column: str, file_id: int) -> np.ndarray:
+    """Worker: (key hash, file id, offset) of every row with a key in one chunk"""
+    keys = [batch.column(0) for batch in iter_chunk_batches(chunk, columns=[key_column])]
+    keys = pa.chunked_array(keys) if keys else pa.chunked_array([], pa.string())
+    if chunk.byte_range is not None:
+        offsets = _line_starts(chunk.path, chunk.byte_range)
+        if len(offsets) != len(keys):
+            raise ValueError(f"{chunk.path}: {len(keys):,} rows parsed but {len(offsets):,} lines found "
+                             f"in bytes {chunk.byte_range}")
+    else:
+        first = _row_offset(chunk.path, chunk.row_groups)
+        offsets = np.arange(first, first + len(keys), dtype=np.uint64)
+
+    entries = np.empty(len(keys), dtype=ENTRY_DTYPE)
+    entries['key'] = key_hashes(keys)
+    entries['file'] = file_id
+    entries['offset'] = offsets
+    return entries[pc.is_valid(keys).to_numpy(zero_copy_only=False)]
+
+
+class KeyIndex:
+    """An index directory: manifest plus sorted, memory-mapped segments"""
+
+    def __init__(self, index_dir: str, config: Optional[IndexConfig] = None):
+        self.index_dir = Path(index_dir)
+        self.config = config or IndexConfig()
+        self.files: Dict[int, IndexedFile] = {}
+        self.segments: List[str] = []
+        self.retired: List[int] = []  # ids of file versions whose entries are still in segments
+        self.next_file_id = 0
+        self._mapped: Dict[str, np.ndarray] = {}
+        manifest = self.index_dir / MANIFEST_FILE
+        if manifest.exists():
+            state = json.loads(manifest.read_text())
+            self.config.key_column = state['key_column']
+            self.files = {entry['id']: IndexedFile(**entry) for entry in state['files']}
+            self.segments = state['segments']
+            self.retired = state['retired']
+            self.next_file_id = state['next_file_id']
+
+    def _save(self) -> None:
+        """Write the manifest atomically; segments it names are already in place"""
+        state = {'key_column': self.config.key_column, 'next_file_id': self.next_file_id,
+                 'segments': self.segments, 'retired': self.retired,
+                 'files': [asdict(entry) for entry in self.files.values()]}
+        temporary = self.index_dir / f".{MANIFEST_FILE}.tmp"
+        temporary.write_text(json.dumps(state, indent=1))
+        os.replace(temporary, self.index_dir / MANIFEST_FILE)
+
+    def _write_segment(self, entries: np.ndarray) -> str:
+        name = f"segment-{self.next_file_id:08d}-{time.time_ns()}.npy"
+        temporary = self.index_dir / f".{name}.tmp"
+        with open(temporary, 'wb') as file:
+            np.save(file, entries)
+        os.replace(temporary, self.index_dir / name)
+        return name
+
+    def _segment(self, name: str) -> np.ndarray:
+        if name not in self._mapped:
+            self._mapped[name] = np.load(self.index_dir / name, mmap_mode='r')
+        return self._mapped[name]
+
+    @property
+    def rows(self) -> int:
+        return sum(entry.rows for entry in self.files.values())
+
+    def _retire_missing(self) -> bool:
+        """Retire the indexed files that are gone from disk; returns whether any were"""
+        missing = [entry for entry in self.files.values() if not os.path.exists(entry.path)]
+        for entry in missing:
+            logger.warning(f"{entry.path} no longer exists; dropping its {entry.rows:,} keys from the index")
+            del self.files[entry.id]
+            self.retired.append(entry.id)
+        return bool(missing)
+
+    def build(self, paths: Sequence[str]) -> List[IndexedFile]:
+        """Index new and changed export files and retire deleted ones; returns the files indexed by this run"""
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        if self._retire_missing():
+            self._save()
+        by_path = {entry.path: entry for entry in self.files.values()}
+        pending = []
+        for path in expand_paths(paths):
+            stat = os.stat(path)
+            previous = by_path.get(os.path.abspath(path))
+            if previous is not None and previous.size == stat.st_size and previous.modified == stat.st_mtime:
+                continue
+            pending.append((path, stat, previous))
+        if not pending:
+            return []
+
+        key_column = self.config.key_column
+        indexed, tasks = [], []
+        for path, stat, previous in pending:
+            column_map = {normalize_column_name(c): c for c in export_columns(path)}
+            if key_column not in column_map:
+                raise ValueError(f"{path} has no '{key_column}' column")
+            entry = IndexedFile(self.next_file_id, os.path.abspath(path), stat.st_size, stat.st_mtime, 0,
+                                export_columns(path))
+            self.next_file_id += 1
+            indexed.append((entry, previous))
+            tasks.extend((chunk, column_map[key_column], entry.id)
+                         for chunk in plan_chunks([path], self.config.chunk_bytes))
+
+        if self.config.workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(min(self.config.workers, len(tasks))) as executor:
+                results = list(executor.map(_index_chunk, *zip(*tasks)))
+        else:
+            results = [_index_chunk(*task) for task in tasks]
+        entries = np.concatenate(results) if results else np.empty(0, ENTRY_DTYPE)
+        entries = entries[np.argsort(entries['key'], kind='stable')]
+        rows = np.bincount(entries['file'], minlength=self.next_file_id)
+
+        self.segments.append(self._write_segment(entries))
+        for entry, previous in indexed:
+            entry.rows = int(rows[entry.id])
+            if previous is not None:
+                del self.files[previous.id]
+                self.retired.append(previous.id)
+            self.files[entry.id] = entry
+        self._save()
+        if len(self.segments) > self.config.max_segments:
+            self.compact()
+        return [entry for entry, _ in indexed]
+
+    def compact(self) -> None:
+        """Merge all segments into one and drop the entries of retired file versions"""
+        if len(self.segments) <= 1 and not self.retired:
+            return
+        entries = np.concatenate([np.asarray(self._segment(name)) for name in self.segments])
+        if self.retired:
+            entries = entries[~np.isin(entries['file'], self.retired)]
+        entries = entries[np.argsort(entries['key'], kind='stable')]
+        old_segments = self.segments
+        self.segments, self.retired = [self._write_segment(entries)], []
+        self._save()
+        self._mapped.clear()
+        for name in old_segments:
+            (self.index_dir / name).unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------------
+
+    def locate(self, keys: Sequence[str]) -> np.ndarray:
+        """Index entries whose key hash matches one of `keys` (hash collisions are resolved by `fetch`)"""
+        hashes = np.unique(key_hashes(pa.array(list(keys), pa.string())))
+        found = []
+        for name in self.segments:
+            segment = self._segment(name)
+            starts = np.searchsorted(segment['key'], hashes, side='left')
+            lengths = np.searchsorted(segment['key'], hashes, side='right') - starts
+            # Positions of every matching entry: each start repeated over its run of equal hashes
+            runs = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+            found.append(np.asarray(segment[runs + np.arange(lengths.sum())]))
+        entries = np.concatenate(found) if found else np.empty(0, ENTRY_DTYPE)
+        if self.retired:
+            entries = entries[~np.isin(entries['file'], self.retired)]
+        return entries
+
+    def fetch(self, keys: Sequence[str]) -> List[pa.Table]:
+        """
+        Rows of `keys` as one table per export file (raw TSV text or Parquet values, export column
+        names), in file order
+        """
+        wanted = pa.array(sorted(set(str(key).strip() for key in keys)), pa.string())
+        entries = self.locate(wanted.to_pylist())
+        tables = []
+        for file_id in np.unique(entries['file']):
+            entry = self.files[int(file_id)]
+            if not os.path.exists(entry.path):
+                logger.warning(f"{entry.path} no longer exists; rebuild the index to drop it")
+                continue
+            offsets = np.sort(entries['offset'][entries['file'] == file_id])
+            if is_parquet(entry.path):
+                table = self._parquet_rows(entry.path, offsets)
+            else:
+                table = self._tsv_rows(entry.path, entry.columns, offsets)
+            key_name = {normalize_column_name(c): c for c in table.column_names}[self.config.key_column]
+            table = table.filter(pc.is_in(key_text(table[key_name]), value_set=wanted))
+            if table.num_rows:
+                tables.append(table)
+        return tables
+
+    @staticmethod
+    def _tsv_rows(path: str, columns: List[str], offsets: np.ndarray) -> pa.Table:
+        lines = []
+        with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for offset in offsets.tolist():
+                end = mapped.find(b'\n', offset)
+                lines.append(mapped[offset:len(mapped) if end == -1 else end].rstrip(b'\r'))
+        return read_tsv_lines(lines, columns)
+
+    @staticmethod
+    def _parquet_rows(path: str, offsets: np.ndarray) -> pa.Table:
+        parquet = pq.ParquetFile(path)
+        group_starts = np.cumsum([0] + [parquet.metadata.row_group(i).num_rows
+                                        for i in range(parquet.metadata.num_row_groups)])
+        groups = np.searchsorted(group_starts, offsets, side='right') - 1
+        tables = []
+        for group in np.unique(groups):
+            rows = offsets[groups == group] - group_starts[group]
+            tables.append(parquet.read_row_group(int(group)).take(pa.array(rows.astype(np.int64))))
+        return pa.concat_tables(tables)
+
+
+# ----------------------------------------------------------------------------
+# Side-by-side comparison
+# ----------------------------------------------------------------------------
+
+@dataclass
+class KeyComparison:
+    """Rows of one key in both exports, with the columns that differ after normalization"""
+    key: str
+    left_rows: int
+    right_rows: int
+    differing_columns: Dict[str, Tuple[Optional[str], Optional[str]]] = field(default_factory=dict)
+
+    @property
+    def status(self) -> str:
+        if not self.left_rows and not self.right_rows:
+            return 'not found'
+        if not self.right_rows:
+            return 'missing in right'
+        if not self.left_rows:
+            return 'missing in left'
+        return 'changed' if self.differing_columns or self.left_rows != self.right_rows else 'match'
+
+
+def _normalized_rows(tables: List[pa.Table], key_column: str) -> Dict[str, List[dict]]:
+    """Normalized rows (diff.py rules, normalized column names) grouped by key"""
+    rows: Dict[str, List[dict]] = {}
+    for table in tables:
+        column_map = {normalize_column_name(c): c for c in table.column_names}
+        for batch in table.combine_chunks().to_batches():
+            for row in normalized_table(batch, column_map, sorted(column_map)).to_pylist():
+                rows.setdefault(row[key_column], []).append(row)
+    return rows
+
+
+def compare_keys(left: KeyIndex, right: KeyIndex, keys: Sequence[str]) -> List[KeyComparison]:
+    """
+    Look up `keys` in both indexes and compare their rows column by column. Duplicate rows of a key are
+    paired in sorted order, so the export order of duplicates does not count as a difference.
+    """
+    key_column = left.config.key_column
+    left_rows = _normalized_rows(left.fetch(keys), key_column)
+    right_rows = _normalized_rows(right.fetch(keys), key_column)
+    comparisons = []
+    for key in sorted(set(str(key).strip() for key in keys)):
+        lefts, rights = left_rows.get(key, []), right_rows.get(key, [])
+        comparison = KeyComparison(key, len(lefts), len(rights))
+        if lefts and rights:
+            columns = sorted(set(lefts[0]) & set(rights[0]))
+            ordered = [sorted(rows, key=lambda row: [(row[c] is not None, row[c] or '') for c in columns])
+                       for rows in (lefts, rights)]
+            for left_row, right_row in zip(*ordered):
+                for column in columns:
+                    if left_row[column] != right_row[column]:
+                        comparison.differing_columns.setdefault(column, (left_row[column], right_row[column]))
+        comparisons.append(comparison)
+    return comparisons
+
+
+def ids_from_sql(path: str) -> List[str]:
+    """Quoted ids of the `transaction_main_id IN (...)` lists in a spot-check query file"""
+    text = Path(path).read_text()
+    ids = []
+    for in_list in re.findall(r'transaction_main_id\s+IN\s*\(([^)]*)\)', text, flags=re.IGNORECASE):
+        ids.extend(re.findall(r"'([^']+)'", in_list))
+    return ids
+
+
+# ----------------------------------------------------------------------------
+# CLI
+# ----------------------------------------------------------------------------
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    parser = argparse.ArgumentParser(description="Sorted transaction_main_id index over local exports")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help="Create or incrementally update an index")
+    build.add_argument('inputs', nargs='+', help="Export files (TSV with header or Parquet), directories or globs")
+    build.add_argument('-i', '--index', required=True, help="Index directory")
+    build.add_argument('--key-column', default='transaction_main_id')
+    build.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    build.add_argument('--compact', action='store_true', help="Merge all segments after the update")
+
+    lookup = commands.add_parser('lookup', help="Fetch rows by transaction_main_id")
+    lookup.add_argument('-i', '--index', required=True, help="Index directory (left side, e.g. Databricks)")
+    lookup.add_argument('--right-index', help="Second index (e.g. Snowflake): compare rows side by side")
+    lookup.add_argument('--ids', nargs='*', default=[])
+    lookup.add_argument('--ids-file', help="File with one id per line")
+    lookup.add_argument('--ids-from-sql', help="Query file with 'transaction_main_id IN (...)' lists")
+    lookup.add_argument('--json', help="Write the rows or comparisons as JSON")
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        index = KeyIndex(args.index, IndexConfig(key_column=args.key_column, workers=args.workers))
+        start = time.perf_counter()
+        indexed = index.build(args.inputs)
+        if args.compact:
+            index.compact()
+        print(f"Indexed {len(indexed)} new or changed files ({sum(f.rows for f in indexed):,} keys) in "
+              f"{time.perf_counter() - start:.1f}s; index holds {len(index.files)} files, {index.rows:,} keys "
+              f"in {len(index.segments)} segments")
+        return
+
+    keys = list(args.ids)
+    if args.ids_file:
+        keys.extend(line.strip() for line in open(args.ids_file) if line.strip())
+    if args.ids_from_sql:
+        keys.extend(ids_from_sql(args.ids_from_sql))
+    if not keys:
+        parser.error("no ids given (--ids, --ids-file or --ids-from-sql)")
+
+    left = KeyIndex(args.index)
+    start = time.perf_counter()
+    if args.right_index:
+        comparisons = compare_keys(left, KeyIndex(args.right_index), keys)
+        elapsed = time.perf_counter() - start
+        for comparison in comparisons:
+            print(f"{comparison.key}: {comparison.status} (rows {comparison.left_rows}/{comparison.right_rows})")
+            for column, (left_value, right_value) in comparison.differing_columns.items():
+                print(f"    {column}: {left_value!r} -> {right_value!r}")
+        counts = {}
+        for comparison in comparisons:
+            counts[comparison.status] = counts.get(comparison.status, 0) + 1
+        print(f"{len(comparisons):,} ids compared in {elapsed * 1000:.0f} ms: "
+              + ', '.join(f"{status}={count:,}" for status, count in sorted(counts.items())))
+        output = [dict(asdict(c), status=c.status) for c in comparisons]
+    else:
+        tables = left.fetch(keys)
+        elapsed = time.perf_counter() - start
+        output = [row for table in tables for row in table.to_pylist()]
+        for row in output:
+            print('\t'.join('null' if value is None else str(value) for value in row.values()))
+        print(f"{len(output):,} rows for {len(set(keys)):,} ids in {elapsed * 1000:.0f} ms")
+
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(output, file, indent=2, default=str)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+"""
+Nuvei DWH Platform POC - Local Bronze Quarantine
+Splits malformed rows out of the local bronze ingestion, with the same reasons as the Databricks
+`BadRecordQuarantine` and the Snowflake bronze loader: wrong column count, undecodable bytes and typed
+fields that do not parse. Rejects keep their source file, byte offset and raw line; valid rows proceed.
+"""
+
+import mmap
+import os
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from shared.ncp_local.schema import (
+    REJECT_COLUMN_COUNT,
+    REJECT_UNDECODABLE,
+    REJECT_UNPARSEABLE_FIELD,
+    TYPED_NULL_TOKENS,
+)
+
+QUARANTINE_SCHEMA = pa.schema([
+    pa.field('source_file_name', pa.string()),
+    pa.field('byte_offset', pa.int64()),
+    pa.field('reason', pa.string()),
+    pa.field('detail', pa.string()),
+    pa.field('raw_line', pa.string()),
+])
+
+# UTF-8 bytes of U+FFFD: what an upstream lossy decode leaves behind (both UNDECODABLE_MARKERS)
+UNDECODABLE_SEQUENCE = '\ufffd'.encode('utf-8')
+
+
+class RangeQuarantine:
+    """
+    Rejects of one newline-aligned byte range. Arrow does not report row positions, so parsed rows are
+    mapped back to byte offsets (non-empty lines minus the skipped ones) only when a range has rejects.
+    """
+
+    def __init__(self, mapped: mmap.mmap, byte_range: Tuple[int, int],
+                 rejects: Optional[List[Tuple[int, str, str, str]]] = None):
+        self.mapped = mapped
+        self.start, self.end = byte_range
+        self.rejects = [] if rejects is None else rejects  # (byte offset, reason, detail, raw line)
+        self._skipped: List[int] = []
+        self._cursor = self.start
+        self._rows_seen = 0
+        self._line_starts: Optional[np.ndarray] = None
+        self._row_starts: Optional[np.ndarray] = None
+        self._row_starts_skipped = 0
+        self._undecodable_lines: Optional[np.ndarray] = None
+        self._undecodable = self._find_all(UNDECODABLE_SEQUENCE)
+
+    def _find_all(self, sequence: bytes) -> List[int]:
+        positions = []
+        position = self.mapped.find(sequence, self.start, self.end)
+        while position != -1:
+            positions.append(position)
+            position = self.mapped.find(sequence, position + 1, self.end)
+        return positions
+
+    def _is_line_start(self, offset: int) -> bool:
+        return offset == self.start or self.mapped[offset - 1] == 0x0A
+
+    def _locate(self, text: bytes) -> int:
+        """Offset of a skipped line: searched forward from the previous one, then from the range start"""
+        for begin in (self._cursor, self.start):
+            offset = self.mapped.find(text, begin, self.end)
+            while offset != -1 and (not self._is_line_start(offset) or offset in self._skipped):
+                offset = self.mapped.find(text, offset + 1, self.end)
+            if offset != -1:
+                self._cursor = offset + len(text)
+                return offset
+        return -1
+
+    def _raw_line(self, offset: int) -> str:
+        end = self.mapped.find(b'\n', offset, self.end)
+        return self.mapped[offset:self.end if end == -1 else end].rstrip(b'\r').decode('latin-1')
+
+    def on_invalid_row(self, row) -> str:
+        """pyarrow.csv invalid_row_handler: quarantine a row with the wrong column count and skip it"""
+        offset = self._locate(row.text.encode('latin-1', errors='replace'))
+        if offset != -1:
+            self._skipped.append(offset)
+        self.rejects.append((offset, REJECT_COLUMN_COUNT,
+                             f"expected {row.expected_columns} columns, got {row.actual_columns}", row.text))
+        return 'skip'
+
+    def _row_offsets(self) -> np.ndarray:
+        """Byte offset of every row Arrow returns for this range"""
+        if self._line_starts is None:
+            data = np.frombuffer(self.mapped, dtype=np.uint8, count=self.end - self.start, offset=self.start)
+            newlines = np.flatnonzero(data == 0x0A) + self.start
+            del data  # release the export so the mapping can be closed
+            starts = np.concatenate(([self.start], newlines + 1))
+            ends = np.concatenate((newlines, [self.end]))
+            self._line_starts = starts[ends > starts]  # Arrow skips empty lines
+        if self._row_starts is None or self._row_starts_skipped != len(self._skipped):
+            self._row_starts = self._line_starts[~np.isin(self._line_starts, self._skipped)]
+            self._row_starts_skipped = len(self._skipped)
+        return self._row_starts
+
+    def _undecodable_rows(self, offsets: np.ndarray) -> np.ndarray:
+        if self._undecodable_lines is None:
+            line_starts = self._line_starts
+            self._undecodable_lines = line_starts[np.searchsorted(line_starts, self._undecodable, side='right') - 1]
+        return np.isin(offsets, self._undecodable_lines)
+
+    def filter_batch(self, raw: pa.RecordBatch, typed: pa.Table, typed_columns: Sequence[str]) -> pa.Table:
+        """Drop and record the rows of a cast batch that are undecodable or have an unparseable typed field"""
+        first = self._rows_seen
+        self._rows_seen += typed.num_rows
+
+        # A typed field failed if the cast nulled it although the raw token is not a placeholder
+        details: Dict[int, str] = {}
+        for name in typed_columns:
+            raw_values = raw.column(name)
+            failed = pc.and_(pc.is_valid(raw_values), pc.is_null(typed.column(name)))
+            if not pc.any(failed).as_py():
+                continue
+            placeholder = pc.is_in(pc.utf8_lower(pc.utf8_trim_whitespace(raw_values)),
+                                   value_set=pa.array(TYPED_NULL_TOKENS))
+            for index in np.flatnonzero(pc.and_(failed, pc.invert(placeholder)).to_numpy(zero_copy_only=False)):
+                details.setdefault(int(index), f"{name}='{raw_values[index].as_py()}'")
+        if not details and not self._undecodable:
+            return typed
+
+        offsets = self._row_offsets()[first:first + typed.num_rows]
+        reject = self._undecodable_rows(offsets) if self._undecodable else np.zeros(typed.num_rows, dtype=bool)
+        for index in np.flatnonzero(reject):
+            offset = int(offsets[index])
+            self.rejects.append((offset, REJECT_UNDECODABLE, 'U+FFFD in line', self._raw_line(offset)))
+        for index, detail in details.items():
+            if not reject[index]:
+                reject[index] = True
+                offset = int(offsets[index])
+                self.rejects.append((offset, REJECT_UNPARSEABLE_FIELD, detail, self._raw_line(offset)))
+        return typed.filter(pa.array(~reject)) if reject.any() else typed
+
+
+class FileQuarantine:
+    """Rejects and per-reason counters of one source file; a context manager that owns the file mapping"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file_name = os.path.basename(path)
+        self.rejects: List[Tuple[int, str, str, str]] = []
+        self._file = None
+        self._mapped: Optional[mmap.mmap] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._mapped is not None:
+            self._mapped.close()
+            self._file.close()
+            self._mapped = None
+
+    def range(self, byte_range: Tuple[int, int]) -> RangeQuarantine:
+        """Collect the rejects of the next byte range"""
+        if self._mapped is None:
+            self._file = open(self.path, 'rb')
+            self._mapped = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return RangeQuarantine(self._mapped, byte_range, self.rejects)
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        """Rejected rows per reason"""
+        return dict(Counter(reject[1] for reject in self.rejects))
+
+    def to_table(self) -> pa.Table:
+        """Quarantine rows in file order"""
+        rejects = sorted(self.rejects, key=lambda reject: reject[0])
+        return pa.table([
+            pa.array([self.file_name] * len(rejects), pa.string()),
+            pa.array([reject[0] for reject in rejects], pa.int64()),
+            *[pa.array([reject[i] for reject in rejects], pa.string()) for i in (1, 2, 3)],
+        ], schema=QUARANTINE_SCHEMA)
@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+"""
+Nuvei DWH Platform POC - Stratified Sample Parity
+Compares a Databricks and a Snowflake silver export on a deterministic, stratified sample of keys instead
+of the full table, and reports per-stratum mismatch rates with confidence bounds.
+
+- Strata are (`multi_client_id`, `transaction_type`, day of `transaction_date`) by default.
+- A key is sampled when the 64-bit hash of its `transaction_main_id` (salted with `--seed`) falls under its
+  stratum's threshold: the base rate, raised to the k-th smallest hash of the stratum so that every stratum
+  gets at least `min_per_stratum` keys (rare strata are sampled completely). The hash depends on the key only,
+  so both platforms draw the same keys without coordination.
+- Pass 1 reads the key and stratum columns of both exports (exact row counts per stratum); pass 2 normalizes
+  and compares every common column (see diff.py) for the sampled keys only. Keys sampled on one side only
+  are looked up on the other with a targeted re-read.
+- Mismatch rates come with Wilson score bounds (finite-population corrected; exact for fully sampled strata).
+
+Usage:
+    python -m shared.ncp_local.sampling --left databricks_silver.parquet --right snowflake_silver.parquet
+    python -m shared.ncp_local.sampling --left dbx/ --right sf/ --base-rate 0.001 --min-per-stratum 50 \\
+        --csv strata.csv --json sample_parity.json
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, asdict
+from statistics import NormalDist
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from shared.ncp_local.columnar import hash_column, key_hashes, mix64
+from shared.ncp_local.diff import ChangedRow
+from shared.ncp_local.exports import (ExportChunk, export_columns, expand_paths, iter_chunk_batches,
+                                     normalized_table, plan_chunks)
+from shared.ncp_local.schema import normalize_column_name
+
+DAY = 'day'  # stratum derived from the date column
+MAX_HASH = np.iinfo(np.uint64).max
+STRATUM_SEPARATOR = ' | '
+
+
+@dataclass
+class SamplingConfig:
+    """Settings shared by both passes"""
+    key_column: str = 'transaction_main_id'
+    date_column: str = 'transaction_date'
+    strata: List[str] = field(default_factory=lambda: ['multi_client_id', 'transaction_type', DAY])
+    base_rate: float = 0.01  # share of the keys of every stratum
+    min_per_stratum: int = 30  # keys per stratum at least (all of them in smaller strata)
+    seed: int = 0  # salt of the key hash: another seed draws another sample
+    confidence: float = 0.95
+    ignore_columns: List[str] = field(default_factory=lambda: ['inserted_at'])
+    ignore_case: bool = False
+    max_examples: int = 20
+    chunk_bytes: int = 256 << 20
+    workers: int = os.cpu_count() or 1
+
+
+@dataclass
+class StratumResult:
+    """Sample outcome of one stratum; rates are over sampled keys"""
+    stratum: str
+    left_rows: int
+    right_rows: int
+    sampled_keys: int = 0
+    mismatched_keys: int = 0
+    missing_keys: int = 0
+    extra_keys: int = 0
+    mismatch_rate: float = 0.0
+    lower_bound: float = 0.0
+    upper_bound: float = 0.0
+    exact: bool = False  # every key of the stratum was sampled
+
+
+@dataclass
+class SampleReport:
+    """Outcome of a sampled comparison; `left` is the baseline"""
+    left_label: str
+    right_label: str
+    left_rows: int = 0
+    right_rows: int = 0
+    compared_columns: List[str] = field(default_factory=list)
+    left_only_columns: List[str] = field(default_factory=list)
+    right_only_columns: List[str] = field(default_factory=list)
+    sampled_keys: int = 0
+    sampled_rows: int = 0
+    mismatched_keys: int = 0
+    strata: List[StratumResult] = field(default_factory=list)
+    column_mismatch_counts: Dict[str, int] = field(default_factory=dict)
+    changed_rows: List[ChangedRow] = field(default_factory=list)
+    estimated_mismatched_rows: float = 0.0
+    mismatched_rows_upper_bound: float = 0.0
+    elapsed_s: float = 0.0
+
+    @property
+    def row_count_differences(self) -> List[StratumResult]:
+        return [s for s in self.strata if s.left_rows != s.right_rows]
+
+    @property
+    def is_match(self) -> bool:
+        return (self.mismatched_keys == 0 and not self.row_count_differences
+                and not self.left_only_columns and not self.right_only_columns)
+
+
+@dataclass
+class _Side:
+    label: str
+    column_map: Dict[str, str]  # normalized name -> name in the export
+    chunks: List[ExportChunk]
+
+
+# ------------------------------------------------------------------------------------------------
+# Keys and strata (run inside the workers)
+# ------------------------------------------------------------------------------------------------
+
+def _day(values) -> pa.Array:
+    if pa.types.is_timestamp(values.type) or pa.types.is_date(values.type):
+        return pc.strftime(values, format='%Y-%m-%d')
+    return pc.utf8_slice_codeunits(pc.utf8_trim_whitespace(values.cast(pa.string())), 0, 10)
+
+
+def _raw_columns(column_map: Dict[str, str], config: SamplingConfig, extra: Sequence[str] = ()) -> List[str]:
+    names = [config.key_column, config.date_column] + [s for s in config.strata if s != DAY] + list(extra)
+    return [column_map[name] for name in dict.fromkeys(names)]
+
+
+def _strata(batch: pa.RecordBatch, column_map: Dict[str, str], config: SamplingConfig) -> pa.Array:
+    """Stratum label of every row: the normalized stratum values joined"""
+    parts = []
+    for name in config.strata:
+        if name == DAY:
+            values = _day(batch.column(batch.schema.get_field_index(column_map[config.date_column])))
+        else:
+            values = normalized_table(batch, column_map, [name], config.ignore_case)[name]
+        parts.append(pc.fill_null(values, 'null'))
+    return pc.binary_join_element_wise(*parts, STRATUM_SEPARATOR)
+
+
+def _encoded_strata(batch, column_map, config) -> Tuple[List[str], np.ndarray]:
+    encoded = pc.dictionary_encode(_strata(batch, column_map, config))
+    if isinstance(encoded, pa.ChunkedArray):
+        encoded = encoded.combine_chunks()
+    return encoded.dictionary.to_pylist(), encoded.indices.to_numpy(zero_copy_only=False)
+
+
+def _merge_smallest(counts: Dict[str, Tuple[int, np.ndarray]], label: str, rows: int, smallest: np.ndarray,
+                    k: int) -> None:
+    previous_rows, previous = counts.get(label, (0, np.zeros(0, np.uint64)))
+    counts[label] = (previous_rows + rows, np.sort(np.concatenate([previous, smallest]))[:k])
+
+
+def _count_chunk(chunk, column_map, config):
+    """Pass 1 worker: rows and the `min_per_stratum` smallest key hashes of every stratum in one chunk"""
+    counts: Dict[str, Tuple[int, np.ndarray]] = {}
+    k = config.min_per_stratum
+    for batch in iter_chunk_batches(chunk, _raw_columns(column_map, config)):
+        if not batch.num_rows:
+            continue
+        labels, index = _encoded_strata(batch, column_map, config)
+        hashes = key_hashes(batch.column(batch.schema.get_field_index(column_map[config.key_column])), config.seed)
+        order = np.lexsort((hashes, index))
+        sorted_index, sorted_hashes = index[order], hashes[order]
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(sorted_index)) + 1))
+        ends = np.append(starts[1:], len(sorted_index))
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            _merge_smallest(counts, labels[sorted_index[start]], end - start,
+                            sorted_hashes[start:min(end, start + k)], k)
+    return counts
+
+
+def _sample_chunk(chunk, column_map, compare_columns, config, thresholds, wanted):
+    """
+    Pass 2 worker: normalized rows of the sampled keys in one chunk (hash under the stratum threshold, or
+    in `wanted`), with their key hashes, strata and per-column value hashes
+    """
+    tables, hashed_keys, strata = [], [], []
+    for batch in iter_chunk_batches(chunk, _raw_columns(column_map, config, compare_columns)):
+        if not batch.num_rows:
+            continue
+        labels, index = _encoded_strata(batch, column_map, config)
+        hashes = key_hashes(batch.column(batch.schema.get_field_index(column_map[config.key_column])), config.seed)
+        selected = np.zeros(len(hashes), dtype=bool)
+        if thresholds is not None:
+            limits = np.array([thresholds.get(label, MAX_HASH) for label in labels], dtype=np.uint64)
+            selected |= hashes <= limits[index]
+        if wanted is not None and len(wanted):
+            selected |= np.isin(hashes, wanted)
+        rows = np.flatnonzero(selected)
+        if not len(rows):
+            continue
+        picked = batch.take(pa.array(rows))
+        tables.append(normalized_table(picked, column_map, compare_columns, config.ignore_case))
+        hashed_keys.append(hashes[rows])
+        strata.extend(labels[i] for i in index[rows].tolist())
+    if not tables:
+        return None
+    return pa.concat_tables(tables), np.concatenate(hashed_keys), strata
+
+
+# ------------------------------------------------------------------------------------------------
+# Statistics
+# ------------------------------------------------------------------------------------------------
+
+def rate_bounds(mismatched: int, sampled: int, population: int, confidence: float) -> Tuple[float, float, bool]:
+    """
+    Wilson score interval of a mismatch rate observed on `sampled` of `population` keys, with the finite
+    population correction applied to the sample size. Fully sampled strata are exact.
+    """
+    if sampled == 0:
+        return 0.0, 1.0, False
+    rate = mismatched / sampled
+    if sampled >= population:
+        return rate, rate, True
+    correction = (population - sampled) / max(population - 1, 1)
+    n = sampled / correction
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    center = (rate + z * z / (2 * n)) / (1 + z * z / n)
+    margin = z * math.sqrt(rate * (1 - rate) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+    lower = max(0.0, center - margin) if mismatched else 0.0
+    upper = min(1.0, center + margin) if mismatched < sampled else 1.0
+    return round(lower, 9), round(upper, 9), False
+
+
+def _per_key(hashed_keys: np.ndarray, column_hashes: np.ndarray):
+    """Unique keys with their row count, first row and an order-independent digest of each column"""
+    if not len(hashed_keys):
+        return hashed_keys, np.zeros(0, np.int64), np.zeros(0, np.int64), column_hashes
+    order = np.argsort(hashed_keys, kind='stable')
+    sorted_keys = hashed_keys[order]
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(sorted_keys)) + 1))
+    counts = np.diff(np.append(starts, len(sorted_keys)))
+    with np.errstate(over='ignore'):
+        digests = np.add.reduceat(mix64(column_hashes[order]), starts, axis=0)
+    return sorted_keys[starts], counts, order[starts], digests
+
+
+# ------------------------------------------------------------------------------------------------
+# Orchestration
+# ------------------------------------------------------------------------------------------------
+
+class SampleParity:
+    """Runs both passes over a process pool"""
+
+    def __init__(self, config: SamplingConfig):
+        self.config = config
+
+    def _map(self, executor, fn, side: _Side, *args) -> list:
+        tasks = [(chunk, side.column_map) + args for chunk in side.chunks]
+        if executor is None:
+            return [fn(*task) for task in tasks]
+        return list(executor.map(fn, *zip(*tasks))) if tasks else []
+
+    def _side(self, label: str, paths: Sequence[str]) -> _Side:
+        files = expand_paths(paths)
+        if not files:
+            raise FileNotFoundError(f"No export files found for {label}: {paths}")
+        column_map = {normalize_column_name(c): c for c in export_columns(files[0])}
+        return _Side(label, column_map, plan_chunks(files, self.config.chunk_bytes))
+
+    def thresholds(self, counts: Sequence[Dict[str, Tuple[int, np.ndarray]]]) -> Dict[str, int]:
+        """Per-stratum hash threshold: the base rate, or the k-th smallest hash on either side if higher"""
+        base = MAX_HASH if self.config.base_rate >= 1 else np.uint64(int(self.config.base_rate * 2.0 ** 64))
+        limits = {}
+        for side_counts in counts:
+            for label, (rows, smallest) in side_counts.items():
+                kth = MAX_HASH if rows <= self.config.min_per_stratum else smallest[-1]
+                limits[label] = max(limits.get(label, base), kth)
+        return {label: int(limit) for label, limit in limits.items()}
+
+    def _sample(self, executor, side: _Side, compare_columns, thresholds, wanted=None):
+        tables, hashed_keys, strata = [], [], []
+        for result in self._map(executor, _sample_chunk, side, compare_columns, self.config, thresholds, wanted):
+            if result is not None:
+                tables.append(result[0])
+                hashed_keys.append(result[1])
+                strata.extend(result[2])
+        if not tables:
+            empty = pa.table({c: pa.array([], pa.string()) for c in compare_columns})
+            return empty, np.zeros(0, np.uint64), []
+        return pa.concat_tables(tables), np.concatenate(hashed_keys), strata
+
+    def run(self, left_paths: Sequence[str], right_paths: Sequence[str],
+            left_label: str = 'databricks', right_label: str = 'snowflake') -> SampleReport:
+        config = self.config
+        start = time.perf_counter()
+        report = SampleReport(left_label, right_label)
+        left, right = self._side(left_label, left_paths), self._side(right_label, right_paths)
+
+        required = [config.key_column, config.date_column] + [s for s in config.strata if s != DAY]
+        for name in required:
+            if name not in left.column_map or name not in right.column_map:
+                raise ValueError(f"Column '{name}' must exist in both exports")
+        ignored = {normalize_column_name(c) for c in config.ignore_columns}
+        compare_columns = sorted((set(left.column_map) & set(right.column_map)) - ignored)
+        report.compared_columns = compare_columns
+        report.left_only_columns = sorted(set(left.column_map) - set(right.column_map) - ignored)
+        report.right_only_columns = sorted(set(right.column_map) - set(left.column_map) - ignored)
+
+        executor = ProcessPoolExecutor(config.workers) if config.workers > 1 else None
+        try:
+            # Pass 1: exact rows per stratum and the smallest key hashes of every stratum
+            counts = []
+            for side in (left, right):
+                merged: Dict[str, Tuple[int, np.ndarray]] = {}
+                for chunk_counts in self._map(executor, _count_chunk, side, config):
+                    for label, (rows, smallest) in chunk_counts.items():
+                        _merge_smallest(merged, label, rows, smallest, config.min_per_stratum)
+                counts.append(merged)
+            report.left_rows = sum(rows for rows, _ in counts[0].values())
+            report.right_rows = sum(rows for rows, _ in counts[1].values())
+            thresholds = self.thresholds(counts)
+
+            # Pass 2: the sampled rows of both sides, then the keys each side sampled that the other did not
+            samples = [list(self._sample(executor, side, compare_columns, thresholds)) for side in (left, right)]
+            left_keys, right_keys = (np.unique(sample[1]) for sample in samples)
+            for sample, side, wanted in ((samples[0], left, np.setdiff1d(right_keys, left_keys)),
+                                         (samples[1], right, np.setdiff1d(left_keys, right_keys))):
+                if len(wanted):
+                    table, hashed_keys, strata = self._sample(executor, side, compare_columns, None, wanted)
+                    sample[0] = pa.concat_tables([sample[0], table])
+                    sample[1] = np.concatenate([sample[1], hashed_keys])
+                    sample[2] = sample[2] + strata
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        self._compare(samples, counts, thresholds, compare_columns, report)
+        report.elapsed_s = round(time.perf_counter() - start, 3)
+        return report
+
+    def _compare(self, samples, counts, thresholds: Dict[str, int], compare_columns: List[str],
+                 report: SampleReport) -> None:
+        config = self.config
+        keyed = []
+        for table, hashed_keys, _ in samples:
+            column_hashes = (np.column_stack([hash_column(table[c]) for c in compare_columns]) if table.num_rows
+                             else np.zeros((0, len(compare_columns)), np.uint64))
+            keyed.append(_per_key(hashed_keys, column_hashes))
+        report.sampled_rows = sum(len(sample[1]) for sample in samples)
+        (l_keys, l_counts, l_first, l_digests), (r_keys, r_counts, r_first, r_digests) = keyed
+
+        keys = np.union1d(l_keys, r_keys)
+        in_left, in_right = np.isin(keys, l_keys), np.isin(keys, r_keys)
+        _, l_index, r_index = np.intersect1d(l_keys, r_keys, assume_unique=True, return_indices=True)
+        column_differs = l_digests[l_index] != r_digests[r_index]
+        changed = column_differs.any(axis=1) | (l_counts[l_index] != r_counts[r_index])
+        report.sampled_keys = len(keys)
+        report.column_mismatch_counts = {c: int(n) for c, n in zip(compare_columns, column_differs.sum(axis=0))
+                                         if n}
+        report.column_mismatch_counts = dict(sorted(report.column_mismatch_counts.items(), key=lambda i: -i[1]))
+
+        # Stratum of every key: the baseline's (the compared side's for keys only it has)
+        left_strata, right_strata = samples[0][2], samples[1][2]
+        stratum = {}
+        for key, row in zip(r_keys.tolist(), r_first.tolist()):
+            stratum[key] = right_strata[row]
+        for key, row in zip(l_keys.tolist(), l_first.tolist()):
+            stratum[key] = left_strata[row]
+        mismatched = set(l_keys[l_index][changed].tolist())
+        missing = set(keys[in_left & ~in_right].tolist())
+        extra = set(keys[in_right & ~in_left].tolist())
+        report.mismatched_keys = len(mismatched) + len(missing) + len(extra)
+
+        left_counts, right_counts = counts
+        results = {label: StratumResult(label, left_counts.get(label, (0,))[0], right_counts.get(label, (0,))[0])
+                   for label in sorted(set(left_counts) | set(right_counts))}
+        for key in keys.tolist():
+            result = results[stratum[key]]
+            result.sampled_keys += 1
+            result.missing_keys += key in missing
+            result.extra_keys += key in extra
+            result.mismatched_keys += key in mismatched or key in missing or key in extra
+        estimate, upper = 0.0, 0.0
+        for result in results.values():
+            # Fully sampled strata are exact (their row counts may include duplicate keys)
+            rows = max(result.left_rows, result.right_rows)
+            complete = thresholds.get(result.stratum) == int(MAX_HASH)
+            population = result.sampled_keys if complete else rows
+            result.mismatch_rate = result.mismatched_keys / result.sampled_keys if result.sampled_keys else 0.0
+            result.lower_bound, result.upper_bound, result.exact = rate_bounds(
+                result.mismatched_keys, result.sampled_keys, population, config.confidence)
+            estimate += rows * result.mismatch_rate
+            upper += rows * result.upper_bound
+        report.strata = sorted(results.values(), key=lambda r: (-r.mismatch_rate, -r.upper_bound, r.stratum))
+        report.estimated_mismatched_rows = round(estimate, 1)
+        report.mismatched_rows_upper_bound = round(upper, 1)
+
+        # Examples: the differing columns of the first changed keys
+        (l_table, _, _), (r_table, _, _) = samples
+        key_column = config.key_column
+        for position in np.flatnonzero(changed)[:config.max_examples].tolist():
+            left_row = l_table.slice(int(l_first[l_index[position]]), 1).to_pylist()[0]
+            right_row = r_table.slice(int(r_first[r_index[position]]), 1).to_pylist()[0]
+            columns = {c: (left_row[c], right_row[c]) for c in compare_columns if left_row[c] != right_row[c]}
+            report.changed_rows.append(ChangedRow(left_row[key_column], columns))
+
+
+def sample_parity(left_paths: Sequence[str], right_paths: Sequence[str], config: Optional[SamplingConfig] = None,
+                  left_label: str = 'databricks', right_label: str = 'snowflake') -> SampleReport:
+    """Compare two silver exports (files, directories or globs per side) on a stratified key sample"""
+    return SampleParity(config or SamplingConfig()).run(left_paths, right_paths, left_label, right_label)
+
+
+def print_report(report: SampleReport, confidence: float, max_rows: int = 20) -> None:
+    left, right = report.left_label, report.right_label
+    sampled_strata = [s for s in report.strata if s.sampled_keys]
+    smallest = min((s.sampled_keys for s in sampled_strata), default=0)
+    print(f"Rows: {left}={report.left_rows:,} {right}={report.right_rows:,} "
+          f"({len(report.compared_columns)} columns compared, {report.elapsed_s}s)")
+    if report.left_only_columns:
+        print(f"Columns only in {left}: {', '.join(report.left_only_columns)}")
+    if report.right_only_columns:
+        print(f"Columns only in {right}: {', '.join(report.right_only_columns)}")
+    print(f"Sample: {report.sampled_keys:,} keys ({report.sampled_rows:,} rows on both sides) in "
+          f"{len(report.strata):,} strata, {sum(s.exact for s in report.strata):,} sampled completely, "
+          f"smallest stratum sample {smallest:,} keys")
+    for result in report.row_count_differences[:max_rows]:
+        print(f"  rows differ in {result.stratum}: {left}={result.left_rows:,} {right}={result.right_rows:,}")
+    print(f"Mismatched sampled keys: {report.mismatched_keys:,} of {report.sampled_keys:,}; estimated "
+          f"mismatched rows {report.estimated_mismatched_rows:,.0f} (upper bound "
+          f"{report.mismatched_rows_upper_bound:,.0f} at {confidence:.0%})")
+    mismatched_strata = [s for s in report.strata if s.mismatched_keys]
+    if mismatched_strata:
+        print(f"  {'stratum':<60} {'rows':>10} {'sampled':>8} {'mismatch':>8} {'rate':>8} {'bounds':>19}")
+    for result in mismatched_strata[:max_rows]:
+        print(f"  {result.stratum[:60]:<60} {max(result.left_rows, result.right_rows):>10,} "
+              f"{result.sampled_keys:>8,} {result.mismatched_keys:>8,} {result.mismatch_rate:>8.2%} "
+              f"{result.lower_bound:>8.2%} - {result.upper_bound:>7.2%}")
+    for column, count in list(report.column_mismatch_counts.items())[:max_rows]:
+        print(f"  {column}: {count:,} sampled keys differ")
+    for row in report.changed_rows[:max_rows]:
+        print(f"  {row.key}: " + ', '.join(f"{c}: {l!r} -> {r!r}" for c, (l, r) in row.columns.items()))
+    print("SAMPLE PARITY: PASS" if report.is_match else "SAMPLE PARITY: FAIL")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stratified sample parity check of two silver exports")
+    parser.add_argument('--left', nargs='+', required=True, help="Baseline export files/dirs/globs (Databricks)")
+    parser.add_argument('--right', nargs='+', required=True, help="Compared export files/dirs/globs (Snowflake)")
+    parser.add_argument('--left-label', default='databricks')
+    parser.add_argument('--right-label', default='snowflake')
+    parser.add_argument('--key', default='transaction_main_id')
+    parser.add_argument('--date-column', default='transaction_date')
+    parser.add_argument('--strata', default=f'multi_client_id,transaction_type,{DAY}',
+                        help=f"Comma-separated stratum columns ('{DAY}' is the day of the date column)")
+    parser.add_argument('--base-rate', type=float, default=0.01, help="Share of the keys of every stratum")
+    parser.add_argument('--min-per-stratum', type=int, default=30, help="Keys sampled per stratum at least")
+    parser.add_argument('--seed', type=int, default=0, help="Hash salt; another seed draws another sample")
+    parser.add_argument('--confidence', type=float, default=0.95)
+    parser.add_argument('--ignore-columns', default='inserted_at', help="Comma-separated columns to skip")
+    parser.add_argument('--ignore-case', action='store_true', help="Compare values case-insensitively")
+    parser.add_argument('--max-examples', type=int, default=20)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--csv', help="Write every stratum's result as CSV")
+    parser.add_argument('--json', help="Write the full report as JSON")
+    args = parser.parse_args()
+
+    config = SamplingConfig(key_column=args.key, date_column=args.date_column,
+                            strata=[s for s in args.strata.split(',') if s], base_rate=args.base_rate,
+                            min_per_stratum=args.min_per_stratum, seed=args.seed, confidence=args.confidence,
+                            ignore_columns=[c for c in args.ignore_columns.split(',') if c],
+                            ignore_case=args.ignore_case, max_examples=args.max_examples, workers=args.workers)
+    report = sample_parity(args.left, args.right, config, args.left_label, args.right_label)
+    print_report(report, config.confidence)
+    if args.csv:
+        with open(args.csv, 'w', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=list(asdict(report.strata[0])) if report.strata else [])
+            writer.writeheader()
+            writer.writerows(asdict(result) for result in report.strata)
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(asdict(report), file, indent=2, default=str)
+    sys.exit(0 if report.is_match else 1)
+
+
+if __name__ == '__main__':
+    main()
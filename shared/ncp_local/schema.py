@@ -0,0 +1,115 @@
+"""
+Nuvei DWH Platform POC - Local Schema Definitions
+Loads `schema_config.json` and exposes the Databricks ETL constants and Arrow types for local tooling.
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+import pyarrow as pa
+
+# Add the Databricks scripts folder to path so the ETL constants are shared, not copied
+project_root = Path(__file__).parent.parent.parent
+DATABRICKS_SCRIPTS_DIR = project_root / 'databricks' / 'original_scripts'
+sys.path.append(str(DATABRICKS_SCRIPTS_DIR))
+
+from ncp_etl.constants import (  # noqa: E402
+    TEST_CLIENTS,
+    BOOLEAN_STRING_COLUMN,
+    COLUMNS_TO_FORCE_NULL,
+    BOOLEAN_TRUE_VALUES,
+    BOOLEAN_FALSE_VALUES,
+    STRING_NULL_VALUES,
+    DEPRECATED_VALUE,
+    TRANSACTION_STATUS_MAP,
+    APPROVED_RESULT_ID,
+    DECLINED_RESULT_ID,
+    CONVERSION_COLUMNS,
+    REJECT_COLUMN_COUNT,
+    REJECT_UNDECODABLE,
+    REJECT_UNPARSEABLE_FIELD,
+    TYPED_NULL_TOKENS,
+    UNDECODABLE_MARKERS,
+)
+
+__all__ = [
+    # Re-exported from ncp_etl.constants for the local tools
+    'TEST_CLIENTS', 'BOOLEAN_STRING_COLUMN', 'COLUMNS_TO_FORCE_NULL', 'BOOLEAN_TRUE_VALUES', 'BOOLEAN_FALSE_VALUES',
+    'STRING_NULL_VALUES', 'DEPRECATED_VALUE', 'TRANSACTION_STATUS_MAP', 'APPROVED_RESULT_ID', 'DECLINED_RESULT_ID',
+    'CONVERSION_COLUMNS', 'REJECT_COLUMN_COUNT', 'REJECT_UNDECODABLE', 'REJECT_UNPARSEABLE_FIELD', 'TYPED_NULL_TOKENS',
+    'UNDECODABLE_MARKERS',
+    # Defined here
+    'DATABRICKS_SCRIPTS_DIR', 'SCHEMA_CONFIG_PATH', 'INGESTION_COLUMNS', 'ARROW_TYPE_MAPPING',
+    'SNOWFLAKE_COLUMN_ALIASES', 'load_schema', 'arrow_type', 'arrow_schema', 'file_columns', 'normalize_column_name',
+]
+
+SCHEMA_CONFIG_PATH = DATABRICKS_SCRIPTS_DIR / 'schema_config.json'
+
+# Columns added at ingestion, not present in the source files
+INGESTION_COLUMNS = ['inserted_at']
+
+# Arrow equivalents of SchemaManager.type_mapping
+ARROW_TYPE_MAPPING = {
+    "bigint": pa.int64(),
+    "int": pa.int32(),
+    "integer": pa.int32(),
+    "tinyint": pa.int8(),
+    "long": pa.int64(),
+    "smallint": pa.int16(),
+    "boolean": pa.bool_(),
+    "bit": pa.bool_(),
+    "float": pa.float32(),
+    "real": pa.float32(),
+    "double": pa.float64(),
+    "char": pa.string(),
+    "string": pa.string(),
+    "varchar": pa.string(),
+    "nvarchar": pa.string(),
+    "text": pa.string(),
+    "date": pa.date32(),
+    "datetime": pa.timestamp('ms'),
+    "timestamp": pa.timestamp('ms'),
+    "time": pa.string(),
+    "blob": pa.binary(),
+    "binary": pa.binary(),
+}
+
+
+def load_schema(table_name: str = 'transactions') -> Dict[str, str]:
+    """Column name -> type name for a table in schema_config.json, in file order"""
+    with open(SCHEMA_CONFIG_PATH, 'r') as file:
+        return json.load(file)[table_name]
+
+
+def arrow_type(type_name: str) -> pa.DataType:
+    """Resolve a schema_config type name (including decimal(p,s)) to an Arrow type"""
+    if type_name.startswith('decimal') or type_name.startswith('numeric'):
+        precision, scale = map(int, type_name[type_name.index('(') + 1:-1].split(','))
+        return pa.decimal128(precision, scale)
+    return ARROW_TYPE_MAPPING[type_name]
+
+
+def arrow_schema(schema_dict: Dict[str, str]) -> pa.Schema:
+    """Arrow schema for a schema_config table definition"""
+    return pa.schema([pa.field(name, arrow_type(type_name)) for name, type_name in schema_dict.items()])
+
+
+def file_columns(schema_dict: Dict[str, str]) -> List[str]:
+    """Columns present in the raw source files (schema minus ingestion-time columns)"""
+    return [name for name in schema_dict if name not in INGESTION_COLUMNS]
+
+
+# Snowflake spellings of the Databricks '3d_*' columns (identifiers cannot start with a digit there)
+SNOWFLAKE_COLUMN_ALIASES = {
+    'threed_flow_status': '3d_flow_status',
+    'three_ds_flow_status': '3d_flow_status',
+    'threed_flow': '3d_flow',
+}
+
+
+def normalize_column_name(name: str) -> str:
+    """Platform-neutral column name: lower-case (Snowflake upper-cases) with the 3d_* renames undone"""
+    name = name.strip().lower()
+    return SNOWFLAKE_COLUMN_ALIASES.get(name, name)
@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+"""
+Nuvei DWH Platform POC - Column Sketches
+One-pass profiling of every column of a silver export, replacing the per-level aggregate queries in
+`snowflake/validation/test_143_column_parity.sql` and `final/progressive_validation.sql`.
+
+Each column gets a mergeable sketch: row and null counts, HyperLogLog distinct estimate, min/max,
+approximate top-k values and (for numeric values) a relative-error quantile sketch. Chunks of an
+export are profiled in parallel and merged; profiles are saved as JSON so the Databricks and
+Snowflake exports can be profiled where they live and compared later with tolerances.
+
+Usage:
+    python -m shared.ncp_local.sketches profile databricks_export/ -o databricks_profile.json
+    python -m shared.ncp_local.sketches profile snowflake_export.tsv -o snowflake_profile.json
+    python -m shared.ncp_local.sketches compare databricks_profile.json snowflake_profile.json
+"""
+
+import argparse
+import base64
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from shared.ncp_local.columnar import hash_column
+from shared.ncp_local.exports import (ExportChunk, export_columns, expand_paths, iter_chunk_batches,
+                                     normalized_table, plan_chunks)
+from shared.ncp_local.schema import normalize_column_name
+
+HLL_PRECISION = 14  # 16384 registers, ~0.8% standard error
+QUANTILE_ACCURACY = 0.01  # relative error of reported quantiles
+TOP_K_CAPACITY = 256  # values tracked per column before the least frequent are evicted
+REPORTED_QUANTILES = (0.01, 0.25, 0.5, 0.75, 0.99)
+
+NUMERIC_PATTERN = r'^-?\d+(\.\d+)?$'
+
+
+# ------------------------------------------------------------------------------------------------
+# Sketches
+# ------------------------------------------------------------------------------------------------
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """Exact bit length of uint64 values (frexp is exact on the 32-bit halves)"""
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    return np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1])
+
+
+class HyperLogLog:
+    """HyperLogLog distinct counter over 64-bit hashes; merge takes the register maximum"""
+
+    def __init__(self, precision: int = HLL_PRECISION, registers: Optional[np.ndarray] = None):
+        self.precision = precision
+        self.registers = registers if registers is not None else np.zeros(1 << precision, dtype=np.uint8)
+
+    def add_hashes(self, hashes: np.ndarray) -> None:
+        if not len(hashes):
+            return
+        p = np.uint64(self.precision)
+        index = (hashes >> (np.uint64(64) - p)).astype(np.int64)
+        remainder = (hashes << p) | (np.uint64(1) << (p - np.uint64(1)))  # guard bit caps the rank
+        rank = (65 - _bit_length(remainder)).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: 'HyperLogLog') -> None:
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int((self.registers == 0).sum())
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)  # linear counting for small cardinalities
+        return int(round(estimate))
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(len(self.registers))
+
+
+class QuantileSketch:
+    """
+    Log-bucketed quantile sketch (DDSketch-style): every value lands in a bucket whose bounds are
+    within QUANTILE_ACCURACY of each other, so quantiles have bounded relative error and merging is
+    a bucket-wise sum.
+    """
+
+    def __init__(self, accuracy: float = QUANTILE_ACCURACY):
+        self.accuracy = accuracy
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def _add_buckets(self, buckets: Dict[int, int], magnitudes: np.ndarray) -> None:
+        index = np.ceil(np.log(magnitudes) / math.log(self.gamma)).astype(np.int64)
+        for key, count in zip(*np.unique(index, return_counts=True)):
+            buckets[int(key)] = buckets.get(int(key), 0) + int(count)
+
+    def add(self, values: np.ndarray) -> None:
+        values = values[np.isfinite(values)]
+        if not len(values):
+            return
+        self._add_buckets(self.positive, values[values > 0])
+        self._add_buckets(self.negative, -values[values < 0])
+        self.zero_count += int((values == 0).sum())
+        self.count += len(values)
+        low, high = float(values.min()), float(values.max())
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+
+    def merge(self, other: 'QuantileSketch') -> None:
+        for mine, theirs in ((self.positive, other.positive), (self.negative, other.negative)):
+            for key, count in theirs.items():
+                mine[key] = mine.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        for attribute, pick in (('min', min), ('max', max)):
+            values = [v for v in (getattr(self, attribute), getattr(other, attribute)) if v is not None]
+            setattr(self, attribute, pick(values) if values else None)
+
+    def _bucket_value(self, key: int) -> float:
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        rank = q * (self.count - 1)
+        seen = 0
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return -self._bucket_value(key)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return min(max(self._bucket_value(key), self.min), self.max)
+        return self.max
+
+    def to_dict(self) -> Dict:
+        return {'accuracy': self.accuracy, 'positive': self.positive, 'negative': self.negative,
+                'zero_count': self.zero_count, 'count': self.count, 'min': self.min, 'max': self.max}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'QuantileSketch':
+        sketch = cls(data['accuracy'])
+        sketch.positive = {int(k): v for k, v in data['positive'].items()}
+        sketch.negative = {int(k): v for k, v in data['negative'].items()}
+        sketch.zero_count, sketch.count = data['zero_count'], data['count']
+        sketch.min, sketch.max = data['min'], data['max']
+        return sketch
+
+
+class ColumnSketch:
+    """Null count, distinct estimate, min/max, top-k and numeric quantiles of one column"""
+
+    def __init__(self, name: str, top_k_capacity: int = TOP_K_CAPACITY):
+        self.name = name
+        self.top_k_capacity = top_k_capacity
+        self.row_count = 0
+        self.null_count = 0
+        self.min_value: Optional[str] = None
+        self.max_value: Optional[str] = None
+        self.distinct = HyperLogLog()
+        self.numeric = QuantileSketch()
+        self.value_counts: Dict[str, int] = {}
+        self.top_k_error = 0  # upper bound on the undercount of any tracked value
+
+    def update(self, values: pa.Array) -> None:
+        """Add a batch of normalized string values"""
+        self.row_count += len(values)
+        self.null_count += values.null_count
+        non_null = pc.drop_null(values)
+        if not len(non_null):
+            return
+        self._update_min_max(*pc.min_max(non_null).values())
+        self.distinct.add_hashes(hash_column(non_null))
+
+        numeric = pc.match_substring_regex(non_null, NUMERIC_PATTERN)
+        if pc.any(numeric).as_py():
+            self.numeric.add(pc.cast(pc.filter(non_null, numeric), pa.float64()).to_numpy(zero_copy_only=False))
+
+        counts = pc.value_counts(non_null)
+        self._add_counts(zip(counts.field('values').to_pylist(), counts.field('counts').to_pylist()))
+
+    def _update_min_max(self, low, high) -> None:
+        low, high = low.as_py(), high.as_py()
+        if low is not None and (self.min_value is None or low < self.min_value):
+            self.min_value = low
+        if high is not None and (self.max_value is None or high > self.max_value):
+            self.max_value = high
+
+    def _add_counts(self, pairs) -> None:
+        for value, count in pairs:
+            self.value_counts[value] = self.value_counts.get(value, 0) + count
+        if len(self.value_counts) > self.top_k_capacity:
+            ranked = sorted(self.value_counts.items(), key=lambda item: -item[1])
+            self.top_k_error += ranked[self.top_k_capacity][1]
+            self.value_counts = dict(ranked[:self.top_k_capacity])
+
+    def merge(self, other: 'ColumnSketch') -> None:
+        self.row_count += other.row_count
+        self.null_count += other.null_count
+        self._update_min_max(pa.scalar(other.min_value, pa.string()), pa.scalar(other.max_value, pa.string()))
+        self.distinct.merge(other.distinct)
+        self.numeric.merge(other.numeric)
+        self.top_k_error += other.top_k_error
+        self._add_counts(other.value_counts.items())
+
+    def top_k(self, k: int = 10) -> List[Tuple[str, int]]:
+        return sorted(self.value_counts.items(), key=lambda item: (-item[1], item[0]))[:k]
+
+    @property
+    def null_rate(self) -> float:
+        return self.null_count / self.row_count if self.row_count else 0.0
+
+    @property
+    def numeric_rate(self) -> float:
+        """Share of non-null values that are numeric; the quantiles are meaningful when this is ~1"""
+        non_null = self.row_count - self.null_count
+        return self.numeric.count / non_null if non_null else 0.0
+
+    def summary(self, k: int = 5) -> Dict:
+        result = {'rows': self.row_count, 'nulls': self.null_count, 'distinct': self.distinct.estimate(),
+                  'min': self.min_value, 'max': self.max_value, 'top': self.top_k(k)}
+        if self.numeric.count:
+            result['quantiles'] = {q: self.numeric.quantile(q) for q in REPORTED_QUANTILES}
+        return result
+
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name, 'top_k_capacity': self.top_k_capacity, 'row_count': self.row_count,
+            'null_count': self.null_count, 'min_value': self.min_value, 'max_value': self.max_value,
+            'hll_precision': self.distinct.precision,
+            'hll_registers': base64.b64encode(self.distinct.registers.tobytes()).decode('ascii'),
+            'numeric': self.numeric.to_dict(), 'value_counts': self.value_counts, 'top_k_error': self.top_k_error,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ColumnSketch':
+        sketch = cls(data['name'], data['top_k_capacity'])
+        sketch.row_count, sketch.null_count = data['row_count'], data['null_count']
+        sketch.min_value, sketch.max_value = data['min_value'], data['max_value']
+        registers = np.frombuffer(base64.b64decode(data['hll_registers']), dtype=np.uint8).copy()
+        sketch.distinct = HyperLogLog(data['hll_precision'], registers)
+        sketch.numeric = QuantileSketch.from_dict(data['numeric'])
+        sketch.value_counts, sketch.top_k_error = data['value_counts'], data['top_k_error']
+        return sketch
+
+
+@dataclass
+class TableProfile:
+    """Column sketches of one export, keyed by normalized column name"""
+    label: str
+    row_count: int = 0
+    columns: Dict[str, ColumnSketch] = field(default_factory=dict)
+
+    def merge(self, other: 'TableProfile') -> None:
+        self.row_count += other.row_count
+        for name, sketch in other.columns.items():
+            if name in self.columns:
+                self.columns[name].merge(sketch)
+            else:
+                self.columns[name] = sketch
+
+    def save(self, path: str) -> None:
+        with open(path, 'w') as file:
+            json.dump({'label': self.label, 'row_count': self.row_count,
+                       'columns': [s.to_dict() for s in self.columns.values()]}, file)
+
+    @classmethod
+    def load(cls, path: str) -> 'TableProfile':
+        with open(path) as file:
+            data = json.load(file)
+        return cls(data['label'], data['row_count'], {c['name']: ColumnSketch.from_dict(c) for c in data['columns']})
+
+
+# ------------------------------------------------------------------------------------------------
+# Profiling
+# ------------------------------------------------------------------------------------------------
+
+def _profile_chunk(chunk: ExportChunk, column_map: Dict[str, str], label: str) -> TableProfile:
+    columns = list(column_map)
+    profile = TableProfile(label, columns={name: ColumnSketch(name) for name in columns})
+    for batch in iter_chunk_batches(chunk, [column_map[c] for c in columns]):
+        table = normalized_table(batch, column_map, columns)
+        profile.row_count += table.num_rows
+        for name in columns:
+            profile.columns[name].update(table[name].combine_chunks())
+    return profile
+
+
+def profile_export(paths: Sequence[str], label: Optional[str] = None, ignore_columns: Sequence[str] = ('inserted_at',),
+                   workers: int = os.cpu_count() or 1, chunk_bytes: int = 256 << 20) -> TableProfile:
+    """Profile every column of an export (files, directories or globs) in one pass"""
+    files = expand_paths(paths)
+    if not files:
+        raise FileNotFoundError(f"No export files found: {paths}")
+    ignored = {normalize_column_name(c) for c in ignore_columns}
+    column_map = {normalize_column_name(c): c for c in export_columns(files[0])}
+    column_map = {name: raw for name, raw in column_map.items() if name not in ignored}
+
+    chunks = plan_chunks(files, chunk_bytes)
+    profile = TableProfile(label or str(paths[0]), columns={name: ColumnSketch(name) for name in column_map})
+    if workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(workers) as executor:
+            partials = executor.map(_profile_chunk, chunks, [column_map] * len(chunks), [profile.label] * len(chunks))
+            for partial in partials:
+                profile.merge(partial)
+    else:
+        for chunk in chunks:
+            profile.merge(_profile_chunk(chunk, column_map, profile.label))
+    return profile
+
+
+# ------------------------------------------------------------------------------------------------
+# Comparison
+# ------------------------------------------------------------------------------------------------
+
+@dataclass
+class SketchTolerances:
+    """Allowed differences between two profiles; estimates get their own error bound on top"""
+    row_count_relative: float = 0.0
+    null_rate_absolute: float = 0.0
+    distinct_relative: float = 0.0  # in addition to 3 standard errors of the HLL estimate
+    top_k: int = 10
+    top_k_frequency_absolute: float = 0.001
+    quantile_relative: float = 0.0  # in addition to the sketch accuracy
+    quantile_rank: float = 0.005  # a quantile may move this far in rank (steps in discrete columns)
+    compare_min_max: bool = True
+
+
+@dataclass
+class SketchCheck:
+    column: str
+    check: str
+    left: object
+    right: object
+    passed: bool
+
+
+def _within(left: float, right: float, relative: float) -> bool:
+    return abs(left - right) <= relative * max(abs(left), abs(right)) + 1e-12
+
+
+def _quantile_matches(left: QuantileSketch, right: QuantileSketch, q: float, tolerances: SketchTolerances) -> bool:
+    """Each side's q-quantile must fall inside the other side's [q - rank, q + rank] band (plus value error)"""
+    relative = tolerances.quantile_relative + 2 * left.accuracy
+    for this, other in ((left, right), (right, left)):
+        value = this.quantile(q)
+        low, high = other.quantile(q - tolerances.quantile_rank), other.quantile(q + tolerances.quantile_rank)
+        if not (low - relative * abs(low) - 1e-12 <= value <= high + relative * abs(high) + 1e-12):
+            return False
+    return True
+
+
+def compare_column(left: ColumnSketch, right: ColumnSketch, tolerances: SketchTolerances) -> List[SketchCheck]:
+    """All checks for one column present in both profiles"""
+    name = left.name
+    checks = [SketchCheck(name, 'null_rate', round(left.null_rate, 6), round(right.null_rate, 6),
+                          abs(left.null_rate - right.null_rate) <= tolerances.null_rate_absolute)]
+
+    left_distinct, right_distinct = left.distinct.estimate(), right.distinct.estimate()
+    distinct_tolerance = tolerances.distinct_relative + 3 * left.distinct.relative_error
+    checks.append(SketchCheck(name, 'distinct', left_distinct, right_distinct,
+                              _within(left_distinct, right_distinct, distinct_tolerance)))
+
+    if tolerances.compare_min_max:
+        checks.append(SketchCheck(name, 'min', left.min_value, right.min_value, left.min_value == right.min_value))
+        checks.append(SketchCheck(name, 'max', left.max_value, right.max_value, left.max_value == right.max_value))
+
+    left_non_null = max(left.row_count - left.null_count, 1)
+    right_non_null = max(right.row_count - right.null_count, 1)
+    frequency_tolerance = (tolerances.top_k_frequency_absolute + left.top_k_error / left_non_null
+                           + right.top_k_error / right_non_null)
+    top_values = {v for v, _ in left.top_k(tolerances.top_k)} | {v for v, _ in right.top_k(tolerances.top_k)}
+    for value in sorted(top_values):
+        left_frequency = left.value_counts.get(value, 0) / left_non_null
+        right_frequency = right.value_counts.get(value, 0) / right_non_null
+        if abs(left_frequency - right_frequency) > frequency_tolerance:
+            checks.append(SketchCheck(name, f'top_k[{value}]', round(left_frequency, 6), round(right_frequency, 6),
+                                      False))
+    if not any(c.check.startswith('top_k') for c in checks):
+        checks.append(SketchCheck(name, 'top_k', len(top_values), len(top_values), True))
+
+    if left.numeric.count and right.numeric.count and min(left.numeric_rate, right.numeric_rate) > 0.99:
+        for q in REPORTED_QUANTILES:
+            checks.append(SketchCheck(name, f'p{int(q * 100)}', left.numeric.quantile(q), right.numeric.quantile(q),
+                                      _quantile_matches(left.numeric, right.numeric, q, tolerances)))
+    return checks
+
+
+def compare_profiles(left: TableProfile, right: TableProfile,
+                     tolerances: Optional[SketchTolerances] = None) -> List[SketchCheck]:
+    """Checks for the whole table: row counts, column presence and every shared column"""
+    tolerances = tolerances or SketchTolerances()
+    checks = [SketchCheck('*', 'row_count', left.row_count, right.row_count,
+                          _within(left.row_count, right.row_count, tolerances.row_count_relative))]
+    for name in sorted(set(left.columns) | set(right.columns)):
+        if name not in left.columns or name not in right.columns:
+            checks.append(SketchCheck(name, 'present', name in left.columns, name in right.columns, False))
+            continue
+        checks.extend(compare_column(left.columns[name], right.columns[name], tolerances))
+    return checks
+
+
+def print_comparison(left: TableProfile, right: TableProfile, checks: List[SketchCheck]) -> None:
+    failed = [c for c in checks if not c.passed]
+    columns = {c.column for c in checks if c.column != '*'}
+    failed_columns = {c.column for c in failed if c.column != '*'}
+    print(f"{left.label} vs {right.label}: {len(columns) - len(failed_columns)}/{len(columns)} columns match "
+          f"({len(checks) - len(failed)}/{len(checks)} checks passed)")
+    print(f"{'COLUMN':<40} {'CHECK':<24} {left.label[:30]:<32} {right.label[:30]:<32}")
+    for check in failed:
+        print(f"{check.column:<40} {check.check[:24]:<24} {str(check.left)[:30]:<32} {str(check.right)[:30]:<32}")
+    print("PARITY: PASS" if not failed else "PARITY: FAIL")
+
+
+def _load_or_profile(source: str, workers: int) -> TableProfile:
+    if source.endswith('.json'):
+        return TableProfile.load(source)
+    return profile_export([source], workers=workers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="One-pass column sketches of silver exports")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    profile_parser = subparsers.add_parser('profile', help="Profile an export and save the sketches as JSON")
+    profile_parser.add_argument('inputs', nargs='+', help="Export files, directories or globs")
+    profile_parser.add_argument('-o', '--output', required=True)
+    profile_parser.add_argument('--label', help="Name shown in comparisons (default: first input)")
+    profile_parser.add_argument('--ignore-columns', default='inserted_at')
+    profile_parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    profile_parser.add_argument('--show', action='store_true', help="Print per-column summaries")
+
+    compare_parser = subparsers.add_parser('compare', help="Compare two profiles (or exports) with tolerances")
+    compare_parser.add_argument('left', help="Baseline profile JSON or export path")
+    compare_parser.add_argument('right', help="Compared profile JSON or export path")
+    compare_parser.add_argument('--null-rate-tolerance', type=float, default=0.0)
+    compare_parser.add_argument('--distinct-tolerance', type=float, default=0.0)
+    compare_parser.add_argument('--top-k', type=int, default=10)
+    compare_parser.add_argument('--top-k-tolerance', type=float, default=0.001)
+    compare_parser.add_argument('--quantile-tolerance', type=float, default=0.0)
+    compare_parser.add_argument('--quantile-rank-tolerance', type=float, default=0.005)
+    compare_parser.add_argument('--row-count-tolerance', type=float, default=0.0)
+    compare_parser.add_argument('--skip-min-max', action='store_true')
+    compare_parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    if args.command == 'profile':
+        profile = profile_export(args.inputs, args.label, [c for c in args.ignore_columns.split(',') if c],
+                                 args.workers)
+        profile.save(args.output)
+        print(f"Profiled {profile.row_count:,} rows x {len(profile.columns)} columns -> {args.output}")
+        if args.show:
+            for name, sketch in profile.columns.items():
+                print(name, json.dumps(sketch.summary(), default=str))
+        return
+
+    left, right = _load_or_profile(args.left, args.workers), _load_or_profile(args.right, args.workers)
+    tolerances = SketchTolerances(row_count_relative=args.row_count_tolerance,
+                                  null_rate_absolute=args.null_rate_tolerance,
+                                  distinct_relative=args.distinct_tolerance, top_k=args.top_k,
+                                  top_k_frequency_absolute=args.top_k_tolerance,
+                                  quantile_relative=args.quantile_tolerance,
+                                  quantile_rank=args.quantile_rank_tolerance, compare_min_max=not args.skip_min_max)
+    checks = compare_profiles(left, right, tolerances)
+    print_comparison(left, right, checks)
+    sys.exit(0 if all(c.passed for c in checks) else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,948 @@
+#!/usr/bin/env python3
+"""
+Nuvei DWH Platform POC - Schema-Driven Snowflake SQL Generator
+Generates the Snowflake staging -> bronze -> silver scripts from `schema_config.json` instead of
+hand-maintaining them, so their columns cannot drift from the Databricks schema:
+
+    - staging -> bronze: line classification into the quarantine (same reasons as `ingest.py`) and the
+      `cols[N]` parse of every file column, typed by the schema (`3d_*` columns become `threed_*`)
+    - bronze -> silver: dedupe on the table keys, the test-client filter, the `create_conversions_columns`
+      CASE block and the `fixing_dtypes` expressions, in the Databricks silver column order
+
+Both come as a full rebuild and an incremental variant (only staging files missing from the bronze load
+log are parsed and appended, so a re-run is a no-op and deleting a file's log row reprocesses it; bronze
+rows newer than the silver checkpoint are MERGEd into silver, like `silver_batch_etl`). `verify` runs the
+DuckDB rendering of the same statements over raw drops, full then incremental, and compares bronze and
+silver with the local reference (`ingest.py` + `transforms.py`). `loadtest` times incremental bronze loads
+of successive drops against full rebuilds.
+
+Usage:
+    python -m shared.ncp_local.sqlgen generate -o snowflake/generated
+    python -m shared.ncp_local.sqlgen generate -o snowflake/generated --check
+    python -m shared.ncp_local.sqlgen verify /data/ncp_drops
+    python -m shared.ncp_local.sqlgen loadtest /data/ncp_drops --batches 8
+"""
+
+import argparse
+import logging
+import os
+import re
+import sys
+import textwrap
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from shared.ncp_local.exports import expand_paths, normalized_table
+from shared.ncp_local.ingest import read_bronze_batches
+from shared.ncp_local.quarantine import FileQuarantine
+from shared.ncp_local.schema import (
+    TEST_CLIENTS,
+    BOOLEAN_STRING_COLUMN,
+    COLUMNS_TO_FORCE_NULL,
+    BOOLEAN_TRUE_VALUES,
+    BOOLEAN_FALSE_VALUES,
+    STRING_NULL_VALUES,
+    DEPRECATED_VALUE,
+    TRANSACTION_STATUS_MAP,
+    APPROVED_RESULT_ID,
+    DECLINED_RESULT_ID,
+    CONVERSION_COLUMNS,
+    REJECT_COLUMN_COUNT,
+    REJECT_UNDECODABLE,
+    REJECT_UNPARSEABLE_FIELD,
+    TYPED_NULL_TOKENS,
+    UNDECODABLE_MARKERS,
+    SNOWFLAKE_COLUMN_ALIASES,
+    INGESTION_COLUMNS,
+    file_columns,
+    load_schema,
+    normalize_column_name,
+)
+from shared.ncp_local.transforms import NUMERIC_STRING_PATTERN, filter_and_transform_transactions
+from shared.ncp_local.tsv import DECIMAL_PATTERN, INTEGER_PATTERN, TIMESTAMP_PATTERN
+
+try:
+    import duckdb
+except ImportError:  # only needed for verify
+    duckdb = None
+
+logger = logging.getLogger(__name__)
+
+STAGING_TABLE = 'poc.public.ncp_bronze_staging_v2'
+QUARANTINE_TABLE = 'poc.public.ncp_bronze_quarantine_v2'
+REJECT_COUNTS_TABLE = 'poc.public.ncp_bronze_reject_counts_v2'
+BRONZE_TABLE = 'poc.public.ncp_bronze_v2'
+LOAD_LOG_TABLE = 'poc.public.ncp_bronze_load_log_v2'
+SILVER_TABLE = 'poc.public.ncp_silver_v2'
+SILVER_CHECKPOINT_TABLE = 'poc.public.ncp_silver_checkpoint_v2'
+CLASSIFIED_TABLE = 'ncp_bronze_classified_v2'
+PENDING_FILES_TABLE = 'ncp_bronze_pending_files_v2'
+SILVER_WINDOW_TABLE = 'ncp_silver_window_v2'
+SILVER_BATCH_TABLE = 'ncp_silver_batch_v2'
+
+TABLE_KEYS = ['transaction_main_id', 'transaction_date']
+
+# Bronze spellings of the Databricks '3d_*' columns (Snowflake identifiers cannot start with a digit)
+BRONZE_COLUMN_NAMES = {name: alias for alias, name in SNOWFLAKE_COLUMN_ALIASES.items() if alias.startswith('threed_')}
+# Copies the existing Snowflake silver also carries (validation.SNOWFLAKE_EXTRA_COLUMNS)
+SILVER_EXTRA_COLUMNS = {'three_ds_flow_status': '3d_flow_status'}
+
+SCRIPTS = {
+    '01_staging_to_bronze_full.sql': ('bronze', False),
+    '01_staging_to_bronze_incremental.sql': ('bronze', True),
+    '02_bronze_to_silver_full.sql': ('silver', False),
+    '02_bronze_to_silver_incremental.sql': ('silver', True),
+}
+
+# NUMERIC_STRING_PATTERN with the integer part captured: matching values keep only that part
+INTEGER_PART_PATTERN = NUMERIC_STRING_PATTERN.replace(r'^\d+', r'^(\d+)')
+INTEGER_PART_REPLACEMENT = r'\1'
+_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_$]*$')
+
+
+# ------------------------------------------------------------------------------------------------
+# Dialects
+# ------------------------------------------------------------------------------------------------
+
+class SnowflakeDialect:
+    """The few expressions that differ between Snowflake and the DuckDB stand-in"""
+    name = 'snowflake'
+    TYPES = {
+        'string': 'STRING', 'varchar': 'STRING', 'nvarchar': 'STRING', 'char': 'STRING', 'text': 'STRING',
+        'time': 'STRING', 'timestamp': 'TIMESTAMP_NTZ', 'datetime': 'TIMESTAMP_NTZ', 'date': 'DATE',
+        'int': 'INTEGER', 'integer': 'INTEGER', 'tinyint': 'TINYINT', 'smallint': 'SMALLINT',
+        'bigint': 'BIGINT', 'long': 'BIGINT', 'boolean': 'BOOLEAN', 'bit': 'BOOLEAN',
+        'float': 'FLOAT', 'real': 'FLOAT', 'double': 'DOUBLE', 'binary': 'BINARY', 'blob': 'BINARY',
+    }
+
+    def sql_type(self, type_name: str) -> str:
+        if type_name.startswith('decimal') or type_name.startswith('numeric'):
+            return 'DECIMAL' + type_name[type_name.index('('):]
+        return self.TYPES[type_name]
+
+    def literal(self, value: str) -> str:
+        escaped = []
+        for char in value:
+            if char == "'":
+                escaped.append("''")
+            elif char == '\\':
+                escaped.append('\\\\')
+            elif char == '\t':
+                escaped.append('\\t')
+            elif ord(char) < 0x20 or ord(char) > 0x7E:
+                escaped.append(f'\\u{ord(char):04X}')
+            else:
+                escaped.append(char)
+        return f"'{''.join(escaped)}'"
+
+    def split_line(self, column: str) -> str:
+        return f"SPLIT({column}, '\\t')"
+
+    def field(self, index: int) -> str:
+        """File column `index` (0-based) of the split line"""
+        return f"cols[{index}]::STRING"
+
+    def field_count(self) -> str:
+        return 'ARRAY_SIZE(cols)'
+
+    def matches(self, value: str, pattern: str) -> str:
+        return f"REGEXP_LIKE({value}, {self.literal(pattern)})"
+
+    def integer_part(self, value: str) -> str:
+        pattern, replacement = self.literal(INTEGER_PART_PATTERN), self.literal(INTEGER_PART_REPLACEMENT)
+        return f"REGEXP_REPLACE({value}, {pattern}, {replacement})"
+
+    def utc_now(self) -> str:
+        return 'SYSDATE()'
+
+
+class DuckDBDialect(SnowflakeDialect):
+    name = 'duckdb'
+    TYPES = {**SnowflakeDialect.TYPES, **{name: 'VARCHAR' for name, sql in SnowflakeDialect.TYPES.items()
+                                          if sql == 'STRING'},
+             'timestamp': 'TIMESTAMP', 'datetime': 'TIMESTAMP', 'binary': 'BLOB', 'blob': 'BLOB'}
+
+    def literal(self, value: str) -> str:
+        # No backslash escapes in DuckDB strings; NUL cannot appear in a literal at all
+        if value == '\x00':
+            return 'chr(0)'
+        return "'" + value.replace("'", "''") + "'"
+
+    def split_line(self, column: str) -> str:
+        return f"string_split({column}, chr(9))"
+
+    def field(self, index: int) -> str:
+        return f"cols[{index + 1}]"
+
+    def field_count(self) -> str:
+        return 'len(cols)'
+
+    def matches(self, value: str, pattern: str) -> str:
+        return f"regexp_full_match({value}, {self.literal(pattern)})"
+
+    def utc_now(self) -> str:
+        return "CAST(now() AS TIMESTAMP)"
+
+
+DIALECTS = {dialect.name: dialect for dialect in (SnowflakeDialect(), DuckDBDialect())}
+
+
+def identifier(name: str) -> str:
+    """Column name as written in the SQL; names that are not plain identifiers are quoted"""
+    return name if _IDENTIFIER.match(name) else f'"{name}"'
+
+
+def bronze_column(name: str) -> str:
+    return identifier(BRONZE_COLUMN_NAMES.get(name, name))
+
+
+def _in_list(dialect: SnowflakeDialect, values: Sequence[str]) -> str:
+    return ', '.join(dialect.literal(value) for value in values)
+
+
+def _column_list(names: Sequence[str], indent: str = '    ') -> str:
+    """Comma-separated names wrapped to readable lines"""
+    return '\n'.join(textwrap.wrap(', '.join(names), width=110, initial_indent=indent, subsequent_indent=indent,
+                                    break_long_words=False, break_on_hyphens=False))
+
+
+# ------------------------------------------------------------------------------------------------
+# Staging -> bronze
+# ------------------------------------------------------------------------------------------------
+
+def _parses(dialect: SnowflakeDialect, value: str, type_name: str) -> str:
+    """Condition: a non-empty raw token converts to the column type (tsv.cast_string_column rules)"""
+    sql_type = dialect.sql_type(type_name)
+    if sql_type.startswith('TIMESTAMP'):
+        return dialect.matches(value, TIMESTAMP_PATTERN)
+    if sql_type == 'DATE':
+        return dialect.matches(value, r'^\d{4}-\d{2}-\d{2}.*$')
+    if sql_type == 'BOOLEAN':
+        return f"LOWER(TRIM({value}, ' ')) IN ({_in_list(dialect, BOOLEAN_TRUE_VALUES + BOOLEAN_FALSE_VALUES)})"
+    if sql_type in ('INTEGER', 'TINYINT', 'SMALLINT', 'BIGINT'):
+        return dialect.matches(value, INTEGER_PATTERN)
+    return dialect.matches(value, DECIMAL_PATTERN)
+
+
+def _typed_value(dialect: SnowflakeDialect, value: str, type_name: str) -> str:
+    """Bronze value of a raw token; placeholders and unparseable tokens become null (Spark PERMISSIVE)"""
+    sql_type = dialect.sql_type(type_name)
+    if sql_type in ('STRING', 'VARCHAR'):
+        return f"NULLIF({value}, '')"
+    if sql_type == 'BOOLEAN':
+        normalized = f"LOWER(TRIM({value}, ' '))"
+        return (f"CASE WHEN {normalized} IN ({_in_list(dialect, BOOLEAN_TRUE_VALUES)}) THEN TRUE "
+                f"WHEN {normalized} IN ({_in_list(dialect, BOOLEAN_FALSE_VALUES)}) THEN FALSE END")
+    if sql_type == 'DATE':
+        return f"TRY_CAST(LEFT({value}, 10) AS DATE)"
+    return f"TRY_CAST(TRIM({value}) AS {sql_type})"
+
+
+def _unparseable(dialect: SnowflakeDialect, value: str, type_name: str) -> str:
+    """A typed field fails when its token neither converts nor is a null placeholder"""
+    return (f"{value} <> '' AND NOT {_parses(dialect, value, type_name)}\n"
+            f"             AND LOWER(TRIM({value})) NOT IN ({_in_list(dialect, TYPED_NULL_TOKENS)})")
+
+
+def classify_sql(dialect: SnowflakeDialect, schema_dict: Dict[str, str], incremental: bool) -> str:
+    """Split staging lines and attach a quarantine reason (NULL for valid lines)"""
+    columns = file_columns(schema_dict)
+    typed = [(index, name) for index, name in enumerate(columns)
+             if dialect.sql_type(schema_dict[name]) not in ('STRING', 'VARCHAR')]
+    markers = ' OR '.join(f"CONTAINS(raw_line, {dialect.literal(marker)})" for marker in UNDECODABLE_MARKERS)
+    reasons = [f"        WHEN {dialect.field_count()} <> {len(columns)} THEN '{REJECT_COLUMN_COUNT}'",
+               f"        WHEN {markers} THEN '{REJECT_UNDECODABLE}'"]
+    details = [f"        WHEN {dialect.field_count()} <> {len(columns)}\n"
+               f"            THEN 'expected {len(columns)} columns, got ' || {dialect.field_count()}",
+               f"        WHEN {markers} THEN 'U+FFFD in line'"]
+    for index, name in typed:
+        failed = _unparseable(dialect, dialect.field(index), schema_dict[name])
+        reasons.append(f"        WHEN {failed}\n            THEN '{REJECT_UNPARSEABLE_FIELD}'")
+        details.append(f"        WHEN {failed}\n            THEN '{name}=''' || {dialect.field(index)} || ''''")
+    pending = (f"\n    AND filename IN (SELECT filename FROM {PENDING_FILES_TABLE})" if incremental else '')
+    nl = '\n'
+    return f"""CREATE OR REPLACE TEMPORARY TABLE {CLASSIFIED_TABLE} AS
+WITH parsed_data AS (
+  SELECT
+    filename,
+    file_row_number,
+    loaded_at,
+    {dialect.split_line('raw_line')} AS cols,
+    raw_line
+  FROM {STAGING_TABLE}
+  WHERE raw_line IS NOT NULL
+    AND raw_line <> ''{pending}
+)
+SELECT
+    parsed_data.*,
+    CASE
+{nl.join(reasons)}
+    END AS reject_reason,
+    CASE
+{nl.join(details)}
+    END AS reject_detail
+FROM parsed_data"""
+
+
+def quarantine_sql(dialect: SnowflakeDialect) -> List[str]:
+    """Record the rejects of the classified files (replacing earlier parse rejects of the same files)"""
+    return [
+        f"""-- Re-running for the same files replaces their parse rejects and counts (COPY load errors are kept)
+DELETE FROM {QUARANTINE_TABLE}
+WHERE reason <> 'load_error'
+  AND filename IN (SELECT DISTINCT filename FROM {CLASSIFIED_TABLE})""",
+        f"""INSERT INTO {QUARANTINE_TABLE}
+SELECT filename, file_row_number, reject_reason, reject_detail, raw_line, CURRENT_TIMESTAMP
+FROM {CLASSIFIED_TABLE}
+WHERE reject_reason IS NOT NULL""",
+        f"""CREATE TABLE IF NOT EXISTS {REJECT_COUNTS_TABLE} (
+    filename {dialect.sql_type('string')},
+    reason {dialect.sql_type('string')},
+    rejected_rows {dialect.sql_type('long')},
+    recorded_at {dialect.sql_type('timestamp')}
+)""",
+        f"""DELETE FROM {REJECT_COUNTS_TABLE}
+WHERE SPLIT_PART(filename, '/', -1) IN (SELECT DISTINCT SPLIT_PART(filename, '/', -1) FROM {CLASSIFIED_TABLE})""",
+        f"""INSERT INTO {REJECT_COUNTS_TABLE}
+SELECT filename, reason, COUNT(*), CURRENT_TIMESTAMP
+FROM {QUARANTINE_TABLE}
+WHERE SPLIT_PART(filename, '/', -1) IN (SELECT DISTINCT SPLIT_PART(filename, '/', -1) FROM {CLASSIFIED_TABLE})
+GROUP BY filename, reason""",
+    ]
+
+
+def bronze_columns(dialect: SnowflakeDialect, schema_dict: Dict[str, str]) -> List[Tuple[str, str]]:
+    """(bronze column, SQL type) in bronze order: filename, inserted_at, the file columns, raw_line"""
+    columns = [('filename', dialect.sql_type('string')), ('inserted_at', dialect.sql_type('timestamp'))]
+    columns += [(bronze_column(name), dialect.sql_type(schema_dict[name])) for name in file_columns(schema_dict)]
+    return columns + [('raw_line', dialect.sql_type('string'))]
+
+
+def bronze_select_sql(dialect: SnowflakeDialect, schema_dict: Dict[str, str]) -> str:
+    """Typed parse of the valid classified lines: one expression per schema file column"""
+    expressions = ['    filename', '    loaded_at AS inserted_at']
+    for index, name in enumerate(file_columns(schema_dict)):
+        value = _typed_value(dialect, dialect.field(index), schema_dict[name])
+        expressions.append(f"    {value} AS {bronze_column(name)}")
+    expressions.append('    raw_line')
+    return "SELECT\n" + ',\n'.join(expressions) + f"\nFROM {CLASSIFIED_TABLE}\nWHERE reject_reason IS NULL"
+
+
+def load_log_ddl(dialect: SnowflakeDialect, replace: bool) -> str:
+    """One row per staging file parsed into bronze"""
+    create = 'CREATE OR REPLACE TABLE' if replace else 'CREATE TABLE IF NOT EXISTS'
+    return f"""{create} {LOAD_LOG_TABLE} (
+    filename {dialect.sql_type('string')},
+    staged_at {dialect.sql_type('timestamp')},
+    staged_lines {dialect.sql_type('long')},
+    bronze_rows {dialect.sql_type('long')},
+    rejected_rows {dialect.sql_type('long')},
+    loaded_at {dialect.sql_type('timestamp')}
+)"""
+
+
+def pending_files_sql(incremental: bool) -> str:
+    """Staging files to parse: all of them, or those not in the load log (delete a log row to reprocess)"""
+    new_files = f"\nWHERE filename NOT IN (SELECT filename FROM {LOAD_LOG_TABLE})" if incremental else ''
+    return f"""CREATE OR REPLACE TEMPORARY TABLE {PENDING_FILES_TABLE} AS
+SELECT
+    filename,
+    MAX(loaded_at) AS staged_at,
+    COUNT(*) AS staged_lines
+FROM {STAGING_TABLE}{new_files}
+GROUP BY filename"""
+
+
+def record_loads_sql(dialect: SnowflakeDialect) -> str:
+    return f"""INSERT INTO {LOAD_LOG_TABLE}
+SELECT
+    pending.filename,
+    pending.staged_at,
+    pending.staged_lines,
+    COUNT(classified.filename) - COUNT(classified.reject_reason),
+    COUNT(classified.reject_reason),
+    {dialect.utc_now()}
+FROM {PENDING_FILES_TABLE} pending
+LEFT JOIN {CLASSIFIED_TABLE} classified ON classified.filename = pending.filename
+GROUP BY pending.filename, pending.staged_at, pending.staged_lines"""
+
+
+def bronze_statements(dialect: SnowflakeDialect, schema_dict: Dict[str, str], incremental: bool) -> List[str]:
+    """Full: rebuild bronze and the load log from all of staging. Incremental: parse only the files not in
+    the load log and append them in one transaction (rows of reprocessed files are replaced)"""
+    statements = []
+    if incremental:
+        ddl = ',\n'.join(f"    {name} {sql_type}" for name, sql_type in bronze_columns(dialect, schema_dict))
+        statements += [f"-- STEP 0: Bronze table and load log (first run only)\n"
+                       f"CREATE TABLE IF NOT EXISTS {BRONZE_TABLE} (\n{ddl}\n)",
+                       load_log_ddl(dialect, replace=False)]
+    statements.append(f"-- STEP 1: Staging files to parse\n{pending_files_sql(incremental)}")
+    statements.append(f"-- STEP 1b: Classify their lines (rejects go to {QUARANTINE_TABLE})\n"
+                      + classify_sql(dialect, schema_dict, incremental))
+    statements.extend(quarantine_sql(dialect))
+    if incremental:
+        names = _column_list([name for name, _ in bronze_columns(dialect, schema_dict)])
+        statements += [
+            "-- STEP 2: Append the pending files to bronze and log them in one transaction\nBEGIN TRANSACTION",
+            f"DELETE FROM {BRONZE_TABLE}\nWHERE filename IN (SELECT filename FROM {PENDING_FILES_TABLE})",
+            f"INSERT INTO {BRONZE_TABLE} (\n{names}\n)\n" + bronze_select_sql(dialect, schema_dict),
+            record_loads_sql(dialect),
+            "COMMIT",
+        ]
+    else:
+        statements += [
+            f"-- STEP 2: Rebuild bronze from every staged file\nCREATE OR REPLACE TABLE {BRONZE_TABLE} AS\n"
+            + bronze_select_sql(dialect, schema_dict),
+            f"-- STEP 3: Restart the load log with every staged file\n{load_log_ddl(dialect, replace=True)}",
+            record_loads_sql(dialect),
+        ]
+    return statements
+
+
+# ------------------------------------------------------------------------------------------------
+# Bronze -> silver
+# ------------------------------------------------------------------------------------------------
+
+def _status_flags_sql() -> List[str]:
+    """create_conversions_columns step 2: 'true'/'false' for the matching transaction type, else NULL"""
+    return [f"    CASE WHEN transaction_type = '{transaction_type}'\n"
+            f"        THEN CASE WHEN transaction_result_id = '{APPROVED_RESULT_ID}' THEN 'true' ELSE 'false' END\n"
+            f"    END AS {name}" for name, transaction_type in TRANSACTION_STATUS_MAP.items()]
+
+
+def conversion_columns_sql() -> Tuple[List[str], List[str]]:
+    """
+    The create_conversions_columns CASE block over bronze values: the status flags, then the columns
+    that read them (Spark's lateral references become a second SELECT level). Values stay the strings
+    'true'/'false' as in Databricks, where these columns are not part of the schema.
+    """
+    flow_status = bronze_column('3d_flow_status')
+    frictionless_success = "authentication_flow = 'frictionless' AND status = '40'"
+    derived = {
+        'is_sale_3d_auth_3d': "CASE WHEN transaction_type = 'auth3d' THEN is_sale_3d END",
+        'manage_3d_decision_auth_3d': "CASE WHEN transaction_type = 'auth3d' THEN manage_3d_decision END",
+        'is_successful_challenge': f"""CASE
+        WHEN {flow_status} = '3d_success' THEN 'true'
+        WHEN {flow_status} IN ('3d_failure', '3d_wasnt_completed') THEN 'false'
+    END""",
+        'is_successful_exemption': """CASE
+        WHEN authentication_flow = 'exemption' THEN 'true'
+        WHEN challenge_preference = 'y_requested_by_acquirer' THEN 'false'
+    END""",
+        'is_successful_frictionless': f"""CASE
+        WHEN {frictionless_success} THEN 'true'
+        WHEN authentication_flow = 'frictionless' THEN 'false'
+    END""",
+        'is_successful_authentication': f"""CASE
+        WHEN {flow_status} = '3d_success' OR ({frictionless_success}) THEN 'true'
+        WHEN (acs_url IS NOT NULL AND authentication_flow <> 'exemption')
+          OR (authentication_flow = 'frictionless' AND status <> '40') THEN 'false'
+    END""",
+        'is_approved': """CASE
+        WHEN auth_status = 'true' OR sale_status = 'true' THEN 'true'
+        WHEN auth_status = 'false' OR sale_status = 'false' THEN 'false'
+    END""",
+        'is_declined': f"""CASE
+        WHEN transaction_type IN ('sale', 'auth') AND transaction_result_id = '{DECLINED_RESULT_ID}' THEN 'true'
+        WHEN auth_status IS NOT NULL OR sale_status IS NOT NULL THEN 'false'
+    END""",
+    }
+    missing = set(CONVERSION_COLUMNS) - set(derived) - set(TRANSACTION_STATUS_MAP)
+    if missing:
+        raise ValueError(f"No SQL for conversion columns {sorted(missing)}")
+    return _status_flags_sql(), [f"    {expression} AS {name}" for name, expression in derived.items()]
+
+
+def _cleans_string(dialect: SnowflakeDialect, name: str, type_name: str) -> bool:
+    return (name not in COLUMNS_TO_FORCE_NULL and name not in INGESTION_COLUMNS and name not in BOOLEAN_STRING_COLUMN
+            and dialect.sql_type(type_name) in ('STRING', 'VARCHAR'))
+
+
+def string_normalization_sql(dialect: SnowflakeDialect, name: str) -> str:
+    """Numeric-looking strings keep their integer part, then lower/trim (null tokens follow in fixing_dtypes_sql)"""
+    return f"TRIM(LOWER({dialect.integer_part(bronze_column(name))}), ' ')"
+
+
+def fixing_dtypes_sql(dialect: SnowflakeDialect, name: str, type_name: str) -> str:
+    """fixing_dtypes for one schema column, reading its bronze value (string columns already normalized)"""
+    sql_type = dialect.sql_type(type_name)
+    value = bronze_column(name)
+    if name in COLUMNS_TO_FORCE_NULL:
+        return f"CAST(NULL AS {sql_type})"
+    if name in INGESTION_COLUMNS:
+        # silver_batch_etl stamps the silver load time (UTC)
+        return dialect.utc_now()
+    if sql_type == 'BOOLEAN' or name in BOOLEAN_STRING_COLUMN:
+        normalized = f"TRIM(LOWER({value}), ' ')"
+        return (f"CASE WHEN {normalized} IN ({_in_list(dialect, BOOLEAN_TRUE_VALUES)}) THEN TRUE "
+                f"WHEN {normalized} IN ({_in_list(dialect, BOOLEAN_FALSE_VALUES)}) THEN FALSE END")
+    if _cleans_string(dialect, name, type_name):
+        null_tokens = _in_list(dialect, STRING_NULL_VALUES + [DEPRECATED_VALUE])
+        return f"CASE WHEN {value} IN ({null_tokens}) THEN NULL ELSE {value} END"
+    if sql_type in ('FLOAT', 'DOUBLE'):
+        return f"COALESCE(CAST({value} AS {sql_type}), 'NaN'::{sql_type})"
+    return f"CAST({value} AS {sql_type})"
+
+
+def silver_columns(schema_dict: Dict[str, str]) -> List[str]:
+    """Silver column order: schema columns (fixing_dtypes), conversion columns, Snowflake extras"""
+    return list(schema_dict) + list(CONVERSION_COLUMNS) + list(SILVER_EXTRA_COLUMNS)
+
+
+def silver_select_sql(dialect: SnowflakeDialect, schema_dict: Dict[str, str], source_filter: str) -> str:
+    """Dedupe (latest load wins), test-client filter, conversions and typed projection of bronze rows"""
+    keys = ', '.join(bronze_column(key) for key in TABLE_KEYS)
+    status_flags, derived = conversion_columns_sql()
+    normalized = [f"    {string_normalization_sql(dialect, name)} AS {bronze_column(name)}"
+                  for name, type_name in schema_dict.items() if _cleans_string(dialect, name, type_name)]
+    fixed = {name: fixing_dtypes_sql(dialect, name, type_name) for name, type_name in schema_dict.items()}
+    projection = [f"    {fixed[name]} AS {identifier(name)}" for name in schema_dict]
+    projection += [f"    {name}" for name in CONVERSION_COLUMNS]
+    projection += [f"    {fixed[column]} AS {identifier(alias)}" for alias, column in SILVER_EXTRA_COLUMNS.items()]
+    separator = ',\n'
+    return f"""WITH deduped_bronze AS (
+    SELECT *
+    FROM {BRONZE_TABLE}
+    WHERE {source_filter}
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY {keys} ORDER BY inserted_at DESC) = 1
+),
+filtered_data AS (
+    SELECT *
+    FROM deduped_bronze
+    WHERE multi_client_name IS NOT NULL
+      AND multi_client_name NOT IN ({_in_list(dialect, TEST_CLIENTS)})
+),
+status_flags_calculated AS (
+    SELECT
+    *,
+{separator.join(status_flags)}
+    FROM filtered_data
+),
+conversions_calculated AS (
+    SELECT
+    *,
+{separator.join(derived)}
+    FROM status_flags_calculated
+),
+strings_normalized AS (
+    SELECT * REPLACE (
+{separator.join(normalized)}
+    )
+    FROM conversions_calculated
+)
+SELECT
+{separator.join(projection)}
+FROM strings_normalized"""
+
+
+def silver_statements(dialect: SnowflakeDialect, schema_dict: Dict[str, str], incremental: bool) -> List[str]:
+    """
+    Bronze rows loaded after the last checkpoint and up to the newest bronze load at the start of the run
+    are processed, and that load time becomes the next checkpoint (silver_batch_etl's `inserted_at` sync
+    point). The full variant rebuilds silver from every bronze row up to that point.
+    """
+    timestamp = dialect.sql_type('timestamp')
+    statements = [
+        f"""CREATE TABLE IF NOT EXISTS {SILVER_CHECKPOINT_TABLE} (
+    checkpoint_time {timestamp},
+    rows_merged {dialect.sql_type('long')},
+    recorded_at {timestamp}
+)""",
+        f"""-- STEP 1: Bronze load window of this run
+CREATE OR REPLACE TEMPORARY TABLE {SILVER_WINDOW_TABLE} AS
+SELECT
+    {'(SELECT MAX(checkpoint_time) FROM ' + SILVER_CHECKPOINT_TABLE + ')' if incremental else 'NULL'} AS window_start,
+    (SELECT MAX(inserted_at) FROM {BRONZE_TABLE}) AS window_end""",
+    ]
+    source_filter = f"inserted_at <= (SELECT window_end FROM {SILVER_WINDOW_TABLE})"
+    if incremental:
+        source_filter = (f"inserted_at > COALESCE((SELECT window_start FROM {SILVER_WINDOW_TABLE}), "
+                         f"CAST('1900-01-01' AS {timestamp}))\n      AND {source_filter}")
+    select = silver_select_sql(dialect, schema_dict, source_filter)
+
+    if incremental:
+        columns = [identifier(name) for name in silver_columns(schema_dict)]
+        keys = ' AND '.join(f"target.{key} = source.{key}" for key in TABLE_KEYS)
+        updates = ',\n    '.join(f"{name} = source.{name}" for name in columns)
+        statements += [
+            f"-- STEP 2: Transform the new bronze rows\n"
+            f"CREATE OR REPLACE TEMPORARY TABLE {SILVER_BATCH_TABLE} AS\n{select}",
+            f"""-- STEP 3: Upsert them into silver (whenMatchedUpdateAll / whenNotMatchedInsertAll)
+MERGE INTO {SILVER_TABLE} AS target
+USING {SILVER_BATCH_TABLE} AS source
+ON {keys}
+WHEN MATCHED THEN UPDATE SET
+    {updates}
+WHEN NOT MATCHED THEN INSERT (
+{_column_list(columns)}
+) VALUES (
+{_column_list([f'source.{name}' for name in columns])}
+)""",
+            f"""-- STEP 4: Advance the checkpoint (only when the window had bronze rows)
+INSERT INTO {SILVER_CHECKPOINT_TABLE}
+SELECT window_end, (SELECT COUNT(*) FROM {SILVER_BATCH_TABLE}), {dialect.utc_now()}
+FROM {SILVER_WINDOW_TABLE}
+WHERE window_end IS NOT NULL
+  AND (window_start IS NULL OR window_end > window_start)""",
+        ]
+    else:
+        statements += [
+            f"-- STEP 2: Rebuild silver\nCREATE OR REPLACE TABLE {SILVER_TABLE} AS\n{select}",
+            f"-- STEP 3: Restart the checkpoint at the rebuilt window\nDELETE FROM {SILVER_CHECKPOINT_TABLE}",
+            f"""INSERT INTO {SILVER_CHECKPOINT_TABLE}
+SELECT window_end, (SELECT COUNT(*) FROM {SILVER_TABLE}), {dialect.utc_now()}
+FROM {SILVER_WINDOW_TABLE}
+WHERE window_end IS NOT NULL""",
+        ]
+    return statements
+
+
+# ------------------------------------------------------------------------------------------------
+# Scripts
+# ------------------------------------------------------------------------------------------------
+
+def statements_for(script: str, dialect: SnowflakeDialect, schema_dict: Dict[str, str]) -> List[str]:
+    layer, incremental = SCRIPTS[script]
+    build = bronze_statements if layer == 'bronze' else silver_statements
+    return build(dialect, schema_dict, incremental)
+
+
+def render_script(script: str, schema_dict: Dict[str, str]) -> str:
+    layer, incremental = SCRIPTS[script]
+    title = {'bronze': 'STAGING TO BRONZE', 'silver': 'BRONZE TO SILVER'}[layer]
+    variant = ('INCREMENTAL - only new staging files are parsed and appended' if layer == 'bronze' else
+               'INCREMENTAL - bronze rows after the checkpoint are merged') if incremental else 'FULL REBUILD'
+    header = [
+        f"-- {title} ({variant})",
+        "-- GENERATED by `python -m shared.ncp_local.sqlgen generate` from",
+        "-- databricks/original_scripts/schema_config.json - edit the generator, not this file.",
+        f"-- {len(file_columns(schema_dict))} file columns; silver has {len(silver_columns(schema_dict))} columns.",
+    ]
+    body = ';\n\n'.join(statements_for(script, SnowflakeDialect(), schema_dict))
+    return '\n'.join(header) + '\n\n' + body + ';\n'
+
+
+def generate_scripts(output_dir: str, table_name: str = 'transactions', check: bool = False) -> List[str]:
+    """Write every script; with `check`, write nothing and return the scripts that are out of date"""
+    schema_dict = load_schema(table_name)
+    stale = []
+    for script in SCRIPTS:
+        path = Path(output_dir) / script
+        text = render_script(script, schema_dict)
+        if path.exists() and path.read_text() == text:
+            continue
+        stale.append(str(path))
+        if not check:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text)
+    return stale
+
+
+# ------------------------------------------------------------------------------------------------
+# DuckDB verification
+# ------------------------------------------------------------------------------------------------
+
+@dataclass
+class VerifyReport:
+    """Outcome of running the generated SQL against the local reference"""
+    files: int = 0
+    bronze_rows: int = 0
+    silver_rows: int = 0
+    compared_rows: int = 0
+    mismatches: Dict[str, int] = field(default_factory=dict)
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return not self.errors and not any(self.mismatches.values())
+
+
+@dataclass
+class LoadRun:
+    """One staging drop loaded into bronze incrementally, and the full rebuild at the same point"""
+    batch: int
+    files: int
+    new_rows: int
+    bronze_rows: int
+    incremental_seconds: float
+    full_seconds: float
+
+    @property
+    def us_per_new_row(self) -> float:
+        return self.incremental_seconds * 1e6 / max(self.new_rows, 1)
+
+    @property
+    def us_per_bronze_row(self) -> float:
+        return self.full_seconds * 1e6 / max(self.bronze_rows, 1)
+
+
+@dataclass
+class LoadReport:
+    runs: List[LoadRun] = field(default_factory=list)
+    rerun_seconds: float = 0.0
+    reprocess_seconds: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+
+def _staging_table(paths: Sequence[str], loaded_at: datetime) -> pa.Table:
+    """Raw lines as COPY INTO loads them (ISO-8859-1, one row per line, 1-based row numbers)"""
+    filenames, row_numbers, lines = [], [], []
+    for path in paths:
+        with open(path, 'rb') as file:
+            for number, line in enumerate(file.read().decode('latin-1').split('\n'), start=1):
+                line = line.rstrip('\r')
+                if line:
+                    filenames.append(os.path.basename(path))
+                    row_numbers.append(number)
+                    lines.append(line)
+    loaded = pa.repeat(pa.scalar(loaded_at, pa.timestamp('us')), len(lines))
+    return pa.table({'filename': filenames, 'loaded_at': loaded,
+                     'file_row_number': pa.array(row_numbers, pa.int64()), 'raw_line': lines})
+
+
+def _stand_in():
+    """In-memory DuckDB with the `poc.public` staging and quarantine tables of 00_staging_data_loader.sql"""
+    if duckdb is None:
+        raise RuntimeError("the DuckDB stand-in needs the duckdb package")
+    connection = duckdb.connect()
+    connection.execute("ATTACH ':memory:' AS poc")
+    connection.execute("CREATE SCHEMA poc.public")
+    connection.execute(f"CREATE TABLE {STAGING_TABLE} (filename VARCHAR, loaded_at TIMESTAMP, "
+                       f"file_row_number BIGINT, raw_line VARCHAR)")
+    connection.execute(f"CREATE TABLE {QUARANTINE_TABLE} (filename VARCHAR, file_row_number BIGINT, reason VARCHAR, "
+                       f"detail VARCHAR, raw_line VARCHAR, quarantined_at TIMESTAMP)")
+    return connection
+
+
+def _stage(connection, paths: Sequence[str], loaded_at: datetime):
+    connection.register('staging_batch', _staging_table(paths, loaded_at))
+    connection.execute(f"INSERT INTO {STAGING_TABLE} SELECT * FROM staging_batch")
+    connection.unregister('staging_batch')
+
+
+def _execute(connection, statements: Sequence[str]) -> float:
+    start = time.perf_counter()
+    for statement in statements:
+        connection.execute(statement)
+    return time.perf_counter() - start
+
+
+def _keyed(table: pa.Table) -> pa.Table:
+    """Normalized text of every column plus a `_key` column, sorted by key"""
+    column_map = {normalize_column_name(name): name for name in table.column_names
+                  if name.lower() not in SILVER_EXTRA_COLUMNS}
+    columns = sorted(set(column_map) - set(INGESTION_COLUMNS))
+    normalized = pa.concat_tables([normalized_table(batch, column_map, columns) for batch in table.to_batches()])
+    key = pc.binary_join_element_wise(*[pc.fill_null(normalized[k], '\x00') for k in TABLE_KEYS], '\x1f')
+    normalized = normalized.append_column('_key', key)
+    return normalized.sort_by('_key')
+
+
+def _reference(paths: Sequence[str], schema_dict: Dict[str, str]) -> Tuple[pa.Table, Dict[str, Dict[str, int]]]:
+    """Local bronze (ingest.py) and its silver transform (transforms.py), plus reject counts per file"""
+    batches, rejects = [], {}
+    for path in paths:
+        with FileQuarantine(path) as quarantine:
+            batches.extend(read_bronze_batches(path, schema_dict, quarantine=quarantine))
+            rejects[os.path.basename(path)] = quarantine.counts
+    return pa.Table.from_batches(batches), rejects
+
+
+def verify(inputs: Sequence[str], table_name: str = 'transactions', initial_share: float = 0.5) -> VerifyReport:
+    """
+    Load the first `initial_share` of the files with the full scripts and the rest with the incremental
+    ones (then re-run them, which must change nothing), and compare with the local reference: bronze row
+    and reject counts per file, and every silver column of the keys that occur once in the input.
+    """
+    dialect, schema_dict = DuckDBDialect(), load_schema(table_name)
+    paths = sorted(expand_paths(inputs))
+    report = VerifyReport(files=len(paths))
+    split = max(1, min(len(paths), round(len(paths) * initial_share)))
+
+    connection = _stand_in()
+    full = [statements_for(script, dialect, schema_dict) for script in SCRIPTS if not SCRIPTS[script][1]]
+    incremental = [statements_for(script, dialect, schema_dict) for script in SCRIPTS if SCRIPTS[script][1]]
+    loaded_at = datetime.now(timezone.utc).replace(tzinfo=None)
+    for batch, (first, last) in enumerate([(0, split), (split, len(paths))]):
+        if first == last and batch:
+            continue
+        _stage(connection, paths[first:last], loaded_at + timedelta(seconds=batch))
+        for statements in (incremental if batch else full):
+            seconds = _execute(connection, statements)
+            logger.info(f"{'incremental' if batch else 'full'} load of {last - first} files: "
+                        f"{len(statements)} statements in {seconds:.2f}s")
+
+    silver_rows = connection.execute(f"SELECT COUNT(*) FROM {SILVER_TABLE}").fetchone()[0]
+    _execute(connection, [statement for statements in incremental for statement in statements])
+    rerun_rows = connection.execute(f"SELECT COUNT(*) FROM {SILVER_TABLE}").fetchone()[0]
+    if rerun_rows != silver_rows:
+        report.errors.append(f"re-running the incremental scripts changed silver from {silver_rows:,} "
+                             f"to {rerun_rows:,} rows")
+
+    # Bronze: rows and rejects per file
+    bronze, rejects = _reference(paths, schema_dict)
+    report.bronze_rows = bronze.num_rows
+    file_rows = pc.value_counts(bronze['source_file_name'])
+    expected_rows = dict(zip(file_rows.field(0).to_pylist(), file_rows.field(1).to_pylist()))
+    actual_rows = dict(connection.execute(
+        f"SELECT filename, COUNT(*) FROM {BRONZE_TABLE} GROUP BY filename").fetchall())
+    if actual_rows != expected_rows:
+        report.errors.append(f"bronze rows per file differ: expected {expected_rows}, got {actual_rows}")
+    actual_rejects: Dict[str, Dict[str, int]] = {}
+    for filename, reason, rows in connection.execute(
+            f"SELECT filename, reason, rejected_rows FROM {REJECT_COUNTS_TABLE}").fetchall():
+        actual_rejects.setdefault(filename, {})[reason] = rows
+    expected_rejects = {name: counts for name, counts in rejects.items() if counts}
+    if actual_rejects != expected_rejects:
+        report.errors.append(f"quarantine counts differ: expected {expected_rejects}, got {actual_rejects}")
+
+    # Silver: the keys that occur once (duplicates keep an arbitrary row in Databricks)
+    reference = filter_and_transform_transactions(bronze.drop_columns(['source_file_name']), schema_dict)
+    result = connection.execute(f"SELECT * FROM {SILVER_TABLE}").arrow()
+    result = result.read_all() if isinstance(result, pa.RecordBatchReader) else result
+    report.silver_rows = result.num_rows
+    expected_names = [identifier(name).strip('"') for name in silver_columns(schema_dict)]
+    if result.column_names != expected_names:
+        report.errors.append("silver columns are not in the generated order")
+
+    bronze_keys = _keyed(bronze.select(TABLE_KEYS))['_key']
+    counts = pc.value_counts(bronze_keys)
+    unique_keys = counts.field(0).filter(pc.equal(counts.field(1), 1))
+    reference, result = _keyed(reference), _keyed(result)
+    extra = pc.sum(pc.invert(pc.is_in(result['_key'], reference['_key']))).as_py()
+    if extra:
+        report.errors.append(f"{extra:,} silver keys are not in the reference")
+    reference = reference.filter(pc.is_in(reference['_key'], unique_keys))
+    result = result.filter(pc.is_in(result['_key'], unique_keys))
+    report.compared_rows = result.num_rows
+    if reference['_key'] != result['_key']:
+        report.errors.append("compared keys are not aligned")
+        return report
+    for name in reference.column_names:
+        if name == '_key':
+            continue
+        if name not in result.column_names:
+            report.errors.append(f"silver column {name} missing")
+            continue
+        left, right = reference[name], result[name]
+        equal = pc.or_(pc.fill_null(pc.equal(left, right), False), pc.and_(pc.is_null(left), pc.is_null(right)))
+        report.mismatches[name] = left.length() - pc.sum(pc.cast(equal, pa.int64())).as_py()
+    return report
+
+
+def _bronze_state(connection) -> Tuple[int, int, Dict[str, int]]:
+    """Bronze rows, load-log files and bronze rows per file"""
+    rows = connection.execute(f"SELECT COUNT(*) FROM {BRONZE_TABLE}").fetchone()[0]
+    logged = connection.execute(f"SELECT COUNT(*) FROM {LOAD_LOG_TABLE}").fetchone()[0]
+    per_file = dict(connection.execute(
+        f"SELECT filename, COUNT(*) FROM {BRONZE_TABLE} GROUP BY filename").fetchall())
+    return rows, logged, per_file
+
+
+def load_test(inputs: Sequence[str], table_name: str = 'transactions', batches: int = 4) -> LoadReport:
+    """
+    Stage the files in `batches` drops and load each one with the incremental bronze script, then time the
+    full rebuild over everything staged so far. Afterwards an unchanged re-run must load nothing and
+    reprocessing one file (its load-log row deleted) must leave bronze as it was.
+    """
+    dialect, schema_dict = DuckDBDialect(), load_schema(table_name)
+    incremental = bronze_statements(dialect, schema_dict, incremental=True)
+    full = bronze_statements(dialect, schema_dict, incremental=False)
+    paths = sorted(expand_paths(inputs))
+    batches = max(1, min(batches, len(paths)))
+    bounds = [round(len(paths) * batch / batches) for batch in range(batches + 1)]
+    report = LoadReport()
+
+    connection = _stand_in()
+    loaded_at = datetime.now(timezone.utc).replace(tzinfo=None)
+    bronze_rows = 0
+    for batch in range(batches):
+        _stage(connection, paths[bounds[batch]:bounds[batch + 1]], loaded_at + timedelta(minutes=15 * batch))
+        seconds = _execute(connection, incremental)
+        rows, _, _ = _bronze_state(connection)
+        full_seconds = _execute(connection, full)
+        rebuilt, _, _ = _bronze_state(connection)
+        if rebuilt != rows:
+            report.errors.append(f"batch {batch + 1}: full rebuild has {rebuilt:,} rows, incremental {rows:,}")
+        report.runs.append(LoadRun(batch + 1, bounds[batch + 1] - bounds[batch], rows - bronze_rows, rows,
+                                   seconds, full_seconds))
+        logger.info(f"batch {batch + 1}: +{rows - bronze_rows:,} rows in {seconds:.2f}s "
+                    f"(full rebuild of {rows:,} rows: {full_seconds:.2f}s)")
+        bronze_rows = rows
+
+    before = _bronze_state(connection)
+    report.rerun_seconds = _execute(connection, incremental)
+    if _bronze_state(connection) != before:
+        report.errors.append("re-running with no new files changed bronze or the load log")
+    reprocessed = os.path.basename(paths[0])
+    connection.execute(f"DELETE FROM {LOAD_LOG_TABLE} WHERE filename = ?", [reprocessed])
+    report.reprocess_seconds = _execute(connection, incremental)
+    if _bronze_state(connection) != before:
+        report.errors.append(f"reprocessing {reprocessed} did not restore bronze and the load log")
+    return report
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    parser = argparse.ArgumentParser(description="Generate and verify the Snowflake bronze/silver SQL")
+    commands = parser.add_subparsers(dest='command', required=True)
+    generate = commands.add_parser('generate', help="Write the full and incremental scripts")
+    generate.add_argument('-o', '--output-dir', default='snowflake/generated')
+    generate.add_argument('--table', default='transactions', help="schema_config.json table")
+    generate.add_argument('--check', action='store_true', help="Fail if the written scripts are out of date")
+    check = commands.add_parser('verify', help="Run the DuckDB rendering over raw drops against the local reference")
+    check.add_argument('inputs', nargs='+', help="Raw drop files, directories or globs")
+    check.add_argument('--table', default='transactions')
+    check.add_argument('--initial-share', type=float, default=0.5,
+                       help="Share of the files loaded by the full scripts (the rest goes incremental)")
+    load = commands.add_parser('loadtest', help="Time incremental bronze loads against full rebuilds (DuckDB)")
+    load.add_argument('inputs', nargs='+', help="Raw drop files, directories or globs")
+    load.add_argument('--table', default='transactions')
+    load.add_argument('--batches', type=int, default=4, help="Staging drops the files are split into")
+    args = parser.parse_args()
+
+    if args.command == 'generate':
+        stale = generate_scripts(args.output_dir, args.table, args.check)
+        if args.check:
+            for path in stale:
+                print(f"Out of date: {path}")
+            sys.exit(1 if stale else 0)
+        print(f"Wrote {len(stale)} of {len(SCRIPTS)} scripts to {args.output_dir}")
+        return
+
+    if args.command == 'loadtest':
+        load_report = load_test(args.inputs, args.table, args.batches)
+        print(f"{'batch':>5} {'files':>5} {'new rows':>10} {'bronze rows':>11} {'incr s':>7} {'us/new row':>10} "
+              f"{'full s':>7} {'us/bronze row':>13}")
+        for run in load_report.runs:
+            print(f"{run.batch:>5} {run.files:>5} {run.new_rows:>10,} {run.bronze_rows:>11,} "
+                  f"{run.incremental_seconds:>7.2f} {run.us_per_new_row:>10.1f} {run.full_seconds:>7.2f} "
+                  f"{run.us_per_bronze_row:>13.1f}")
+        print(f"Re-run with no new files: {load_report.rerun_seconds:.2f}s; "
+              f"reprocessing one file: {load_report.reprocess_seconds:.2f}s")
+        for error in load_report.errors:
+            print(f"FAIL {error}")
+        print('PASS' if not load_report.errors else 'FAIL')
+        sys.exit(1 if load_report.errors else 0)
+
+    start = time.perf_counter()
+    report = verify(args.inputs, args.table, args.initial_share)
+    for error in report.errors:
+        print(f"FAIL {error}")
+    for name, count in sorted(report.mismatches.items()):
+        if count:
+            print(f"FAIL {name}: {count:,} of {report.compared_rows:,} rows differ")
+    print(f"{'PASS' if report.passed else 'FAIL'}: {report.files} files, {report.bronze_rows:,} bronze rows, "
+          f"{report.silver_rows:,} silver rows, {report.compared_rows:,} compared on "
+          f"{len(report.mismatches)} columns in {time.perf_counter() - start:.1f}s")
+    sys.exit(0 if report.passed else 1)
+
+
+if __name__ == '__main__':
+    main()
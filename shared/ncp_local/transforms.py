@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+Nuvei DWH Platform POC - Vectorized Local Silver Transforms
+Columnar (pyarrow.compute) port of `create_conversions_columns`, `fixing_dtypes` and
+`filter_and_transform_transactions` from ncp_etl.transforms, so the transactions silver logic can be
+verified on a laptop and its output diffed against the Databricks and Snowflake exports.
+
+Usage:
+    python -m shared.ncp_local.transforms 5_REFERENCE_DATA/databricks_silver_data_sample -o silver_local.tsv
+"""
+
+import argparse
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from shared.ncp_local.schema import (
+    TEST_CLIENTS,
+    BOOLEAN_STRING_COLUMN,
+    COLUMNS_TO_FORCE_NULL,
+    BOOLEAN_TRUE_VALUES,
+    BOOLEAN_FALSE_VALUES,
+    STRING_NULL_VALUES,
+    DEPRECATED_VALUE,
+    TRANSACTION_STATUS_MAP,
+    APPROVED_RESULT_ID,
+    DECLINED_RESULT_ID,
+    CONVERSION_COLUMNS,
+    INGESTION_COLUMNS,
+    arrow_type,
+    file_columns,
+    load_schema,
+)
+from shared.ncp_local.columnar import hash_strings, on_distinct_values
+from shared.ncp_local.ingest import SINK_ENCODING, SINK_NULL_VALUES, read_bronze_batches
+from shared.ncp_local.tsv import cast_batch, cast_string_column, read_tsv_batches, write_tsv
+
+logger = logging.getLogger(__name__)
+
+NUMERIC_STRING_PATTERN = r'^\d+\.?\d*$'
+
+_reported_missing = set()
+
+Condition = Union[pa.Array, pa.ChunkedArray]
+Value = Union[str, pa.Array, pa.ChunkedArray]
+
+
+def _case(*branches: Tuple[Condition, Value], otherwise: Optional[Value] = None) -> pa.ChunkedArray:
+    """
+    Vectorized `F.when(...).when(...).otherwise(...)`: the first branch whose condition is true wins,
+    and a null condition counts as false, exactly like Spark.
+    """
+    first_value = branches[0][1]
+    value_type = pa.string() if isinstance(first_value, str) else first_value.type
+    result = otherwise if isinstance(otherwise, (pa.Array, pa.ChunkedArray)) else pa.scalar(otherwise, value_type)
+    for condition, value in reversed(branches):
+        result = pc.if_else(pc.fill_null(condition, False), value, result)
+    return result
+
+
+def _eq(values, literal):
+    return pc.equal(values, pa.scalar(literal, pa.string()))
+
+
+def _ne(values, literal):
+    return pc.not_equal(values, pa.scalar(literal, pa.string()))
+
+
+def _as_string(values):
+    return values if pa.types.is_string(values.type) else pc.cast(values, pa.string())
+
+
+def create_conversions_columns(table: pa.Table) -> pa.Table:
+    """
+    Adds the transaction status, challenge, exemption, frictionless, authentication, approval and
+    decline flag columns (same rules as the Spark version). Existing flag columns are recomputed.
+    """
+    transaction_type = _as_string(table['transaction_type'])
+    result_id = _as_string(table['transaction_result_id'])
+    flow_status = _as_string(table['3d_flow_status'])
+    authentication_flow = _as_string(table['authentication_flow'])
+    challenge_preference = _as_string(table['challenge_preference'])
+    status = _as_string(table['status'])
+    acs_url = table['acs_url']
+
+    new_cols = {}
+
+    # --- 1. Conditional copies ---
+    is_auth3d = _eq(transaction_type, 'auth3d')
+    new_cols['is_sale_3d_auth_3d'] = _case((is_auth3d, table['is_sale_3d']))
+    new_cols['manage_3d_decision_auth_3d'] = _case((is_auth3d, table['manage_3d_decision']))
+
+    # --- 2. Transaction result status flags ---
+    is_approved_result = _case((_eq(result_id, APPROVED_RESULT_ID), 'true'), otherwise='false')
+    for new_col, txn_type in TRANSACTION_STATUS_MAP.items():
+        new_cols[new_col] = _case((_eq(transaction_type, txn_type), is_approved_result))
+
+    # --- 3. Challenge success ---
+    new_cols['is_successful_challenge'] = _case(
+        (_eq(flow_status, '3d_success'), 'true'),
+        (pc.is_in(flow_status, pa.array(['3d_failure', '3d_wasnt_completed'])), 'false'),
+    )
+
+    # --- 4. Exemption logic ---
+    new_cols['is_successful_exemption'] = _case(
+        (_eq(authentication_flow, 'exemption'), 'true'),
+        (_eq(challenge_preference, 'y_requested_by_acquirer'), 'false'),
+    )
+
+    # --- 5. Frictionless logic ---
+    is_frictionless = _eq(authentication_flow, 'frictionless')
+    frictionless_success = pc.and_kleene(is_frictionless, _eq(status, '40'))
+    new_cols['is_successful_frictionless'] = _case(
+        (frictionless_success, 'true'),
+        (is_frictionless, 'false'),
+    )
+
+    # --- 6. Successful authentication ---
+    new_cols['is_successful_authentication'] = _case(
+        (pc.or_kleene(_eq(flow_status, '3d_success'), frictionless_success), 'true'),
+        (pc.or_kleene(pc.and_kleene(pc.is_valid(acs_url), _ne(authentication_flow, 'exemption')),
+                      pc.and_kleene(is_frictionless, _ne(status, '40'))), 'false'),
+    )
+
+    # --- 7. Approval logic (reads the status flags computed above, like Spark's lateral aliases) ---
+    auth_status, sale_status = new_cols['auth_status'], new_cols['sale_status']
+    new_cols['is_approved'] = _case(
+        (pc.or_kleene(_eq(auth_status, 'true'), _eq(sale_status, 'true')), 'true'),
+        (pc.or_kleene(_eq(auth_status, 'false'), _eq(sale_status, 'false')), 'false'),
+    )
+
+    # --- 8. Decline logic ---
+    new_cols['is_declined'] = _case(
+        (pc.and_kleene(pc.is_in(transaction_type, pa.array(['sale', 'auth'])),
+                       _eq(result_id, DECLINED_RESULT_ID)), 'true'),
+        (pc.or_kleene(pc.is_valid(auth_status), pc.is_valid(sale_status)), 'false'),
+    )
+
+    # --- Final projection ---
+    # Keep all existing columns and add new ones
+    table = table.drop_columns([c for c in CONVERSION_COLUMNS if c in table.column_names])
+    for new_col in CONVERSION_COLUMNS:
+        table = table.append_column(new_col, new_cols[new_col])
+    return table
+
+
+def _normalize_boolean(values) -> pa.ChunkedArray:
+    return on_distinct_values(_as_string(values), _normalize_boolean_values)
+
+
+def _normalize_boolean_values(values) -> pa.Array:
+    normalized = pc.utf8_trim(pc.utf8_lower(_as_string(values)), characters=' ')
+    return _case(
+        (pc.is_in(normalized, pa.array(BOOLEAN_TRUE_VALUES)), pa.scalar(True)),
+        (pc.is_in(normalized, pa.array(BOOLEAN_FALSE_VALUES)), pa.scalar(False)),
+    )
+
+
+def _clean_string(values) -> pa.ChunkedArray:
+    return on_distinct_values(_as_string(values), _clean_string_values)
+
+
+def _clean_string_values(values) -> pa.Array:
+    # Numeric-looking strings keep their integer part ("1.0" -> "1", "12.50" -> "12")
+    is_numeric = pc.match_substring_regex(values, NUMERIC_STRING_PATTERN)
+    values = pc.if_else(is_numeric, pc.replace_substring_regex(values, r'^(\d+).*$', r'\1'), values)
+    values = pc.utf8_trim(pc.utf8_lower(values), characters=' ')
+    null = pa.scalar(None, pa.string())
+    values = pc.if_else(pc.is_in(values, pa.array(STRING_NULL_VALUES)), null, values)
+    return pc.if_else(_eq(values, DEPRECATED_VALUE), null, values)
+
+
+def fixing_dtypes(table: pa.Table, schema_dict: Dict[str, str]) -> pa.Table:
+    """
+    Fixes the column types according to the schema: normalizes boolean strings, trims and lowers string
+    columns, blanks the forced-null columns and casts everything else. Columns outside the schema are
+    passed through after the schema columns.
+    """
+    num_rows = table.num_rows
+    new_cols = {}
+
+    for field, type_name in schema_dict.items():
+        field_type = arrow_type(type_name)
+        if field in COLUMNS_TO_FORCE_NULL:
+            new_cols[field] = pa.nulls(num_rows, field_type)
+            continue
+
+        if field not in table.column_names:
+            if field not in _reported_missing:
+                logger.warning(f"Column '{field}' missing from input, filled with nulls")
+                _reported_missing.add(field)
+            new_cols[field] = pa.nulls(num_rows, pa.bool_() if field in BOOLEAN_STRING_COLUMN else field_type)
+            continue
+
+        values = table[field]
+        if pa.types.is_boolean(field_type) or field in BOOLEAN_STRING_COLUMN:
+            new_cols[field] = _normalize_boolean(values)
+        elif pa.types.is_string(field_type):
+            new_cols[field] = _clean_string(values)
+        else:
+            if pa.types.is_string(values.type):
+                values = cast_string_column(values.combine_chunks(), field_type)
+            values = pc.cast(values, field_type)
+            if pa.types.is_floating(field_type):
+                values = pc.fill_null(values, float('nan'))
+            new_cols[field] = values
+
+    # Also select any additional columns in the table that are not part of the schema
+    for name in table.column_names:
+        if name not in schema_dict:
+            new_cols[name] = table[name]
+    return pa.table(new_cols)
+
+
+def filter_and_transform_transactions(table: pa.Table, schema_dict: Dict[str, str]) -> pa.Table:
+    """
+    Removes test clients (and, as Spark's filter does, rows with a null client name), creates the
+    transaction status columns and fixes data types.
+    """
+    client_name = table['multi_client_name']
+    keep = pc.and_(pc.is_valid(client_name), pc.invert(pc.is_in(client_name, pa.array(TEST_CLIENTS))))
+    table = table.filter(keep)
+    table = create_conversions_columns(table)
+    return fixing_dtypes(table, schema_dict)
+
+
+class Deduplicator:
+    """
+    Streaming `dropDuplicates(keys)`: keeps the first row seen for each key across batches.
+
+    Seen keys are kept as 64-bit hashes in sorted runs (merged when a run is as large as the one before it,
+    so each key is re-sorted O(log n) times) and probed with a binary search; a hash hit is confirmed
+    against the stored key text, so a collision cannot drop a row.
+    """
+
+    def __init__(self, keys: Sequence[str]):
+        self.keys = list(keys)
+        self._runs: List[Tuple[np.ndarray, np.ndarray]] = []  # (sorted key hashes, positions in _seen_keys)
+        self._seen_keys: List[pa.Array] = []
+        self._seen_count = 0
+
+    def _lookup(self, hashes: np.ndarray) -> np.ndarray:
+        """Position of a stored key with the same hash, -1 where there is none"""
+        # Probing in sorted order keeps the binary searches cache-friendly
+        order = np.argsort(hashes)
+        probes = hashes[order]
+        found = np.full(len(hashes), -1, dtype=np.int64)
+        for run_hashes, run_positions in self._runs:
+            index = np.minimum(np.searchsorted(run_hashes, probes), len(run_hashes) - 1)
+            hit = run_hashes[index] == probes
+            found[hit] = run_positions[index[hit]]
+        positions = np.empty_like(found)
+        positions[order] = found
+        return positions
+
+    def _is_seen(self, key: str, key_hash: np.uint64) -> bool:
+        """Exact check of one key against every stored key with its hash (only after a hash collision)"""
+        seen_keys = pa.chunked_array(self._seen_keys, pa.string())
+        for run_hashes, run_positions in self._runs:
+            first, last = np.searchsorted(run_hashes, key_hash), np.searchsorted(run_hashes, key_hash, 'right')
+            if key in seen_keys.take(pa.array(run_positions[first:last])).to_pylist():
+                return True
+        return False
+
+    def _remember(self, keys: pa.Array, hashes: np.ndarray) -> None:
+        order = np.argsort(hashes, kind='stable')
+        positions = np.arange(self._seen_count, self._seen_count + len(keys), dtype=np.int64)
+        self._runs.append((hashes[order], positions[order]))
+        self._seen_keys.append(keys)
+        self._seen_count += len(keys)
+        while len(self._runs) > 1 and len(self._runs[-1][0]) >= len(self._runs[-2][0]):
+            (newer_hashes, newer_positions), (older_hashes, older_positions) = self._runs.pop(), self._runs.pop()
+            merged_hashes = np.concatenate([older_hashes, newer_hashes])
+            order = np.argsort(merged_hashes, kind='stable')
+            self._runs.append((merged_hashes[order], np.concatenate([older_positions, newer_positions])[order]))
+
+    def __call__(self, table: pa.Table) -> pa.Table:
+        key = pc.binary_join_element_wise(*[_as_string(table[k]) for k in self.keys], '\x1f',
+                                          null_handling='replace', null_replacement='\x00')
+        indexed = pa.table({'key': key, 'row': pa.array(range(table.num_rows), pa.int64())})
+        first_rows = indexed.group_by('key', use_threads=False).aggregate([('row', 'min')])
+        keys = first_rows['key'].combine_chunks()
+        hashes = hash_strings(keys)
+        positions = self._lookup(hashes)
+        new = positions < 0
+        hits = np.flatnonzero(~new)
+        if len(hits):
+            stored = pa.chunked_array(self._seen_keys, pa.string()).take(pa.array(positions[hits]))
+            same = pc.equal(keys.take(pa.array(hits)), stored).to_numpy(zero_copy_only=False)
+            for hit in hits[~same].tolist():
+                new[hit] = not self._is_seen(keys[hit].as_py(), hashes[hit])
+        selected = pa.array(np.flatnonzero(new))
+        self._remember(keys.take(selected), hashes[new])
+        rows = first_rows['row_min'].take(selected)
+        return table.take(pc.take(rows, pc.sort_indices(rows)))
+
+
+def transform_batches(batches: Iterable[pa.RecordBatch], schema_dict: Dict[str, str],
+                      dedupe_keys: Optional[List[str]] = None,
+                      workers: int = os.cpu_count() or 1) -> Iterator[pa.Table]:
+    """
+    Type raw/exported string batches with the schema and run the silver transforms on each. Batches are
+    transformed on a thread pool (Arrow kernels release the GIL) and yielded in input order; at most
+    `2 * workers` batches are in flight, which bounds memory.
+    """
+    deduplicate = Deduplicator(dedupe_keys) if dedupe_keys else None
+    inserted_at = pa.scalar(datetime.now(timezone.utc).replace(tzinfo=None), pa.timestamp('ms'))
+
+    def prepare(batch):
+        table = cast_batch(batch, schema_dict)
+        if 'inserted_at' not in table.column_names:
+            table = table.append_column('inserted_at', pa.repeat(inserted_at, table.num_rows))
+        return table
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque()
+        for batch in batches:
+            table = prepare(batch)
+            if deduplicate:
+                table = deduplicate(table)
+            in_flight.append(executor.submit(filter_and_transform_transactions, table, schema_dict))
+            if len(in_flight) >= 2 * workers:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def transform_files(input_paths: Sequence[Union[str, Path]], output_path: Union[str, Path],
+                    table_name: str = 'transactions', headerless: bool = False,
+                    dedupe_keys: Optional[List[str]] = None, block_size: int = 16 << 20,
+                    workers: int = os.cpu_count() or 1) -> int:
+    """Run the silver transforms over TSV files into one TSV export. Returns rows written."""
+    schema_dict = load_schema(table_name)
+    return write_tsv(transform_batches(_input_batches(input_paths, schema_dict, headerless, block_size),
+                                       schema_dict, dedupe_keys, workers), output_path)
+
+
+def _input_batches(input_paths: Sequence[Union[str, Path]], schema_dict: Dict[str, str], headerless: bool,
+                   block_size: int = 16 << 20) -> Iterator[pa.RecordBatch]:
+    """Raw drops are read like the bronze sink ('null' and '-' tokens stay strings); exports with a header
+    use the export null tokens"""
+    for path in input_paths:
+        if headerless:
+            yield from read_tsv_batches(path, column_names=file_columns(schema_dict), null_values=SINK_NULL_VALUES,
+                                        encoding=SINK_ENCODING, block_size=block_size)
+        else:
+            yield from read_tsv_batches(path, block_size=block_size)
+
+
+def compare_with_bronze(input_paths: Sequence[Union[str, Path]], table_name: str = 'transactions') -> List[str]:
+    """
+    Check the headerless path against bronze (ingest.py) -> filter_and_transform_transactions for the same
+    raw drops. Returns the differences (row count, then columns with their differing row counts).
+    """
+    schema_dict = load_schema(table_name)
+    headerless = pa.concat_tables(transform_batches(_input_batches(input_paths, schema_dict, True), schema_dict,
+                                                    workers=1))
+    bronze = pa.Table.from_batches([batch for path in input_paths
+                                    for batch in read_bronze_batches(str(path), schema_dict)])
+    reference = filter_and_transform_transactions(bronze.drop_columns(['source_file_name']), schema_dict)
+    if headerless.num_rows != reference.num_rows:
+        return [f"rows: headerless {headerless.num_rows:,}, bronze {reference.num_rows:,}"]
+    differences = []
+    for name in reference.column_names:
+        if name in INGESTION_COLUMNS:
+            continue
+        if name not in headerless.column_names:
+            differences.append(f"{name}: missing from the headerless output")
+            continue
+        left, right = reference[name], headerless[name].cast(reference[name].type)
+        equal = pc.or_(pc.fill_null(pc.equal(left, right), False), pc.and_(pc.is_null(left), pc.is_null(right)))
+        # NaN floats (fixing_dtypes fills nulls with NaN) never compare equal
+        if pa.types.is_floating(left.type):
+            both_nan = pc.and_(pc.fill_null(pc.is_nan(left), False), pc.fill_null(pc.is_nan(right), False))
+            equal = pc.or_(equal, both_nan)
+        differing = left.length() - pc.sum(pc.cast(equal, pa.int64())).as_py()
+        if differing:
+            differences.append(f"{name}: {differing:,} rows differ")
+    return differences
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the transactions silver transforms locally")
+    parser.add_argument('inputs', nargs='+', help="TSV files (exports with a header, or raw drops with --headerless)")
+    parser.add_argument('-o', '--output', required=True, help="Output TSV path")
+    parser.add_argument('--table', default='transactions', help="schema_config.json table")
+    parser.add_argument('--headerless', action='store_true', help="Inputs are raw SFTP drops in schema column order")
+    parser.add_argument('--check-bronze', action='store_true',
+                        help="With --headerless: also check the output against bronze (ingest.py) -> silver")
+    parser.add_argument('--dedupe-keys', help="Comma-separated keys for dropDuplicates (e.g. transaction_main_id)")
+    parser.add_argument('--block-size-mb', type=int, default=16)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Transform threads")
+    args = parser.parse_args()
+    if args.check_bronze and (not args.headerless or args.dedupe_keys):
+        parser.error("--check-bronze needs --headerless and no --dedupe-keys")
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s %(message)s')
+    start = time.perf_counter()
+    rows = transform_files(args.inputs, args.output, args.table, args.headerless,
+                           args.dedupe_keys.split(',') if args.dedupe_keys else None,
+                           args.block_size_mb << 20, args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {rows:,} rows to {args.output} in {elapsed:.2f}s "
+          f"({rows / max(elapsed, 1e-9) * 60:,.0f} rows/min)")
+    if args.check_bronze:
+        differences = compare_with_bronze(args.inputs, args.table)
+        for difference in differences:
+            print(f"FAIL {difference}")
+        print("Headerless output matches bronze -> silver" if not differences else "BRONZE CHECK: FAIL")
+        if differences:
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
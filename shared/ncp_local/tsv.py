@@ -0,0 +1,206 @@
+"""
+Nuvei DWH Platform POC - TSV Export Reader/Writer
+Streams tab-delimited NCP files (raw drops or platform exports) as Arrow record batches.
+"""
+
+import mmap
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+
+from shared.ncp_local.schema import arrow_type, BOOLEAN_TRUE_VALUES, BOOLEAN_FALSE_VALUES
+
+# Null spellings written by the Databricks/Snowflake exports ('NaN' is kept: it is data in string columns)
+EXPORT_NULL_VALUES = ['null', 'NULL', '']
+
+LATIN1_ENCODINGS = {'latin-1', 'latin1', 'iso-8859-1', 'iso8859-1'}
+
+TIMESTAMP_PATTERN = r'^\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(\.\d+)?$'
+INTEGER_PATTERN = r'^\s*-?\d+\s*$'
+DECIMAL_PATTERN = r'^\s*-?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?\s*$'
+
+
+def read_header(path: Union[str, Path], encoding: str = 'latin-1') -> List[str]:
+    """Column names from the first line of a TSV export"""
+    with open(path, 'r', encoding=encoding) as file:
+        return file.readline().rstrip('\r\n').split('\t')
+
+
+def split_byte_ranges(path: Union[str, Path], target_bytes: int = 256 << 20,
+                      has_header: bool = True) -> List[Tuple[int, int]]:
+    """
+    Split a TSV file into [start, end) byte ranges of roughly `target_bytes` that begin and end on line
+    boundaries (values never contain newlines: the loaders run with multiLine=false), so ranges can be
+    parsed independently and in parallel. The header line is excluded.
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        start = mapped.find(b'\n') + 1 if has_header else 0
+        if has_header and start == 0:
+            return []
+        ranges = []
+        while start < size:
+            end = min(start + target_bytes, size)
+            if end < size:
+                newline = mapped.find(b'\n', end)
+                end = size if newline == -1 else newline + 1
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _tsv_options(header: List[str], null_values: Optional[List[str]] = None,
+                 include_columns: Optional[List[str]] = None,
+                 invalid_row_handler: Optional[Callable] = None) -> Tuple[pacsv.ParseOptions, pacsv.ConvertOptions]:
+    """Parse/convert options shared by every TSV read: tab, '"' quote, no multi-line values, all strings"""
+    parse_options = pacsv.ParseOptions(delimiter='\t', quote_char='"', double_quote=True,
+                                       newlines_in_values=False, invalid_row_handler=invalid_row_handler)
+    convert_options = pacsv.ConvertOptions(
+        column_types={name: pa.string() for name in header},
+        null_values=EXPORT_NULL_VALUES if null_values is None else null_values,
+        strings_can_be_null=True,
+        include_columns=include_columns or [],
+    )
+    return parse_options, convert_options
+
+
+def read_tsv_batches(path: Union[str, Path], column_names: Optional[List[str]] = None,
+                     null_values: Optional[List[str]] = None, encoding: str = 'latin-1',
+                     block_size: int = 16 << 20,
+                     byte_range: Optional[Tuple[int, int]] = None,
+                     include_columns: Optional[List[str]] = None,
+                     invalid_row_handler: Optional[Callable] = None) -> Iterator[pa.RecordBatch]:
+    """
+    Stream a TSV file as all-string record batches.
+
+    Args:
+        path: File to read.
+        column_names: Column names for headerless files; None reads them from the first line.
+        null_values: Tokens read as null (defaults to EXPORT_NULL_VALUES).
+        encoding: Source encoding (the SFTP drops are ISO-8859-1).
+        block_size: Bytes per parsed block, which bounds memory per batch.
+        byte_range: Only parse this [start, end) slice of the file (see split_byte_ranges); the slice
+            is memory-mapped, not copied.
+        include_columns: Only convert these columns (the others are tokenized but skipped).
+        invalid_row_handler: Called with rows whose column count is wrong; returns 'skip' or 'error'
+            (pyarrow.csv.ParseOptions.invalid_row_handler). Default raises.
+    """
+    header = column_names if column_names is not None else read_header(path, encoding)
+    skip_header = column_names is None and byte_range is None
+    read_options = pacsv.ReadOptions(column_names=header, skip_rows=1 if skip_header else 0,
+                                     block_size=block_size, encoding=encoding)
+    parse_options, convert_options = _tsv_options(header, null_values, include_columns, invalid_row_handler)
+
+    if byte_range is not None:
+        start, end = byte_range
+        if end <= start:
+            return
+        with pa.memory_map(str(path), 'r') as mapped:
+            mapped.seek(start)
+            data = mapped.read_buffer(end - start)  # zero-copy view of the mapping
+            # Pure-ASCII ranges are valid UTF-8, so they skip Arrow's transcoding stream
+            if encoding.lower().replace('_', '-') in LATIN1_ENCODINGS and \
+                    np.frombuffer(data, dtype=np.uint8).max(initial=0) < 0x80:
+                read_options.encoding = 'utf8'
+            yield from pacsv.open_csv(pa.BufferReader(data), read_options=read_options,
+                                      parse_options=parse_options, convert_options=convert_options)
+        return
+
+    reader = pacsv.open_csv(path, read_options=read_options, parse_options=parse_options,
+                            convert_options=convert_options)
+    for batch in reader:
+        yield batch
+
+
+def read_tsv_lines(lines: Sequence[bytes], column_names: List[str], encoding: str = 'latin-1') -> pa.Table:
+    """Parse individual TSV lines (without their newline, e.g. fetched by byte offset) as an all-string table"""
+    read_options = pacsv.ReadOptions(column_names=column_names, encoding=encoding)
+    parse_options, convert_options = _tsv_options(column_names)
+    if not lines:
+        return pa.table({name: pa.array([], pa.string()) for name in column_names})
+    return pacsv.read_csv(pa.BufferReader(b'\n'.join(lines) + b'\n'), read_options=read_options,
+                          parse_options=parse_options, convert_options=convert_options)
+
+
+def cast_string_column(values: pa.Array, target: pa.DataType) -> pa.Array:
+    """Cast a string column the way Spark's permissive CSV reader does: unparseable values become null"""
+    if pa.types.is_string(target):
+        return values
+    if pa.types.is_timestamp(target) or pa.types.is_date(target):
+        valid = pc.match_substring_regex(values, TIMESTAMP_PATTERN if pa.types.is_timestamp(target)
+                                         else r'^\d{4}-\d{2}-\d{2}')
+        cleaned = pc.if_else(valid, values, pa.scalar(None, pa.string()))
+        if pa.types.is_date(target):
+            cleaned = pc.utf8_slice_codeunits(cleaned, 0, 10)
+        return pc.cast(cleaned, target)
+    if pa.types.is_boolean(target):
+        normalized = pc.utf8_lower(pc.utf8_trim(values, characters=' '))
+        return pc.if_else(pc.is_in(normalized, pa.array(BOOLEAN_TRUE_VALUES)), True,
+                          pc.if_else(pc.is_in(normalized, pa.array(BOOLEAN_FALSE_VALUES)), False,
+                                     pa.scalar(None, pa.bool_())))
+    pattern = INTEGER_PATTERN if pa.types.is_integer(target) else DECIMAL_PATTERN
+    valid = pc.match_substring_regex(values, pattern)
+    cleaned = pc.utf8_trim(pc.if_else(valid, values, pa.scalar(None, pa.string())), characters=' ')
+    if pa.types.is_decimal(target):
+        return pc.cast(pc.cast(cleaned, pa.float64()), target, safe=False)
+    return pc.cast(cleaned, target)
+
+
+def cast_batch(batch: Union[pa.RecordBatch, pa.Table], schema_dict: Dict[str, str]) -> pa.Table:
+    """Type the schema columns of an all-string batch; columns not in the schema stay strings"""
+    table = pa.Table.from_batches([batch]) if isinstance(batch, pa.RecordBatch) else batch
+    columns = []
+    for name, values in zip(table.column_names, table.columns):
+        if name in schema_dict:
+            target = arrow_type(schema_dict[name])
+            if not pa.types.is_string(target):
+                values = cast_string_column(values, target)
+        columns.append(values)
+    return pa.table(columns, names=table.column_names)
+
+
+def format_column(values: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Render a typed column as export text (ISO timestamps with millis, lower-case booleans)"""
+    if pa.types.is_timestamp(values.type):
+        return pc.strftime(pc.cast(values, pa.timestamp('ms')), format='%Y-%m-%dT%H:%M:%S')
+    if pa.types.is_string(values.type):
+        return values
+    return pc.cast(values, pa.string())
+
+
+def write_lines(file, lines: pa.ChunkedArray) -> None:
+    """Append a newline to each value and write the string data buffers directly (no Python strings)"""
+    for chunk in lines.chunks:
+        newline, empty = (b'\n', b'') if pa.types.is_binary(chunk.type) else ('\n', '')
+        chunk = pc.binary_join_element_wise(chunk, newline, empty)
+        if len(chunk) == 0:
+            continue
+        buffers = chunk.buffers()
+        offsets = pa.Array.from_buffers(pa.int32(), len(chunk) + 1, [None, buffers[1]], offset=chunk.offset)
+        file.write(memoryview(buffers[2])[offsets[0].as_py():offsets[-1].as_py()])
+
+
+def write_tsv(tables: Iterable[pa.Table], path: Union[str, Path], header: bool = True,
+              null_token: str = 'null') -> int:
+    """Write tables as one UTF-8 TSV export (same layout as the Databricks exports). Returns rows written."""
+    rows_written = 0
+    with open(path, 'wb') as file:
+        for table in tables:
+            if header:
+                file.write(('\t'.join(table.column_names) + '\n').encode('utf-8'))
+                header = False
+            if table.num_rows == 0:
+                continue
+            columns = [format_column(table.column(i)) for i in range(table.num_columns)]
+            lines = pc.binary_join_element_wise(*columns, '\t', null_handling='replace',
+                                                null_replacement=null_token)
+            write_lines(file, lines)
+            rows_written += table.num_rows
+    return rows_written
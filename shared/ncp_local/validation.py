@@ -0,0 +1,801 @@
+#!/usr/bin/env python3
+"""
+Nuvei DWH Platform POC - Progressive Validation Runner
+Runs `final/progressive_validation.sql` and `snowflake/validation/sanity_check_comprehensive.sql` as named
+checks instead of pasting queries into two consoles.
+
+- Each file is parsed into levels (`LEVEL n: ...` / `n. ...` headers) and statements. Statements inside
+  `/* ... */` blocks are the Databricks counterparts; within a level the n-th Databricks statement is
+  paired with the n-th Snowflake one, and the pair is compared for parity.
+- Checks of one level run concurrently through a pluggable backend (a connection pool per platform).
+  The offline stand-in is DuckDB over local Parquet/TSV exports, exposed as `POC.PUBLIC.NCP_SILVER_V2`
+  (Snowflake spellings) and `ncp.silver` (Databricks spellings); live backends use the Snowflake and
+  Databricks SQL connectors.
+- Results are cached by query text and input fingerprint (export paths, sizes and modification times),
+  so unchanged inputs are not queried twice. Live backends are not cached.
+- A failing level stops the run: later levels are reported as skipped (`--keep-going` runs them all).
+
+A check fails when it errors, returns no rows or misses an `--expect column=value`; a pair fails when
+the results differ (label columns ignored, numbers compared with a relative tolerance). Random samples
+are only executed, not compared.
+
+Usage:
+    python -m shared.ncp_local.validation --snowflake-export snowflake_silver.parquet \\
+        --databricks-export databricks_silver.parquet
+    python -m shared.ncp_local.validation --snowflake-export sf/ --databricks-export dbx/ \\
+        --expect snowflake:column_count=174 --expect liability_shift_true=2402585 --json validation.json
+    python -m shared.ncp_local.validation --snowflake-connection poc_connection --databricks-export dbx/
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import logging
+import math
+import os
+import queue
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from shared.ncp_local.convert import export_schema
+from shared.ncp_local.exports import export_columns, expand_paths, is_parquet
+from shared.ncp_local.schema import load_schema, normalize_column_name
+
+try:
+    import duckdb
+except ImportError:  # only needed for the offline stand-in
+    duckdb = None
+
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_SUITES = [
+    REPO_ROOT / 'final' / 'progressive_validation.sql',
+    REPO_ROOT / 'snowflake' / 'validation' / 'sanity_check_comprehensive.sql',
+]
+
+SNOWFLAKE = 'snowflake'
+DATABRICKS = 'databricks'
+PLATFORMS = (SNOWFLAKE, DATABRICKS)
+
+# Tables the validation queries read, per platform (the DuckDB stand-in creates them as views)
+SILVER_TABLES = {SNOWFLAKE: 'POC.PUBLIC.NCP_SILVER_V2', DATABRICKS: 'ncp.silver'}
+
+PASS, FAIL, ERROR, SKIP, NOT_APPLICABLE = 'PASS', 'FAIL', 'ERROR', 'SKIP', 'n/a'
+
+SNOWFLAKE_SILVER_SQL = REPO_ROOT / 'final' / '02_bronze_to_silver_sept2-9.sql'
+
+# NCP_SILVER_V2 carries 3d_flow_status twice: as "3d_flow_status" and as three_ds_flow_status
+# (final/02_bronze_to_silver_sept2-9.sql); the stand-in adds the second spelling when an export lacks it
+SNOWFLAKE_EXTRA_COLUMNS = {'three_ds_flow_status': '3d_flow_status'}
+
+# Differences that are by design, as (Snowflake - Databricks) per result column
+KNOWN_DIFFERENCES = {'column_count': len(SNOWFLAKE_EXTRA_COLUMNS)}
+
+# Constant first columns that only say which console a row came from
+LABEL_COLUMNS = {'source', 'test_type'}
+
+
+# ----------------------------------------------------------------------------
+# Parsing
+# ----------------------------------------------------------------------------
+
+@dataclass
+class Check:
+    """One statement of a validation file"""
+    name: str
+    suite: str
+    level: int
+    level_title: str
+    platform: str
+    sql: str
+    description: str = ''
+    expected_note: str = ''
+
+    @property
+    def deterministic(self) -> bool:
+        return not re.search(r'\bRAND(OM)?\s*\(', self.sql, flags=re.IGNORECASE)
+
+
+@dataclass
+class CheckPair:
+    """The Snowflake and Databricks statements of one check (either may be missing)"""
+    name: str
+    suite: str
+    level: int
+    level_title: str
+    snowflake: Optional[Check] = None
+    databricks: Optional[Check] = None
+
+    @property
+    def checks(self) -> List[Check]:
+        return [check for check in (self.snowflake, self.databricks) if check is not None]
+
+
+_LEVEL_HEADER = re.compile(r'^--\s*(?:LEVEL\s+(\d+)\s*:|(\d+)\.)\s*(.+?)\s*$', re.IGNORECASE)
+_LABEL = re.compile(r"'([^']+)'\s+AS\s+(?:source|test_type)\b", re.IGNORECASE)
+_PLATFORM_PREFIX = re.compile(r'^(SNOWFLAKE|DATABRICKS|SF|DBX)[\s_:-]+', re.IGNORECASE)
+_COLUMN_COUNT = re.compile(r'^\s*DESCRIBE\s+(?:EXTENDED\s+)?([\w.`]+)\s*$', re.IGNORECASE)
+
+
+def _column_count_query(table: str) -> str:
+    """`DESCRIBE EXTENDED t` (an interactive column count) as a comparable information_schema count"""
+    schema, _, name = table.replace('`', '').rpartition('.')
+    return (f"SELECT 'DATABRICKS_COLUMN_COUNT' AS source, COUNT(*) AS column_count\n"
+            f"FROM information_schema.columns\n"
+            f"WHERE table_schema = '{schema.split('.')[-1]}' AND table_name = '{name}'")
+
+
+def _check_name(sql: str, description: str) -> str:
+    """Label literal of the statement ('SNOWFLAKE_BASIC_STATS' AS source), else its comment"""
+    label = _LABEL.search(sql)
+    if label:
+        return label.group(1)
+    return re.sub(r'\s*\(.*?\)\s*', ' ', description).strip() or 'statement'
+
+
+def _pair_name(name: str) -> str:
+    return _PLATFORM_PREFIX.sub('', name).strip() or name
+
+
+def parse_suite(path) -> List[CheckPair]:
+    """Levels and statements of a validation file, as Snowflake/Databricks pairs in file order"""
+    suite = Path(path).stem
+    checks: List[Check] = []
+    level, level_title = 0, 'Preamble'
+    description, statement = '', []
+    in_block = False
+
+    def finish(platform: str):
+        nonlocal description, statement
+        sql = '\n'.join(statement).strip().rstrip(';').strip()
+        statement = []
+        if not sql:
+            return
+        count = _COLUMN_COUNT.match(sql)
+        if count:
+            sql = _column_count_query(count.group(1))
+        checks.append(Check(_check_name(sql, description), suite, level, level_title, platform, sql, description))
+        description = ''
+
+    for line in Path(path).read_text(encoding='utf-8').splitlines():
+        stripped = line.strip()
+        if not in_block and stripped.startswith('/*'):
+            in_block, statement = True, []
+            line = stripped = stripped[2:].strip()
+            if not stripped:
+                continue
+        if in_block and stripped.endswith('*/'):
+            stripped = stripped[:-2].strip()
+            if stripped:
+                statement.append(stripped)
+            finish(DATABRICKS)
+            in_block = False
+            continue
+
+        if stripped.startswith('--') and not statement:
+            header = _LEVEL_HEADER.match(stripped)
+            text = stripped.lstrip('-').strip()
+            if header and not in_block:
+                level = int(header.group(1) or header.group(2))
+                level_title = header.group(3)
+            elif text.lower().startswith('expected:') and checks:
+                checks[-1].expected_note = text.split(':', 1)[1].strip()
+            elif text and not set(text) <= set('=-'):
+                description = text
+            continue
+        if not stripped and not statement:
+            continue
+
+        statement.append(line.rstrip())
+        code = re.sub(r'--.*$', '', stripped).rstrip()
+        if code.endswith(';'):
+            platform = DATABRICKS if in_block or description.upper().startswith('DATABRICKS') else SNOWFLAKE
+            finish(platform)
+    if statement:
+        finish(DATABRICKS if in_block else SNOWFLAKE)
+
+    # Pair the n-th Databricks statement of a level with its n-th Snowflake statement
+    pairs: List[CheckPair] = []
+    by_level: Dict[int, Dict[str, List[Check]]] = {}
+    for check in checks:
+        by_level.setdefault(check.level, {SNOWFLAKE: [], DATABRICKS: []})[check.platform].append(check)
+    for level_number, platforms in by_level.items():
+        snowflake, databricks = platforms[SNOWFLAKE], platforms[DATABRICKS]
+        for index in range(max(len(snowflake), len(databricks))):
+            first = (snowflake + databricks)[0]
+            pair = CheckPair('', suite, level_number, first.level_title,
+                             snowflake[index] if index < len(snowflake) else None,
+                             databricks[index] if index < len(databricks) else None)
+            pair.name = _pair_name(pair.checks[0].name)
+            pairs.append(pair)
+
+    seen: Dict[str, int] = {}
+    for pair in pairs:
+        seen[pair.name] = seen.get(pair.name, 0) + 1
+        if seen[pair.name] > 1:
+            pair.name = f"{pair.name} #{seen[pair.name]}"
+    return pairs
+
+
+# ----------------------------------------------------------------------------
+# Backends
+# ----------------------------------------------------------------------------
+
+class ConnectionPool:
+    """Fixed-size pool of connections created on demand by `factory`"""
+
+    def __init__(self, factory: Callable, size: int):
+        self.factory = factory
+        self.size = size
+        self._idle: queue.Queue = queue.Queue()
+        self._created = 0
+        self._connections = []
+        self._lock = threading.Lock()  # guards _created and _connections across the check threads
+
+    def _reserve(self) -> bool:
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                return True
+            return False
+
+    @contextmanager
+    def connection(self):
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            if self._reserve():
+                # Connect outside the lock; a failed connect gives its slot back
+                try:
+                    connection = self.factory()
+                except BaseException:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+                with self._lock:
+                    self._connections.append(connection)
+            else:
+                connection = self._idle.get()
+        try:
+            yield connection
+        finally:
+            self._idle.put(connection)
+
+    def close(self) -> None:
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+
+
+def _fetch_table(cursor) -> pa.Table:
+    """Result of an executed DB-API cursor as Arrow (native Arrow fetch when the connector has one)"""
+    for method in ('fetch_arrow_all', 'fetchall_arrow'):
+        if hasattr(cursor, method):
+            table = getattr(cursor, method)()
+            if table is not None:
+                return table
+    names = [column[0] for column in cursor.description or []]
+    return pa.Table.from_pylist([dict(zip(names, row)) for row in cursor.fetchall()]) if names else pa.table({})
+
+
+class QueryBackend:
+    """Executes the checks of the platforms it serves; `fingerprint` identifies its input data"""
+    platforms: Tuple[str, ...] = ()
+
+    def execute(self, platform: str, sql: str) -> pa.Table:
+        raise NotImplementedError
+
+    def fingerprint(self) -> Optional[str]:
+        """Digest of the data behind the backend; None disables caching"""
+        return None
+
+    def close(self) -> None:
+        pass
+
+
+class DuckDBBackend(QueryBackend):
+    """
+    Offline stand-in: DuckDB views over local exports named like the platform tables. The Snowflake
+    view has upper-case columns (as in INFORMATION_SCHEMA) and the Databricks view lower-case ones;
+    Spark functions without a DuckDB equivalent are rewritten.
+    """
+
+    REWRITES = [
+        (re.compile(r'`([^`]+)`'), r'"\1"'),
+        (re.compile(r'\bRAND\s*\(\s*\)', re.IGNORECASE), 'random()'),
+        (re.compile(r'\bPERCENTILE\s*\(', re.IGNORECASE), 'quantile_cont('),
+    ]
+
+    def __init__(self, exports: Dict[str, Sequence[str]], pool_size: int = 4):
+        if duckdb is None:
+            raise ImportError("The offline stand-in requires duckdb (pip install duckdb)")
+        self.exports = {platform: expand_paths(paths) for platform, paths in exports.items() if paths}
+        for platform, files in self.exports.items():
+            if not files:
+                raise FileNotFoundError(f"No export files found for {platform}: {exports[platform]}")
+        self.platforms = tuple(self.exports)
+        self.database = duckdb.connect()
+        try:
+            # The top-N window rewrite fails on ROW_NUMBER() dedupes over the typed TSV views (DuckDB 1.5)
+            self.database.execute("SET disabled_optimizers = 'top_n_window_elimination'")
+        except duckdb.Error:
+            pass  # releases without that optimizer
+        for platform, files in self.exports.items():
+            self._create_view(platform, files)
+        self.pool = ConnectionPool(self.database.cursor, pool_size)
+
+    @staticmethod
+    def snowflake_casts(path=SNOWFLAKE_SILVER_SQL) -> Dict[str, str]:
+        """
+        Decimal columns of NCP_SILVER_V2, from the silver SQL's `COALESCE(TRY_CAST(c AS DECIMAL(p,s)), 0) AS c`
+        projections (text exports lose them; the Databricks silver keeps these columns as strings)
+        """
+        pattern = r'COALESCE\(\s*TRY_CAST\(\s*(\w+)\s+AS\s+(DECIMAL\(\d+\s*,\s*\d+\))\s*\)\s*,\s*0\s*\)\s+AS\s+(\w+)'
+        casts = {}
+        if Path(path).exists():
+            for source, sql_type, alias in re.findall(pattern, Path(path).read_text(), flags=re.IGNORECASE):
+                if source.lower() == alias.lower():
+                    casts[alias.lower()] = sql_type
+        return casts
+
+    @staticmethod
+    def _reader(files: List[str]) -> str:
+        listed = ', '.join("'" + path.replace("'", "''") + "'" for path in files)
+        if is_parquet(files[0]):
+            return f"read_parquet([{listed}], union_by_name = true)"
+        return (f"read_csv([{listed}], delim = '\\t', header = true, quote = '\"', escape = '\"', "
+                f"nullstr = ['null', 'NULL', ''], all_varchar = true, union_by_name = true)")
+
+    @staticmethod
+    def _sql_type(arrow: pa.DataType) -> str:
+        if pa.types.is_timestamp(arrow):
+            return 'TIMESTAMP'
+        if pa.types.is_boolean(arrow):
+            return 'BOOLEAN'
+        if pa.types.is_integer(arrow):
+            return 'BIGINT'
+        if pa.types.is_decimal(arrow):
+            return f"DECIMAL({arrow.precision},{arrow.scale})"
+        return 'DOUBLE' if pa.types.is_floating(arrow) else 'VARCHAR'
+
+    def _create_view(self, platform: str, files: List[str]) -> None:
+        header = export_columns(files[0])
+        # TSV values are typed like convert.py would (placeholders become null instead of failing)
+        types = {} if is_parquet(files[0]) else {
+            name: self._sql_type(arrow.type) for name, arrow in
+            zip(header, export_schema([normalize_column_name(c) for c in header], load_schema()))}
+        casts = self.snowflake_casts() if platform == SNOWFLAKE else {}
+        columns, names = [], set()
+        for column in header:
+            name = normalize_column_name(column)
+            if name in names:
+                continue
+            names.add(name)
+            value = f'"{column}"'
+            if types.get(column, 'VARCHAR') != 'VARCHAR':
+                value = f"TRY_CAST({value} AS {types[column]})"
+            if name in casts:
+                value = f"COALESCE(TRY_CAST({value} AS {casts[name]}), 0)"
+            columns.append(f'{value} AS "{name.upper() if platform == SNOWFLAKE and not name[:1].isdigit() else name}"')
+        if platform == SNOWFLAKE:
+            for alias, column in SNOWFLAKE_EXTRA_COLUMNS.items():
+                if column in names and alias not in names:
+                    names.add(alias)
+                    columns.append(f'"{column}" AS "{alias.upper()}"')
+        qualified = SILVER_TABLES[platform].split('.')
+        if len(qualified) == 3:
+            self.database.execute(f"ATTACH IF NOT EXISTS ':memory:' AS {qualified[0]}")
+        self.database.execute(f"CREATE SCHEMA IF NOT EXISTS {'.'.join(qualified[:-1])}")
+        self.database.execute(f"CREATE OR REPLACE VIEW {SILVER_TABLES[platform]} AS "
+                              f"SELECT {', '.join(columns)} FROM {self._reader(files)}")
+
+    def translate(self, sql: str) -> str:
+        for pattern, replacement in self.REWRITES:
+            sql = pattern.sub(replacement, sql)
+        return sql
+
+    def execute(self, platform: str, sql: str) -> pa.Table:
+        with self.pool.connection() as cursor:
+            result = cursor.execute(self.translate(sql)).arrow()
+            return result.read_all() if isinstance(result, pa.RecordBatchReader) else result
+
+    def fingerprint(self) -> Optional[str]:
+        digest = hashlib.sha256(b'duckdb')
+        for platform, files in sorted(self.exports.items()):
+            for path in files:
+                stat = os.stat(path)
+                digest.update(f"{platform}|{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime}".encode())
+        return digest.hexdigest()
+
+    def close(self) -> None:
+        self.pool.close()
+        self.database.close()
+
+
+class SnowflakeBackend(QueryBackend):
+    """Live Snowflake through snowflake-connector-python and a `~/.snowflake/connections.toml` entry"""
+    platforms = (SNOWFLAKE,)
+
+    def __init__(self, connection_name: str = 'poc_connection', pool_size: int = 4):
+        import snowflake.connector
+        self.pool = ConnectionPool(lambda: snowflake.connector.connect(connection_name=connection_name), pool_size)
+
+    def execute(self, platform: str, sql: str) -> pa.Table:
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(sql)
+                return _fetch_table(cursor)
+            finally:
+                cursor.close()
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+class DatabricksBackend(QueryBackend):
+    """Live Databricks SQL warehouse through databricks-sql-connector (DATABRICKS_HOST/HTTP_PATH/TOKEN)"""
+    platforms = (DATABRICKS,)
+
+    def __init__(self, pool_size: int = 4):
+        from databricks import sql as databricks_sql
+        settings = {'server_hostname': os.environ['DATABRICKS_HOST'],
+                    'http_path': os.environ['DATABRICKS_HTTP_PATH'],
+                    'access_token': os.environ['DATABRICKS_TOKEN']}
+        self.pool = ConnectionPool(lambda: databricks_sql.connect(**settings), pool_size)
+
+    def execute(self, platform: str, sql: str) -> pa.Table:
+        with self.pool.connection() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute(sql)
+                return _fetch_table(cursor)
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+class ResultCache:
+    """Arrow IPC files keyed by backend fingerprint, platform and statement"""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, fingerprint: str, platform: str, sql: str) -> Path:
+        key = hashlib.sha256(f"{fingerprint}\n{platform}\n{sql}".encode()).hexdigest()
+        return self.cache_dir / f"{key}.arrow"
+
+    def get(self, fingerprint: str, platform: str, sql: str) -> Optional[pa.Table]:
+        path = self._path(fingerprint, platform, sql)
+        if not path.exists():
+            return None
+        with ipc.open_file(path) as reader:
+            return reader.read_all()
+
+    def put(self, fingerprint: str, platform: str, sql: str, table: pa.Table) -> None:
+        path = self._path(fingerprint, platform, sql)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f".{path.name}.tmp")
+        with ipc.new_file(temporary, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(temporary, path)
+
+
+# ----------------------------------------------------------------------------
+# Evaluation
+# ----------------------------------------------------------------------------
+
+@dataclass
+class CheckResult:
+    """Outcome of one statement"""
+    status: str
+    seconds: float = 0.0
+    rows: int = 0
+    cached: bool = False
+    message: str = ''
+    table: Optional[pa.Table] = field(default=None, repr=False)
+
+
+@dataclass
+class PairResult:
+    """Outcome of one matrix row"""
+    suite: str
+    level: int
+    level_title: str
+    name: str
+    snowflake: Optional[CheckResult] = None
+    databricks: Optional[CheckResult] = None
+    parity: str = NOT_APPLICABLE
+    parity_message: str = ''
+
+    @property
+    def status(self) -> str:
+        """FAIL if a statement or the parity comparison failed, SKIP if nothing ran, else PASS"""
+        results = [r for r in (self.snowflake, self.databricks) if r is not None]
+        if any(r.status in (FAIL, ERROR) for r in results) or self.parity == FAIL:
+            return FAIL
+        return SKIP if all(r.status == SKIP for r in results) else PASS
+
+
+def _parse_expected(value: str):
+    value = value.strip().replace(',', '')
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def _value(value):
+    """Comparable form of a result value"""
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, (int, float, Decimal)):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ')
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def _same(left, right, tolerance: float) -> bool:
+    if isinstance(left, float) and isinstance(right, float):
+        return (math.isclose(left, right, rel_tol=tolerance, abs_tol=tolerance)
+                or (math.isnan(left) and math.isnan(right)))
+    return left == right
+
+
+def _comparable_rows(table: pa.Table) -> Tuple[List[str], List[list]]:
+    names = [normalize_column_name(name) for name in table.column_names]
+    keep = [i for i, name in enumerate(names) if name not in LABEL_COLUMNS]
+    rows = [[_value(row[i]) for i in keep] for row in zip(*[column.to_pylist() for column in table.columns])]
+    rows.sort(key=lambda row: [f"{v:.9g}" if isinstance(v, float) else str(v) for v in row])
+    return [names[i] for i in keep], rows
+
+
+def compare_results(left: pa.Table, right: pa.Table, tolerance: float = 1e-6,
+                    known_differences: Optional[Dict[str, float]] = None) -> str:
+    """Empty string when two result sets match (up to `known_differences`, left - right), else the first difference"""
+    known_differences = known_differences or {}
+    left_names, left_rows = _comparable_rows(left)
+    right_names, right_rows = _comparable_rows(right)
+    common = [name for name in left_names if name in right_names]
+    if not common:
+        return f"no common columns ({', '.join(left_names)} vs {', '.join(right_names)})"
+    if len(left_rows) != len(right_rows):
+        return f"{len(left_rows)} rows vs {len(right_rows)}"
+    left_index = [left_names.index(name) for name in common]
+    right_index = [right_names.index(name) for name in common]
+    for number, (left_row, right_row) in enumerate(zip(left_rows, right_rows)):
+        for name, i, j in zip(common, left_index, right_index):
+            right_value = right_row[j]
+            if name in known_differences and isinstance(right_value, float):
+                right_value += known_differences[name]
+            if not _same(left_row[i], right_value, tolerance):
+                return f"row {number + 1} {name}: {left_row[i]!r} vs {right_row[j]!r}"
+    return ''
+
+
+class ValidationRunner:
+    """Runs parsed suites level by level; the checks of a level run concurrently"""
+
+    def __init__(self, backends: Dict[str, QueryBackend], workers: int = 4, cache: Optional[ResultCache] = None,
+                 expectations: Optional[Dict[str, str]] = None, tolerance: float = 1e-6,
+                 keep_going: bool = False):
+        self.backends = backends
+        self.workers = workers
+        self.cache = cache
+        # '[platform:]column' -> expected value of that column in the first result row
+        self.expectations = {k.lower(): _parse_expected(v) for k, v in (expectations or {}).items()}
+        self.tolerance = tolerance
+        self.keep_going = keep_going
+
+    def _execute(self, check: Check) -> CheckResult:
+        backend = self.backends.get(check.platform)
+        if backend is None:
+            return CheckResult(SKIP, message=f"no {check.platform} backend")
+        # Random samples are re-drawn on every run
+        fingerprint = backend.fingerprint() if self.cache is not None and check.deterministic else None
+        start = time.perf_counter()
+        if fingerprint is not None:
+            table = self.cache.get(fingerprint, check.platform, check.sql)
+            if table is not None:
+                return self._evaluate(check, table, time.perf_counter() - start, cached=True)
+        try:
+            table = backend.execute(check.platform, check.sql)
+        except Exception as error:  # any driver error is a failed check, not a failed run
+            return CheckResult(ERROR, time.perf_counter() - start, message=str(error).splitlines()[0])
+        seconds = time.perf_counter() - start
+        if fingerprint is not None:
+            self.cache.put(fingerprint, check.platform, check.sql, table)
+        return self._evaluate(check, table, seconds)
+
+    def _evaluate(self, check: Check, table: pa.Table, seconds: float, cached: bool = False) -> CheckResult:
+        result = CheckResult(PASS, round(seconds, 3), table.num_rows, cached, table=table)
+        if not table.num_rows:
+            result.status, result.message = FAIL, 'no rows'
+            return result
+        first = dict(zip([name.lower() for name in table.column_names], table.slice(0, 1).to_pylist()[0].values()))
+        for key, expected in self.expectations.items():
+            platform, _, column = key.rpartition(':')
+            if column in first and platform in ('', check.platform):
+                actual = _value(first[column])
+                if not _same(actual, expected, self.tolerance):
+                    result.status, result.message = FAIL, f"{column}={actual!r}, expected {expected!r}"
+                    return result
+        return result
+
+    def _compare(self, pair: CheckPair, result: PairResult) -> None:
+        if pair.snowflake is None or pair.databricks is None:
+            return
+        if not (pair.snowflake.deterministic and pair.databricks.deterministic):
+            result.parity_message = 'random sample'
+            return
+        if result.snowflake.status != PASS or result.databricks.status != PASS:
+            result.parity = SKIP
+            return
+        difference = compare_results(result.snowflake.table, result.databricks.table, self.tolerance,
+                                     KNOWN_DIFFERENCES)
+        result.parity, result.parity_message = (FAIL, difference) if difference else (PASS, '')
+
+    def run(self, suites: Sequence[List[CheckPair]]) -> List[PairResult]:
+        """Results in suite and level order; levels after a failing one are skipped"""
+        results: List[PairResult] = []
+        stages: Dict[Tuple[int, int], List[CheckPair]] = {}
+        for suite_index, pairs in enumerate(suites):
+            for pair in pairs:
+                stages.setdefault((suite_index, pair.level), []).append(pair)
+        failed_at: Dict[int, int] = {}
+
+        with ThreadPoolExecutor(max_workers=max(1, self.workers)) as executor:
+            # Level n of every suite runs together; a suite stops after its first failing level
+            for rank in sorted({level for _, level in stages}):
+                current = [(suite_index, pair) for (suite_index, level), pairs in sorted(stages.items())
+                           if level == rank for pair in pairs]
+                futures = {}
+                for suite_index, pair in current:
+                    if suite_index in failed_at and not self.keep_going:
+                        continue
+                    for check in pair.checks:
+                        futures[id(check)] = executor.submit(self._execute, check)
+                for suite_index, pair in current:
+                    result = PairResult(pair.suite, pair.level, pair.level_title, pair.name)
+                    if suite_index in failed_at and not self.keep_going:
+                        skipped = CheckResult(SKIP, message=f"level {failed_at[suite_index]} failed")
+                        result.snowflake = skipped if pair.snowflake else None
+                        result.databricks = skipped if pair.databricks else None
+                        results.append(result)
+                        continue
+                    result.snowflake = futures[id(pair.snowflake)].result() if pair.snowflake else None
+                    result.databricks = futures[id(pair.databricks)].result() if pair.databricks else None
+                    self._compare(pair, result)
+                    results.append(result)
+                for suite_index, pair in current:
+                    if suite_index not in failed_at and any(
+                            r.status == FAIL for r in results if r.suite == pair.suite and r.level == rank):
+                        failed_at[suite_index] = rank
+        return results
+
+
+# ----------------------------------------------------------------------------
+# Reporting
+# ----------------------------------------------------------------------------
+
+def _cell(result: Optional[CheckResult]) -> str:
+    if result is None:
+        return '-'
+    if result.status in (SKIP,):
+        return SKIP
+    timing = 'cached' if result.cached else f"{result.seconds:.2f}s"
+    return f"{result.status} {timing}"
+
+
+def print_matrix(results: List[PairResult]) -> None:
+    header = ('Suite', 'Lvl', 'Check', 'Snowflake', 'Databricks', 'Parity')
+    rows = [(r.suite, str(r.level), r.name[:40], _cell(r.snowflake), _cell(r.databricks), r.parity)
+            for r in results]
+    widths = [max(len(row[i]) for row in rows + [header]) for i in range(len(header))]
+    for row in [header] + rows:
+        print('  '.join(value.ljust(width) for value, width in zip(row, widths)).rstrip())
+    for r in results:
+        notes = [f"{platform}: {result.message}" for platform, result in
+                 ((SNOWFLAKE, r.snowflake), (DATABRICKS, r.databricks))
+                 if result is not None and result.message and result.status != SKIP]
+        if r.parity == FAIL:
+            notes.append(f"parity: {r.parity_message}")
+        for note in notes:
+            print(f"  {r.suite} L{r.level} {r.name}: {note}")
+    counts = {status: sum(r.status == status for r in results) for status in (PASS, FAIL, SKIP)}
+    print(f"{counts[PASS]} passed, {counts[FAIL]} failed, {counts[SKIP]} skipped of {len(results)} checks")
+    print("VALIDATION: FAIL" if counts[FAIL] else "VALIDATION: PASS")
+
+
+def _flat(results: List[PairResult]) -> List[dict]:
+    rows = []
+    for r in results:
+        row = {'suite': r.suite, 'level': r.level, 'level_title': r.level_title, 'check': r.name,
+               'parity': r.parity, 'parity_message': r.parity_message, 'status': r.status}
+        for platform, result in ((SNOWFLAKE, r.snowflake), (DATABRICKS, r.databricks)):
+            values = asdict(result) if result is not None else {}
+            values.pop('table', None)
+            for key in ('status', 'seconds', 'rows', 'cached', 'message'):
+                row[f"{platform}_{key}"] = values.get(key)
+        rows.append(row)
+    return rows
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    parser = argparse.ArgumentParser(description="Run the progressive validation SQL as a pass/fail matrix")
+    parser.add_argument('--suite', nargs='+', default=[str(path) for path in DEFAULT_SUITES],
+                        help="Validation SQL files (default: progressive + comprehensive sanity check)")
+    parser.add_argument('--snowflake-export', nargs='+', help="Local Snowflake silver export (DuckDB stand-in)")
+    parser.add_argument('--databricks-export', nargs='+', help="Local Databricks silver export (DuckDB stand-in)")
+    parser.add_argument('--snowflake-connection', help="Run Snowflake checks live (connections.toml entry)")
+    parser.add_argument('--databricks-live', action='store_true',
+                        help="Run Databricks checks on a SQL warehouse (DATABRICKS_HOST/HTTP_PATH/TOKEN)")
+    parser.add_argument('--workers', type=int, default=4, help="Concurrent checks (and connections per backend)")
+    parser.add_argument('--expect', action='append', default=[], metavar='COLUMN=VALUE',
+                        help="Expected first-row value of a result column, optionally for one platform "
+                             "(snowflake:column_count=174)")
+    parser.add_argument('--tolerance', type=float, default=1e-6, help="Relative tolerance for numbers")
+    parser.add_argument('--cache-dir', default='.validation_cache')
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--keep-going', action='store_true', help="Run every level even after a failure")
+    parser.add_argument('--json', help="Write the matrix as JSON")
+    parser.add_argument('--csv', help="Write the matrix as CSV")
+    args = parser.parse_args()
+
+    backends: Dict[str, QueryBackend] = {}
+    exports = {SNOWFLAKE: args.snowflake_export, DATABRICKS: args.databricks_export}
+    if args.snowflake_connection:
+        backends[SNOWFLAKE] = SnowflakeBackend(args.snowflake_connection, args.workers)
+        exports[SNOWFLAKE] = None
+    if args.databricks_live:
+        backends[DATABRICKS] = DatabricksBackend(args.workers)
+        exports[DATABRICKS] = None
+    if any(exports.values()):
+        stand_in = DuckDBBackend(exports, args.workers)
+        backends.update({platform: stand_in for platform in stand_in.platforms})
+    if not backends:
+        parser.error("no backend: give --snowflake-export/--databricks-export or a live connection")
+
+    expectations = dict(item.split('=', 1) for item in args.expect)
+    runner = ValidationRunner(backends, args.workers, None if args.no_cache else ResultCache(args.cache_dir),
+                              expectations, args.tolerance, args.keep_going)
+    start = time.perf_counter()
+    try:
+        results = runner.run([parse_suite(path) for path in args.suite])
+    finally:
+        for backend in set(backends.values()):
+            backend.close()
+    print_matrix(results)
+    print(f"Elapsed: {time.perf_counter() - start:.1f}s")
+
+    rows = _flat(results)
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(rows, file, indent=2, default=str)
+    if args.csv and rows:
+        with open(args.csv, 'w', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+    raise SystemExit(1 if any(r.status == FAIL for r in results) else 0)
+
+
+if __name__ == '__main__':
+    main()
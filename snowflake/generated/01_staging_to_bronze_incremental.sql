@@ -0,0 +1,551 @@
+-- STAGING TO BRONZE (INCREMENTAL - only new staging files are parsed and appended)
+-- GENERATED by `python -m shared.ncp_local.sqlgen generate` from
+-- databricks/original_scripts/schema_config.json - edit the generator, not this file.
+-- 158 file columns; silver has 174 columns.
+
+-- STEP 0: Bronze table and load log (first run only)
+CREATE TABLE IF NOT EXISTS poc.public.ncp_bronze_v2 (
+    filename STRING,
+    inserted_at TIMESTAMP_NTZ,
+    transaction_main_id STRING,
+    transaction_date TIMESTAMP_NTZ,
+    transaction_id_life_cycle STRING,
+    transaction_date_life_cycle TIMESTAMP_NTZ,
+    transaction_type_id STRING,
+    transaction_type STRING,
+    transaction_result_id STRING,
+    final_transaction_status STRING,
+    threed_flow_status STRING,
+    challenge_preference STRING,
+    preference_reason STRING,
+    authentication_flow STRING,
+    threed_flow STRING,
+    is_void STRING,
+    liability_shift STRING,
+    status STRING,
+    acs_url STRING,
+    acs_res_authentication_status STRING,
+    r_req_authentication_status STRING,
+    transaction_status_reason STRING,
+    interaction_counter STRING,
+    challenge_cancel STRING,
+    three_ds_method_indication STRING,
+    is_sale_3d STRING,
+    manage_3d_decision STRING,
+    decline_reason STRING,
+    amount_in_usd STRING,
+    approved_amount_in_usd STRING,
+    original_currency_amount STRING,
+    rate_usd STRING,
+    currency_code STRING,
+    three_ds_protocol_version STRING,
+    is_external_mpi STRING,
+    rebill STRING,
+    device_channel STRING,
+    user_agent_3d STRING,
+    device_type STRING,
+    device_name STRING,
+    device_os STRING,
+    challenge_window_size STRING,
+    type_of_authentication_method STRING,
+    multi_client_id STRING,
+    client_id STRING,
+    multi_client_name STRING,
+    client_name STRING,
+    industry_code STRING,
+    credit_card_id STRING,
+    cccid STRING,
+    bin STRING,
+    is_prepaid STRING,
+    card_scheme STRING,
+    card_type STRING,
+    consumer_id STRING,
+    issuer_bank_name STRING,
+    device_channel_name STRING,
+    bin_country STRING,
+    is_eea STRING,
+    region STRING,
+    payment_instrument STRING,
+    source_application STRING,
+    is_partial_amount STRING,
+    enable_partial_approval STRING,
+    partial_approval_is_void STRING,
+    partial_approval_void_id STRING,
+    partial_approval_void_time STRING,
+    partial_approval_requested_amount STRING,
+    partial_approval_requested_currency STRING,
+    partial_approval_processed_amount STRING,
+    partial_approval_processed_currency STRING,
+    partial_approval_processed_amount_in_usd STRING,
+    website_id STRING,
+    browser_user_agent STRING,
+    ip_country STRING,
+    processor_id STRING,
+    processor_name STRING,
+    risk_email_id STRING,
+    is_currency_converted STRING,
+    email_seniority_start_date TIMESTAMP_NTZ,
+    email_payment_attempts STRING,
+    final_fraud_decision_id STRING,
+    external_token_eci STRING,
+    risk_threed_eci STRING,
+    threed_eci STRING,
+    cvv_code STRING,
+    provider_response_code STRING,
+    issuer_card_program_id STRING,
+    scenario_id STRING,
+    previous_id STRING,
+    next_id STRING,
+    step STRING,
+    reprocess_3d_reason STRING,
+    data_only_authentication_result STRING,
+    is_cascaded_after_data_only_authentication STRING,
+    next_action STRING,
+    authentication_method STRING,
+    cavv_verification_code STRING,
+    channel STRING,
+    authentication_request STRING,
+    authentication_response STRING,
+    cc_hash STRING,
+    exp_date TIMESTAMP_NTZ,
+    message_version_3d STRING,
+    cc_seniority_start_date TIMESTAMP_NTZ,
+    mc_scheme_token_used STRING,
+    stored_credentials_mode STRING,
+    avs_code STRING,
+    is_3d STRING,
+    credit_type_id STRING,
+    subscription_step STRING,
+    scheme_token_fetching_result STRING,
+    browser_screen_height STRING,
+    browser_screen_width STRING,
+    filter_reason_id STRING,
+    reason_code STRING,
+    reason STRING,
+    request_timestamp_service STRING,
+    token_unique_reference_service STRING,
+    response_timestamp_service STRING,
+    api_type_service STRING,
+    request_timestamp_fetching STRING,
+    token_unique_reference_fetching STRING,
+    response_timestamp_fetching STRING,
+    api_type_fetching STRING,
+    is_cryptogram_fetching_skipped STRING,
+    is_external_scheme_token STRING,
+    three_ds_server_trans_id STRING,
+    gateway_id STRING,
+    cc_request_type_id STRING,
+    upo_id STRING,
+    IsCardReplaced STRING,
+    IsVdcuFeeApplied STRING,
+    AftType STRING,
+    secondarycccid STRING,
+    transaction_duration STRING,
+    authorization_req_duration STRING,
+    FirstInstallment STRING,
+    PeriodicalInstallment STRING,
+    numberOfInstallments STRING,
+    InstallmentProgram STRING,
+    InstallmentFundingType STRING,
+    first_installment_usd STRING,
+    periodical_installment_usd STRING,
+    ApplicableScenarios STRING,
+    cascading_ab_test_experimant_name STRING,
+    IsOnlineRefund INTEGER,
+    IsNoCVV INTEGER,
+    IsSupportedOCT INTEGER,
+    ExternalTokenTrasactionType STRING,
+    SubscriptionType STRING,
+    MerchantCountryCodeNum INTEGER,
+    MCMerchantAdviceCode STRING,
+    AcquirerBinCountryId INTEGER,
+    AcquirerBin INTEGER,
+    IsPSD2 INTEGER,
+    IsSCAScope INTEGER,
+    IsAirline INTEGER,
+    RequestedCCCID INTEGER,
+    merchant_country STRING,
+    raw_line STRING
+);
+
+CREATE TABLE IF NOT EXISTS poc.public.ncp_bronze_load_log_v2 (
+    filename STRING,
+    staged_at TIMESTAMP_NTZ,
+    staged_lines BIGINT,
+    bronze_rows BIGINT,
+    rejected_rows BIGINT,
+    loaded_at TIMESTAMP_NTZ
+);
+
+-- STEP 1: Staging files to parse
+CREATE OR REPLACE TEMPORARY TABLE ncp_bronze_pending_files_v2 AS
+SELECT
+    filename,
+    MAX(loaded_at) AS staged_at,
+    COUNT(*) AS staged_lines
+FROM poc.public.ncp_bronze_staging_v2
+WHERE filename NOT IN (SELECT filename FROM poc.public.ncp_bronze_load_log_v2)
+GROUP BY filename;
+
+-- STEP 1b: Classify their lines (rejects go to poc.public.ncp_bronze_quarantine_v2)
+CREATE OR REPLACE TEMPORARY TABLE ncp_bronze_classified_v2 AS
+WITH parsed_data AS (
+  SELECT
+    filename,
+    file_row_number,
+    loaded_at,
+    SPLIT(raw_line, '\t') AS cols,
+    raw_line
+  FROM poc.public.ncp_bronze_staging_v2
+  WHERE raw_line IS NOT NULL
+    AND raw_line <> ''
+    AND filename IN (SELECT filename FROM ncp_bronze_pending_files_v2)
+)
+SELECT
+    parsed_data.*,
+    CASE
+        WHEN ARRAY_SIZE(cols) <> 158 THEN 'column_count'
+        WHEN CONTAINS(raw_line, '\u00EF\u00BF\u00BD') OR CONTAINS(raw_line, '\uFFFD') THEN 'undecodable_bytes'
+        WHEN cols[1]::STRING <> '' AND NOT REGEXP_LIKE(cols[1]::STRING, '^\\d{4}-\\d{2}-\\d{2}[T ]\\d{2}:\\d{2}:\\d{2}(\\.\\d+)?$')
+             AND LOWER(TRIM(cols[1]::STRING)) NOT IN ('', '\u0000', ' ', '-', '<na>', 'deprecated', 'na', 'nan', 'none', 'null')
+            THEN 'unparseable_field'
+        WHEN cols[3]::STRING <> '' AND NOT REGEXP_LIKE(cols[3]::STRING, '^\\d{4}-\\d{2}-\\d{2}[T ]\\d{2}:\\d{2}:\\d{2}(\\.\\d+)?$')
+             AND LOWER(TRIM(cols[3]::STRING)) NOT IN ('', '\u0000', ' ', '-', '<na>', 'deprecated', 'na', 'nan', 'none', 'null')
+            THEN 'unparseable_field'
+        WHEN cols[77]::STRING <> '' AND NOT REGEXP_LIKE(cols[77]::STRING, '^\\d{4}-\\d{2}-\\d{2}[T ]\\d{2}:\\d{2}:\\d{2}(\\.\\d+)?$')
+             AND LOWER(TRIM(cols[77]::STRING)) NOT IN ('', '\u0000', ' ', '-', '<na>', 'deprecated', 'na', 'nan', 'none', 'null')
+            THEN 'unparseable_field'
+        WHEN cols[100]::STRING <> '' AND NOT REGEXP_LIKE(cols[100]::STRING, '^\\d{4}-\\d{2}-\\d{2}[T ]\\d{2}:\\d{2}:\\d{2}(\\.\\d+)?$')
+             AND LOWER(TRIM(cols[100]::STRING)) NOT IN ('', '\u0000', ' ', '-', '<na>', 'deprecated', 'na', 'nan', 'none', 'null')
+            THEN 'unparseable_field'
+        WHEN cols[102]::STRING <> '' AND NOT REGEXP_LIKE(cols[102]::STRING, '^\\d{4}-\\d{2}-\\d{2}[T ]\\d{2}:\\d{2}:\\d{2}(\\.\\d+)?$')
+             AND LOWER(TRIM(cols[102]::STRING)) NOT IN ('', '\u0000', ' ', '-', '<na>', 'deprecated', 'na', 'nan', 'none', 'null')
+            THEN 'unparseable_field'
+        WHEN cols[144]::STRING <> '' AND NOT REGEXP_LIKE(cols[144]::STRING, '^\\s*-?\\d+\\s*$')
+             AND LOWER(TRIM(cols[144]::STRING)) NOT IN ('', '\u0000', ' ', '-', '<na>', 'deprecated', 'na', 'nan', 'none', 'null')
+            THEN 'unparseable_field'
+        WHEN cols[145]::STRING <> '' AND NOT REGEXP_LIKE(cols[145]::STRING, '^\\s*-?\\d+\\s*$')
+             AND LOWER(TRIM(cols[145]::STRING)) NOT IN ('', '\u0000', ' ', '-', '<na>', 'deprecated', 'na', 'nan', 'none', 'null')
+            THEN 'unparseable_field'
+        WHEN cols[146]::STRING <> '' AND NOT REGEXP_LIKE(cols[146]::STRING, '^\\s*-?\\d+\\s*$')
+             AND LOWER(TRIM(cols[146]::STRING)) NOT IN ('', '\u0000', ' ', '-', '<na>', 'deprecated', 'na', 'nan', 'none', 'null')
+            THEN 'unparseable_field'
+        WHEN cols[149]::STRING <> '' AND NOT REGEXP_LIKE(cols[149]::STRING, '^\\s*-?\\d+\\s*$')
+             AND LOWER(TRIM(cols[149]::STRING)) NOT IN ('', '\u0000', ' ', '-', '<na>', 'deprecated', 'na', 'nan', 'none', 'null')
+            THEN 'unparseable_field'
+        WHEN cols[151]::STRING <> '' AND NOT REGEXP_LIKE(cols[151]::STRING, '^\\s*-?\\d+\\s*$')
+             AND LOWER(TRIM(cols[151]::STRING)) NOT IN ('', '\u0000', ' ', '-', '<na>', 'deprecated', 'na', 'nan', 'none', 'null')
+            THEN 'unparseable_field'
+        WHEN cols[152]::STRING <> '' AND NOT REGEXP_LIKE(cols[152]::STRING, '^\\s*-?\\d+\\s*$')
+             AND LOWER(TRIM(cols[152]::STRING)) NOT IN ('', '\u0000', ' ', '-', '<na>', 'deprecated', 'na', 'nan', 'none', 'null')
+            THEN 'unparseable_field'
+        WHEN cols[153]::STRING <> '' AND NOT REGEXP_LIKE(cols[153]::STRING, '^\\s*-?\\d+\\s*$')
+             AND LOWER(TRIM(cols[153]::STRING)) NOT IN ('', '\u0000', ' ', '-', '<na>', 'deprecated', 'na', 'nan', 'none', 'null')
+            THEN 'unparseable_field'
+        WHEN cols[154]::STRING <> '' AND NOT REGEXP_LIKE(cols[154]::STRING, '^\\s*-?\\d+\\s*$')
+             AND LOWER(TRIM(cols[154]::STRING)) NOT IN ('', '\u0000', ' ', '-', '<na>', 'deprecated', 'na', 'nan', 'none', 'null')
+            THEN 'unparseable_field'
+        WHEN cols[155]::STRING <> '' AND NOT REGEXP_LIKE(cols[155]::STRING, '^\\s*-?\\d+\\s*$')
+             AND LOWER(TRIM(cols[155]::STRING)) NOT IN ('', '\u0000', ' ', '-', '<na>', 'deprecated', 'na', 'nan', 'none', 'null')
+            THEN 'unparseable_field'
+        WHEN cols[156]::STRING <> '' AND NOT REGEXP_LIKE(cols[156]::STRING, '^\\s*-?\\d+\\s*$')
+             AND LOWER(TRIM(cols[156]::STRING)) NOT IN ('', '\u0000', ' ', '-', '<na>', 'deprecated', 'na', 'nan', 'none', 'null')
+            THEN 'unparseable_field'
+    END AS reject_reason,
+    CASE
+        WHEN ARRAY_SIZE(cols) <> 158
+            THEN 'expected 158 columns, got ' || ARRAY_SIZE(cols)
+        WHEN CONTAINS(raw_line, '\u00EF\u00BF\u00BD') OR CONTAINS(raw_line, '\uFFFD') THEN 'U+FFFD in line'
+        WHEN cols[1]::STRING <> '' AND NOT REGEXP_LIKE(cols[1]::STRING, '^\\d{4}-\\d{2}-\\d{2}[T ]\\d{2}:\\d{2}:\\d{2}(\\.\\d+)?$')
+             AND LOWER(TRIM(cols[1]::STRING)) NOT IN ('', '\u0000', ' ', '-', '<na>', 'deprecated', 'na', 'nan', 'none', 'null')
+            THEN 'transaction_date=''' || cols[1]::STRING || ''''
+        WHEN cols[3]::STRING <> '' AND NOT REGEXP_LIKE(cols[3]::STRING, '^\\d{4}-\\d{2}-\\d{2}[T ]\\d{2}:\\d{2}:\\d{2}(\\.\\d+)?$')
+             AND LOWER(TRIM(cols[3]::STRING)) NOT IN ('', '\u0000', ' ', '-', '<na>', 'deprecated', 'na', 'nan', 'none', 'null')
+            THEN 'transaction_date_life_cycle=''' || cols[3]::STRING || ''''
+        WHEN cols[77]::STRING <> '' AND NOT REGEXP_LIKE(cols[77]::STRING, '^\\d{4}-\\d{2}-\\d{2}[T ]\\d{2}:\\d{2}:\\d{2}(\\.\\d+)?$')
+             AND LOWER(TRIM(cols[77]::STRING)) NOT IN ('', '\u0000', ' ', '-', '<na>', 'deprecated', 'na', 'nan', 'none', 'null')
+            THEN 'email_seniority_start_date=''' || cols[77]::STRING || ''''
+        WHEN cols[100]::STRING <> '' AND NOT REGEXP_LIKE(cols[100]::STRING, '^\\d{4}-\\d{2}-\\d{2}[T ]\\d{2}:\\d{2}:\\d{2}(\\.\\d+)?$')
+             AND LOWER(TRIM(cols[100]::STRING)) NOT IN ('', '\u0000', ' ', '-', '<na>', 'deprecated', 'na', 'nan', 'none', 'null')
+            THEN 'exp_date=''' || cols[100]::STRING || ''''
+        WHEN cols[102]::STRING <> '' AND NOT REGEXP_LIKE(cols[102]::STRING, '^\\d{4}-\\d{2}-\\d{2}[T ]\\d{2}:\\d{2}:\\d{2}(\\.\\d+)?$')
+             AND LOWER(TRIM(cols[102]::STRING)) NOT IN ('', '\u0000', ' ', '-', '<na>', 'deprecated', 'na', 'nan', 'none', 'null')
+            THEN 'cc_seniority_start_date=''' || cols[102]::STRING || ''''
+        WHEN cols[144]::STRING <> '' AND NOT REGEXP_LIKE(cols[144]::STRING, '^\\s*-?\\d+\\s*$')
+             AND LOWER(TRIM(cols[144]::STRING)) NOT IN ('', '\u0000', ' ', '-', '<na>', 'deprecated', 'na', 'nan', 'none', 'null')
+            THEN 'IsOnlineRefund=''' || cols[144]::STRING || ''''
+        WHEN cols[145]::STRING <> '' AND NOT REGEXP_LIKE(cols[145]::STRING, '^\\s*-?\\d+\\s*$')
+             AND LOWER(TRIM(cols[145]::STRING)) NOT IN ('', '\u0000', ' ', '-', '<na>', 'deprecated', 'na', 'nan', 'none', 'null')
+            THEN 'IsNoCVV=''' || cols[145]::STRING || ''''
+        WHEN cols[146]::STRING <> '' AND NOT REGEXP_LIKE(cols[146]::STRING, '^\\s*-?\\d+\\s*$')
+             AND LOWER(TRIM(cols[146]::STRING)) NOT IN ('', '\u0000', ' ', '-', '<na>', 'deprecated', 'na', 'nan', 'none', 'null')
+            THEN 'IsSupportedOCT=''' || cols[146]::STRING || ''''
+        WHEN cols[149]::STRING <> '' AND NOT REGEXP_LIKE(cols[149]::STRING, '^\\s*-?\\d+\\s*$')
+             AND LOWER(TRIM(cols[149]::STRING)) NOT IN ('', '\u0000', ' ', '-', '<na>', 'deprecated', 'na', 'nan', 'none', 'null')
+            THEN 'MerchantCountryCodeNum=''' || cols[149]::STRING || ''''
+        WHEN cols[151]::STRING <> '' AND NOT REGEXP_LIKE(cols[151]::STRING, '^\\s*-?\\d+\\s*$')
+             AND LOWER(TRIM(cols[151]::STRING)) NOT IN ('', '\u0000', ' ', '-', '<na>', 'deprecated', 'na', 'nan', 'none', 'null')
+            THEN 'AcquirerBinCountryId=''' || cols[151]::STRING || ''''
+        WHEN cols[152]::STRING <> '' AND NOT REGEXP_LIKE(cols[152]::STRING, '^\\s*-?\\d+\\s*$')
+             AND LOWER(TRIM(cols[152]::STRING)) NOT IN ('', '\u0000', ' ', '-', '<na>', 'deprecated', 'na', 'nan', 'none', 'null')
+            THEN 'AcquirerBin=''' || cols[152]::STRING || ''''
+        WHEN cols[153]::STRING <> '' AND NOT REGEXP_LIKE(cols[153]::STRING, '^\\s*-?\\d+\\s*$')
+             AND LOWER(TRIM(cols[153]::STRING)) NOT IN ('', '\u0000', ' ', '-', '<na>', 'deprecated', 'na', 'nan', 'none', 'null')
+            THEN 'IsPSD2=''' || cols[153]::STRING || ''''
+        WHEN cols[154]::STRING <> '' AND NOT REGEXP_LIKE(cols[154]::STRING, '^\\s*-?\\d+\\s*$')
+             AND LOWER(TRIM(cols[154]::STRING)) NOT IN ('', '\u0000', ' ', '-', '<na>', 'deprecated', 'na', 'nan', 'none', 'null')
+            THEN 'IsSCAScope=''' || cols[154]::STRING || ''''
+        WHEN cols[155]::STRING <> '' AND NOT REGEXP_LIKE(cols[155]::STRING, '^\\s*-?\\d+\\s*$')
+             AND LOWER(TRIM(cols[155]::STRING)) NOT IN ('', '\u0000', ' ', '-', '<na>', 'deprecated', 'na', 'nan', 'none', 'null')
+            THEN 'IsAirline=''' || cols[155]::STRING || ''''
+        WHEN cols[156]::STRING <> '' AND NOT REGEXP_LIKE(cols[156]::STRING, '^\\s*-?\\d+\\s*$')
+             AND LOWER(TRIM(cols[156]::STRING)) NOT IN ('', '\u0000', ' ', '-', '<na>', 'deprecated', 'na', 'nan', 'none', 'null')
+            THEN 'RequestedCCCID=''' || cols[156]::STRING || ''''
+    END AS reject_detail
+FROM parsed_data;
+
+-- Re-running for the same files replaces their parse rejects and counts (COPY load errors are kept)
+DELETE FROM poc.public.ncp_bronze_quarantine_v2
+WHERE reason <> 'load_error'
+  AND filename IN (SELECT DISTINCT filename FROM ncp_bronze_classified_v2);
+
+INSERT INTO poc.public.ncp_bronze_quarantine_v2
+SELECT filename, file_row_number, reject_reason, reject_detail, raw_line, CURRENT_TIMESTAMP
+FROM ncp_bronze_classified_v2
+WHERE reject_reason IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS poc.public.ncp_bronze_reject_counts_v2 (
+    filename STRING,
+    reason STRING,
+    rejected_rows BIGINT,
+    recorded_at TIMESTAMP_NTZ
+);
+
+DELETE FROM poc.public.ncp_bronze_reject_counts_v2
+WHERE SPLIT_PART(filename, '/', -1) IN (SELECT DISTINCT SPLIT_PART(filename, '/', -1) FROM ncp_bronze_classified_v2);
+
+INSERT INTO poc.public.ncp_bronze_reject_counts_v2
+SELECT filename, reason, COUNT(*), CURRENT_TIMESTAMP
+FROM poc.public.ncp_bronze_quarantine_v2
+WHERE SPLIT_PART(filename, '/', -1) IN (SELECT DISTINCT SPLIT_PART(filename, '/', -1) FROM ncp_bronze_classified_v2)
+GROUP BY filename, reason;
+
+-- STEP 2: Append the pending files to bronze and log them in one transaction
+BEGIN TRANSACTION;
+
+DELETE FROM poc.public.ncp_bronze_v2
+WHERE filename IN (SELECT filename FROM ncp_bronze_pending_files_v2);
+
+INSERT INTO poc.public.ncp_bronze_v2 (
+    filename, inserted_at, transaction_main_id, transaction_date, transaction_id_life_cycle,
+    transaction_date_life_cycle, transaction_type_id, transaction_type, transaction_result_id,
+    final_transaction_status, threed_flow_status, challenge_preference, preference_reason,
+    authentication_flow, threed_flow, is_void, liability_shift, status, acs_url,
+    acs_res_authentication_status, r_req_authentication_status, transaction_status_reason,
+    interaction_counter, challenge_cancel, three_ds_method_indication, is_sale_3d, manage_3d_decision,
+    decline_reason, amount_in_usd, approved_amount_in_usd, original_currency_amount, rate_usd, currency_code,
+    three_ds_protocol_version, is_external_mpi, rebill, device_channel, user_agent_3d, device_type,
+    device_name, device_os, challenge_window_size, type_of_authentication_method, multi_client_id, client_id,
+    multi_client_name, client_name, industry_code, credit_card_id, cccid, bin, is_prepaid, card_scheme,
+    card_type, consumer_id, issuer_bank_name, device_channel_name, bin_country, is_eea, region,
+    payment_instrument, source_application, is_partial_amount, enable_partial_approval,
+    partial_approval_is_void, partial_approval_void_id, partial_approval_void_time,
+    partial_approval_requested_amount, partial_approval_requested_currency, partial_approval_processed_amount,
+    partial_approval_processed_currency, partial_approval_processed_amount_in_usd, website_id,
+    browser_user_agent, ip_country, processor_id, processor_name, risk_email_id, is_currency_converted,
+    email_seniority_start_date, email_payment_attempts, final_fraud_decision_id, external_token_eci,
+    risk_threed_eci, threed_eci, cvv_code, provider_response_code, issuer_card_program_id, scenario_id,
+    previous_id, next_id, step, reprocess_3d_reason, data_only_authentication_result,
+    is_cascaded_after_data_only_authentication, next_action, authentication_method, cavv_verification_code,
+    channel, authentication_request, authentication_response, cc_hash, exp_date, message_version_3d,
+    cc_seniority_start_date, mc_scheme_token_used, stored_credentials_mode, avs_code, is_3d, credit_type_id,
+    subscription_step, scheme_token_fetching_result, browser_screen_height, browser_screen_width,
+    filter_reason_id, reason_code, reason, request_timestamp_service, token_unique_reference_service,
+    response_timestamp_service, api_type_service, request_timestamp_fetching, token_unique_reference_fetching,
+    response_timestamp_fetching, api_type_fetching, is_cryptogram_fetching_skipped, is_external_scheme_token,
+    three_ds_server_trans_id, gateway_id, cc_request_type_id, upo_id, IsCardReplaced, IsVdcuFeeApplied,
+    AftType, secondarycccid, transaction_duration, authorization_req_duration, FirstInstallment,
+    PeriodicalInstallment, numberOfInstallments, InstallmentProgram, InstallmentFundingType,
+    first_installment_usd, periodical_installment_usd, ApplicableScenarios, cascading_ab_test_experimant_name,
+    IsOnlineRefund, IsNoCVV, IsSupportedOCT, ExternalTokenTrasactionType, SubscriptionType,
+    MerchantCountryCodeNum, MCMerchantAdviceCode, AcquirerBinCountryId, AcquirerBin, IsPSD2, IsSCAScope,
+    IsAirline, RequestedCCCID, merchant_country, raw_line
+)
+SELECT
+    filename,
+    loaded_at AS inserted_at,
+    NULLIF(cols[0]::STRING, '') AS transaction_main_id,
+    TRY_CAST(TRIM(cols[1]::STRING) AS TIMESTAMP_NTZ) AS transaction_date,
+    NULLIF(cols[2]::STRING, '') AS transaction_id_life_cycle,
+    TRY_CAST(TRIM(cols[3]::STRING) AS TIMESTAMP_NTZ) AS transaction_date_life_cycle,
+    NULLIF(cols[4]::STRING, '') AS transaction_type_id,
+    NULLIF(cols[5]::STRING, '') AS transaction_type,
+    NULLIF(cols[6]::STRING, '') AS transaction_result_id,
+    NULLIF(cols[7]::STRING, '') AS final_transaction_status,
+    NULLIF(cols[8]::STRING, '') AS threed_flow_status,
+    NULLIF(cols[9]::STRING, '') AS challenge_preference,
+    NULLIF(cols[10]::STRING, '') AS preference_reason,
+    NULLIF(cols[11]::STRING, '') AS authentication_flow,
+    NULLIF(cols[12]::STRING, '') AS threed_flow,
+    NULLIF(cols[13]::STRING, '') AS is_void,
+    NULLIF(cols[14]::STRING, '') AS liability_shift,
+    NULLIF(cols[15]::STRING, '') AS status,
+    NULLIF(cols[16]::STRING, '') AS acs_url,
+    NULLIF(cols[17]::STRING, '') AS acs_res_authentication_status,
+    NULLIF(cols[18]::STRING, '') AS r_req_authentication_status,
+    NULLIF(cols[19]::STRING, '') AS transaction_status_reason,
+    NULLIF(cols[20]::STRING, '') AS interaction_counter,
+    NULLIF(cols[21]::STRING, '') AS challenge_cancel,
+    NULLIF(cols[22]::STRING, '') AS three_ds_method_indication,
+    NULLIF(cols[23]::STRING, '') AS is_sale_3d,
+    NULLIF(cols[24]::STRING, '') AS manage_3d_decision,
+    NULLIF(cols[25]::STRING, '') AS decline_reason,
+    NULLIF(cols[26]::STRING, '') AS amount_in_usd,
+    NULLIF(cols[27]::STRING, '') AS approved_amount_in_usd,
+    NULLIF(cols[28]::STRING, '') AS original_currency_amount,
+    NULLIF(cols[29]::STRING, '') AS rate_usd,
+    NULLIF(cols[30]::STRING, '') AS currency_code,
+    NULLIF(cols[31]::STRING, '') AS three_ds_protocol_version,
+    NULLIF(cols[32]::STRING, '') AS is_external_mpi,
+    NULLIF(cols[33]::STRING, '') AS rebill,
+    NULLIF(cols[34]::STRING, '') AS device_channel,
+    NULLIF(cols[35]::STRING, '') AS user_agent_3d,
+    NULLIF(cols[36]::STRING, '') AS device_type,
+    NULLIF(cols[37]::STRING, '') AS device_name,
+    NULLIF(cols[38]::STRING, '') AS device_os,
+    NULLIF(cols[39]::STRING, '') AS challenge_window_size,
+    NULLIF(cols[40]::STRING, '') AS type_of_authentication_method,
+    NULLIF(cols[41]::STRING, '') AS multi_client_id,
+    NULLIF(cols[42]::STRING, '') AS client_id,
+    NULLIF(cols[43]::STRING, '') AS multi_client_name,
+    NULLIF(cols[44]::STRING, '') AS client_name,
+    NULLIF(cols[45]::STRING, '') AS industry_code,
+    NULLIF(cols[46]::STRING, '') AS credit_card_id,
+    NULLIF(cols[47]::STRING, '') AS cccid,
+    NULLIF(cols[48]::STRING, '') AS bin,
+    NULLIF(cols[49]::STRING, '') AS is_prepaid,
+    NULLIF(cols[50]::STRING, '') AS card_scheme,
+    NULLIF(cols[51]::STRING, '') AS card_type,
+    NULLIF(cols[52]::STRING, '') AS consumer_id,
+    NULLIF(cols[53]::STRING, '') AS issuer_bank_name,
+    NULLIF(cols[54]::STRING, '') AS device_channel_name,
+    NULLIF(cols[55]::STRING, '') AS bin_country,
+    NULLIF(cols[56]::STRING, '') AS is_eea,
+    NULLIF(cols[57]::STRING, '') AS region,
+    NULLIF(cols[58]::STRING, '') AS payment_instrument,
+    NULLIF(cols[59]::STRING, '') AS source_application,
+    NULLIF(cols[60]::STRING, '') AS is_partial_amount,
+    NULLIF(cols[61]::STRING, '') AS enable_partial_approval,
+    NULLIF(cols[62]::STRING, '') AS partial_approval_is_void,
+    NULLIF(cols[63]::STRING, '') AS partial_approval_void_id,
+    NULLIF(cols[64]::STRING, '') AS partial_approval_void_time,
+    NULLIF(cols[65]::STRING, '') AS partial_approval_requested_amount,
+    NULLIF(cols[66]::STRING, '') AS partial_approval_requested_currency,
+    NULLIF(cols[67]::STRING, '') AS partial_approval_processed_amount,
+    NULLIF(cols[68]::STRING, '') AS partial_approval_processed_currency,
+    NULLIF(cols[69]::STRING, '') AS partial_approval_processed_amount_in_usd,
+    NULLIF(cols[70]::STRING, '') AS website_id,
+    NULLIF(cols[71]::STRING, '') AS browser_user_agent,
+    NULLIF(cols[72]::STRING, '') AS ip_country,
+    NULLIF(cols[73]::STRING, '') AS processor_id,
+    NULLIF(cols[74]::STRING, '') AS processor_name,
+    NULLIF(cols[75]::STRING, '') AS risk_email_id,
+    NULLIF(cols[76]::STRING, '') AS is_currency_converted,
+    TRY_CAST(TRIM(cols[77]::STRING) AS TIMESTAMP_NTZ) AS email_seniority_start_date,
+    NULLIF(cols[78]::STRING, '') AS email_payment_attempts,
+    NULLIF(cols[79]::STRING, '') AS final_fraud_decision_id,
+    NULLIF(cols[80]::STRING, '') AS external_token_eci,
+    NULLIF(cols[81]::STRING, '') AS risk_threed_eci,
+    NULLIF(cols[82]::STRING, '') AS threed_eci,
+    NULLIF(cols[83]::STRING, '') AS cvv_code,
+    NULLIF(cols[84]::STRING, '') AS provider_response_code,
+    NULLIF(cols[85]::STRING, '') AS issuer_card_program_id,
+    NULLIF(cols[86]::STRING, '') AS scenario_id,
+    NULLIF(cols[87]::STRING, '') AS previous_id,
+    NULLIF(cols[88]::STRING, '') AS next_id,
+    NULLIF(cols[89]::STRING, '') AS step,
+    NULLIF(cols[90]::STRING, '') AS reprocess_3d_reason,
+    NULLIF(cols[91]::STRING, '') AS data_only_authentication_result,
+    NULLIF(cols[92]::STRING, '') AS is_cascaded_after_data_only_authentication,
+    NULLIF(cols[93]::STRING, '') AS next_action,
+    NULLIF(cols[94]::STRING, '') AS authentication_method,
+    NULLIF(cols[95]::STRING, '') AS cavv_verification_code,
+    NULLIF(cols[96]::STRING, '') AS channel,
+    NULLIF(cols[97]::STRING, '') AS authentication_request,
+    NULLIF(cols[98]::STRING, '') AS authentication_response,
+    NULLIF(cols[99]::STRING, '') AS cc_hash,
+    TRY_CAST(TRIM(cols[100]::STRING) AS TIMESTAMP_NTZ) AS exp_date,
+    NULLIF(cols[101]::STRING, '') AS message_version_3d,
+    TRY_CAST(TRIM(cols[102]::STRING) AS TIMESTAMP_NTZ) AS cc_seniority_start_date,
+    NULLIF(cols[103]::STRING, '') AS mc_scheme_token_used,
+    NULLIF(cols[104]::STRING, '') AS stored_credentials_mode,
+    NULLIF(cols[105]::STRING, '') AS avs_code,
+    NULLIF(cols[106]::STRING, '') AS is_3d,
+    NULLIF(cols[107]::STRING, '') AS credit_type_id,
+    NULLIF(cols[108]::STRING, '') AS subscription_step,
+    NULLIF(cols[109]::STRING, '') AS scheme_token_fetching_result,
+    NULLIF(cols[110]::STRING, '') AS browser_screen_height,
+    NULLIF(cols[111]::STRING, '') AS browser_screen_width,
+    NULLIF(cols[112]::STRING, '') AS filter_reason_id,
+    NULLIF(cols[113]::STRING, '') AS reason_code,
+    NULLIF(cols[114]::STRING, '') AS reason,
+    NULLIF(cols[115]::STRING, '') AS request_timestamp_service,
+    NULLIF(cols[116]::STRING, '') AS token_unique_reference_service,
+    NULLIF(cols[117]::STRING, '') AS response_timestamp_service,
+    NULLIF(cols[118]::STRING, '') AS api_type_service,
+    NULLIF(cols[119]::STRING, '') AS request_timestamp_fetching,
+    NULLIF(cols[120]::STRING, '') AS token_unique_reference_fetching,
+    NULLIF(cols[121]::STRING, '') AS response_timestamp_fetching,
+    NULLIF(cols[122]::STRING, '') AS api_type_fetching,
+    NULLIF(cols[123]::STRING, '') AS is_cryptogram_fetching_skipped,
+    NULLIF(cols[124]::STRING, '') AS is_external_scheme_token,
+    NULLIF(cols[125]::STRING, '') AS three_ds_server_trans_id,
+    NULLIF(cols[126]::STRING, '') AS gateway_id,
+    NULLIF(cols[127]::STRING, '') AS cc_request_type_id,
+    NULLIF(cols[128]::STRING, '') AS upo_id,
+    NULLIF(cols[129]::STRING, '') AS IsCardReplaced,
+    NULLIF(cols[130]::STRING, '') AS IsVdcuFeeApplied,
+    NULLIF(cols[131]::STRING, '') AS AftType,
+    NULLIF(cols[132]::STRING, '') AS secondarycccid,
+    NULLIF(cols[133]::STRING, '') AS transaction_duration,
+    NULLIF(cols[134]::STRING, '') AS authorization_req_duration,
+    NULLIF(cols[135]::STRING, '') AS FirstInstallment,
+    NULLIF(cols[136]::STRING, '') AS PeriodicalInstallment,
+    NULLIF(cols[137]::STRING, '') AS numberOfInstallments,
+    NULLIF(cols[138]::STRING, '') AS InstallmentProgram,
+    NULLIF(cols[139]::STRING, '') AS InstallmentFundingType,
+    NULLIF(cols[140]::STRING, '') AS first_installment_usd,
+    NULLIF(cols[141]::STRING, '') AS periodical_installment_usd,
+    NULLIF(cols[142]::STRING, '') AS ApplicableScenarios,
+    NULLIF(cols[143]::STRING, '') AS cascading_ab_test_experimant_name,
+    TRY_CAST(TRIM(cols[144]::STRING) AS INTEGER) AS IsOnlineRefund,
+    TRY_CAST(TRIM(cols[145]::STRING) AS INTEGER) AS IsNoCVV,
+    TRY_CAST(TRIM(cols[146]::STRING) AS INTEGER) AS IsSupportedOCT,
+    NULLIF(cols[147]::STRING, '') AS ExternalTokenTrasactionType,
+    NULLIF(cols[148]::STRING, '') AS SubscriptionType,
+    TRY_CAST(TRIM(cols[149]::STRING) AS INTEGER) AS MerchantCountryCodeNum,
+    NULLIF(cols[150]::STRING, '') AS MCMerchantAdviceCode,
+    TRY_CAST(TRIM(cols[151]::STRING) AS INTEGER) AS AcquirerBinCountryId,
+    TRY_CAST(TRIM(cols[152]::STRING) AS INTEGER) AS AcquirerBin,
+    TRY_CAST(TRIM(cols[153]::STRING) AS INTEGER) AS IsPSD2,
+    TRY_CAST(TRIM(cols[154]::STRING) AS INTEGER) AS IsSCAScope,
+    TRY_CAST(TRIM(cols[155]::STRING) AS INTEGER) AS IsAirline,
+    TRY_CAST(TRIM(cols[156]::STRING) AS INTEGER) AS RequestedCCCID,
+    NULLIF(cols[157]::STRING, '') AS merchant_country,
+    raw_line
+FROM ncp_bronze_classified_v2
+WHERE reject_reason IS NULL;
+
+INSERT INTO poc.public.ncp_bronze_load_log_v2
+SELECT
+    pending.filename,
+    pending.staged_at,
+    pending.staged_lines,
+    COUNT(classified.filename) - COUNT(classified.reject_reason),
+    COUNT(classified.reject_reason),
+    SYSDATE()
+FROM ncp_bronze_pending_files_v2 pending
+LEFT JOIN ncp_bronze_classified_v2 classified ON classified.filename = pending.filename
+GROUP BY pending.filename, pending.staged_at, pending.staged_lines;
+
+COMMIT;
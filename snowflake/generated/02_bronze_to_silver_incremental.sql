@@ -0,0 +1,669 @@
+-- BRONZE TO SILVER (INCREMENTAL - bronze rows after the checkpoint are merged)
+-- GENERATED by `python -m shared.ncp_local.sqlgen generate` from
+-- databricks/original_scripts/schema_config.json - edit the generator, not this file.
+-- 158 file columns; silver has 174 columns.
+
+CREATE TABLE IF NOT EXISTS poc.public.ncp_silver_checkpoint_v2 (
+    checkpoint_time TIMESTAMP_NTZ,
+    rows_merged BIGINT,
+    recorded_at TIMESTAMP_NTZ
+);
+
+-- STEP 1: Bronze load window of this run
+CREATE OR REPLACE TEMPORARY TABLE ncp_silver_window_v2 AS
+SELECT
+    (SELECT MAX(checkpoint_time) FROM poc.public.ncp_silver_checkpoint_v2) AS window_start,
+    (SELECT MAX(inserted_at) FROM poc.public.ncp_bronze_v2) AS window_end;
+
+-- STEP 2: Transform the new bronze rows
+CREATE OR REPLACE TEMPORARY TABLE ncp_silver_batch_v2 AS
+WITH deduped_bronze AS (
+    SELECT *
+    FROM poc.public.ncp_bronze_v2
+    WHERE inserted_at > COALESCE((SELECT window_start FROM ncp_silver_window_v2), CAST('1900-01-01' AS TIMESTAMP_NTZ))
+      AND inserted_at <= (SELECT window_end FROM ncp_silver_window_v2)
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY transaction_main_id, transaction_date ORDER BY inserted_at DESC) = 1
+),
+filtered_data AS (
+    SELECT *
+    FROM deduped_bronze
+    WHERE multi_client_name IS NOT NULL
+      AND multi_client_name NOT IN ('test multi', 'davidh test2 multi', 'ice demo multi', 'monitoring client pod2 multi')
+),
+status_flags_calculated AS (
+    SELECT
+    *,
+    CASE WHEN transaction_type = 'initauth3d'
+        THEN CASE WHEN transaction_result_id = '1006' THEN 'true' ELSE 'false' END
+    END AS init_status,
+    CASE WHEN transaction_type = 'auth3d'
+        THEN CASE WHEN transaction_result_id = '1006' THEN 'true' ELSE 'false' END
+    END AS auth_3d_status,
+    CASE WHEN transaction_type = 'sale'
+        THEN CASE WHEN transaction_result_id = '1006' THEN 'true' ELSE 'false' END
+    END AS sale_status,
+    CASE WHEN transaction_type = 'auth'
+        THEN CASE WHEN transaction_result_id = '1006' THEN 'true' ELSE 'false' END
+    END AS auth_status,
+    CASE WHEN transaction_type = 'settle'
+        THEN CASE WHEN transaction_result_id = '1006' THEN 'true' ELSE 'false' END
+    END AS settle_status,
+    CASE WHEN transaction_type = 'verify_auth_3d'
+        THEN CASE WHEN transaction_result_id = '1006' THEN 'true' ELSE 'false' END
+    END AS verify_auth_3d_status
+    FROM filtered_data
+),
+conversions_calculated AS (
+    SELECT
+    *,
+    CASE WHEN transaction_type = 'auth3d' THEN is_sale_3d END AS is_sale_3d_auth_3d,
+    CASE WHEN transaction_type = 'auth3d' THEN manage_3d_decision END AS manage_3d_decision_auth_3d,
+    CASE
+        WHEN threed_flow_status = '3d_success' THEN 'true'
+        WHEN threed_flow_status IN ('3d_failure', '3d_wasnt_completed') THEN 'false'
+    END AS is_successful_challenge,
+    CASE
+        WHEN authentication_flow = 'exemption' THEN 'true'
+        WHEN challenge_preference = 'y_requested_by_acquirer' THEN 'false'
+    END AS is_successful_exemption,
+    CASE
+        WHEN authentication_flow = 'frictionless' AND status = '40' THEN 'true'
+        WHEN authentication_flow = 'frictionless' THEN 'false'
+    END AS is_successful_frictionless,
+    CASE
+        WHEN threed_flow_status = '3d_success' OR (authentication_flow = 'frictionless' AND status = '40') THEN 'true'
+        WHEN (acs_url IS NOT NULL AND authentication_flow <> 'exemption')
+          OR (authentication_flow = 'frictionless' AND status <> '40') THEN 'false'
+    END AS is_successful_authentication,
+    CASE
+        WHEN auth_status = 'true' OR sale_status = 'true' THEN 'true'
+        WHEN auth_status = 'false' OR sale_status = 'false' THEN 'false'
+    END AS is_approved,
+    CASE
+        WHEN transaction_type IN ('sale', 'auth') AND transaction_result_id = '1008' THEN 'true'
+        WHEN auth_status IS NOT NULL OR sale_status IS NOT NULL THEN 'false'
+    END AS is_declined
+    FROM status_flags_calculated
+),
+strings_normalized AS (
+    SELECT * REPLACE (
+    TRIM(LOWER(REGEXP_REPLACE(transaction_main_id, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS transaction_main_id,
+    TRIM(LOWER(REGEXP_REPLACE(transaction_id_life_cycle, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS transaction_id_life_cycle,
+    TRIM(LOWER(REGEXP_REPLACE(transaction_type_id, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS transaction_type_id,
+    TRIM(LOWER(REGEXP_REPLACE(transaction_type, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS transaction_type,
+    TRIM(LOWER(REGEXP_REPLACE(transaction_result_id, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS transaction_result_id,
+    TRIM(LOWER(REGEXP_REPLACE(final_transaction_status, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS final_transaction_status,
+    TRIM(LOWER(REGEXP_REPLACE(threed_flow_status, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS threed_flow_status,
+    TRIM(LOWER(REGEXP_REPLACE(challenge_preference, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS challenge_preference,
+    TRIM(LOWER(REGEXP_REPLACE(preference_reason, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS preference_reason,
+    TRIM(LOWER(REGEXP_REPLACE(authentication_flow, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS authentication_flow,
+    TRIM(LOWER(REGEXP_REPLACE(threed_flow, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS threed_flow,
+    TRIM(LOWER(REGEXP_REPLACE(status, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS status,
+    TRIM(LOWER(REGEXP_REPLACE(acs_url, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS acs_url,
+    TRIM(LOWER(REGEXP_REPLACE(acs_res_authentication_status, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS acs_res_authentication_status,
+    TRIM(LOWER(REGEXP_REPLACE(r_req_authentication_status, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS r_req_authentication_status,
+    TRIM(LOWER(REGEXP_REPLACE(transaction_status_reason, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS transaction_status_reason,
+    TRIM(LOWER(REGEXP_REPLACE(interaction_counter, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS interaction_counter,
+    TRIM(LOWER(REGEXP_REPLACE(challenge_cancel, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS challenge_cancel,
+    TRIM(LOWER(REGEXP_REPLACE(three_ds_method_indication, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS three_ds_method_indication,
+    TRIM(LOWER(REGEXP_REPLACE(decline_reason, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS decline_reason,
+    TRIM(LOWER(REGEXP_REPLACE(amount_in_usd, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS amount_in_usd,
+    TRIM(LOWER(REGEXP_REPLACE(approved_amount_in_usd, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS approved_amount_in_usd,
+    TRIM(LOWER(REGEXP_REPLACE(original_currency_amount, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS original_currency_amount,
+    TRIM(LOWER(REGEXP_REPLACE(rate_usd, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS rate_usd,
+    TRIM(LOWER(REGEXP_REPLACE(currency_code, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS currency_code,
+    TRIM(LOWER(REGEXP_REPLACE(three_ds_protocol_version, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS three_ds_protocol_version,
+    TRIM(LOWER(REGEXP_REPLACE(device_channel, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS device_channel,
+    TRIM(LOWER(REGEXP_REPLACE(device_type, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS device_type,
+    TRIM(LOWER(REGEXP_REPLACE(device_name, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS device_name,
+    TRIM(LOWER(REGEXP_REPLACE(device_os, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS device_os,
+    TRIM(LOWER(REGEXP_REPLACE(challenge_window_size, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS challenge_window_size,
+    TRIM(LOWER(REGEXP_REPLACE(type_of_authentication_method, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS type_of_authentication_method,
+    TRIM(LOWER(REGEXP_REPLACE(multi_client_id, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS multi_client_id,
+    TRIM(LOWER(REGEXP_REPLACE(client_id, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS client_id,
+    TRIM(LOWER(REGEXP_REPLACE(multi_client_name, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS multi_client_name,
+    TRIM(LOWER(REGEXP_REPLACE(client_name, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS client_name,
+    TRIM(LOWER(REGEXP_REPLACE(industry_code, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS industry_code,
+    TRIM(LOWER(REGEXP_REPLACE(credit_card_id, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS credit_card_id,
+    TRIM(LOWER(REGEXP_REPLACE(cccid, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS cccid,
+    TRIM(LOWER(REGEXP_REPLACE(bin, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS bin,
+    TRIM(LOWER(REGEXP_REPLACE(card_scheme, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS card_scheme,
+    TRIM(LOWER(REGEXP_REPLACE(card_type, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS card_type,
+    TRIM(LOWER(REGEXP_REPLACE(consumer_id, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS consumer_id,
+    TRIM(LOWER(REGEXP_REPLACE(issuer_bank_name, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS issuer_bank_name,
+    TRIM(LOWER(REGEXP_REPLACE(device_channel_name, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS device_channel_name,
+    TRIM(LOWER(REGEXP_REPLACE(bin_country, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS bin_country,
+    TRIM(LOWER(REGEXP_REPLACE(region, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS region,
+    TRIM(LOWER(REGEXP_REPLACE(payment_instrument, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS payment_instrument,
+    TRIM(LOWER(REGEXP_REPLACE(source_application, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS source_application,
+    TRIM(LOWER(REGEXP_REPLACE(enable_partial_approval, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS enable_partial_approval,
+    TRIM(LOWER(REGEXP_REPLACE(partial_approval_void_id, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS partial_approval_void_id,
+    TRIM(LOWER(REGEXP_REPLACE(partial_approval_void_time, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS partial_approval_void_time,
+    TRIM(LOWER(REGEXP_REPLACE(partial_approval_requested_amount, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS partial_approval_requested_amount,
+    TRIM(LOWER(REGEXP_REPLACE(partial_approval_requested_currency, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS partial_approval_requested_currency,
+    TRIM(LOWER(REGEXP_REPLACE(partial_approval_processed_amount, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS partial_approval_processed_amount,
+    TRIM(LOWER(REGEXP_REPLACE(partial_approval_processed_currency, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS partial_approval_processed_currency,
+    TRIM(LOWER(REGEXP_REPLACE(partial_approval_processed_amount_in_usd, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS partial_approval_processed_amount_in_usd,
+    TRIM(LOWER(REGEXP_REPLACE(website_id, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS website_id,
+    TRIM(LOWER(REGEXP_REPLACE(browser_user_agent, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS browser_user_agent,
+    TRIM(LOWER(REGEXP_REPLACE(ip_country, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS ip_country,
+    TRIM(LOWER(REGEXP_REPLACE(processor_id, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS processor_id,
+    TRIM(LOWER(REGEXP_REPLACE(processor_name, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS processor_name,
+    TRIM(LOWER(REGEXP_REPLACE(risk_email_id, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS risk_email_id,
+    TRIM(LOWER(REGEXP_REPLACE(email_payment_attempts, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS email_payment_attempts,
+    TRIM(LOWER(REGEXP_REPLACE(final_fraud_decision_id, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS final_fraud_decision_id,
+    TRIM(LOWER(REGEXP_REPLACE(external_token_eci, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS external_token_eci,
+    TRIM(LOWER(REGEXP_REPLACE(risk_threed_eci, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS risk_threed_eci,
+    TRIM(LOWER(REGEXP_REPLACE(threed_eci, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS threed_eci,
+    TRIM(LOWER(REGEXP_REPLACE(cvv_code, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS cvv_code,
+    TRIM(LOWER(REGEXP_REPLACE(provider_response_code, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS provider_response_code,
+    TRIM(LOWER(REGEXP_REPLACE(issuer_card_program_id, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS issuer_card_program_id,
+    TRIM(LOWER(REGEXP_REPLACE(scenario_id, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS scenario_id,
+    TRIM(LOWER(REGEXP_REPLACE(previous_id, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS previous_id,
+    TRIM(LOWER(REGEXP_REPLACE(next_id, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS next_id,
+    TRIM(LOWER(REGEXP_REPLACE(step, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS step,
+    TRIM(LOWER(REGEXP_REPLACE(reprocess_3d_reason, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS reprocess_3d_reason,
+    TRIM(LOWER(REGEXP_REPLACE(data_only_authentication_result, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS data_only_authentication_result,
+    TRIM(LOWER(REGEXP_REPLACE(is_cascaded_after_data_only_authentication, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS is_cascaded_after_data_only_authentication,
+    TRIM(LOWER(REGEXP_REPLACE(next_action, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS next_action,
+    TRIM(LOWER(REGEXP_REPLACE(authentication_method, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS authentication_method,
+    TRIM(LOWER(REGEXP_REPLACE(cavv_verification_code, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS cavv_verification_code,
+    TRIM(LOWER(REGEXP_REPLACE(channel, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS channel,
+    TRIM(LOWER(REGEXP_REPLACE(cc_hash, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS cc_hash,
+    TRIM(LOWER(REGEXP_REPLACE(message_version_3d, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS message_version_3d,
+    TRIM(LOWER(REGEXP_REPLACE(stored_credentials_mode, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS stored_credentials_mode,
+    TRIM(LOWER(REGEXP_REPLACE(avs_code, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS avs_code,
+    TRIM(LOWER(REGEXP_REPLACE(credit_type_id, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS credit_type_id,
+    TRIM(LOWER(REGEXP_REPLACE(subscription_step, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS subscription_step,
+    TRIM(LOWER(REGEXP_REPLACE(scheme_token_fetching_result, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS scheme_token_fetching_result,
+    TRIM(LOWER(REGEXP_REPLACE(browser_screen_height, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS browser_screen_height,
+    TRIM(LOWER(REGEXP_REPLACE(browser_screen_width, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS browser_screen_width,
+    TRIM(LOWER(REGEXP_REPLACE(filter_reason_id, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS filter_reason_id,
+    TRIM(LOWER(REGEXP_REPLACE(reason_code, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS reason_code,
+    TRIM(LOWER(REGEXP_REPLACE(reason, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS reason,
+    TRIM(LOWER(REGEXP_REPLACE(request_timestamp_service, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS request_timestamp_service,
+    TRIM(LOWER(REGEXP_REPLACE(token_unique_reference_service, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS token_unique_reference_service,
+    TRIM(LOWER(REGEXP_REPLACE(response_timestamp_service, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS response_timestamp_service,
+    TRIM(LOWER(REGEXP_REPLACE(api_type_service, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS api_type_service,
+    TRIM(LOWER(REGEXP_REPLACE(request_timestamp_fetching, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS request_timestamp_fetching,
+    TRIM(LOWER(REGEXP_REPLACE(token_unique_reference_fetching, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS token_unique_reference_fetching,
+    TRIM(LOWER(REGEXP_REPLACE(response_timestamp_fetching, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS response_timestamp_fetching,
+    TRIM(LOWER(REGEXP_REPLACE(api_type_fetching, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS api_type_fetching,
+    TRIM(LOWER(REGEXP_REPLACE(is_cryptogram_fetching_skipped, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS is_cryptogram_fetching_skipped,
+    TRIM(LOWER(REGEXP_REPLACE(is_external_scheme_token, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS is_external_scheme_token,
+    TRIM(LOWER(REGEXP_REPLACE(three_ds_server_trans_id, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS three_ds_server_trans_id,
+    TRIM(LOWER(REGEXP_REPLACE(gateway_id, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS gateway_id,
+    TRIM(LOWER(REGEXP_REPLACE(cc_request_type_id, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS cc_request_type_id,
+    TRIM(LOWER(REGEXP_REPLACE(upo_id, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS upo_id,
+    TRIM(LOWER(REGEXP_REPLACE(IsCardReplaced, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS IsCardReplaced,
+    TRIM(LOWER(REGEXP_REPLACE(IsVdcuFeeApplied, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS IsVdcuFeeApplied,
+    TRIM(LOWER(REGEXP_REPLACE(AftType, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS AftType,
+    TRIM(LOWER(REGEXP_REPLACE(secondarycccid, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS secondarycccid,
+    TRIM(LOWER(REGEXP_REPLACE(transaction_duration, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS transaction_duration,
+    TRIM(LOWER(REGEXP_REPLACE(FirstInstallment, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS FirstInstallment,
+    TRIM(LOWER(REGEXP_REPLACE(PeriodicalInstallment, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS PeriodicalInstallment,
+    TRIM(LOWER(REGEXP_REPLACE(numberOfInstallments, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS numberOfInstallments,
+    TRIM(LOWER(REGEXP_REPLACE(InstallmentProgram, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS InstallmentProgram,
+    TRIM(LOWER(REGEXP_REPLACE(InstallmentFundingType, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS InstallmentFundingType,
+    TRIM(LOWER(REGEXP_REPLACE(first_installment_usd, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS first_installment_usd,
+    TRIM(LOWER(REGEXP_REPLACE(periodical_installment_usd, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS periodical_installment_usd,
+    TRIM(LOWER(REGEXP_REPLACE(ApplicableScenarios, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS ApplicableScenarios,
+    TRIM(LOWER(REGEXP_REPLACE(cascading_ab_test_experimant_name, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS cascading_ab_test_experimant_name,
+    TRIM(LOWER(REGEXP_REPLACE(ExternalTokenTrasactionType, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS ExternalTokenTrasactionType,
+    TRIM(LOWER(REGEXP_REPLACE(SubscriptionType, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS SubscriptionType,
+    TRIM(LOWER(REGEXP_REPLACE(MCMerchantAdviceCode, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS MCMerchantAdviceCode,
+    TRIM(LOWER(REGEXP_REPLACE(merchant_country, '^(\\d+)\\.?\\d*$', '\\1')), ' ') AS merchant_country
+    )
+    FROM conversions_calculated
+)
+SELECT
+    CASE WHEN transaction_main_id IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE transaction_main_id END AS transaction_main_id,
+    CAST(transaction_date AS TIMESTAMP_NTZ) AS transaction_date,
+    CASE WHEN transaction_id_life_cycle IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE transaction_id_life_cycle END AS transaction_id_life_cycle,
+    CAST(transaction_date_life_cycle AS TIMESTAMP_NTZ) AS transaction_date_life_cycle,
+    CASE WHEN transaction_type_id IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE transaction_type_id END AS transaction_type_id,
+    CASE WHEN transaction_type IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE transaction_type END AS transaction_type,
+    CASE WHEN transaction_result_id IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE transaction_result_id END AS transaction_result_id,
+    CASE WHEN final_transaction_status IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE final_transaction_status END AS final_transaction_status,
+    CASE WHEN threed_flow_status IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE threed_flow_status END AS "3d_flow_status",
+    CASE WHEN challenge_preference IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE challenge_preference END AS challenge_preference,
+    CASE WHEN preference_reason IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE preference_reason END AS preference_reason,
+    CASE WHEN authentication_flow IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE authentication_flow END AS authentication_flow,
+    CASE WHEN threed_flow IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE threed_flow END AS "3d_flow",
+    CASE WHEN TRIM(LOWER(is_void), ' ') IN ('true', '1', 'yes', '1.0') THEN TRUE WHEN TRIM(LOWER(is_void), ' ') IN ('false', '0', 'no', '0.0') THEN FALSE END AS is_void,
+    CASE WHEN TRIM(LOWER(liability_shift), ' ') IN ('true', '1', 'yes', '1.0') THEN TRUE WHEN TRIM(LOWER(liability_shift), ' ') IN ('false', '0', 'no', '0.0') THEN FALSE END AS liability_shift,
+    CASE WHEN status IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE status END AS status,
+    CASE WHEN acs_url IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE acs_url END AS acs_url,
+    CASE WHEN acs_res_authentication_status IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE acs_res_authentication_status END AS acs_res_authentication_status,
+    CASE WHEN r_req_authentication_status IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE r_req_authentication_status END AS r_req_authentication_status,
+    CASE WHEN transaction_status_reason IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE transaction_status_reason END AS transaction_status_reason,
+    CASE WHEN interaction_counter IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE interaction_counter END AS interaction_counter,
+    CASE WHEN challenge_cancel IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE challenge_cancel END AS challenge_cancel,
+    CASE WHEN three_ds_method_indication IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE three_ds_method_indication END AS three_ds_method_indication,
+    CASE WHEN TRIM(LOWER(is_sale_3d), ' ') IN ('true', '1', 'yes', '1.0') THEN TRUE WHEN TRIM(LOWER(is_sale_3d), ' ') IN ('false', '0', 'no', '0.0') THEN FALSE END AS is_sale_3d,
+    CASE WHEN TRIM(LOWER(manage_3d_decision), ' ') IN ('true', '1', 'yes', '1.0') THEN TRUE WHEN TRIM(LOWER(manage_3d_decision), ' ') IN ('false', '0', 'no', '0.0') THEN FALSE END AS manage_3d_decision,
+    CASE WHEN decline_reason IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE decline_reason END AS decline_reason,
+    CASE WHEN amount_in_usd IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE amount_in_usd END AS amount_in_usd,
+    CASE WHEN approved_amount_in_usd IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE approved_amount_in_usd END AS approved_amount_in_usd,
+    CASE WHEN original_currency_amount IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE original_currency_amount END AS original_currency_amount,
+    CASE WHEN rate_usd IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE rate_usd END AS rate_usd,
+    CASE WHEN currency_code IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE currency_code END AS currency_code,
+    CASE WHEN three_ds_protocol_version IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE three_ds_protocol_version END AS three_ds_protocol_version,
+    CASE WHEN TRIM(LOWER(is_external_mpi), ' ') IN ('true', '1', 'yes', '1.0') THEN TRUE WHEN TRIM(LOWER(is_external_mpi), ' ') IN ('false', '0', 'no', '0.0') THEN FALSE END AS is_external_mpi,
+    CASE WHEN TRIM(LOWER(rebill), ' ') IN ('true', '1', 'yes', '1.0') THEN TRUE WHEN TRIM(LOWER(rebill), ' ') IN ('false', '0', 'no', '0.0') THEN FALSE END AS rebill,
+    CASE WHEN device_channel IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE device_channel END AS device_channel,
+    CAST(NULL AS STRING) AS user_agent_3d,
+    CASE WHEN device_type IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE device_type END AS device_type,
+    CASE WHEN device_name IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE device_name END AS device_name,
+    CASE WHEN device_os IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE device_os END AS device_os,
+    CASE WHEN challenge_window_size IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE challenge_window_size END AS challenge_window_size,
+    CASE WHEN type_of_authentication_method IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE type_of_authentication_method END AS type_of_authentication_method,
+    CASE WHEN multi_client_id IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE multi_client_id END AS multi_client_id,
+    CASE WHEN client_id IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE client_id END AS client_id,
+    CASE WHEN multi_client_name IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE multi_client_name END AS multi_client_name,
+    CASE WHEN client_name IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE client_name END AS client_name,
+    CASE WHEN industry_code IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE industry_code END AS industry_code,
+    CASE WHEN credit_card_id IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE credit_card_id END AS credit_card_id,
+    CASE WHEN cccid IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE cccid END AS cccid,
+    CASE WHEN bin IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE bin END AS bin,
+    CASE WHEN TRIM(LOWER(is_prepaid), ' ') IN ('true', '1', 'yes', '1.0') THEN TRUE WHEN TRIM(LOWER(is_prepaid), ' ') IN ('false', '0', 'no', '0.0') THEN FALSE END AS is_prepaid,
+    CASE WHEN card_scheme IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE card_scheme END AS card_scheme,
+    CASE WHEN card_type IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE card_type END AS card_type,
+    CASE WHEN consumer_id IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE consumer_id END AS consumer_id,
+    CASE WHEN issuer_bank_name IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE issuer_bank_name END AS issuer_bank_name,
+    CASE WHEN device_channel_name IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE device_channel_name END AS device_channel_name,
+    CASE WHEN bin_country IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE bin_country END AS bin_country,
+    CASE WHEN TRIM(LOWER(is_eea), ' ') IN ('true', '1', 'yes', '1.0') THEN TRUE WHEN TRIM(LOWER(is_eea), ' ') IN ('false', '0', 'no', '0.0') THEN FALSE END AS is_eea,
+    CASE WHEN region IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE region END AS region,
+    CASE WHEN payment_instrument IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE payment_instrument END AS payment_instrument,
+    CASE WHEN source_application IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE source_application END AS source_application,
+    CASE WHEN TRIM(LOWER(is_partial_amount), ' ') IN ('true', '1', 'yes', '1.0') THEN TRUE WHEN TRIM(LOWER(is_partial_amount), ' ') IN ('false', '0', 'no', '0.0') THEN FALSE END AS is_partial_amount,
+    CASE WHEN enable_partial_approval IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE enable_partial_approval END AS enable_partial_approval,
+    CASE WHEN TRIM(LOWER(partial_approval_is_void), ' ') IN ('true', '1', 'yes', '1.0') THEN TRUE WHEN TRIM(LOWER(partial_approval_is_void), ' ') IN ('false', '0', 'no', '0.0') THEN FALSE END AS partial_approval_is_void,
+    CASE WHEN partial_approval_void_id IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE partial_approval_void_id END AS partial_approval_void_id,
+    CASE WHEN partial_approval_void_time IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE partial_approval_void_time END AS partial_approval_void_time,
+    CASE WHEN partial_approval_requested_amount IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE partial_approval_requested_amount END AS partial_approval_requested_amount,
+    CASE WHEN partial_approval_requested_currency IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE partial_approval_requested_currency END AS partial_approval_requested_currency,
+    CASE WHEN partial_approval_processed_amount IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE partial_approval_processed_amount END AS partial_approval_processed_amount,
+    CASE WHEN partial_approval_processed_currency IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE partial_approval_processed_currency END AS partial_approval_processed_currency,
+    CASE WHEN partial_approval_processed_amount_in_usd IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE partial_approval_processed_amount_in_usd END AS partial_approval_processed_amount_in_usd,
+    CASE WHEN website_id IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE website_id END AS website_id,
+    CASE WHEN browser_user_agent IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE browser_user_agent END AS browser_user_agent,
+    CASE WHEN ip_country IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE ip_country END AS ip_country,
+    CASE WHEN processor_id IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE processor_id END AS processor_id,
+    CASE WHEN processor_name IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE processor_name END AS processor_name,
+    CASE WHEN risk_email_id IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE risk_email_id END AS risk_email_id,
+    CASE WHEN TRIM(LOWER(is_currency_converted), ' ') IN ('true', '1', 'yes', '1.0') THEN TRUE WHEN TRIM(LOWER(is_currency_converted), ' ') IN ('false', '0', 'no', '0.0') THEN FALSE END AS is_currency_converted,
+    CAST(email_seniority_start_date AS TIMESTAMP_NTZ) AS email_seniority_start_date,
+    CASE WHEN email_payment_attempts IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE email_payment_attempts END AS email_payment_attempts,
+    CASE WHEN final_fraud_decision_id IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE final_fraud_decision_id END AS final_fraud_decision_id,
+    CASE WHEN external_token_eci IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE external_token_eci END AS external_token_eci,
+    CASE WHEN risk_threed_eci IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE risk_threed_eci END AS risk_threed_eci,
+    CASE WHEN threed_eci IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE threed_eci END AS threed_eci,
+    CASE WHEN cvv_code IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE cvv_code END AS cvv_code,
+    CASE WHEN provider_response_code IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE provider_response_code END AS provider_response_code,
+    CASE WHEN issuer_card_program_id IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE issuer_card_program_id END AS issuer_card_program_id,
+    CASE WHEN scenario_id IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE scenario_id END AS scenario_id,
+    CASE WHEN previous_id IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE previous_id END AS previous_id,
+    CASE WHEN next_id IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE next_id END AS next_id,
+    CASE WHEN step IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE step END AS step,
+    CASE WHEN reprocess_3d_reason IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE reprocess_3d_reason END AS reprocess_3d_reason,
+    CASE WHEN data_only_authentication_result IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE data_only_authentication_result END AS data_only_authentication_result,
+    CASE WHEN is_cascaded_after_data_only_authentication IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE is_cascaded_after_data_only_authentication END AS is_cascaded_after_data_only_authentication,
+    CASE WHEN next_action IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE next_action END AS next_action,
+    CASE WHEN authentication_method IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE authentication_method END AS authentication_method,
+    CASE WHEN cavv_verification_code IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE cavv_verification_code END AS cavv_verification_code,
+    CASE WHEN channel IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE channel END AS channel,
+    CAST(NULL AS STRING) AS authentication_request,
+    CAST(NULL AS STRING) AS authentication_response,
+    CASE WHEN cc_hash IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE cc_hash END AS cc_hash,
+    CAST(exp_date AS TIMESTAMP_NTZ) AS exp_date,
+    CASE WHEN message_version_3d IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE message_version_3d END AS message_version_3d,
+    CAST(cc_seniority_start_date AS TIMESTAMP_NTZ) AS cc_seniority_start_date,
+    CASE WHEN TRIM(LOWER(mc_scheme_token_used), ' ') IN ('true', '1', 'yes', '1.0') THEN TRUE WHEN TRIM(LOWER(mc_scheme_token_used), ' ') IN ('false', '0', 'no', '0.0') THEN FALSE END AS mc_scheme_token_used,
+    CASE WHEN stored_credentials_mode IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE stored_credentials_mode END AS stored_credentials_mode,
+    CASE WHEN avs_code IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE avs_code END AS avs_code,
+    CASE WHEN TRIM(LOWER(is_3d), ' ') IN ('true', '1', 'yes', '1.0') THEN TRUE WHEN TRIM(LOWER(is_3d), ' ') IN ('false', '0', 'no', '0.0') THEN FALSE END AS is_3d,
+    CASE WHEN credit_type_id IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE credit_type_id END AS credit_type_id,
+    CASE WHEN subscription_step IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE subscription_step END AS subscription_step,
+    CASE WHEN scheme_token_fetching_result IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE scheme_token_fetching_result END AS scheme_token_fetching_result,
+    CASE WHEN browser_screen_height IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE browser_screen_height END AS browser_screen_height,
+    CASE WHEN browser_screen_width IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE browser_screen_width END AS browser_screen_width,
+    CASE WHEN filter_reason_id IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE filter_reason_id END AS filter_reason_id,
+    CASE WHEN reason_code IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE reason_code END AS reason_code,
+    CASE WHEN reason IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE reason END AS reason,
+    CASE WHEN request_timestamp_service IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE request_timestamp_service END AS request_timestamp_service,
+    CASE WHEN token_unique_reference_service IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE token_unique_reference_service END AS token_unique_reference_service,
+    CASE WHEN response_timestamp_service IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE response_timestamp_service END AS response_timestamp_service,
+    CASE WHEN api_type_service IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE api_type_service END AS api_type_service,
+    CASE WHEN request_timestamp_fetching IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE request_timestamp_fetching END AS request_timestamp_fetching,
+    CASE WHEN token_unique_reference_fetching IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE token_unique_reference_fetching END AS token_unique_reference_fetching,
+    CASE WHEN response_timestamp_fetching IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE response_timestamp_fetching END AS response_timestamp_fetching,
+    CASE WHEN api_type_fetching IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE api_type_fetching END AS api_type_fetching,
+    CASE WHEN is_cryptogram_fetching_skipped IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE is_cryptogram_fetching_skipped END AS is_cryptogram_fetching_skipped,
+    CASE WHEN is_external_scheme_token IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE is_external_scheme_token END AS is_external_scheme_token,
+    CASE WHEN three_ds_server_trans_id IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE three_ds_server_trans_id END AS three_ds_server_trans_id,
+    CASE WHEN gateway_id IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE gateway_id END AS gateway_id,
+    CASE WHEN cc_request_type_id IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE cc_request_type_id END AS cc_request_type_id,
+    CASE WHEN upo_id IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE upo_id END AS upo_id,
+    CASE WHEN IsCardReplaced IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE IsCardReplaced END AS IsCardReplaced,
+    CASE WHEN IsVdcuFeeApplied IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE IsVdcuFeeApplied END AS IsVdcuFeeApplied,
+    CASE WHEN AftType IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE AftType END AS AftType,
+    CASE WHEN secondarycccid IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE secondarycccid END AS secondarycccid,
+    CASE WHEN transaction_duration IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE transaction_duration END AS transaction_duration,
+    CAST(NULL AS STRING) AS authorization_req_duration,
+    CASE WHEN FirstInstallment IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE FirstInstallment END AS FirstInstallment,
+    CASE WHEN PeriodicalInstallment IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE PeriodicalInstallment END AS PeriodicalInstallment,
+    CASE WHEN numberOfInstallments IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE numberOfInstallments END AS numberOfInstallments,
+    CASE WHEN InstallmentProgram IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE InstallmentProgram END AS InstallmentProgram,
+    CASE WHEN InstallmentFundingType IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE InstallmentFundingType END AS InstallmentFundingType,
+    CASE WHEN first_installment_usd IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE first_installment_usd END AS first_installment_usd,
+    CASE WHEN periodical_installment_usd IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE periodical_installment_usd END AS periodical_installment_usd,
+    CASE WHEN ApplicableScenarios IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE ApplicableScenarios END AS ApplicableScenarios,
+    CASE WHEN cascading_ab_test_experimant_name IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE cascading_ab_test_experimant_name END AS cascading_ab_test_experimant_name,
+    CAST(IsOnlineRefund AS INTEGER) AS IsOnlineRefund,
+    CAST(IsNoCVV AS INTEGER) AS IsNoCVV,
+    CAST(IsSupportedOCT AS INTEGER) AS IsSupportedOCT,
+    CASE WHEN ExternalTokenTrasactionType IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE ExternalTokenTrasactionType END AS ExternalTokenTrasactionType,
+    CASE WHEN SubscriptionType IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE SubscriptionType END AS SubscriptionType,
+    CAST(MerchantCountryCodeNum AS INTEGER) AS MerchantCountryCodeNum,
+    CASE WHEN MCMerchantAdviceCode IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE MCMerchantAdviceCode END AS MCMerchantAdviceCode,
+    CAST(AcquirerBinCountryId AS INTEGER) AS AcquirerBinCountryId,
+    CAST(AcquirerBin AS INTEGER) AS AcquirerBin,
+    CAST(IsPSD2 AS INTEGER) AS IsPSD2,
+    CAST(IsSCAScope AS INTEGER) AS IsSCAScope,
+    CAST(IsAirline AS INTEGER) AS IsAirline,
+    CAST(RequestedCCCID AS INTEGER) AS RequestedCCCID,
+    CASE WHEN merchant_country IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE merchant_country END AS merchant_country,
+    SYSDATE() AS inserted_at,
+    is_sale_3d_auth_3d,
+    manage_3d_decision_auth_3d,
+    init_status,
+    auth_3d_status,
+    sale_status,
+    auth_status,
+    settle_status,
+    verify_auth_3d_status,
+    is_successful_challenge,
+    is_successful_exemption,
+    is_successful_frictionless,
+    is_successful_authentication,
+    is_approved,
+    is_declined,
+    CASE WHEN threed_flow_status IN ('<na>', 'na', 'nan', 'none', '', ' ', '\u0000', 'deprecated') THEN NULL ELSE threed_flow_status END AS three_ds_flow_status
+FROM strings_normalized;
+
+-- STEP 3: Upsert them into silver (whenMatchedUpdateAll / whenNotMatchedInsertAll)
+MERGE INTO poc.public.ncp_silver_v2 AS target
+USING ncp_silver_batch_v2 AS source
+ON target.transaction_main_id = source.transaction_main_id AND target.transaction_date = source.transaction_date
+WHEN MATCHED THEN UPDATE SET
+    transaction_main_id = source.transaction_main_id,
+    transaction_date = source.transaction_date,
+    transaction_id_life_cycle = source.transaction_id_life_cycle,
+    transaction_date_life_cycle = source.transaction_date_life_cycle,
+    transaction_type_id = source.transaction_type_id,
+    transaction_type = source.transaction_type,
+    transaction_result_id = source.transaction_result_id,
+    final_transaction_status = source.final_transaction_status,
+    "3d_flow_status" = source."3d_flow_status",
+    challenge_preference = source.challenge_preference,
+    preference_reason = source.preference_reason,
+    authentication_flow = source.authentication_flow,
+    "3d_flow" = source."3d_flow",
+    is_void = source.is_void,
+    liability_shift = source.liability_shift,
+    status = source.status,
+    acs_url = source.acs_url,
+    acs_res_authentication_status = source.acs_res_authentication_status,
+    r_req_authentication_status = source.r_req_authentication_status,
+    transaction_status_reason = source.transaction_status_reason,
+    interaction_counter = source.interaction_counter,
+    challenge_cancel = source.challenge_cancel,
+    three_ds_method_indication = source.three_ds_method_indication,
+    is_sale_3d = source.is_sale_3d,
+    manage_3d_decision = source.manage_3d_decision,
+    decline_reason = source.decline_reason,
+    amount_in_usd = source.amount_in_usd,
+    approved_amount_in_usd = source.approved_amount_in_usd,
+    original_currency_amount = source.original_currency_amount,
+    rate_usd = source.rate_usd,
+    currency_code = source.currency_code,
+    three_ds_protocol_version = source.three_ds_protocol_version,
+    is_external_mpi = source.is_external_mpi,
+    rebill = source.rebill,
+    device_channel = source.device_channel,
+    user_agent_3d = source.user_agent_3d,
+    device_type = source.device_type,
+    device_name = source.device_name,
+    device_os = source.device_os,
+    challenge_window_size = source.challenge_window_size,
+    type_of_authentication_method = source.type_of_authentication_method,
+    multi_client_id = source.multi_client_id,
+    client_id = source.client_id,
+    multi_client_name = source.multi_client_name,
+    client_name = source.client_name,
+    industry_code = source.industry_code,
+    credit_card_id = source.credit_card_id,
+    cccid = source.cccid,
+    bin = source.bin,
+    is_prepaid = source.is_prepaid,
+    card_scheme = source.card_scheme,
+    card_type = source.card_type,
+    consumer_id = source.consumer_id,
+    issuer_bank_name = source.issuer_bank_name,
+    device_channel_name = source.device_channel_name,
+    bin_country = source.bin_country,
+    is_eea = source.is_eea,
+    region = source.region,
+    payment_instrument = source.payment_instrument,
+    source_application = source.source_application,
+    is_partial_amount = source.is_partial_amount,
+    enable_partial_approval = source.enable_partial_approval,
+    partial_approval_is_void = source.partial_approval_is_void,
+    partial_approval_void_id = source.partial_approval_void_id,
+    partial_approval_void_time = source.partial_approval_void_time,
+    partial_approval_requested_amount = source.partial_approval_requested_amount,
+    partial_approval_requested_currency = source.partial_approval_requested_currency,
+    partial_approval_processed_amount = source.partial_approval_processed_amount,
+    partial_approval_processed_currency = source.partial_approval_processed_currency,
+    partial_approval_processed_amount_in_usd = source.partial_approval_processed_amount_in_usd,
+    website_id = source.website_id,
+    browser_user_agent = source.browser_user_agent,
+    ip_country = source.ip_country,
+    processor_id = source.processor_id,
+    processor_name = source.processor_name,
+    risk_email_id = source.risk_email_id,
+    is_currency_converted = source.is_currency_converted,
+    email_seniority_start_date = source.email_seniority_start_date,
+    email_payment_attempts = source.email_payment_attempts,
+    final_fraud_decision_id = source.final_fraud_decision_id,
+    external_token_eci = source.external_token_eci,
+    risk_threed_eci = source.risk_threed_eci,
+    threed_eci = source.threed_eci,
+    cvv_code = source.cvv_code,
+    provider_response_code = source.provider_response_code,
+    issuer_card_program_id = source.issuer_card_program_id,
+    scenario_id = source.scenario_id,
+    previous_id = source.previous_id,
+    next_id = source.next_id,
+    step = source.step,
+    reprocess_3d_reason = source.reprocess_3d_reason,
+    data_only_authentication_result = source.data_only_authentication_result,
+    is_cascaded_after_data_only_authentication = source.is_cascaded_after_data_only_authentication,
+    next_action = source.next_action,
+    authentication_method = source.authentication_method,
+    cavv_verification_code = source.cavv_verification_code,
+    channel = source.channel,
+    authentication_request = source.authentication_request,
+    authentication_response = source.authentication_response,
+    cc_hash = source.cc_hash,
+    exp_date = source.exp_date,
+    message_version_3d = source.message_version_3d,
+    cc_seniority_start_date = source.cc_seniority_start_date,
+    mc_scheme_token_used = source.mc_scheme_token_used,
+    stored_credentials_mode = source.stored_credentials_mode,
+    avs_code = source.avs_code,
+    is_3d = source.is_3d,
+    credit_type_id = source.credit_type_id,
+    subscription_step = source.subscription_step,
+    scheme_token_fetching_result = source.scheme_token_fetching_result,
+    browser_screen_height = source.browser_screen_height,
+    browser_screen_width = source.browser_screen_width,
+    filter_reason_id = source.filter_reason_id,
+    reason_code = source.reason_code,
+    reason = source.reason,
+    request_timestamp_service = source.request_timestamp_service,
+    token_unique_reference_service = source.token_unique_reference_service,
+    response_timestamp_service = source.response_timestamp_service,
+    api_type_service = source.api_type_service,
+    request_timestamp_fetching = source.request_timestamp_fetching,
+    token_unique_reference_fetching = source.token_unique_reference_fetching,
+    response_timestamp_fetching = source.response_timestamp_fetching,
+    api_type_fetching = source.api_type_fetching,
+    is_cryptogram_fetching_skipped = source.is_cryptogram_fetching_skipped,
+    is_external_scheme_token = source.is_external_scheme_token,
+    three_ds_server_trans_id = source.three_ds_server_trans_id,
+    gateway_id = source.gateway_id,
+    cc_request_type_id = source.cc_request_type_id,
+    upo_id = source.upo_id,
+    IsCardReplaced = source.IsCardReplaced,
+    IsVdcuFeeApplied = source.IsVdcuFeeApplied,
+    AftType = source.AftType,
+    secondarycccid = source.secondarycccid,
+    transaction_duration = source.transaction_duration,
+    authorization_req_duration = source.authorization_req_duration,
+    FirstInstallment = source.FirstInstallment,
+    PeriodicalInstallment = source.PeriodicalInstallment,
+    numberOfInstallments = source.numberOfInstallments,
+    InstallmentProgram = source.InstallmentProgram,
+    InstallmentFundingType = source.InstallmentFundingType,
+    first_installment_usd = source.first_installment_usd,
+    periodical_installment_usd = source.periodical_installment_usd,
+    ApplicableScenarios = source.ApplicableScenarios,
+    cascading_ab_test_experimant_name = source.cascading_ab_test_experimant_name,
+    IsOnlineRefund = source.IsOnlineRefund,
+    IsNoCVV = source.IsNoCVV,
+    IsSupportedOCT = source.IsSupportedOCT,
+    ExternalTokenTrasactionType = source.ExternalTokenTrasactionType,
+    SubscriptionType = source.SubscriptionType,
+    MerchantCountryCodeNum = source.MerchantCountryCodeNum,
+    MCMerchantAdviceCode = source.MCMerchantAdviceCode,
+    AcquirerBinCountryId = source.AcquirerBinCountryId,
+    AcquirerBin = source.AcquirerBin,
+    IsPSD2 = source.IsPSD2,
+    IsSCAScope = source.IsSCAScope,
+    IsAirline = source.IsAirline,
+    RequestedCCCID = source.RequestedCCCID,
+    merchant_country = source.merchant_country,
+    inserted_at = source.inserted_at,
+    is_sale_3d_auth_3d = source.is_sale_3d_auth_3d,
+    manage_3d_decision_auth_3d = source.manage_3d_decision_auth_3d,
+    init_status = source.init_status,
+    auth_3d_status = source.auth_3d_status,
+    sale_status = source.sale_status,
+    auth_status = source.auth_status,
+    settle_status = source.settle_status,
+    verify_auth_3d_status = source.verify_auth_3d_status,
+    is_successful_challenge = source.is_successful_challenge,
+    is_successful_exemption = source.is_successful_exemption,
+    is_successful_frictionless = source.is_successful_frictionless,
+    is_successful_authentication = source.is_successful_authentication,
+    is_approved = source.is_approved,
+    is_declined = source.is_declined,
+    three_ds_flow_status = source.three_ds_flow_status
+WHEN NOT MATCHED THEN INSERT (
+    transaction_main_id, transaction_date, transaction_id_life_cycle, transaction_date_life_cycle,
+    transaction_type_id, transaction_type, transaction_result_id, final_transaction_status, "3d_flow_status",
+    challenge_preference, preference_reason, authentication_flow, "3d_flow", is_void, liability_shift, status,
+    acs_url, acs_res_authentication_status, r_req_authentication_status, transaction_status_reason,
+    interaction_counter, challenge_cancel, three_ds_method_indication, is_sale_3d, manage_3d_decision,
+    decline_reason, amount_in_usd, approved_amount_in_usd, original_currency_amount, rate_usd, currency_code,
+    three_ds_protocol_version, is_external_mpi, rebill, device_channel, user_agent_3d, device_type,
+    device_name, device_os, challenge_window_size, type_of_authentication_method, multi_client_id, client_id,
+    multi_client_name, client_name, industry_code, credit_card_id, cccid, bin, is_prepaid, card_scheme,
+    card_type, consumer_id, issuer_bank_name, device_channel_name, bin_country, is_eea, region,
+    payment_instrument, source_application, is_partial_amount, enable_partial_approval,
+    partial_approval_is_void, partial_approval_void_id, partial_approval_void_time,
+    partial_approval_requested_amount, partial_approval_requested_currency, partial_approval_processed_amount,
+    partial_approval_processed_currency, partial_approval_processed_amount_in_usd, website_id,
+    browser_user_agent, ip_country, processor_id, processor_name, risk_email_id, is_currency_converted,
+    email_seniority_start_date, email_payment_attempts, final_fraud_decision_id, external_token_eci,
+    risk_threed_eci, threed_eci, cvv_code, provider_response_code, issuer_card_program_id, scenario_id,
+    previous_id, next_id, step, reprocess_3d_reason, data_only_authentication_result,
+    is_cascaded_after_data_only_authentication, next_action, authentication_method, cavv_verification_code,
+    channel, authentication_request, authentication_response, cc_hash, exp_date, message_version_3d,
+    cc_seniority_start_date, mc_scheme_token_used, stored_credentials_mode, avs_code, is_3d, credit_type_id,
+    subscription_step, scheme_token_fetching_result, browser_screen_height, browser_screen_width,
+    filter_reason_id, reason_code, reason, request_timestamp_service, token_unique_reference_service,
+    response_timestamp_service, api_type_service, request_timestamp_fetching, token_unique_reference_fetching,
+    response_timestamp_fetching, api_type_fetching, is_cryptogram_fetching_skipped, is_external_scheme_token,
+    three_ds_server_trans_id, gateway_id, cc_request_type_id, upo_id, IsCardReplaced, IsVdcuFeeApplied,
+    AftType, secondarycccid, transaction_duration, authorization_req_duration, FirstInstallment,
+    PeriodicalInstallment, numberOfInstallments, InstallmentProgram, InstallmentFundingType,
+    first_installment_usd, periodical_installment_usd, ApplicableScenarios, cascading_ab_test_experimant_name,
+    IsOnlineRefund, IsNoCVV, IsSupportedOCT, ExternalTokenTrasactionType, SubscriptionType,
+    MerchantCountryCodeNum, MCMerchantAdviceCode, AcquirerBinCountryId, AcquirerBin, IsPSD2, IsSCAScope,
+    IsAirline, RequestedCCCID, merchant_country, inserted_at, is_sale_3d_auth_3d, manage_3d_decision_auth_3d,
+    init_status, auth_3d_status, sale_status, auth_status, settle_status, verify_auth_3d_status,
+    is_successful_challenge, is_successful_exemption, is_successful_frictionless,
+    is_successful_authentication, is_approved, is_declined, three_ds_flow_status
+) VALUES (
+    source.transaction_main_id, source.transaction_date, source.transaction_id_life_cycle,
+    source.transaction_date_life_cycle, source.transaction_type_id, source.transaction_type,
+    source.transaction_result_id, source.final_transaction_status, source."3d_flow_status",
+    source.challenge_preference, source.preference_reason, source.authentication_flow, source."3d_flow",
+    source.is_void, source.liability_shift, source.status, source.acs_url,
+    source.acs_res_authentication_status, source.r_req_authentication_status,
+    source.transaction_status_reason, source.interaction_counter, source.challenge_cancel,
+    source.three_ds_method_indication, source.is_sale_3d, source.manage_3d_decision, source.decline_reason,
+    source.amount_in_usd, source.approved_amount_in_usd, source.original_currency_amount, source.rate_usd,
+    source.currency_code, source.three_ds_protocol_version, source.is_external_mpi, source.rebill,
+    source.device_channel, source.user_agent_3d, source.device_type, source.device_name, source.device_os,
+    source.challenge_window_size, source.type_of_authentication_method, source.multi_client_id,
+    source.client_id, source.multi_client_name, source.client_name, source.industry_code,
+    source.credit_card_id, source.cccid, source.bin, source.is_prepaid, source.card_scheme, source.card_type,
+    source.consumer_id, source.issuer_bank_name, source.device_channel_name, source.bin_country,
+    source.is_eea, source.region, source.payment_instrument, source.source_application,
+    source.is_partial_amount, source.enable_partial_approval, source.partial_approval_is_void,
+    source.partial_approval_void_id, source.partial_approval_void_time,
+    source.partial_approval_requested_amount, source.partial_approval_requested_currency,
+    source.partial_approval_processed_amount, source.partial_approval_processed_currency,
+    source.partial_approval_processed_amount_in_usd, source.website_id, source.browser_user_agent,
+    source.ip_country, source.processor_id, source.processor_name, source.risk_email_id,
+    source.is_currency_converted, source.email_seniority_start_date, source.email_payment_attempts,
+    source.final_fraud_decision_id, source.external_token_eci, source.risk_threed_eci, source.threed_eci,
+    source.cvv_code, source.provider_response_code, source.issuer_card_program_id, source.scenario_id,
+    source.previous_id, source.next_id, source.step, source.reprocess_3d_reason,
+    source.data_only_authentication_result, source.is_cascaded_after_data_only_authentication,
+    source.next_action, source.authentication_method, source.cavv_verification_code, source.channel,
+    source.authentication_request, source.authentication_response, source.cc_hash, source.exp_date,
+    source.message_version_3d, source.cc_seniority_start_date, source.mc_scheme_token_used,
+    source.stored_credentials_mode, source.avs_code, source.is_3d, source.credit_type_id,
+    source.subscription_step, source.scheme_token_fetching_result, source.browser_screen_height,
+    source.browser_screen_width, source.filter_reason_id, source.reason_code, source.reason,
+    source.request_timestamp_service, source.token_unique_reference_service,
+    source.response_timestamp_service, source.api_type_service, source.request_timestamp_fetching,
+    source.token_unique_reference_fetching, source.response_timestamp_fetching, source.api_type_fetching,
+    source.is_cryptogram_fetching_skipped, source.is_external_scheme_token, source.three_ds_server_trans_id,
+    source.gateway_id, source.cc_request_type_id, source.upo_id, source.IsCardReplaced,
+    source.IsVdcuFeeApplied, source.AftType, source.secondarycccid, source.transaction_duration,
+    source.authorization_req_duration, source.FirstInstallment, source.PeriodicalInstallment,
+    source.numberOfInstallments, source.InstallmentProgram, source.InstallmentFundingType,
+    source.first_installment_usd, source.periodical_installment_usd, source.ApplicableScenarios,
+    source.cascading_ab_test_experimant_name, source.IsOnlineRefund, source.IsNoCVV, source.IsSupportedOCT,
+    source.ExternalTokenTrasactionType, source.SubscriptionType, source.MerchantCountryCodeNum,
+    source.MCMerchantAdviceCode, source.AcquirerBinCountryId, source.AcquirerBin, source.IsPSD2,
+    source.IsSCAScope, source.IsAirline, source.RequestedCCCID, source.merchant_country, source.inserted_at,
+    source.is_sale_3d_auth_3d, source.manage_3d_decision_auth_3d, source.init_status, source.auth_3d_status,
+    source.sale_status, source.auth_status, source.settle_status, source.verify_auth_3d_status,
+    source.is_successful_challenge, source.is_successful_exemption, source.is_successful_frictionless,
+    source.is_successful_authentication, source.is_approved, source.is_declined, source.three_ds_flow_status
+);
+
+-- STEP 4: Advance the checkpoint (only when the window had bronze rows)
+INSERT INTO poc.public.ncp_silver_checkpoint_v2
+SELECT window_end, (SELECT COUNT(*) FROM ncp_silver_batch_v2), SYSDATE()
+FROM ncp_silver_window_v2
+WHERE window_end IS NOT NULL
+  AND (window_start IS NULL OR window_end > window_start);